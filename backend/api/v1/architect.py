@@ -9,6 +9,7 @@ import time
 
 from fastapi import APIRouter, Depends, HTTPException
 
+from backend.core.components import ARCHITECT_GRAPH, registry
 from backend.core.config import Settings, get_settings
 from backend.core.dependencies import UserWithUsageLimit
 from backend.schemas.architect import (
@@ -27,14 +28,11 @@ from src.utils.exceptions import LLMError, ValidationError
 router = APIRouter()
 
 
-def get_architect_graph(
-    settings: Settings = Depends(get_settings),
-) -> ArchitectGraph:
+def get_architect_graph() -> ArchitectGraph:
     """
     ArchitectGraphインスタンスを取得する依存性注入
 
-    Args:
-        settings: アプリケーション設定
+    lifespanで構築済みの共有インスタンスをレジストリから返します。
 
     Returns:
         ArchitectGraphインスタンス
@@ -43,10 +41,7 @@ def get_architect_graph(
         HTTPException: ArchitectGraph初期化エラー
     """
     try:
-        return ArchitectGraph(
-            llm_model=settings.default_llm_model,
-            temperature=settings.temperature,
-        )
+        return registry.get(ARCHITECT_GRAPH)
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -5,25 +5,37 @@ RAG学習支援機能のAPIエンドポイント。
 既存のRAGChainロジックを呼び出します。
 """
 
+import asyncio
+import json
 import sys
 import time
+from collections.abc import AsyncIterator, Awaitable, Iterator
 from pathlib import Path
+from typing import Any, TypeVar
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import iterate_in_threadpool, run_in_threadpool
+from fastapi.responses import StreamingResponse
 
 # プロジェクトルートをPythonパスに追加
 project_root = Path(__file__).parent.parent.parent.parent
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
+from backend.core.components import RAG_CHAIN, VECTORSTORE, registry
 from backend.core.config import Settings, get_settings
-from backend.core.dependencies import UserWithUsageLimit
+from backend.core.dependencies import AdminUser, UserWithUsageLimit
+from backend.schemas.common import SuccessResponse
 from backend.schemas.rag import (
     CodeExampleResponse,
+    RAGCacheStatsResponse,
     RAGHealthResponse,
     RAGQueryMetadata,
     RAGQueryRequest,
     RAGQueryResponse,
+    RAGStreamFinalEvent,
+    RAGStreamSourcesEvent,
+    RAGStreamTokenEvent,
     SourceResponse,
 )
 from src.features.rag.chain import RAGChain
@@ -32,13 +44,23 @@ from src.utils.exceptions import LLMError, ValidationError, VectorStoreError
 
 router = APIRouter()
 
+# Server-Sent Eventsのレスポンスヘッダー（プロキシでのバッファリングを無効化）
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
 
-def get_vectorstore(settings: Settings = Depends(get_settings)) -> ChromaVectorStore:
+# クライアントの切断を確認する間隔（秒）
+DISCONNECT_POLL_INTERVAL = 0.5
+
+# クライアントが応答前に切断した場合のステータスコード（nginxの慣例）
+CLIENT_CLOSED_REQUEST = 499
+
+T = TypeVar("T")
+
+
+def get_vectorstore() -> ChromaVectorStore:
     """
     VectorStoreインスタンスを取得する依存性注入
 
-    Args:
-        settings: アプリケーション設定
+    lifespanで構築済みの共有インスタンスをレジストリから返します。
 
     Returns:
         ChromaVectorStoreインスタンス
@@ -47,10 +69,7 @@ def get_vectorstore(settings: Settings = Depends(get_settings)) -> ChromaVectorS
         HTTPException: VectorStore初期化エラー
     """
     try:
-        return ChromaVectorStore(
-            persist_directory=settings.chroma_persist_dir,
-            embedding_model=settings.default_embedding_model,
-        )
+        return registry.get(VECTORSTORE)
     except VectorStoreError as e:
         raise HTTPException(
             status_code=500,
@@ -58,16 +77,11 @@ def get_vectorstore(settings: Settings = Depends(get_settings)) -> ChromaVectorS
         )
 
 
-def get_rag_chain(
-    vectorstore: ChromaVectorStore = Depends(get_vectorstore),
-    settings: Settings = Depends(get_settings),
-) -> RAGChain:
+def get_rag_chain() -> RAGChain:
     """
     RAGChainインスタンスを取得する依存性注入
 
-    Args:
-        vectorstore: VectorStoreインスタンス
-        settings: アプリケーション設定
+    lifespanで構築済みの共有インスタンスをレジストリから返します。
 
     Returns:
         RAGChainインスタンス
@@ -76,11 +90,7 @@ def get_rag_chain(
         HTTPException: RAGChain初期化エラー
     """
     try:
-        return RAGChain(
-            vectorstore=vectorstore,
-            llm_model=settings.default_llm_model,
-            temperature=settings.temperature,
-        )
+        return registry.get(RAG_CHAIN)
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -88,6 +98,83 @@ def get_rag_chain(
         )
 
 
+def _to_source_responses(sources: list[dict[str, Any]]) -> list[SourceResponse]:
+    """RAGChainのソース情報をレスポンススキーマに変換"""
+    return [
+        SourceResponse(
+            title=source["title"],
+            url=source["url"],
+            excerpt=source["excerpt"],
+            relevance=source.get("relevance", 0.0),
+            doc_type=source.get("doc_type", "unknown"),
+        )
+        for source in sources
+    ]
+
+
+def _to_code_example_responses(code_examples: list[dict[str, Any]]) -> list[CodeExampleResponse]:
+    """RAGChainのコード例をレスポンススキーマに変換"""
+    return [
+        CodeExampleResponse(
+            language=example["language"],
+            code=example["code"],
+            description=example["description"],
+            source_url=example.get("source_url"),
+        )
+        for example in code_examples
+    ]
+
+
+def _sse_event(event: str, data: dict[str, Any]) -> str:
+    """Server-Sent Eventsの1イベントを整形"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _rag_error_detail(error: Exception) -> tuple[int, str]:
+    """RAGクエリの例外をHTTPステータスコードとエラーメッセージに変換"""
+    if isinstance(error, ValidationError):
+        return 400, f"入力バリデーションエラー: {str(error)}"
+    if isinstance(error, VectorStoreError):
+        return 500, f"VectorStoreエラー: {str(error)}"
+    if isinstance(error, LLMError):
+        return 500, f"LLMエラー: {str(error)}"
+    return 500, f"予期しないエラーが発生しました: {str(error)}"
+
+
+async def _run_until_disconnected(http_request: Request, awaitable: Awaitable[T]) -> T:
+    """
+    クライアントが接続している間だけ処理を実行
+
+    応答前にクライアントが切断した場合は処理をキャンセルし、
+    実行中の埋め込み・LLM呼び出しを打ち切ります。
+
+    Args:
+        http_request: HTTPリクエスト（切断の確認に使用）
+        awaitable: 実行する処理
+
+    Returns:
+        処理結果
+
+    Raises:
+        HTTPException: クライアントが切断した場合（499）
+    """
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_INTERVAL)
+            if done:
+                return task.result()
+            if await http_request.is_disconnected():
+                raise HTTPException(
+                    status_code=CLIENT_CLOSED_REQUEST,
+                    detail="クライアントが切断したため処理を中止しました",
+                )
+    finally:
+        # 切断・サーバー側のキャンセルのどちらでもタスクを残さない
+        if not task.done():
+            task.cancel()
+
+
 @router.post(
     "/rag/query",
     response_model=RAGQueryResponse,
@@ -101,6 +188,7 @@ def get_rag_chain(
 )
 async def query_rag(
     request: RAGQueryRequest,
+    http_request: Request,
     current_user: UserWithUsageLimit,
     rag_chain: RAGChain = Depends(get_rag_chain),
     settings: Settings = Depends(get_settings),
@@ -110,12 +198,14 @@ async def query_rag(
 
     LangGraphに関する質問に対して、ベクトルストアから関連ドキュメントを検索し、
     LLMを使用してソース付きで回答を生成します。
+    処理は非同期で行い、応答前にクライアントが切断した場合は中止します。
 
     **認証必須**: JWTトークンが必要です。
     **使用制限**: テストユーザーは1日5回まで、管理者は無制限です。
 
     Args:
         request: RAGクエリリクエスト
+        http_request: HTTPリクエスト（クライアントの切断検知に使用）
         current_user: 認証されたユーザー（依存性注入）
         rag_chain: RAGChainインスタンス（依存性注入）
         settings: アプリケーション設定（依存性注入）
@@ -129,42 +219,32 @@ async def query_rag(
     start_time = time.time()
 
     try:
-        # RAGクエリ実行（既存のロジックをそのまま使用）
-        result = rag_chain.query(
-            question=request.question,
-            k=request.k,
-            include_sources=request.include_sources,
-            include_code_examples=request.include_code_examples,
+        # RAGクエリ実行（非同期、切断時はキャンセル）
+        result = await _run_until_disconnected(
+            http_request,
+            rag_chain.aquery(
+                question=request.question,
+                k=request.k,
+                include_sources=request.include_sources,
+                include_code_examples=request.include_code_examples,
+                search_mode=request.search_mode,
+            ),
         )
 
         # レスポンススキーマに変換
-        sources = [
-            SourceResponse(
-                title=source["title"],
-                url=source["url"],
-                excerpt=source["excerpt"],
-                relevance=source["relevance"],
-                doc_type=source.get("doc_type", "unknown"),
-            )
-            for source in result.get("sources", [])
-        ]
-
-        code_examples = [
-            CodeExampleResponse(
-                language=example["language"],
-                code=example["code"],
-                description=example["description"],
-                source_url=example.get("source_url"),
-            )
-            for example in result.get("code_examples", [])
-        ]
+        sources = _to_source_responses(result.get("sources", []))
+        code_examples = _to_code_example_responses(result.get("code_examples", []))
 
         response_time = time.time() - start_time
 
         metadata = RAGQueryMetadata(
             model=result["metadata"]["model"],
             tokens_used=result["metadata"]["tokens_used"],
+            context_tokens=result["metadata"].get("context_tokens"),
             response_time=response_time,
+            cache_hit=result["metadata"].get("cache_hit", False),
+            cache_type=result["metadata"].get("cache_type"),
+            cache_similarity=result["metadata"].get("cache_similarity"),
         )
 
         return RAGQueryResponse(
@@ -175,26 +255,115 @@ async def query_rag(
             metadata=metadata,
         )
 
-    except ValidationError as e:
-        raise HTTPException(
-            status_code=400,
-            detail=f"入力バリデーションエラー: {str(e)}",
-        )
-    except VectorStoreError as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"VectorStoreエラー: {str(e)}",
-        )
-    except LLMError as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"LLMエラー: {str(e)}",
-        )
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"予期しないエラーが発生しました: {str(e)}",
+        status_code, detail = _rag_error_detail(e)
+        raise HTTPException(status_code=status_code, detail=detail)
+
+
+@router.post(
+    "/rag/query/stream",
+    summary="RAGクエリ実行（ストリーミング）",
+    description=(
+        "RAGクエリの結果をServer-Sent Eventsで返します。"
+        "検索直後にsources、生成中にtoken、最後にfinal（コード例・メタデータ）を送信します"
+    ),
+    response_class=StreamingResponse,
+    responses={
+        200: {"description": "成功（text/event-stream）", "content": {"text/event-stream": {}}},
+        400: {"description": "不正なリクエスト"},
+        500: {"description": "サーバーエラー"},
+    },
+)
+async def query_rag_stream(
+    request: RAGQueryRequest,
+    current_user: UserWithUsageLimit,
+    rag_chain: RAGChain = Depends(get_rag_chain),
+    settings: Settings = Depends(get_settings),
+) -> StreamingResponse:
+    """
+    RAGクエリのストリーミングエンドポイント
+
+    `/rag/query`と同じ処理を行い、結果を次の順でServer-Sent Eventsとして送信します。
+    最初のバイトは検索が終わった時点で返るため、回答生成の完了を待ちません。
+
+    - `sources`: 検索したソース（`RAGStreamSourcesEvent`）
+    - `token`: 回答テキストの差分（`RAGStreamTokenEvent`、生成に合わせて複数回）
+    - `final`: コード例・信頼度・メタデータ（`RAGStreamFinalEvent`）
+    - `error`: 生成中にエラーが発生した場合（`detail`）
+
+    **認証必須**: JWTトークンが必要です。
+    **使用制限**: `/rag/query`と同じく1リクエストにつき1回としてカウントします。
+
+    Args:
+        request: RAGクエリリクエスト
+        current_user: 認証されたユーザー（依存性注入）
+        rag_chain: RAGChainインスタンス（依存性注入）
+        settings: アプリケーション設定（依存性注入）
+
+    Returns:
+        text/event-streamのストリーミングレスポンス
+
+    Raises:
+        HTTPException: 検索までに発生したエラー、認証エラー、使用制限超過
+    """
+    start_time = time.time()
+
+    events: Iterator[tuple[str, dict[str, Any]]] = rag_chain.stream(
+        question=request.question,
+        k=request.k,
+        include_sources=request.include_sources,
+        include_code_examples=request.include_code_examples,
+        search_mode=request.search_mode,
+    )
+
+    # 検索（最初のイベント）まではレスポンス開始前に実行し、エラーはステータスコードで返す
+    try:
+        first_event = await run_in_threadpool(next, events, None)
+    except Exception as e:
+        status_code, detail = _rag_error_detail(e)
+        raise HTTPException(status_code=status_code, detail=detail)
+
+    async def event_stream() -> AsyncIterator[str]:
+        try:
+            if first_event is not None:
+                yield _format_stream_event(*first_event, start_time)
+            async for event in iterate_in_threadpool(events):
+                yield _format_stream_event(*event, start_time)
+        except Exception as e:
+            # ヘッダー送信後のためステータスコードは変えられず、errorイベントで通知
+            _, detail = _rag_error_detail(e)
+            yield _sse_event("error", {"detail": detail})
+        finally:
+            # クライアント切断でここが中断された場合も生成を打ち切り、LLMのストリームを解放する
+            # （iterate_in_threadpoolはキャンセル時に実行中のnextの完了を待つため、closeと競合しない）
+            events.close()
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+def _format_stream_event(event: str, data: dict[str, Any], start_time: float) -> str:
+    """RAGChain.streamのイベントをレスポンススキーマで検証してSSEに整形"""
+    if event == "sources":
+        payload = RAGStreamSourcesEvent(sources=_to_source_responses(data["sources"]))
+    elif event == "token":
+        payload = RAGStreamTokenEvent(delta=data["delta"])
+    else:
+        payload = RAGStreamFinalEvent(
+            code_examples=_to_code_example_responses(data.get("code_examples", [])),
+            confidence=data["confidence"],
+            metadata=RAGQueryMetadata(
+                model=data["metadata"]["model"],
+                tokens_used=data["metadata"]["tokens_used"],
+                context_tokens=data["metadata"].get("context_tokens"),
+                response_time=time.time() - start_time,
+                cache_hit=data["metadata"].get("cache_hit", False),
+                cache_type=data["metadata"].get("cache_type"),
+                cache_similarity=data["metadata"].get("cache_similarity"),
+            ),
         )
+    return _sse_event(event, payload.model_dump())
 
 
 @router.get(
@@ -210,6 +379,8 @@ async def rag_health(
     RAGヘルスチェックエンドポイント
 
     VectorStoreの接続状態とドキュメント数を確認します。
+    統計情報は書き込み時に更新されるキャッシュから返すため、
+    プローブごとのデータベース問い合わせは発生しません。
 
     Args:
         vectorstore: VectorStoreインスタンス（依存性注入）
@@ -225,6 +396,10 @@ async def rag_health(
             status="healthy",
             vectorstore_connected=True,
             document_count=collection_info.get("document_count", 0),
+            documents_by_type=collection_info.get("documents_by_type", {}),
+            embedding_dimension=collection_info.get("embedding_dimension"),
+            disk_size_bytes=collection_info.get("disk_size_bytes"),
+            last_ingest_at=collection_info.get("last_ingest_at"),
         )
     except Exception:
         return RAGHealthResponse(
@@ -232,3 +407,70 @@ async def rag_health(
             vectorstore_connected=False,
             document_count=0,
         )
+
+
+@router.get(
+    "/rag/cache/stats",
+    response_model=RAGCacheStatsResponse,
+    summary="RAG回答キャッシュの統計",
+    description="応答キャッシュとセマンティックキャッシュのヒット率を返します",
+)
+async def rag_cache_stats(
+    rag_chain: RAGChain = Depends(get_rag_chain),
+) -> RAGCacheStatsResponse:
+    """
+    RAG回答キャッシュの統計エンドポイント
+
+    応答キャッシュのヒット/ミス数はSQLiteで全ワーカー分を集計した値（process_*は
+    このワーカーの値）、セマンティックキャッシュはこのワーカーのメモリ上の値です。
+
+    Args:
+        rag_chain: RAGChainインスタンス（依存性注入）
+
+    Returns:
+        RAG回答キャッシュの統計情報レスポンス
+    """
+    response_cache = rag_chain.response_cache
+    answer_cache = rag_chain.answer_cache
+    return RAGCacheStatsResponse(
+        response_cache=(
+            await run_in_threadpool(response_cache.stats) if response_cache is not None else None
+        ),
+        semantic_cache=answer_cache.stats() if answer_cache is not None else None,
+    )
+
+
+@router.post(
+    "/rag/reload",
+    response_model=SuccessResponse,
+    summary="RAGコンポーネント再読み込み",
+    description="再インジェスト後にVectorStoreとRAGChainを再構築します（管理者のみ）",
+)
+async def reload_rag(current_user: AdminUser) -> SuccessResponse:
+    """
+    RAGコンポーネント再読み込みエンドポイント
+
+    `scripts/init_vectorstore.py` などで再インジェストした後に呼び出し、
+    共有インスタンスを新しいコレクションの内容で作り直します。
+
+    **認証必須**: 管理者ユーザーのみ実行できます。
+
+    Args:
+        current_user: 認証された管理者ユーザー（依存性注入）
+
+    Returns:
+        成功レスポンス
+
+    Raises:
+        HTTPException: 再構築エラー
+    """
+    try:
+        # Chromaの構築とウォームアップでイベントループを止めないようスレッドで実行
+        await run_in_threadpool(registry.reload)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"RAGコンポーネントの再構築に失敗しました: {str(e)}",
+        )
+
+    return SuccessResponse(message="RAGコンポーネントを再構築しました")
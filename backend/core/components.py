@@ -0,0 +1,299 @@
+"""
+LangGraph Catalyst - Component Registry
+
+RAG/Architectコンポーネントをプロセス内で共有するレジストリ。
+FastAPIのlifespanで一度だけ構築し、各エンドポイントの依存性注入から参照します。
+"""
+
+import asyncio
+import logging
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from backend.core.config import Settings, get_settings
+from src.features.architect.graph import ArchitectGraph
+from src.features.rag.chain import RAGChain
+from src.features.rag.response_cache import ResponseCache
+from src.features.rag.semantic_cache import SemanticAnswerCache
+from src.features.rag.vectorstore import ChromaVectorStore, create_vectorstore
+
+logger = logging.getLogger(__name__)
+
+# コンポーネント名
+VECTORSTORE = "vectorstore"
+RAG_CHAIN = "rag_chain"
+ARCHITECT_GRAPH = "architect_graph"
+
+# 再インジェスト後に作り直すコンポーネント（依存順）
+RETRIEVAL_COMPONENTS = (VECTORSTORE, RAG_CHAIN)
+
+
+class ComponentRegistry:
+    """
+    プロセス全体で共有するコンポーネントのレジストリ
+
+    ChromaVectorStore（Chromaクライアント + OpenAIEmbeddings）、RAGChain（ChatOpenAI）、
+    ArchitectGraph（コンパイル済みStateGraph）をリクエストごとに作らず再利用することで、
+    初期化コストを省き、HTTP接続を温かいまま保ちます。
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._components: dict[str, Any] = {}
+        self._overrides: dict[str, Any] = {}
+        self._settings: Settings | None = None
+        self._ready = threading.Event()
+        self._warmup_result: dict[str, Any] = {}
+        # startup()/shutdown()ごとに増やし、前回の起動で始まったウォームアップを打ち切る
+        self._generation = 0
+        # リクエストを処理するイベントループ（非同期クライアントのウォームアップ先）
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._builders: dict[str, Callable[[Settings, dict[str, Any]], Any]] = {
+            VECTORSTORE: self._build_vectorstore,
+            RAG_CHAIN: self._build_rag_chain,
+            ARCHITECT_GRAPH: self._build_architect_graph,
+        }
+
+    @property
+    def settings(self) -> Settings:
+        """構築に使用する設定（未指定時はget_settings()）"""
+        return self._settings or get_settings()
+
+    def startup(self, settings: Settings | None = None) -> dict[str, str]:
+        """
+        全コンポーネントを事前構築
+
+        構築に失敗したコンポーネントは起動を止めず、初回アクセス時に再試行します。
+        イベントループ上（lifespan）で呼び出された場合は、そのループを非同期クライアントの
+        ウォームアップ先として記録します。
+
+        Args:
+            settings: アプリケーション設定
+
+        Returns:
+            dict: コンポーネント名→構築結果（"ready" またはエラーメッセージ）
+        """
+        if settings is not None:
+            self._settings = settings
+        self._generation += 1
+        self._ready.clear()
+        self._warmup_result = {}
+        try:
+            self._loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._loop = None
+
+        status = {}
+        for name in self._builders:
+            try:
+                self.get(name)
+                status[name] = "ready"
+            except Exception as e:
+                logger.warning(f"Failed to preload component '{name}': {e}")
+                status[name] = str(e)
+
+        return status
+
+    @property
+    def is_ready(self) -> bool:
+        """ウォームアップが完了しているか"""
+        return self._ready.is_set()
+
+    @property
+    def warmup_result(self) -> dict[str, Any]:
+        """直近のウォームアップ結果（コンポーネント名→結果）"""
+        return dict(self._warmup_result)
+
+    def warmup(self) -> dict[str, Any]:
+        """
+        検索系コンポーネントをウォームアップし、完了後にレディ状態にする
+
+        コレクション・インデックスの読み込みとOpenAIへの接続確立を初回リクエストの前に
+        済ませます。構築やウォームアップに失敗したコンポーネントがあっても完了扱いとし、
+        結果に失敗内容を残します。
+
+        Returns:
+            dict: コンポーネント名→ウォームアップ結果
+        """
+        generation = self._generation
+        results: dict[str, Any] = {}
+        for name in RETRIEVAL_COMPONENTS:
+            if generation != self._generation:
+                # 終了・再起動後は破棄済みのコンポーネントを構築し直さない
+                logger.info("Stopping warmup started by a previous startup")
+                return results
+            try:
+                results[name] = self._warm(self.get(name), self._loop)
+            except Exception as e:
+                logger.warning(f"Failed to warm up component '{name}': {e}")
+                results[name] = {"status": "failed", "error": str(e)}
+
+        if generation != self._generation:
+            # 待っている間に再起動された場合、新しい起動のレディ状態には反映しない
+            logger.info("Ignoring warmup result from a previous startup")
+            return results
+
+        self._warmup_result = results
+        self._ready.set()
+        logger.info(f"Warmup completed: {results}")
+        return results
+
+    def mark_ready(self) -> None:
+        """ウォームアップせずにレディ状態にする（ウォームアップ無効時）"""
+        self._ready.set()
+
+    @staticmethod
+    def _warm(component: Any, loop: asyncio.AbstractEventLoop | None) -> dict[str, Any]:
+        """warmup()を持つコンポーネントをウォームアップ（別スレッドから呼び出すこと）"""
+        warmup = getattr(component, "warmup", None)
+        if not callable(warmup):
+            return {"status": "skipped"}
+        return warmup(loop=loop)
+
+    def get(self, name: str) -> Any:
+        """
+        コンポーネントを取得（未構築の場合は構築）
+
+        Args:
+            name: コンポーネント名
+
+        Returns:
+            コンポーネントインスタンス
+
+        Raises:
+            KeyError: 未知のコンポーネント名
+            Exception: 構築時のエラー
+        """
+        if name in self._overrides:
+            return self._overrides[name]
+
+        component = self._components.get(name)
+        if component is not None:
+            return component
+
+        if name not in self._builders:
+            raise KeyError(f"Unknown component: {name}")
+
+        with self._lock:
+            component = self._components.get(name)
+            if component is None:
+                component = self._builders[name](self.settings, {})
+                self._components[name] = component
+                logger.info(f"Built component: {name}")
+            return component
+
+    def reload(self, names: tuple[str, ...] = RETRIEVAL_COMPONENTS) -> None:
+        """
+        コンポーネントを再構築して差し替える
+
+        再インジェスト後に呼び出します。新しいインスタンスの構築が完了するまで
+        既存インスタンスでリクエストを処理し続け、完了後にまとめて差し替えます。
+        差し替えた古いインスタンスは閉じて、SQLite接続やスレッドプールを解放します。
+
+        Args:
+            names: 再構築するコンポーネント名（依存順）
+        """
+        with self._lock:
+            # 構築に失敗した場合は既存インスタンスをそのまま使い続ける
+            staged: dict[str, Any] = {}
+            for name in names:
+                staged[name] = self._builders[name](self.settings, staged)
+            # 差し替え前に温めておき、切り替え直後のリクエストを遅くしない
+            for name, component in staged.items():
+                try:
+                    self._warm(component, self._loop)
+                except Exception as e:
+                    logger.warning(f"Failed to warm up reloaded component '{name}': {e}")
+            replaced = {name: self._components.get(name) for name in staged}
+            self._components.update(staged)
+
+        for name, component in replaced.items():
+            if component is not None:
+                self._close(name, component)
+
+        logger.info(f"Reloaded components: {', '.join(names)}")
+
+    def override(self, **components: Any) -> None:
+        """
+        コンポーネントを差し替える（テストダブル用）
+
+        Args:
+            **components: コンポーネント名→差し替えるインスタンス
+        """
+        for name in components:
+            if name not in self._builders:
+                raise KeyError(f"Unknown component: {name}")
+        self._overrides.update(components)
+
+    def clear_overrides(self) -> None:
+        """差し替えたコンポーネントを元に戻す"""
+        self._overrides.clear()
+
+    def shutdown(self) -> None:
+        """構築済みコンポーネントを破棄（close()を持つものは解放してから）"""
+        with self._lock:
+            self._generation += 1
+            for name, component in self._components.items():
+                self._close(name, component)
+            self._components.clear()
+            self._ready.clear()
+            self._loop = None
+
+    @staticmethod
+    def _close(name: str, component: Any) -> None:
+        """close()を持つコンポーネントを解放"""
+        close = getattr(component, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception as e:
+                logger.warning(f"Failed to close component '{name}': {e}")
+
+    def _build_vectorstore(self, settings: Settings, staged: dict[str, Any]) -> ChromaVectorStore:
+        """ChromaVectorStoreを構築（設定された検索バックエンドを使用）"""
+        return create_vectorstore(
+            collection_name=settings.chroma_collection_name,
+            persist_directory=settings.chroma_persist_dir,
+            embedding_model=settings.default_embedding_model,
+            embedding_dimensions=settings.embedding_dimensions,
+        )
+
+    def _build_rag_chain(self, settings: Settings, staged: dict[str, Any]) -> RAGChain:
+        """RAGChainを構築（再構築中はステージ済みのVectorStoreを使用）"""
+        vectorstore = staged.get(VECTORSTORE) or self.get(VECTORSTORE)
+        return RAGChain(
+            vectorstore=vectorstore,
+            llm_model=settings.default_llm_model,
+            temperature=settings.temperature,
+            max_tokens=settings.max_tokens,
+            parent_store=vectorstore.get_parent_store() if settings.rag_parent_expansion else None,
+            answer_cache=SemanticAnswerCache() if settings.semantic_cache_enabled else None,
+            response_cache=(
+                ResponseCache(Path(settings.chroma_persist_dir).parent / "response_cache.sqlite3")
+                if settings.response_cache_enabled
+                else None
+            ),
+        )
+
+    def _build_architect_graph(self, settings: Settings, staged: dict[str, Any]) -> ArchitectGraph:
+        """ArchitectGraphを構築"""
+        return ArchitectGraph(
+            llm_model=settings.default_llm_model,
+            temperature=settings.temperature,
+        )
+
+
+# グローバルレジストリインスタンス
+registry = ComponentRegistry()
+
+
+def get_component_registry() -> ComponentRegistry:
+    """
+    コンポーネントレジストリを取得する依存性注入用関数
+
+    Returns:
+        ComponentRegistry: グローバルレジストリ
+    """
+    return registry
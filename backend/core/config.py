@@ -30,6 +30,12 @@ class Settings(BaseSettings):
         description="Chromaベクトルストアの永続化ディレクトリ",
     )
 
+    chroma_collection_name: str = Field(
+        default="langgraph_docs",
+        min_length=3,
+        description="Chromaコレクション名（次元数の移行先コレクションへの切り替えに使用）",
+    )
+
     # ログ設定
     log_level: Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"] = Field(
         default="INFO",
@@ -47,11 +53,18 @@ class Settings(BaseSettings):
         description="デフォルトの埋め込みモデル",
     )
 
+    embedding_dimensions: int | None = Field(
+        default=None,
+        ge=1,
+        le=3072,
+        description="埋め込みの次元数（text-embedding-3系のみ。Noneの場合はモデル既定）",
+    )
+
     max_tokens: int = Field(
         default=4096,
         ge=1,
         le=128000,
-        description="最大トークン数",
+        description="RAGプロンプトのトークン予算（テンプレート・質問を除いた分をコンテキストに使用）",
     )
 
     temperature: float = Field(
@@ -133,6 +146,26 @@ class Settings(BaseSettings):
         description="ドキュメント分割のオーバーラップサイズ",
     )
 
+    rag_parent_expansion: bool = Field(
+        default=True,
+        description="検索したチャンクを親セクションに展開してLLMのコンテキストにするか",
+    )
+
+    semantic_cache_enabled: bool = Field(
+        default=True,
+        description="類似した質問（言い換え）に対して保存済みの回答を返すか",
+    )
+
+    response_cache_enabled: bool = Field(
+        default=True,
+        description="同一のリクエストに保存済みの応答を返すか（SQLiteで複数ワーカーと共有）",
+    )
+
+    startup_warmup_enabled: bool = Field(
+        default=True,
+        description="起動時に検索スタックをウォームアップするか（完了まで/readyは503）",
+    )
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -93,3 +93,31 @@ async def require_usage_limit(current_user: CurrentUser) -> User:
 
 # LLM使用エンドポイント用の型アノテーション
 UserWithUsageLimit = Annotated[User, Depends(require_usage_limit)]
+
+
+async def require_admin(current_user: CurrentUser) -> User:
+    """
+    管理者権限をチェックする依存性注入関数
+
+    運用系のエンドポイント（コンポーネント再読み込みなど）で使用します。
+
+    Args:
+        current_user: 認証されたユーザー（依存性注入）
+
+    Returns:
+        ユーザーオブジェクト
+
+    Raises:
+        HTTPException: 管理者以外の場合（403 Forbidden）
+    """
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="この操作には管理者権限が必要です",
+        )
+
+    return current_user
+
+
+# 管理者専用エンドポイント用の型アノテーション
+AdminUser = Annotated[User, Depends(require_admin)]
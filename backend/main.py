@@ -5,6 +5,7 @@ FastAPIアプリケーションのエントリーポイント。
 CORS設定、ミドルウェア、ルーター登録などを行います。
 """
 
+import threading
 import time
 from contextlib import asynccontextmanager
 
@@ -12,6 +13,7 @@ from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
+from backend.core.components import registry
 from backend.core.config import get_settings
 from backend.schemas.common import ErrorResponse, HealthResponse
 
@@ -32,9 +34,22 @@ async def lifespan(app: FastAPI):
     print(f"   Environment: {settings.environment}")
     print(f"   CORS Origins: {settings.cors_origins_list}")
 
+    # RAG/Architectコンポーネントを一度だけ構築し、全リクエストで共有
+    component_status = registry.startup(settings)
+    for name, status in component_status.items():
+        print(f"   Component {name}: {status}")
+
+    # コレクション・インデックスの読み込みとOpenAIへの接続確立をバックグラウンドで実施
+    # （/healthは即座に応答し、/readyは完了まで503を返す）
+    if settings.startup_warmup_enabled:
+        threading.Thread(target=registry.warmup, name="component-warmup", daemon=True).start()
+    else:
+        registry.mark_ready()
+
     yield
 
     # 終了時の処理
+    registry.shutdown()
     print(f"🛑 Shutting down {settings.api_title}")
 
 
@@ -135,18 +150,29 @@ async def health_check():
     tags=["Health"],
     summary="レディネスチェック",
     description="APIが準備完了状態かを確認します",
+    responses={503: {"model": HealthResponse, "description": "ウォームアップ中"}},
 )
 async def readiness_check():
     """
     レディネスチェックエンドポイント
 
-    APIがリクエストを受け付ける準備ができているかを確認します。
+    起動時のウォームアップが完了するまでは503を返します。
     """
-    # TODO: 実際のデータベース接続確認などを追加
+    if not registry.is_ready:
+        return JSONResponse(
+            status_code=503,
+            content=HealthResponse(
+                status="warming_up",
+                version=settings.api_version,
+                environment=settings.environment,
+            ).model_dump(),
+        )
+
     return HealthResponse(
         status="ready",
         version=settings.api_version,
         environment=settings.environment,
+        checks=registry.warmup_result,
     )
 
 
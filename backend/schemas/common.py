@@ -31,3 +31,4 @@ class HealthResponse(BaseModel):
     status: str = Field(..., description="ステータス (healthy, unhealthy)")
     version: str = Field(..., description="APIバージョン")
     environment: str = Field(..., description="環境 (development, production)")
+    checks: dict[str, Any] | None = Field(None, description="ウォームアップ結果（/readyのみ）")
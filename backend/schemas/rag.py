@@ -5,6 +5,8 @@ RAG学習支援API用のPydanticスキーマ定義。
 リクエスト・レスポンスの型安全性を確保します。
 """
 
+from typing import Any, Literal
+
 from pydantic import BaseModel, Field
 
 
@@ -36,6 +38,11 @@ class RAGQueryRequest(BaseModel):
         description="コード例を含めるか",
     )
 
+    search_mode: Literal["similarity", "hybrid", "mmr"] | None = Field(
+        default=None,
+        description="検索方式（未指定時はサーバー設定。mmrは類似チャンクの重複を抑えて多様化）",
+    )
+
 
 class SourceResponse(BaseModel):
     """ソース情報レスポンス"""
@@ -61,7 +68,18 @@ class RAGQueryMetadata(BaseModel):
 
     model: str = Field(..., description="使用したLLMモデル")
     tokens_used: int = Field(..., ge=0, description="使用トークン数")
+    context_tokens: int | None = Field(
+        default=None, ge=0, description="プロンプトに含めたコンテキストのトークン数"
+    )
     response_time: float = Field(..., ge=0.0, description="応答時間（秒）")
+    cache_hit: bool = Field(default=False, description="キャッシュ済みの回答を返したか")
+    cache_type: str | None = Field(
+        default=None,
+        description="ヒットしたキャッシュ（exact: 同一リクエスト, semantic: 言い換え）",
+    )
+    cache_similarity: float | None = Field(
+        default=None, description="キャッシュヒット時の質問の類似度（コサイン類似度）"
+    )
 
 
 class RAGQueryResponse(BaseModel):
@@ -85,9 +103,61 @@ class RAGQueryResponse(BaseModel):
     metadata: RAGQueryMetadata = Field(..., description="メタデータ")
 
 
+class RAGStreamSourcesEvent(BaseModel):
+    """ストリーミングの最初のイベント（検索直後に送信）"""
+
+    sources: list[SourceResponse] = Field(
+        default_factory=list,
+        description="参照ソース一覧",
+    )
+
+
+class RAGStreamTokenEvent(BaseModel):
+    """ストリーミングのトークン差分イベント"""
+
+    delta: str = Field(..., description="回答テキストの差分")
+
+
+class RAGStreamFinalEvent(BaseModel):
+    """ストリーミングの最終イベント"""
+
+    code_examples: list[CodeExampleResponse] = Field(
+        default_factory=list,
+        description="コード例一覧",
+    )
+    confidence: float = Field(
+        ...,
+        ge=0.0,
+        le=1.0,
+        description="回答の信頼度スコア",
+    )
+    metadata: RAGQueryMetadata = Field(..., description="メタデータ")
+
+
 class RAGHealthResponse(BaseModel):
     """RAGヘルスチェックレスポンス"""
 
     status: str = Field(..., description="ステータス (healthy, unhealthy)")
     vectorstore_connected: bool = Field(..., description="VectorStore接続状態")
     document_count: int = Field(..., ge=0, description="保存されているドキュメント数")
+    documents_by_type: dict[str, int] = Field(
+        default_factory=dict, description="doc_typeごとのドキュメント数"
+    )
+    embedding_dimension: int | None = Field(default=None, description="埋め込みの次元数")
+    disk_size_bytes: int | None = Field(
+        default=None, ge=0, description="ベクトルストアのディスク使用量（バイト）"
+    )
+    last_ingest_at: str | None = Field(default=None, description="最終インジェスト時刻（ISO 8601）")
+
+
+class RAGCacheStatsResponse(BaseModel):
+    """RAG回答キャッシュの統計情報レスポンス"""
+
+    response_cache: dict[str, Any] | None = Field(
+        default=None,
+        description="応答キャッシュ（同一リクエスト、全ワーカー共有）の統計。無効時はNone",
+    )
+    semantic_cache: dict[str, Any] | None = Field(
+        default=None,
+        description="セマンティックキャッシュ（言い換え、このワーカー）の統計。無効時はNone",
+    )
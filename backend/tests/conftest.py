@@ -4,21 +4,23 @@ FastAPI Test Configuration
 FastAPIテストクライアントとフィクスチャを提供します。
 """
 
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 from fastapi.testclient import TestClient
 
+from backend.core.components import registry
 from backend.core.config import Settings
 from backend.main import app
+from backend.main import settings as app_settings
 
 
 @pytest.fixture
-def test_settings():
+def test_settings(tmp_path):
     """テスト用設定"""
     return Settings(
         openai_api_key="sk-test-mock-key",
-        chroma_persist_dir="./tests/data/chroma_test",
+        chroma_persist_dir=str(tmp_path / "chroma"),
         log_level="DEBUG",
         environment="test",
         cors_origins="http://localhost:5173,http://localhost:3000",
@@ -27,115 +29,141 @@ def test_settings():
 
 
 @pytest.fixture
-def client():
-    """FastAPIテストクライアント"""
+def stub_components(monkeypatch, tmp_path):
+    """
+    レジストリのビルダーをモックに差し替え
+
+    lifespanで実際のChroma・ChatOpenAI・応答キャッシュを構築せず、ネットワークや
+    ./data に触れないようにします。戻り値（コンポーネント名→ビルダー）を書き換えると
+    個別のテストでビルダーを差し替えられます。
+    """
+    monkeypatch.setattr(app_settings, "chroma_persist_dir", str(tmp_path / "chroma"))
+
+    def make_builder(name):
+        def builder(settings, staged):
+            component = Mock(name=name)
+            component.warmup.return_value = {"status": "ready"}
+            return component
+
+        return builder
+
+    builders = {name: make_builder(name) for name in registry._builders}
+    monkeypatch.setattr(registry, "_builders", builders)
+    return builders
+
+
+@pytest.fixture
+def client(stub_components, monkeypatch):
+    """FastAPIテストクライアント（コンポーネントはモック、ウォームアップなし）"""
+    monkeypatch.setattr(app_settings, "startup_warmup_enabled", False)
     with TestClient(app) as test_client:
         yield test_client
 
 
 @pytest.fixture
 def mock_vectorstore():
-    """モックVectorStore"""
-    with patch("backend.api.v1.rag.ChromaVectorStore") as mock:
-        instance = Mock()
-        instance.get_collection_info.return_value = {"document_count": 100}
-        mock.return_value = instance
-        yield instance
+    """モックVectorStore（レジストリの共有インスタンスを差し替え）"""
+    instance = Mock()
+    instance.get_collection_info.return_value = {"document_count": 100}
+    registry.override(vectorstore=instance)
+    yield instance
+    registry.clear_overrides()
 
 
 @pytest.fixture
 def mock_rag_chain():
-    """モックRAGChain"""
-    with patch("backend.api.v1.rag.RAGChain") as mock:
-        instance = Mock()
-        instance.query.return_value = {
-            "answer": "This is a test answer about LangGraph.",
-            "sources": [
+    """モックRAGChain（レジストリの共有インスタンスを差し替え）"""
+    instance = Mock()
+    instance.aquery = AsyncMock()
+    instance.aquery.return_value = {
+        "answer": "This is a test answer about LangGraph.",
+        "sources": [
+            {
+                "title": "LangGraph Documentation",
+                "url": "https://langchain-ai.github.io/langgraph/",
+                "excerpt": "LangGraph is a framework for building stateful agents.",
+                "relevance": 0.95,
+                "doc_type": "official_docs",
+            }
+        ],
+        "code_examples": [
+            {
+                "language": "python",
+                "code": "from langgraph.graph import StateGraph\n\ngraph = StateGraph()",
+                "description": "Basic StateGraph initialization",
+                "source_url": "https://github.com/langchain-ai/langgraph",
+            }
+        ],
+        "confidence": 0.92,
+        "metadata": {
+            "model": "gpt-4-turbo-preview",
+            "tokens_used": 1500,
+        },
+    }
+    registry.override(rag_chain=instance)
+    yield instance
+    registry.clear_overrides()
+
+
+@pytest.fixture
+def mock_architect_graph():
+    """モックArchitectGraph（レジストリの共有インスタンスを差し替え）"""
+    instance = Mock()
+    instance.generate_architecture.return_value = {
+        "challenge_analysis": {
+            "summary": "カスタマーサポートの自動化プロジェクト",
+            "key_requirements": [
+                "FAQ自動回答",
+                "人間へのエスカレーション",
+                "Zendesk連携",
+            ],
+            "suggested_approach": "LangGraphの条件分岐フローを活用",
+            "langgraph_fit_reason": "状態管理と条件分岐が適している",
+        },
+        "architecture": {
+            "mermaid_diagram": "graph TD\n    A[問い合わせ受付] --> B{FAQ検索}\n    B -->|一致| C[自動回答]",
+            "node_descriptions": [
                 {
-                    "title": "LangGraph Documentation",
-                    "url": "https://langchain-ai.github.io/langgraph/",
-                    "excerpt": "LangGraph is a framework for building stateful agents.",
-                    "relevance": 0.95,
-                    "doc_type": "official_docs",
+                    "node_id": "A",
+                    "name": "問い合わせ受付",
+                    "purpose": "ユーザーからの問い合わせを受け付ける",
+                    "description": "問い合わせテキストを受け取り、前処理を行う",
+                    "inputs": ["user_query"],
+                    "outputs": ["query_text", "user_id"],
                 }
             ],
-            "code_examples": [
+            "edge_descriptions": [
                 {
-                    "language": "python",
-                    "code": "from langgraph.graph import StateGraph\n\ngraph = StateGraph()",
-                    "description": "Basic StateGraph initialization",
-                    "source_url": "https://github.com/langchain-ai/langgraph",
+                    "from_node": "A",
+                    "to_node": "B",
+                    "condition": None,
+                    "description": "受付した問い合わせをFAQ検索に渡す",
                 }
             ],
-            "confidence": 0.92,
-            "metadata": {
-                "model": "gpt-4-turbo-preview",
-                "tokens_used": 1500,
-            },
-        }
-        mock.return_value = instance
-        yield instance
-
-
-@pytest.fixture
-def mock_architect_graph():
-    """モックArchitectGraph"""
-    with patch("backend.api.v1.architect.ArchitectGraph") as mock:
-        instance = Mock()
-        instance.generate_architecture.return_value = {
-            "challenge_analysis": {
-                "summary": "カスタマーサポートの自動化プロジェクト",
-                "key_requirements": [
-                    "FAQ自動回答",
-                    "人間へのエスカレーション",
-                    "Zendesk連携",
-                ],
-                "suggested_approach": "LangGraphの条件分岐フローを活用",
-                "langgraph_fit_reason": "状態管理と条件分岐が適している",
-            },
-            "architecture": {
-                "mermaid_diagram": "graph TD\n    A[問い合わせ受付] --> B{FAQ検索}\n    B -->|一致| C[自動回答]",
-                "node_descriptions": [
-                    {
-                        "node_id": "A",
-                        "name": "問い合わせ受付",
-                        "purpose": "ユーザーからの問い合わせを受け付ける",
-                        "description": "問い合わせテキストを受け取り、前処理を行う",
-                        "inputs": ["user_query"],
-                        "outputs": ["query_text", "user_id"],
-                    }
-                ],
-                "edge_descriptions": [
-                    {
-                        "from_node": "A",
-                        "to_node": "B",
-                        "condition": None,
-                        "description": "受付した問い合わせをFAQ検索に渡す",
-                    }
-                ],
-                "state_schema": {
-                    "query": "str",
-                    "faq_match": "bool",
-                    "response": "str",
-                },
-            },
-            "code_example": {
-                "language": "python",
-                "code": "from langgraph.graph import StateGraph\nfrom typing import TypedDict\n\nclass SupportState(TypedDict):\n    query: str\n    response: str\n\ngraph = StateGraph(SupportState)",
-                "explanation": "基本的なカスタマーサポートワークフローの実装例",
-            },
-            "business_explanation": "このシステムは、FAQで即座に回答できる質問を自動処理し、複雑な質問は人間にエスカレーションします。",
-            "implementation_notes": [
-                "FAQ検索にはベクトルDBを使用することを推奨",
-                "Zendesk APIの認証情報が必要",
-            ],
-            "metadata": {
-                "model": "gpt-4-turbo-preview",
-                "tokens_used": 3500,
+            "state_schema": {
+                "query": "str",
+                "faq_match": "bool",
+                "response": "str",
             },
-        }
-        mock.return_value = instance
-        yield instance
+        },
+        "code_example": {
+            "language": "python",
+            "code": "from langgraph.graph import StateGraph\nfrom typing import TypedDict\n\nclass SupportState(TypedDict):\n    query: str\n    response: str\n\ngraph = StateGraph(SupportState)",
+            "explanation": "基本的なカスタマーサポートワークフローの実装例",
+        },
+        "business_explanation": "このシステムは、FAQで即座に回答できる質問を自動処理し、複雑な質問は人間にエスカレーションします。",
+        "implementation_notes": [
+            "FAQ検索にはベクトルDBを使用することを推奨",
+            "Zendesk APIの認証情報が必要",
+        ],
+        "metadata": {
+            "model": "gpt-4-turbo-preview",
+            "tokens_used": 3500,
+        },
+    }
+    registry.override(architect_graph=instance)
+    yield instance
+    registry.clear_overrides()
 
 
 @pytest.fixture
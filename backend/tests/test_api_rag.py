@@ -66,7 +66,7 @@ def test_rag_query_success(authenticated_client, mock_vectorstore, mock_rag_chai
 
 def test_rag_query_without_sources(authenticated_client, mock_vectorstore, mock_rag_chain):
     """ソースなしRAGクエリテスト"""
-    mock_rag_chain.query.return_value = {
+    mock_rag_chain.aquery.return_value = {
         "answer": "Test answer",
         "sources": [],
         "code_examples": [],
@@ -148,13 +148,49 @@ def test_rag_health_success(authenticated_client, mock_vectorstore):
     assert data["document_count"] == 100
 
 
-def test_rag_health_vectorstore_error(authenticated_client):
+def test_rag_health_collection_stats(authenticated_client, mock_vectorstore):
+    """統計情報（doc_type別件数・次元数・ディスクサイズ・最終インジェスト）を返すテスト"""
+    mock_vectorstore.get_collection_info.return_value = {
+        "document_count": 3,
+        "documents_by_type": {"blog": 1, "official_docs": 2},
+        "embedding_dimension": 1536,
+        "disk_size_bytes": 4096,
+        "last_ingest_at": "2026-01-01T00:00:00Z",
+    }
+
+    response = authenticated_client.get("/api/v1/rag/health")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["documents_by_type"] == {"blog": 1, "official_docs": 2}
+    assert data["embedding_dimension"] == 1536
+    assert data["disk_size_bytes"] == 4096
+    assert data["last_ingest_at"] == "2026-01-01T00:00:00Z"
+
+
+def test_rag_cache_stats(authenticated_client, mock_rag_chain):
+    """応答キャッシュ（全ワーカー）とセマンティックキャッシュのヒット率を返すテスト"""
+    mock_rag_chain.response_cache.stats.return_value = {
+        "entries": 2,
+        "hits": 3,
+        "misses": 1,
+        "hit_ratio": 0.75,
+    }
+    mock_rag_chain.answer_cache = None
+
+    response = authenticated_client.get("/api/v1/rag/cache/stats")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["response_cache"]["hit_ratio"] == 0.75
+    assert data["semantic_cache"] is None
+
+
+def test_rag_health_vectorstore_error(authenticated_client, mock_vectorstore):
     """VectorStoreエラー時のヘルスチェックテスト"""
-    with patch("backend.api.v1.rag.get_vectorstore") as mock:
-        mock_instance = mock.return_value
-        mock_instance.get_collection_info.side_effect = Exception("Connection error")
+    mock_vectorstore.get_collection_info.side_effect = Exception("Connection error")
 
-        response = authenticated_client.get("/api/v1/rag/health")
+    response = authenticated_client.get("/api/v1/rag/health")
 
     assert response.status_code == 200
     data = response.json()
@@ -168,7 +204,7 @@ def test_rag_query_llm_error(authenticated_client, mock_vectorstore, mock_rag_ch
     """LLMエラー時のテスト"""
     from src.utils.exceptions import LLMError
 
-    mock_rag_chain.query.side_effect = LLMError("OpenAI API error")
+    mock_rag_chain.aquery.side_effect = LLMError("OpenAI API error")
 
     with patch("backend.api.v1.rag.get_vectorstore", return_value=mock_vectorstore):
         with patch("backend.api.v1.rag.get_rag_chain", return_value=mock_rag_chain):
@@ -187,7 +223,7 @@ def test_rag_query_validation_error(authenticated_client, mock_vectorstore, mock
     """バリデーションエラー時のテスト"""
     from src.utils.exceptions import ValidationError
 
-    mock_rag_chain.query.side_effect = ValidationError("Invalid input")
+    mock_rag_chain.aquery.side_effect = ValidationError("Invalid input")
 
     with patch("backend.api.v1.rag.get_vectorstore", return_value=mock_vectorstore):
         with patch("backend.api.v1.rag.get_rag_chain", return_value=mock_rag_chain):
@@ -200,3 +236,206 @@ def test_rag_query_validation_error(authenticated_client, mock_vectorstore, mock
 
     assert response.status_code == 400
     assert "バリデーションエラー" in response.json()["detail"]
+
+
+def _parse_sse(body: str) -> list[tuple[str, dict]]:
+    """SSEのレスポンス本文を(イベント名, データ)のリストに変換"""
+    import json
+
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def _stream_events():
+    """RAGChain.streamが返すイベント列"""
+    yield (
+        "sources",
+        {
+            "sources": [
+                {
+                    "title": "LangGraph Documentation",
+                    "url": "https://langchain-ai.github.io/langgraph/",
+                    "excerpt": "LangGraph is a framework for building stateful agents.",
+                    "doc_type": "official_docs",
+                }
+            ]
+        },
+    )
+    yield "token", {"delta": "LangGraph "}
+    yield "token", {"delta": "is great."}
+    yield (
+        "final",
+        {
+            "code_examples": [
+                {
+                    "language": "python",
+                    "code": "graph = StateGraph()",
+                    "description": "Basic StateGraph initialization",
+                }
+            ],
+            "confidence": 0.9,
+            "metadata": {"model": "gpt-4o-mini", "tokens_used": 42, "response_time": 0.1},
+        },
+    )
+
+
+def test_rag_query_stream_event_order(authenticated_client, mock_rag_chain):
+    """ストリーミングでsources → token → finalの順に送信されること"""
+    mock_rag_chain.stream.return_value = _stream_events()
+
+    response = authenticated_client.post(
+        "/api/v1/rag/query/stream", json={"question": "What is LangGraph?"}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _parse_sse(response.text)
+    assert [name for name, _ in events] == ["sources", "token", "token", "final"]
+    assert events[0][1]["sources"][0]["title"] == "LangGraph Documentation"
+    assert "".join(data["delta"] for name, data in events if name == "token") == (
+        "LangGraph is great."
+    )
+    final = events[-1][1]
+    assert final["code_examples"][0]["code"] == "graph = StateGraph()"
+    assert final["metadata"]["tokens_used"] == 42
+    mock_rag_chain.aquery.assert_not_called()
+
+
+def test_rag_query_stream_counts_usage_once(client, mock_rag_chain, mock_usage_limiter):
+    """ストリーミングでも使用回数は1リクエストにつき1回だけカウントされること"""
+    from backend.core.dependencies import get_current_user
+    from backend.core.users import User
+    from backend.main import app
+
+    user = User(username="testuser", password_hash="", role="user", daily_limit=5)
+    app.dependency_overrides[get_current_user] = lambda: user
+    mock_rag_chain.stream.return_value = _stream_events()
+
+    try:
+        response = client.post("/api/v1/rag/query/stream", json={"question": "What is LangGraph?"})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert len(_parse_sse(response.text)) == 4
+    mock_usage_limiter["increment"].assert_called_once_with(user)
+
+
+def test_rag_query_stream_validation_error(authenticated_client, mock_rag_chain):
+    """検索前のバリデーションエラーはストリーム開始前に400で返ること"""
+    from src.utils.exceptions import ValidationError
+
+    def failing_stream():
+        raise ValidationError("Invalid input")
+        yield  # pragma: no cover
+
+    mock_rag_chain.stream.return_value = failing_stream()
+
+    response = authenticated_client.post("/api/v1/rag/query/stream", json={"question": "Test"})
+
+    assert response.status_code == 400
+    assert "バリデーションエラー" in response.json()["detail"]
+
+
+def test_rag_query_stream_error_after_sources(authenticated_client, mock_rag_chain):
+    """生成中のエラーはerrorイベントで通知されること"""
+    from src.utils.exceptions import LLMError
+
+    def failing_stream():
+        yield "sources", {"sources": []}
+        raise LLMError("OpenAI API error")
+
+    mock_rag_chain.stream.return_value = failing_stream()
+
+    response = authenticated_client.post("/api/v1/rag/query/stream", json={"question": "Test"})
+
+    assert response.status_code == 200
+    events = _parse_sse(response.text)
+    assert [name for name, _ in events] == ["sources", "error"]
+    assert "LLMエラー" in events[1][1]["detail"]
+
+
+def test_rag_query_uses_async_chain(authenticated_client, mock_rag_chain):
+    """RAGクエリは非同期のaqueryで実行されること"""
+    response = authenticated_client.post("/api/v1/rag/query", json={"question": "Test question"})
+
+    assert response.status_code == 200
+    mock_rag_chain.aquery.assert_awaited_once()
+    mock_rag_chain.query.assert_not_called()
+
+
+def test_run_until_disconnected_cancels_on_disconnect():
+    """クライアントが切断したら処理をキャンセルして499を返すこと"""
+    import asyncio
+    from unittest.mock import AsyncMock, Mock
+
+    import pytest
+    from fastapi import HTTPException
+
+    from backend.api.v1 import rag
+
+    cancelled = asyncio.Event()
+
+    async def slow_query():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def run():
+        http_request = Mock()
+        http_request.is_disconnected = AsyncMock(return_value=True)
+        with patch.object(rag, "DISCONNECT_POLL_INTERVAL", 0.01):
+            with pytest.raises(HTTPException) as exc_info:
+                await rag._run_until_disconnected(http_request, slow_query())
+        await asyncio.sleep(0)
+        return exc_info.value
+
+    error = asyncio.run(run())
+
+    assert error.status_code == 499
+    assert cancelled.is_set()
+
+
+def test_rag_query_stream_closes_chain_stream_on_disconnect(mock_rag_chain):
+    """クライアント切断でレスポンスが中断されたらRAGChain.streamのジェネレーターを閉じること"""
+    import asyncio
+    from unittest.mock import Mock
+
+    from backend.api.v1 import rag
+    from backend.schemas.rag import RAGQueryRequest
+
+    closed = []
+
+    def endless_stream():
+        try:
+            yield "sources", {"sources": []}
+            while True:
+                yield "token", {"delta": "LangGraph "}
+        finally:
+            closed.append(True)
+
+    mock_rag_chain.stream.return_value = endless_stream()
+
+    async def run():
+        response = await rag.query_rag_stream(
+            request=RAGQueryRequest(question="What is LangGraph?"),
+            current_user=Mock(),
+            rag_chain=mock_rag_chain,
+            settings=Mock(),
+        )
+        body = response.body_iterator
+        received = [await body.__anext__(), await body.__anext__()]
+        # 切断時にStarletteがレスポンス送信を打ち切るのと同様に途中で閉じる
+        await body.aclose()
+        return received
+
+    received = asyncio.run(run())
+
+    assert received[0].startswith("event: sources")
+    assert received[1].startswith("event: token")
+    assert closed == [True]
@@ -0,0 +1,226 @@
+"""
+Component Registry Tests
+
+RAG/Architectコンポーネントレジストリのテスト。
+"""
+
+import asyncio
+import threading
+from unittest.mock import Mock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.core.components import (
+    ARCHITECT_GRAPH,
+    RAG_CHAIN,
+    VECTORSTORE,
+    ComponentRegistry,
+    registry,
+)
+from backend.main import app
+from backend.main import settings as app_settings
+
+
+@pytest.fixture
+def fake_registry(test_settings):
+    """ビルダーをモックに置き換えたレジストリ"""
+    fake = ComponentRegistry()
+    fake._settings = test_settings
+    builds = {VECTORSTORE: 0, RAG_CHAIN: 0, ARCHITECT_GRAPH: 0}
+
+    def make_builder(name):
+        def builder(settings, staged):
+            builds[name] += 1
+            return Mock(name=f"{name}-{builds[name]}")
+
+        return builder
+
+    fake._builders = {name: make_builder(name) for name in builds}
+    fake.builds = builds
+    return fake
+
+
+def test_get_builds_once(fake_registry):
+    """同じコンポーネントは一度だけ構築されること"""
+    first = fake_registry.get(VECTORSTORE)
+    second = fake_registry.get(VECTORSTORE)
+
+    assert first is second
+    assert fake_registry.builds[VECTORSTORE] == 1
+
+
+def test_startup_reports_failures(fake_registry):
+    """構築に失敗しても起動は継続し、失敗内容を返すこと"""
+
+    def failing_builder(settings, staged):
+        raise RuntimeError("boom")
+
+    fake_registry._builders[ARCHITECT_GRAPH] = failing_builder
+
+    status = fake_registry.startup()
+
+    assert status[VECTORSTORE] == "ready"
+    assert status[RAG_CHAIN] == "ready"
+    assert status[ARCHITECT_GRAPH] == "boom"
+
+
+def test_reload_swaps_retrieval_components(fake_registry):
+    """reloadでVectorStoreとRAGChainのみ差し替わること"""
+    fake_registry.startup()
+    old_vectorstore = fake_registry.get(VECTORSTORE)
+    old_graph = fake_registry.get(ARCHITECT_GRAPH)
+
+    fake_registry.reload()
+
+    assert fake_registry.get(VECTORSTORE) is not old_vectorstore
+    assert fake_registry.get(ARCHITECT_GRAPH) is old_graph
+    assert fake_registry.builds[RAG_CHAIN] == 2
+
+
+def test_reload_failure_keeps_existing(fake_registry):
+    """再構築に失敗した場合は既存インスタンスが残ること"""
+    fake_registry.startup()
+    old_vectorstore = fake_registry.get(VECTORSTORE)
+
+    def failing_builder(settings, staged):
+        raise RuntimeError("reload failed")
+
+    fake_registry._builders[RAG_CHAIN] = failing_builder
+
+    with pytest.raises(RuntimeError):
+        fake_registry.reload()
+
+    assert fake_registry.get(VECTORSTORE) is old_vectorstore
+
+
+def test_override_and_clear(fake_registry):
+    """テストダブルへの差し替えと解除"""
+    double = Mock()
+    fake_registry.override(vectorstore=double)
+    assert fake_registry.get(VECTORSTORE) is double
+
+    fake_registry.clear_overrides()
+    assert fake_registry.get(VECTORSTORE) is not double
+
+
+def test_override_unknown_component(fake_registry):
+    """未知のコンポーネント名はKeyError"""
+    with pytest.raises(KeyError):
+        fake_registry.override(unknown=Mock())
+
+
+def test_shutdown_closes_components(fake_registry):
+    """shutdownで構築済みコンポーネントのclose()が呼ばれること"""
+    fake_registry.startup()
+    vectorstore = fake_registry.get(VECTORSTORE)
+
+    fake_registry.shutdown()
+
+    vectorstore.close.assert_called_once()
+    assert fake_registry.get(VECTORSTORE) is not vectorstore
+
+
+def test_rag_reload_endpoint(authenticated_client, monkeypatch):
+    """管理者は再読み込みエンドポイントを実行できること"""
+    reload_mock = Mock()
+    monkeypatch.setattr(registry, "reload", reload_mock)
+
+    response = authenticated_client.post("/api/v1/rag/reload")
+
+    assert response.status_code == 200
+    assert response.json()["success"] is True
+    reload_mock.assert_called_once()
+
+
+def test_warmup_marks_ready(fake_registry):
+    """ウォームアップ完了後にレディ状態になり、結果を保持すること"""
+    fake_registry.startup()
+    fake_registry.get(VECTORSTORE).warmup.return_value = {"status": "ready"}
+    assert fake_registry.is_ready is False
+
+    results = fake_registry.warmup()
+
+    assert fake_registry.is_ready is True
+    assert results[VECTORSTORE] == {"status": "ready"}
+    assert set(fake_registry.warmup_result) == {VECTORSTORE, RAG_CHAIN}
+    fake_registry.get(ARCHITECT_GRAPH).warmup.assert_not_called()
+
+
+def test_warmup_failure_still_ready(fake_registry):
+    """ウォームアップに失敗しても完了扱いとし、失敗内容を残すこと"""
+    fake_registry.startup()
+    fake_registry.get(VECTORSTORE).warmup.side_effect = RuntimeError("chroma down")
+
+    results = fake_registry.warmup()
+
+    assert fake_registry.is_ready is True
+    assert results[VECTORSTORE] == {"status": "failed", "error": "chroma down"}
+
+
+def test_ready_endpoint_waits_for_warmup(stub_components, monkeypatch):
+    """ウォームアップ完了までは/readyが503を返すこと"""
+    release = threading.Event()
+
+    def slow_vectorstore(settings, staged):
+        vectorstore = Mock(name=VECTORSTORE)
+        vectorstore.warmup.side_effect = lambda **_kwargs: release.wait(5) and {"status": "ready"}
+        return vectorstore
+
+    stub_components[VECTORSTORE] = slow_vectorstore
+    monkeypatch.setattr(app_settings, "startup_warmup_enabled", True)
+
+    with TestClient(app) as client:
+        warming = client.get("/ready")
+        release.set()
+        assert registry._ready.wait(5)
+        ready = client.get("/ready")
+        rag_chain = registry.get(RAG_CHAIN)
+
+    assert warming.status_code == 503
+    assert warming.json()["status"] == "warming_up"
+    assert ready.status_code == 200
+    assert ready.json()["status"] == "ready"
+    assert ready.json()["checks"][VECTORSTORE] == {"status": "ready"}
+    # 非同期クライアントはリクエストを処理するイベントループ上で温める
+    assert isinstance(rag_chain.warmup.call_args.kwargs["loop"], asyncio.AbstractEventLoop)
+
+
+def test_reload_closes_replaced_components(fake_registry):
+    """差し替えた古いインスタンスを閉じ、新しいインスタンスは閉じないこと"""
+    fake_registry.startup()
+    old_vectorstore = fake_registry.get(VECTORSTORE)
+    old_chain = fake_registry.get(RAG_CHAIN)
+
+    fake_registry.reload()
+
+    old_vectorstore.close.assert_called_once()
+    old_chain.close.assert_called_once()
+    fake_registry.get(VECTORSTORE).close.assert_not_called()
+
+
+def test_warmup_from_previous_startup_is_ignored(fake_registry):
+    """再起動前に始まったウォームアップが完了しても、新しい起動をレディにしないこと"""
+    fake_registry.startup()
+
+    def restart_during_warmup(loop):
+        fake_registry.startup()
+        return {"status": "ready"}
+
+    fake_registry.get(VECTORSTORE).warmup.side_effect = restart_during_warmup
+
+    fake_registry.warmup()
+
+    assert fake_registry.is_ready is False
+
+
+def test_warmup_stops_after_shutdown(fake_registry):
+    """終了後はウォームアップを打ち切り、破棄したコンポーネントを構築し直さないこと"""
+    fake_registry.startup()
+    fake_registry.get(VECTORSTORE).warmup.side_effect = lambda **_kwargs: fake_registry.shutdown()
+
+    fake_registry.warmup()
+
+    assert fake_registry.is_ready is False
+    assert fake_registry.builds[RAG_CHAIN] == 1
+    assert fake_registry._components == {}
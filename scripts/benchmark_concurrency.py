@@ -0,0 +1,229 @@
+"""
+LangGraph Catalyst - RAG Concurrency Benchmark Script
+
+1ワーカー（1つのイベントループ）あたりのRAGクエリのスループットを、
+同期のRAGChain.query（非同期ハンドラ内で直接呼び出す従来の実装）と
+非同期のRAGChain.aqueryで比較するスクリプト。
+
+Chromaは一時ディレクトリに作成した実際のコレクションを使い、OpenAIの
+埋め込み・LLM呼び出しは指定したレイテンシで応答するシミュレーションに置き換えます
+（APIキーは不要で、料金も発生しません）。
+
+使い方:
+    python scripts/benchmark_concurrency.py
+    python scripts/benchmark_concurrency.py --concurrency 1,8,32 --llm-latency 1.5
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.messages import AIMessage
+
+# プロジェクトルートをPythonパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# シミュレーションのみのためAPIキーは使用しない
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+from tune_hnsw import parse_int_list  # noqa: E402
+
+from src.features.rag.chain import RAGChain  # noqa: E402
+from src.features.rag.embedding_cache import CachedEmbeddings, QueryEmbeddingCache  # noqa: E402
+from src.features.rag.vectorstore import ChromaVectorStore  # noqa: E402
+
+
+class SimulatedEmbeddings(Embeddings):
+    """テキストのハッシュから決まるベクトルを、指定したレイテンシで返す埋め込み"""
+
+    def __init__(self, dimension: int, latency: float):
+        self.dimension = dimension
+        self.latency = latency
+
+    def _vector(self, text: str) -> list[float]:
+        seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+        vector = np.random.default_rng(seed).normal(size=self.dimension)
+        return (vector / np.linalg.norm(vector)).tolist()
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        time.sleep(self.latency)
+        return self._vector(text)
+
+    async def aembed_query(self, text: str) -> list[float]:
+        await asyncio.sleep(self.latency)
+        return self._vector(text)
+
+
+class SimulatedChatModel:
+    """指定したレイテンシで固定の回答を返すLLM"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def _response(self) -> AIMessage:
+        return AIMessage(
+            content="StateGraph defines nodes and edges.",
+            response_metadata={"token_usage": {"total_tokens": 0}},
+        )
+
+    def invoke(self, prompt) -> AIMessage:
+        time.sleep(self.latency)
+        return self._response()
+
+    async def ainvoke(self, prompt) -> AIMessage:
+        await asyncio.sleep(self.latency)
+        return self._response()
+
+
+def build_chain(workdir: Path, args: argparse.Namespace) -> RAGChain:
+    """一時ディレクトリのChromaコレクションとシミュレーションのOpenAIでRAGChainを構築"""
+    embeddings = CachedEmbeddings(
+        SimulatedEmbeddings(args.dim, args.embed_latency),
+        QueryEmbeddingCache(model_name="simulated"),
+    )
+    vectorstore = ChromaVectorStore(
+        collection_name="benchmark",
+        persist_directory=str(workdir / "chroma"),
+        embeddings=embeddings,
+    )
+    vectorstore.add_documents(
+        [
+            Document(
+                page_content=f"Section {i}: StateGraph nodes, edges and checkpointing notes.",
+                metadata={"source": f"https://example.com/docs/{i}", "title": f"Doc {i}"},
+            )
+            for i in range(args.documents)
+        ]
+    )
+
+    chain = RAGChain(vectorstore=vectorstore, search_mode="similarity")
+    chain.llm = SimulatedChatModel(args.llm_latency)
+    return chain
+
+
+async def run_load(chain: RAGChain, mode: str, concurrency: int, requests: int) -> dict:
+    """
+    1つのイベントループで同時実行数concurrencyのクライアントからrequests件を処理
+
+    Args:
+        chain: RAGChain
+        mode: "sync"（従来の非同期ハンドラ内でのquery呼び出し）または "async"（aquery）
+        concurrency: 同時に処理するリクエスト数
+        requests: 合計リクエスト数
+
+    Returns:
+        dict: requests_per_second, p50_ms, p95_ms
+    """
+    counter = iter(range(requests))
+    latencies: list[float] = []
+
+    async def handler(question: str) -> dict:
+        if mode == "sync":
+            return chain.query(question, k=5, include_code_examples=False)
+        return await chain.aquery(question, k=5, include_code_examples=False)
+
+    async def client() -> None:
+        for i in counter:
+            start = time.perf_counter()
+            # クエリ埋め込みキャッシュに当たらないよう、実行ごとに異なる質問を使う
+            await handler(f"How do I use StateGraph checkpoints? ({mode}, c={concurrency}) #{i}")
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "requests_per_second": requests / elapsed,
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+    }
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(
+        description="Compare RAG requests/s per worker for RAGChain.query vs RAGChain.aquery"
+    )
+    parser.add_argument(
+        "--concurrency", default="1,8,32", help="Comma-separated concurrent clients"
+    )
+    parser.add_argument("--requests", type=int, default=None, help="Requests per run")
+    parser.add_argument(
+        "--embed-latency", type=float, default=0.05, help="Simulated embedding latency (s)"
+    )
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Simulated LLM latency (s)")
+    parser.add_argument("--documents", type=int, default=2000, help="Chunks in the collection")
+    parser.add_argument("--dim", type=int, default=256, help="Embedding dimension")
+    parser.add_argument("--output", default=None, help="Write results as JSON")
+
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("LangGraph Catalyst - RAG Concurrency Benchmark")
+    print("=" * 70)
+    print()
+    print(
+        f"🧪 Simulated latency: embedding {args.embed_latency * 1000:.0f} ms, "
+        f"LLM {args.llm_latency * 1000:.0f} ms"
+    )
+
+    results = []
+    workdir = Path(tempfile.mkdtemp(prefix="concurrency_benchmark_"))
+    try:
+        chain = build_chain(workdir, args)
+        print(f"📦 Chroma collection: {args.documents} chunks x {args.dim} dims")
+        print()
+
+        for concurrency in parse_int_list(args.concurrency):
+            requests = args.requests or max(concurrency * 2, 8)
+            for mode in ("sync", "async"):
+                stats = asyncio.run(run_load(chain, mode, concurrency, requests))
+                results.append(
+                    {"mode": mode, "concurrency": concurrency, "requests": requests, **stats}
+                )
+        chain.vectorstore.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    header = (
+        f"{'concurrency':>12}{'mode':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'speedup':>9}"
+    )
+    print(header)
+    print("-" * len(header))
+    for sync_row, async_row in zip(results[::2], results[1::2], strict=True):
+        speedup = async_row["requests_per_second"] / sync_row["requests_per_second"]
+        for row in (sync_row, async_row):
+            print(
+                f"{row['concurrency']:>12}{row['mode']:>8}{row['requests_per_second']:>10.2f}"
+                f"{row['p50_ms']:>10.0f}{row['p95_ms']:>10.0f}"
+                f"{(f'x{speedup:.1f}' if row is async_row else '-'):>9}"
+            )
+    print()
+    print("ℹ️  sync: RAGChain.query called from an async handler (blocks the event loop)")
+    print("ℹ️  async: RAGChain.aquery (embedding/LLM waits overlap on one event loop)")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"results": results}, f, indent=2)
+        print(f"💾 Results written to {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
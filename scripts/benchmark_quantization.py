@@ -0,0 +1,209 @@
+"""
+LangGraph Catalyst - Quantization Benchmark Script
+
+量子化した一次検索（int8 / binary）+ full-precision再スコアリングを、
+現在のChroma（HNSW）構成と比較するスクリプト。
+厳密検索（float32の全件探索）を正解として、常駐メモリ・recall@k・
+p50/p95レイテンシを計測し、Chromaに対するメモリ削減量とrecallの低下を報告します。
+
+既存コレクションの埋め込みを使う場合も埋め込みAPIは呼び出しません。
+
+使い方:
+    python scripts/benchmark_quantization.py
+    python scripts/benchmark_quantization.py --synthetic 50000 --multipliers 2,4,8
+"""
+
+import argparse
+import json
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# プロジェクトルートをPythonパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tune_hnsw import (  # noqa: E402
+    build_index,
+    directory_size,
+    exact_top_k,
+    load_collection_embeddings,
+    make_queries,
+    parse_int_list,
+)
+
+from src.config.settings import settings  # noqa: E402
+from src.features.rag.numpy_store import ExactVectorIndex  # noqa: E402
+
+
+def hnsw_resident_bytes(n: int, dim: int, m: int) -> int:
+    """HNSWインデックスの常駐メモリの概算（float32ベクトル + 第0層の2M本のリンク）"""
+    return n * dim * 4 + n * 2 * m * 4
+
+
+def measure(search, queries: np.ndarray, truth: list[set[int]], k: int) -> dict[str, float]:
+    """1件ずつ検索してrecall@kとレイテンシを計測"""
+    latencies = []
+    recalls = []
+    for query, expected in zip(queries, truth, strict=True):
+        start = time.perf_counter()
+        found = search(query)
+        latencies.append((time.perf_counter() - start) * 1000)
+        recalls.append(len(set(found) & expected) / k)
+
+    return {
+        "recall": float(np.mean(recalls)),
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+    }
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(
+        description="Compare quantized first-pass search with the Chroma HNSW setup"
+    )
+    parser.add_argument("--collection", default="langgraph_docs", help="Source collection")
+    parser.add_argument(
+        "--synthetic",
+        type=int,
+        default=None,
+        help="Use N random unit vectors instead of the stored collection",
+    )
+    parser.add_argument("--dim", type=int, default=1536, help="Dimension for --synthetic")
+    parser.add_argument("--limit", type=int, default=None, help="Max vectors to load")
+    parser.add_argument("--queries", type=int, default=200, help="Number of queries")
+    parser.add_argument("--noise", type=float, default=0.3, help="Relative query noise")
+    parser.add_argument("-k", type=int, default=5, help="k for recall@k")
+    parser.add_argument(
+        "--multipliers", default="2,4,8", help="Comma-separated rescore multipliers"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--output", default=None, help="Write results as JSON")
+
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("LangGraph Catalyst - Quantization Benchmark")
+    print("=" * 70)
+    print()
+
+    if args.synthetic:
+        rng = np.random.default_rng(args.seed)
+        corpus = rng.normal(size=(args.synthetic, args.dim)).astype(np.float32)
+        corpus /= np.linalg.norm(corpus, axis=1, keepdims=True)
+        print(f"🎲 Synthetic corpus: {corpus.shape[0]} vectors x {corpus.shape[1]} dims")
+    else:
+        try:
+            corpus = load_collection_embeddings(args.collection, args.limit)
+        except Exception as e:
+            print(f"❌ Failed to load collection '{args.collection}': {e}")
+            return 1
+        if len(corpus) == 0:
+            print(f"❌ Collection '{args.collection}' is empty")
+            return 1
+        print(f"📦 Loaded {corpus.shape[0]} vectors x {corpus.shape[1]} dims")
+
+    n, dim = corpus.shape
+    k = min(args.k, n)
+    queries = make_queries(corpus, args.queries, args.noise, args.seed)
+    truth = exact_top_k(corpus, queries, k, "l2")
+    print(f"🔍 {len(queries)} queries, recall@{k} against exact float32 search")
+    print()
+
+    results = []
+    workdir = Path(tempfile.mkdtemp(prefix="quantization_benchmark_"))
+    try:
+        # 現在のChroma構成（設定されたHNSWパラメータ）
+        collection, _ = build_index(
+            workdir / "chroma",
+            corpus,
+            settings.chroma_hnsw_space,
+            settings.chroma_hnsw_m,
+            settings.chroma_hnsw_construction_ef,
+            settings.chroma_hnsw_search_ef,
+        )
+
+        def chroma_search(query):
+            result = collection.query(query_embeddings=[query], n_results=k, include=[])
+            return [int(i) for i in result["ids"][0]]
+
+        stats = measure(chroma_search, queries, truth, k)
+        results.append(
+            {
+                "mode": f"chroma hnsw (M={settings.chroma_hnsw_m})",
+                "multiplier": None,
+                "resident_mb": hnsw_resident_bytes(n, dim, settings.chroma_hnsw_m) / 1024 / 1024,
+                "disk_mb": directory_size(workdir / "chroma") / 1024 / 1024,
+                **stats,
+            }
+        )
+
+        ids = [str(i) for i in range(n)]
+        placeholders = [""] * n
+        metadatas = [{} for _ in range(n)]
+        for quantization in ("none", "int8", "binary"):
+            index_dir = workdir / f"numpy_{quantization}"
+            ExactVectorIndex.from_records(
+                ids, corpus, placeholders, metadatas, quantization=quantization
+            ).save(index_dir)
+            # full-precision行列はメモリマップのまま読み込む（実運用と同じ）
+            index = ExactVectorIndex.load(index_dir)
+
+            multipliers = [None] if quantization == "none" else parse_int_list(args.multipliers)
+            for multiplier in multipliers:
+                if multiplier is not None:
+                    index.rescore_multiplier = multiplier
+
+                def numpy_search(query, index=index):
+                    return [row for row, _ in index.search(query, k=k)]
+
+                stats = measure(numpy_search, queries, truth, k)
+                results.append(
+                    {
+                        "mode": "numpy exact" if quantization == "none" else quantization,
+                        "multiplier": multiplier,
+                        "resident_mb": index.resident_bytes / 1024 / 1024,
+                        "disk_mb": directory_size(index_dir) / 1024 / 1024,
+                        **stats,
+                    }
+                )
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    baseline = results[0]
+    for row in results:
+        row["memory_saved_pct"] = 100.0 * (1 - row["resident_mb"] / baseline["resident_mb"])
+        row["recall_lost"] = baseline["recall"] - row["recall"]
+
+    header = (
+        f"{'mode':<24}{'rescore':>8}{'mem MB':>9}{'saved %':>9}{'disk MB':>9}"
+        f"{'recall':>8}{'lost':>8}{'p50 ms':>8}{'p95 ms':>8}"
+    )
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        multiplier = f"x{row['multiplier']}" if row["multiplier"] else "-"
+        print(
+            f"{row['mode']:<24}{multiplier:>8}{row['resident_mb']:>9.1f}"
+            f"{row['memory_saved_pct']:>9.1f}{row['disk_mb']:>9.1f}{row['recall']:>8.3f}"
+            f"{row['recall_lost']:>8.3f}{row['p50_ms']:>8.2f}{row['p95_ms']:>8.2f}"
+        )
+    print()
+    print("ℹ️  mem MB: resident embedding data (HNSW is an estimate: vectors + level-0 links)")
+    print("ℹ️  lost: recall@k difference from the Chroma HNSW baseline (negative = better)")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"k": k, "vectors": n, "dimension": dim, "results": results}, f, indent=2)
+        print(f"💾 Results written to {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -45,9 +45,9 @@ from src.features.rag.crawler import (
     crawl_github_repo,
     update_all_sources
 )
-from src.features.rag.vectorstore import ChromaVectorStore
+from src.features.rag.vectorstore import create_vectorstore
 
-vectorstore = ChromaVectorStore()
+vectorstore = create_vectorstore()
 
 if '$SOURCE' == 'all':
     result = update_all_sources()
@@ -115,8 +115,8 @@ esac
 echo ""
 echo -e "${BLUE}ベクトルストアの統計情報:${NC}"
 python3 -c "
-from src.features.rag.vectorstore import ChromaVectorStore
-vs = ChromaVectorStore()
+from src.features.rag.vectorstore import create_vectorstore
+vs = create_vectorstore()
 # ここに統計情報を表示するコードを追加
 print('ドキュメント数: 確認してください')
 "
@@ -0,0 +1,122 @@
+"""
+LangGraph Catalyst - Embedding Store GC Script
+
+チャンク埋め込みの内容アドレスストアから、どのコレクションにも
+存在しない本文の埋め込み（孤立エントリ）を削除するスクリプト。
+
+使い方:
+    # 削除対象の件数だけ確認
+    python scripts/gc_embedding_store.py --dry-run
+
+    # 孤立エントリを削除
+    python scripts/gc_embedding_store.py
+
+    # 同じストアを共有する複数のChromaディレクトリを対象にする
+    python scripts/gc_embedding_store.py --persist-dir ./data/chroma_db --persist-dir ./data/exp
+"""
+
+import argparse
+import logging
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+
+import chromadb
+
+# プロジェクトルートをPythonパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config.settings import settings  # noqa: E402
+from src.features.rag.embedding_store import EmbeddingStore, text_hash  # noqa: E402
+
+# ロガー設定
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE = 1000
+
+
+def live_content_hashes(persist_directory: str) -> Iterator[str]:
+    """
+    Chromaディレクトリ内の全コレクションのチャンク本文ハッシュを列挙
+
+    Args:
+        persist_directory: Chromaの永続化ディレクトリ
+
+    Yields:
+        str: チャンク本文のSHA-256ハッシュ
+    """
+    client = chromadb.PersistentClient(path=persist_directory)
+    for collection in client.list_collections():
+        collection = client.get_collection(getattr(collection, "name", collection))
+        offset = 0
+        while True:
+            page = collection.get(
+                include=["documents", "metadatas"], limit=PAGE_SIZE, offset=offset
+            )
+            if not page["ids"]:
+                break
+            for document, metadata in zip(page["documents"], page["metadatas"], strict=True):
+                yield (metadata or {}).get("content_hash") or text_hash(document or "")
+            offset += len(page["ids"])
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="Delete orphaned entries from the embedding store")
+    parser.add_argument(
+        "--persist-dir",
+        action="append",
+        default=None,
+        help="Chroma directories whose chunks are kept (repeatable, default: configured)",
+    )
+    parser.add_argument(
+        "--store",
+        default=None,
+        help="Embedding store path (default: embedding_store.sqlite3 next to the Chroma dir)",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Only count orphaned entries")
+
+    args = parser.parse_args()
+    persist_dirs = args.persist_dir or [settings.chroma_persist_dir]
+    store_path = args.store or Path(persist_dirs[0]).parent / "embedding_store.sqlite3"
+
+    print("=" * 70)
+    print("LangGraph Catalyst - Embedding Store GC")
+    print("=" * 70)
+    print()
+
+    if not Path(store_path).exists():
+        print(f"❌ Embedding store not found: {store_path}")
+        return 1
+
+    store = EmbeddingStore(store_path)
+    try:
+        live: set[str] = set()
+        for persist_dir in persist_dirs:
+            live.update(live_content_hashes(persist_dir))
+        print(f"📚 Live chunk texts: {len(live)} (from {len(persist_dirs)} Chroma directories)")
+
+        result = store.gc(live, dry_run=args.dry_run)
+        print(f"   Entries in store: {result['total_entries']}")
+        print(f"   Referenced: {result['live_entries']}")
+        print(f"   Orphaned: {result['orphaned_entries']}")
+        if args.dry_run:
+            print("✅ Dry run: nothing deleted")
+        else:
+            print(f"✅ Deleted {result['deleted_entries']} orphaned entries")
+    except Exception as e:
+        print(f"❌ GC failed: {e}")
+        return 1
+    finally:
+        store.close()
+
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
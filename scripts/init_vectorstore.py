@@ -2,7 +2,8 @@
 LangGraph Catalyst - Initial Data Loading Script
 
 ベクトルストアに初期データを投入するスクリプト。
-ドキュメントをクロールし、分割して、Chromaベクトルストアに保存します。
+ドキュメントをクロールし、分割して、設定された検索バックエンド（VECTORSTORE_BACKEND）の
+ベクトルストアに保存します。
 """
 
 import argparse
@@ -14,13 +15,15 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from src.config.settings import settings  # noqa: E402
 from src.features.rag.crawler import (  # noqa: E402
     crawl_github_repo,
     crawl_langchain_blog,
     crawl_langchain_docs,
     crawl_langgraph_docs,
 )
-from src.features.rag.vectorstore import ChromaVectorStore  # noqa: E402
+from src.features.rag.dedup import deduplicate_documents  # noqa: E402
+from src.features.rag.vectorstore import create_vectorstore  # noqa: E402
 from src.utils.helpers import split_documents  # noqa: E402
 
 # ロガー設定
@@ -55,6 +58,22 @@ def main():
         action="store_true",
         help="Delete existing collection and recreate",
     )
+    parser.add_argument(
+        "--concurrent",
+        action="store_true",
+        help="Embed token-budgeted batches concurrently with per-batch retries",
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=None,
+        help="Number of concurrent embedding batches (with --concurrent)",
+    )
+    parser.add_argument(
+        "--no-dedup",
+        action="store_true",
+        help="Keep near-duplicate chunks (navigation, footers, boilerplate)",
+    )
     parser.add_argument("--verbose", action="store_true", help="Verbose logging")
 
     args = parser.parse_args()
@@ -70,8 +89,10 @@ def main():
     # ベクトルストアの初期化
     print("📦 Initializing vector store...")
     try:
-        vectorstore = ChromaVectorStore()
+        # partitionedではdoc_typeごとのパーティションに投入されるよう、設定のバックエンドで作成
+        vectorstore = create_vectorstore()
         print(f"✅ Vector store initialized: {vectorstore.collection_name}")
+        print(f"   Backend: {settings.vectorstore_backend}")
         print(f"   Persist directory: {vectorstore.persist_directory}")
         print()
     except Exception as e:
@@ -85,7 +106,8 @@ def main():
             vectorstore.delete_collection()
             print("✅ Collection deleted")
             # 再初期化
-            vectorstore = ChromaVectorStore()
+            vectorstore.close()
+            vectorstore = create_vectorstore()
             print("✅ Collection recreated")
             print()
         except Exception as e:
@@ -160,21 +182,68 @@ def main():
     except Exception as e:
         print(f"❌ Failed to split documents: {e}")
         return 1
+
+    # ほぼ重複するチャンク（ナビゲーション・フッター等の定型文）を埋め込み前に除去
+    dedup_stats = None
+    if settings.ingest_dedup_enabled and not args.no_dedup:
+        splits, dedup_stats = deduplicate_documents(splits)
+        print(
+            f"✅ Removed {dedup_stats['removed_count']} near-duplicate chunks "
+            f"({dedup_stats['duplicate_clusters']} clusters, {len(splits)} remaining)"
+        )
+
+    # 検索時にチャンクを展開する親セクションを保存（チャンクと同じstart_indexの座標系）
+    try:
+        parent_count = vectorstore.get_parent_store().add_documents(all_documents)
+        print(f"✅ Stored {parent_count} parent sections")
+    except Exception as e:
+        print(f"⚠️  Warning: Failed to store parent sections: {e}")
     print()
 
     # 6. ベクトルストアに追加
     print("💾 Adding documents to vector store...")
     try:
-        result = vectorstore.add_documents(splits, batch_size=50)
+        # チャンクIDは内容から決定されるため、再実行しても未変更チャンクは埋め込まない
+        if args.concurrent:
+            result = vectorstore.add_documents_concurrent(
+                splits, max_workers=args.max_workers, prune_stale=True
+            )
+        else:
+            result = vectorstore.add_documents(splits, batch_size=50, prune_stale=True)
 
         print("✅ Document addition completed:")
         print(f"   Added: {result['added_count']} chunks")
+        print(f"   Unchanged (skipped): {result['skipped_unchanged']} chunks")
+        print(f"   Stale (deleted): {result['deleted_stale']} chunks")
         print(f"   Failed: {result['failed_count']} chunks")
+        if dedup_stats is not None:
+            print(f"   Near-duplicates (removed): {dedup_stats['removed_count']} chunks")
         print(f"   Total in store: {result['total_documents_in_store']} chunks")
+        if vectorstore.embedding_store is not None:
+            print(
+                f"   Embedding store: {result['embedding_store_hits']} reused, "
+                f"{result['embedding_store_misses']} embedded "
+                f"(hit ratio {result['embedding_store_hit_ratio']:.1%})"
+            )
         print(f"   Status: {result['status']}")
+        if args.concurrent:
+            print(f"   Batches: {result['batch_count']} (retried: {result['retried_batches']})")
+            print(
+                f"   Throughput: {result['chunks_per_second']:.1f} chunks/s, "
+                f"{result['tokens_per_second']:.0f} tokens/s"
+            )
     except Exception as e:
         print(f"❌ Failed to add documents: {e}")
         return 1
+
+    # sharedバックエンドでは新しいバージョンを公開（各ワーカーはポインタの変更を検知して切り替える）
+    if settings.vectorstore_backend == "shared":
+        try:
+            vectorstore.refresh_index()
+            pointer = vectorstore.get_shared_index_info()["pointer"]
+            print(f"✅ Published shared index version {pointer['version']}")
+        except Exception as e:
+            print(f"⚠️  Warning: Failed to publish shared index: {e}")
     print()
 
     # 7. サンプルクエリでテスト
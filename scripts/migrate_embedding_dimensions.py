@@ -0,0 +1,122 @@
+"""
+LangGraph Catalyst - Embedding Dimension Migration Script
+
+保存済みのチャンクから、埋め込み次元数を下げた移行先コレクションを構築するスクリプト。
+再クロールは行わず、元のコレクションはロールバック用にそのまま残します。
+構築後に元の次元のインデックスとのrecall@kを表示します。
+
+使い方:
+    # 保存済みベクトルを切り詰めて正規化（埋め込みAPIを呼び出さない）
+    python scripts/migrate_embedding_dimensions.py --dimensions 512
+
+    # 保存済みの本文を512次元で埋め込み直す
+    python scripts/migrate_embedding_dimensions.py --dimensions 512 --method reembed
+
+移行後は .env で以下を設定すると新しいコレクションに切り替わります:
+    CHROMA_COLLECTION_NAME=langgraph_docs_512d
+    EMBEDDING_DIMENSIONS=512
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# プロジェクトルートをPythonパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config.settings import settings  # noqa: E402
+from src.features.rag.dimension_migration import (  # noqa: E402
+    MIGRATION_METHODS,
+    evaluate_recall,
+    migrate_embedding_dimensions,
+)
+from src.features.rag.vectorstore import create_vectorstore  # noqa: E402
+
+# ロガー設定
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(
+        description="Build a reduced-dimension collection from stored chunks"
+    )
+    parser.add_argument("--dimensions", type=int, required=True, help="Target dimensions")
+    parser.add_argument(
+        "--method", choices=MIGRATION_METHODS, default="truncate", help="Migration method"
+    )
+    parser.add_argument(
+        "--collection", default=settings.chroma_collection_name, help="Source collection"
+    )
+    parser.add_argument(
+        "--target-collection",
+        default=None,
+        help="Target collection (default: <collection>_<dimensions>d)",
+    )
+    parser.add_argument(
+        "--source-dimensions",
+        type=int,
+        default=None,
+        help="Dimensions of the source collection (default: model default)",
+    )
+    parser.add_argument("--work-dir", default=None, help="Keep intermediate snapshots here")
+    parser.add_argument("--sample", type=int, default=200, help="Queries for the recall check")
+    parser.add_argument("--k", type=int, default=10, help="Top-k for the recall check")
+
+    args = parser.parse_args()
+    target_collection = args.target_collection or f"{args.collection}_{args.dimensions}d"
+
+    print("=" * 70)
+    print("LangGraph Catalyst - Embedding Dimension Migration")
+    print("=" * 70)
+    print()
+
+    try:
+        source = create_vectorstore(
+            collection_name=args.collection, embedding_dimensions=args.source_dimensions
+        )
+        target = create_vectorstore(
+            collection_name=target_collection, embedding_dimensions=args.dimensions
+        )
+    except Exception as e:
+        print(f"❌ Failed to initialize vector store: {e}")
+        return 1
+
+    try:
+        result = migrate_embedding_dimensions(
+            source, target, method=args.method, work_directory=args.work_dir
+        )
+        print(f"✅ Migrated {result['migrated_count']} chunks ({result['method']})")
+        print(f"   {args.collection} ({result['source_dimension']}d) -> {target_collection}")
+        print(f"   Dimensions: {result['dimensions']}")
+        print(f"   Total in target: {result['total_documents_in_store']} chunks")
+        print(f"   Elapsed: {result['elapsed_seconds']:.2f}s")
+        print()
+
+        recall = evaluate_recall(source, target, sample_size=args.sample, k=args.k)
+        print(
+            f"📊 Recall@{recall['k']} vs. full-dimension index: {recall['recall_at_k']:.4f} "
+            f"({recall['queries']} queries)"
+        )
+        print()
+        print("To switch over, set in .env:")
+        print(f"   CHROMA_COLLECTION_NAME={target_collection}")
+        print(f"   EMBEDDING_DIMENSIONS={args.dimensions}")
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        return 1
+    finally:
+        source.close()
+        target.close()
+
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
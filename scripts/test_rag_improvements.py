@@ -15,7 +15,7 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from src.features.rag.chain import RAGChain
-from src.features.rag.vectorstore import ChromaVectorStore
+from src.features.rag.vectorstore import create_vectorstore
 
 
 # カラー出力用のANSIエスケープコード
@@ -74,7 +74,7 @@ def main():
 
     # ベクトルストアとRAGチェーンの初期化
     print(f"{Colors.OKCYAN}Initializing RAG system...{Colors.ENDC}")
-    vectorstore = ChromaVectorStore()
+    vectorstore = create_vectorstore()
     rag_chain = RAGChain(vectorstore=vectorstore)
     print(f"{Colors.OKGREEN}✅ RAG system initialized{Colors.ENDC}\n")
 
@@ -0,0 +1,269 @@
+"""
+LangGraph Catalyst - HNSW Parameter Tuning Script
+
+HNSWパラメータ（space, M, construction_ef, search_ef）を総当たりで変えながら、
+厳密検索（NumPyによる全件探索）を正解として recall@k・p50/p95レイテンシ・
+ディスク上のインデックスサイズを計測するスクリプト。
+
+既存コレクションの埋め込みを使う場合も埋め込みAPIは呼び出しません
+（クエリは保存済みの埋め込みにノイズを加えて作成します）。
+
+使い方:
+    python scripts/tune_hnsw.py --m 8,16,32 --construction-ef 100,200 --search-ef 10,50,100
+    python scripts/tune_hnsw.py --synthetic 20000 --dim 1536 --output results.json
+"""
+
+import argparse
+import itertools
+import json
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# プロジェクトルートをPythonパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import chromadb  # noqa: E402
+
+from src.features.rag.vectorstore import build_hnsw_configuration  # noqa: E402
+
+# Chromaへの書き込みバッチサイズ
+ADD_BATCH_SIZE = 1000
+
+
+def parse_int_list(value: str) -> list[int]:
+    """カンマ区切りの整数リストを解析"""
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def load_collection_embeddings(collection_name: str, limit: int | None) -> np.ndarray:
+    """既存コレクションの埋め込みを読み込む（埋め込みAPIは呼ばない）"""
+    from src.config.settings import settings
+
+    client = chromadb.PersistentClient(path=settings.chroma_persist_dir)
+    collection = client.get_collection(collection_name)
+
+    embeddings = []
+    offset = 0
+    while limit is None or offset < limit:
+        page_size = ADD_BATCH_SIZE if limit is None else min(ADD_BATCH_SIZE, limit - offset)
+        page = collection.get(include=["embeddings"], limit=page_size, offset=offset)
+        if not len(page["ids"]):
+            break
+        embeddings.extend(page["embeddings"])
+        offset += len(page["ids"])
+
+    return np.asarray(embeddings, dtype=np.float32)
+
+
+def make_queries(corpus: np.ndarray, n_queries: int, noise: float, seed: int) -> np.ndarray:
+    """コーパスの埋め込みにノイズを加えてクエリを作成"""
+    rng = np.random.default_rng(seed)
+    rows = rng.choice(len(corpus), size=min(n_queries, len(corpus)), replace=False)
+    scale = noise * float(np.linalg.norm(corpus, axis=1).mean()) / np.sqrt(corpus.shape[1])
+    return corpus[rows] + rng.normal(scale=scale, size=(len(rows), corpus.shape[1])).astype(
+        np.float32
+    )
+
+
+def exact_top_k(corpus: np.ndarray, queries: np.ndarray, k: int, space: str) -> list[set[int]]:
+    """距離空間に応じた厳密な上位k件（正解集合）"""
+    if space == "cosine":
+        corpus_n = corpus / np.linalg.norm(corpus, axis=1, keepdims=True)
+        queries_n = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+        distances = -(queries_n @ corpus_n.T)
+    elif space == "ip":
+        distances = -(queries @ corpus.T)
+    else:
+        distances = (
+            (queries**2).sum(axis=1)[:, None] - 2.0 * queries @ corpus.T + (corpus**2).sum(axis=1)
+        )
+
+    top = np.argpartition(distances, k - 1, axis=1)[:, :k]
+    return [set(row.tolist()) for row in top]
+
+
+def directory_size(path: Path) -> int:
+    """ディレクトリ配下のファイルサイズ合計（バイト）"""
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+def build_index(
+    workdir: Path,
+    corpus: np.ndarray,
+    space: str,
+    m: int,
+    construction_ef: int,
+    search_ef: int,
+) -> tuple[chromadb.Collection, float]:
+    """一時ディレクトリにHNSWインデックスを構築"""
+    client = chromadb.PersistentClient(path=str(workdir))
+    collection = client.create_collection(
+        "hnsw_tuning",
+        configuration={
+            "hnsw": build_hnsw_configuration(
+                space=space, m=m, construction_ef=construction_ef, search_ef=search_ef
+            )
+        },
+    )
+
+    start = time.perf_counter()
+    for offset in range(0, len(corpus), ADD_BATCH_SIZE):
+        batch = corpus[offset : offset + ADD_BATCH_SIZE]
+        collection.add(
+            ids=[str(i) for i in range(offset, offset + len(batch))],
+            embeddings=batch,
+        )
+    return collection, time.perf_counter() - start
+
+
+def measure(
+    collection: chromadb.Collection, queries: np.ndarray, truth: list[set[int]], k: int
+) -> dict[str, float]:
+    """1件ずつクエリを発行してrecall@kとレイテンシを計測"""
+    latencies = []
+    recalls = []
+    for query, expected in zip(queries, truth, strict=True):
+        start = time.perf_counter()
+        result = collection.query(query_embeddings=[query], n_results=k, include=[])
+        latencies.append((time.perf_counter() - start) * 1000)
+        found = {int(i) for i in result["ids"][0]}
+        recalls.append(len(found & expected) / k)
+
+    return {
+        "recall": float(np.mean(recalls)),
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+    }
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(
+        description="Sweep HNSW parameters against exact search (recall@k / latency / size)"
+    )
+    parser.add_argument("--collection", default="langgraph_docs", help="Source collection")
+    parser.add_argument(
+        "--synthetic",
+        type=int,
+        default=None,
+        help="Use N random vectors instead of the stored collection",
+    )
+    parser.add_argument("--dim", type=int, default=1536, help="Dimension for --synthetic")
+    parser.add_argument("--limit", type=int, default=None, help="Max vectors to load")
+    parser.add_argument("--queries", type=int, default=200, help="Number of queries")
+    parser.add_argument("--noise", type=float, default=0.3, help="Relative query noise")
+    parser.add_argument("-k", type=int, default=5, help="k for recall@k")
+    parser.add_argument("--space", default="l2", help="Comma-separated spaces (l2,cosine,ip)")
+    parser.add_argument("--m", default="8,16,32", help="Comma-separated M values")
+    parser.add_argument(
+        "--construction-ef", default="100,200", help="Comma-separated construction_ef values"
+    )
+    parser.add_argument(
+        "--search-ef", default="10,25,50,100,200", help="Comma-separated search_ef values"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--output", default=None, help="Write results as JSON")
+
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("LangGraph Catalyst - HNSW Parameter Sweep")
+    print("=" * 70)
+    print()
+
+    if args.synthetic:
+        rng = np.random.default_rng(args.seed)
+        corpus = rng.normal(size=(args.synthetic, args.dim)).astype(np.float32)
+        print(f"🎲 Synthetic corpus: {corpus.shape[0]} vectors x {corpus.shape[1]} dims")
+    else:
+        try:
+            corpus = load_collection_embeddings(args.collection, args.limit)
+        except Exception as e:
+            print(f"❌ Failed to load collection '{args.collection}': {e}")
+            return 1
+        if len(corpus) == 0:
+            print(f"❌ Collection '{args.collection}' is empty")
+            return 1
+        print(f"📦 Loaded {corpus.shape[0]} vectors x {corpus.shape[1]} dims")
+
+    k = min(args.k, len(corpus))
+    queries = make_queries(corpus, args.queries, args.noise, args.seed)
+    print(f"🔍 {len(queries)} queries, recall@{k}")
+    print()
+
+    spaces = [s.strip() for s in args.space.split(",") if s.strip()]
+    results = []
+
+    header = (
+        f"{'space':<7}{'M':>4}{'c_ef':>6}{'s_ef':>6}"
+        f"{'recall':>9}{'p50 ms':>9}{'p95 ms':>9}{'size MB':>9}{'build s':>9}"
+    )
+    print(header)
+    print("-" * len(header))
+
+    for space in spaces:
+        truth = exact_top_k(corpus, queries, k, space)
+
+        for m, construction_ef, search_ef in itertools.product(
+            parse_int_list(args.m),
+            parse_int_list(args.construction_ef),
+            parse_int_list(args.search_ef),
+        ):
+            # 読み込み済みのインデックスにはsearch_efの変更が反映されないため、組み合わせごとに構築する
+            workdir = Path(tempfile.mkdtemp(prefix="hnsw_tuning_"))
+            try:
+                collection, build_seconds = build_index(
+                    workdir, corpus, space, m, construction_ef, search_ef
+                )
+                stats = measure(collection, queries, truth, k)
+                size_mb = directory_size(workdir) / 1024 / 1024
+                row = {
+                    "space": space,
+                    "M": m,
+                    "construction_ef": construction_ef,
+                    "search_ef": search_ef,
+                    "recall_at_k": stats["recall"],
+                    "p50_ms": stats["p50_ms"],
+                    "p95_ms": stats["p95_ms"],
+                    "index_size_mb": size_mb,
+                    "build_seconds": build_seconds,
+                }
+                results.append(row)
+                print(
+                    f"{space:<7}{m:>4}{construction_ef:>6}{search_ef:>6}"
+                    f"{stats['recall']:>9.3f}{stats['p50_ms']:>9.2f}{stats['p95_ms']:>9.2f}"
+                    f"{size_mb:>9.1f}{build_seconds:>9.1f}"
+                )
+            finally:
+                shutil.rmtree(workdir, ignore_errors=True)
+
+    print()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"k": k, "vectors": len(corpus), "results": results}, f, indent=2)
+        print(f"💾 Results written to {args.output}")
+
+    best = [r for r in results if r["recall_at_k"] >= 0.95]
+    if best:
+        fastest = min(best, key=lambda r: r["p95_ms"])
+        print(
+            "✅ Fastest setting with recall >= 0.95: "
+            f"space={fastest['space']} M={fastest['M']} "
+            f"construction_ef={fastest['construction_ef']} search_ef={fastest['search_ef']} "
+            f"(p95 {fastest['p95_ms']:.2f} ms)"
+        )
+    else:
+        print("⚠️  No setting reached recall >= 0.95; try larger M / search_ef")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
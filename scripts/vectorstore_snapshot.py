@@ -0,0 +1,86 @@
+"""
+LangGraph Catalyst - Vector Store Snapshot Script
+
+ベクトルストアのスナップショットを書き出し・読み込むスクリプト。
+デプロイ後にスナップショットを読み込めば、再クロール・再埋め込みなしに
+数秒でベクトルストアを復元できます（埋め込みAPIは呼び出しません）。
+
+使い方:
+    python scripts/vectorstore_snapshot.py export ./snapshots/latest
+    python scripts/vectorstore_snapshot.py import ./snapshots/latest
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# プロジェクトルートをPythonパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config.settings import settings  # noqa: E402
+from src.features.rag.vectorstore import create_vectorstore  # noqa: E402
+
+# ロガー設定
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="Export or import a vector store snapshot")
+    parser.add_argument("command", choices=["export", "import"], help="Operation to run")
+    parser.add_argument("directory", help="Snapshot directory")
+    parser.add_argument(
+        "--collection", default=settings.chroma_collection_name, help="Collection name"
+    )
+    parser.add_argument(
+        "--keep-existing",
+        action="store_true",
+        help="On import, keep chunks that are not in the snapshot",
+    )
+
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print(f"LangGraph Catalyst - Vector Store Snapshot ({args.command})")
+    print("=" * 70)
+    print()
+
+    try:
+        vectorstore = create_vectorstore(collection_name=args.collection)
+    except Exception as e:
+        print(f"❌ Failed to initialize vector store: {e}")
+        return 1
+
+    try:
+        if args.command == "export":
+            manifest = vectorstore.export_snapshot(args.directory)
+            print(f"✅ Exported {manifest['count']} chunks to {args.directory}")
+            print(f"   Embedding model: {manifest['embedding_model']}")
+            print(f"   Dimension: {manifest['dimension']}")
+            print(f"   Corpus version: {manifest['corpus_version']}")
+            print(f"   Parent sections: {manifest['parent_count']}")
+        else:
+            result = vectorstore.import_snapshot(args.directory, prune=not args.keep_existing)
+            print(f"✅ Imported {result['added_count']} chunks from {args.directory}")
+            print(f"   Stale (deleted): {result['deleted_stale']} chunks")
+            print(f"   Total in store: {result['total_documents_in_store']} chunks")
+            print(f"   Corpus version: {result['corpus_version']}")
+            print(f"   Parent sections: {result['parent_sections']}")
+            print(f"   Elapsed: {result['elapsed_seconds']:.2f}s")
+    except Exception as e:
+        print(f"❌ Snapshot {args.command} failed: {e}")
+        return 1
+    finally:
+        vectorstore.close()
+
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -29,6 +29,12 @@ class Settings(BaseSettings):
         description="Chromaベクトルストアの永続化ディレクトリ",
     )
 
+    chroma_collection_name: str = Field(
+        default="langgraph_docs",
+        min_length=3,
+        description="Chromaコレクション名（次元数の移行先コレクションへの切り替えに使用）",
+    )
+
     # ログ設定
     log_level: Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"] = Field(
         default="INFO",
@@ -46,11 +52,18 @@ class Settings(BaseSettings):
         description="デフォルトの埋め込みモデル",
     )
 
+    embedding_dimensions: int | None = Field(
+        default=None,
+        ge=1,
+        le=3072,
+        description="埋め込みの次元数（text-embedding-3系のみ。Noneの場合はモデル既定）",
+    )
+
     max_tokens: int = Field(
         default=4096,
         ge=1,
         le=128000,
-        description="最大トークン数",
+        description="RAGプロンプトのトークン予算（テンプレート・質問を除いた分をコンテキストに使用）",
     )
 
     temperature: float = Field(
@@ -96,6 +109,253 @@ class Settings(BaseSettings):
         description="ドキュメント分割のオーバーラップサイズ",
     )
 
+    # インジェスト時の重複チャンク除去設定
+    ingest_dedup_enabled: bool = Field(
+        default=True,
+        description="インジェスト時にほぼ重複するチャンク（ナビゲーション・フッター等）を除去するか",
+    )
+
+    ingest_dedup_threshold: float = Field(
+        default=0.85,
+        gt=0.0,
+        le=1.0,
+        description="重複とみなすチャンク間のJaccard類似度（MinHashによる推定値）",
+    )
+
+    ingest_dedup_num_perm: int = Field(
+        default=128,
+        ge=16,
+        le=1024,
+        description="MinHash署名の長さ（大きいほど類似度の推定が正確）",
+    )
+
+    # 親ドキュメント（small-to-big）設定
+    rag_parent_expansion: bool = Field(
+        default=True,
+        description="検索したチャンクを親セクションに展開してLLMのコンテキストにするか",
+    )
+
+    rag_parent_chunk_size: int = Field(
+        default=4000,
+        ge=500,
+        le=20000,
+        description="インジェスト時に保存する親セクションの最大文字数",
+    )
+
+    rag_parent_context_tokens: int = Field(
+        default=3000,
+        ge=100,
+        le=100000,
+        description="親セクションに展開したコンテキストのトークン予算",
+    )
+
+    # セマンティック回答キャッシュ設定
+    semantic_cache_enabled: bool = Field(
+        default=True,
+        description="類似した質問（言い換え）に対して保存済みの回答を返すか",
+    )
+
+    semantic_cache_threshold: float = Field(
+        default=0.95,
+        gt=0.0,
+        le=1.0,
+        description="キャッシュ済みの回答を返す質問埋め込みのコサイン類似度",
+    )
+
+    semantic_cache_ttl_seconds: float = Field(
+        default=3600.0,
+        gt=0.0,
+        description="キャッシュした回答の有効期間（秒）",
+    )
+
+    semantic_cache_max_entries: int = Field(
+        default=1000,
+        ge=1,
+        le=100000,
+        description="セマンティックキャッシュに保持する最大件数（超えるとLRUで削除）",
+    )
+
+    # 応答キャッシュ設定
+    response_cache_enabled: bool = Field(
+        default=True,
+        description=(
+            "同一のリクエスト（正規化した質問とパラメータ）に保存済みの応答を返すか"
+            "（SQLiteで複数ワーカーと共有）"
+        ),
+    )
+
+    response_cache_ttl_seconds: float = Field(
+        default=86400.0,
+        gt=0.0,
+        description="キャッシュした応答の有効期間（秒、再インジェスト時は期間内でも無効）",
+    )
+
+    # 検索バックエンド設定
+    vectorstore_backend: Literal["chroma", "numpy", "partitioned", "shared"] = Field(
+        default="chroma",
+        description=(
+            "検索バックエンド（chroma: HNSW / numpy: 小規模コーパス向け厳密検索 / "
+            "partitioned: doc_typeごとのコレクション / "
+            "shared: 複数ワーカーでメモリマップを共有する読み取り専用のNumPyインデックス）"
+        ),
+    )
+
+    numpy_index_dtype: Literal["float32", "float16"] = Field(
+        default="float32",
+        description="NumPyバックエンドで保持する埋め込み行列の型",
+    )
+    numpy_index_quantization: Literal["none", "int8", "binary"] = Field(
+        default="none",
+        description=(
+            "NumPyバックエンドの一次検索に使う量子化（int8: 1/4 / binary: 1/32のメモリ）。"
+            "上位候補はディスク上のfull-precision行列で再スコアリング"
+        ),
+    )
+    numpy_index_rescore_multiplier: int = Field(
+        default=4,
+        ge=1,
+        description="量子化検索で再スコアリングする候補数（kの倍数）",
+    )
+
+    shared_index_poll_interval: float = Field(
+        default=2.0,
+        ge=0.0,
+        le=300.0,
+        description="sharedバックエンドで公開バージョンのポインタを確認する間隔（秒）",
+    )
+
+    shared_index_keep_versions: int = Field(
+        default=2,
+        ge=1,
+        le=20,
+        description="sharedバックエンドで残す公開バージョン数（現在のものを含む）",
+    )
+
+    # HNSWインデックス設定（コレクション作成時に適用。search_ef以外は既存コレクションでは変更不可）
+    chroma_hnsw_space: Literal["l2", "cosine", "ip"] = Field(
+        default="l2",
+        description="HNSWの距離空間",
+    )
+
+    chroma_hnsw_m: int = Field(
+        default=16,
+        ge=2,
+        le=128,
+        description="HNSWの各ノードの最大近傍数（M）",
+    )
+
+    chroma_hnsw_construction_ef: int = Field(
+        default=100,
+        ge=1,
+        le=2000,
+        description="HNSW構築時の探索幅（construction_ef）",
+    )
+
+    chroma_hnsw_search_ef: int = Field(
+        default=100,
+        ge=1,
+        le=2000,
+        description="HNSW検索時の探索幅（search_ef）",
+    )
+
+    # クエリ埋め込みキャッシュ設定
+    query_embedding_cache_size: int = Field(
+        default=1024,
+        ge=0,
+        description="メモリ上に保持するクエリ埋め込みの最大件数",
+    )
+
+    query_embedding_cache_persist: bool = Field(
+        default=True,
+        description="クエリ埋め込みをディスク（Chromaディレクトリの隣）にも保存するか",
+    )
+
+    embedding_store_enabled: bool = Field(
+        default=True,
+        description=(
+            "チャンク本文の埋め込みを(モデル, 次元数, sha256(本文))で保存し、"
+            "再インジェスト時に再利用するか"
+        ),
+    )
+
+    # インジェスト設定
+    embedding_batch_max_tokens: int = Field(
+        default=50000,
+        ge=1000,
+        le=300000,
+        description="並列インジェスト時の1埋め込みバッチあたりの最大トークン数",
+    )
+
+    embedding_max_workers: int = Field(
+        default=4,
+        ge=1,
+        le=32,
+        description="並列インジェスト時に同時送信する埋め込みバッチ数",
+    )
+
+    embedding_max_retries: int = Field(
+        default=3,
+        ge=0,
+        le=10,
+        description="埋め込みバッチの最大再試行回数",
+    )
+
+    # ウォームアップ設定
+    warmup_http_timeout: float = Field(
+        default=5.0,
+        gt=0,
+        le=60,
+        description="起動時にOpenAIへの接続を確立する際のタイムアウト（秒）",
+    )
+
+    # ハイブリッド / MMR検索設定
+    rag_search_mode: Literal["similarity", "hybrid", "mmr"] = Field(
+        default="similarity",
+        description=(
+            "RAGの検索方式（similarity: ベクトルのみ / hybrid: BM25とベクトルのRRF統合 / "
+            "mmr: 重複の少ない候補をMMRで選択）"
+        ),
+    )
+
+    lexical_index_enabled: bool = Field(
+        default=True,
+        description="インジェスト時にBM25語彙インデックスを構築するか",
+    )
+
+    hybrid_fetch_k: int = Field(
+        default=20,
+        ge=1,
+        le=200,
+        description="ハイブリッド検索で各検索器から取得する候補数",
+    )
+
+    hybrid_rrf_k: int = Field(
+        default=60,
+        ge=1,
+        description="Reciprocal Rank Fusionの平滑化定数",
+    )
+
+    mmr_fetch_k: int = Field(
+        default=20,
+        ge=1,
+        le=200,
+        description="MMR検索で多様化の対象とする候補数",
+    )
+
+    mmr_lambda: float = Field(
+        default=0.5,
+        ge=0.0,
+        le=1.0,
+        description="MMR検索の関連度の重み（1.0で類似度順、0.0で多様性のみ）",
+    )
+
+    vector_search_max_workers: int = Field(
+        default=4,
+        ge=1,
+        le=32,
+        description="ベクトル検索を実行する専用スレッドプールのワーカー数",
+    )
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -5,8 +5,11 @@ RAG (Retrieval-Augmented Generation) チェーンを実装するモジュール
 ベクトルストアからの検索結果を使用してLLMで回答を生成します。
 """
 
+import asyncio
 import logging
+import re
 import time
+from collections.abc import Iterator
 from typing import Any
 
 from langchain_core.documents import Document
@@ -14,12 +17,34 @@ from langchain_core.prompts import ChatPromptTemplate
 from langchain_openai import ChatOpenAI
 
 from src.config.settings import settings
-from src.features.rag.vectorstore import ChromaVectorStore
+from src.features.rag.parent_store import ParentDocumentStore
+from src.features.rag.response_cache import ResponseCache
+from src.features.rag.semantic_cache import SemanticAnswerCache, SemanticCacheHit
+from src.features.rag.vectorstore import ChromaVectorStore, make_chunk_id
+from src.features.rag.warmup import (
+    open_async_openai_connection,
+    open_openai_connection,
+    run_warmup_steps,
+)
 from src.utils.exceptions import LLMError, ValidationError
-from src.utils.helpers import extract_code_blocks, format_sources
+from src.utils.helpers import (
+    calculate_token_count,
+    extract_code_blocks,
+    format_sources,
+    truncate_to_token_limit,
+)
 
 logger = logging.getLogger(__name__)
 
+# サポートする検索方式
+SEARCH_MODES = ("similarity", "hybrid", "mmr")
+
+# コンテキストに収まらないチャンクを切り詰める位置（句点・感嘆符・疑問符・文末のピリオド・改行）
+SENTENCE_END_PATTERN = re.compile(r"[。．！？!?]|\.(?=\s|$)|\n")
+
+# 予算の残りがこれ未満なら、最後のチャンクを切り詰めて含めずに打ち切る
+MIN_TRIMMED_CHUNK_TOKENS = 50
+
 # システムプロンプトテンプレート（学習支援重視版）
 SYSTEM_PROMPT_LEARNING = """あなたはLangGraphの学習支援エキスパートです。ユーザーがLangGraphを理解し、学習を進められるよう支援してください。
 
@@ -68,6 +93,11 @@ class RAGChain:
         llm_model: str | None = None,
         temperature: float | None = None,
         streaming: bool = False,
+        search_mode: str | None = None,
+        parent_store: ParentDocumentStore | None = None,
+        answer_cache: SemanticAnswerCache | None = None,
+        response_cache: ResponseCache | None = None,
+        max_tokens: int | None = None,
     ):
         """
         RAGChainの初期化
@@ -77,6 +107,15 @@ class RAGChain:
             llm_model: 使用するLLMモデル
             temperature: 温度パラメータ
             streaming: ストリーミングを有効にするか
+            search_mode: 検索方式（similarity / hybrid / mmr）。未指定時は設定値
+            parent_store: 親ドキュメントストア。指定時は検索したチャンクを
+                親セクションに展開してコンテキストを構築（ソース表示はチャンク単位のまま）
+            answer_cache: セマンティック回答キャッシュ。指定時は類似した質問に対して
+                検索・LLM呼び出しを行わずに保存済みの回答を返す
+            response_cache: 応答キャッシュ。指定時は同一のリクエスト（正規化した質問と
+                パラメータ、コーパスバージョンが一致）に保存済みの応答を返す
+            max_tokens: プロンプトのトークン予算（未指定時は設定値）。テンプレートと質問を
+                除いた分をコンテキストに使う
 
         Raises:
             ValidationError: バリデーションエラー
@@ -85,6 +124,11 @@ class RAGChain:
         self.llm_model = llm_model or settings.default_llm_model
         self.temperature = temperature if temperature is not None else settings.temperature
         self.streaming = streaming
+        self.search_mode = search_mode or settings.rag_search_mode
+        self.parent_store = parent_store
+        self.answer_cache = answer_cache
+        self.response_cache = response_cache
+        self.max_tokens = max_tokens or settings.max_tokens
 
         # LLMの初期化
         try:
@@ -102,6 +146,39 @@ class RAGChain:
         self.prompt_template_learning = ChatPromptTemplate.from_template(SYSTEM_PROMPT_LEARNING)
         self.prompt_template_with_code = ChatPromptTemplate.from_template(SYSTEM_PROMPT_WITH_CODE)
 
+        # コンテキスト・質問を除いたテンプレートのトークン数（コード提示版か→トークン数）
+        self._template_tokens = {
+            False: calculate_token_count(
+                self.prompt_template_learning.format(context="", question="")
+            ),
+            True: calculate_token_count(
+                self.prompt_template_with_code.format(context="", question="")
+            ),
+        }
+
+    def warmup(self, loop: asyncio.AbstractEventLoop | None = None) -> dict[str, Any]:
+        """
+        LLMへのHTTP接続を事前に確立（起動時に呼び出す）
+
+        Args:
+            loop: aquery()を処理するイベントループ（指定時は非同期クライアントの接続も確立）
+
+        Returns:
+            dict: status（ready / degraded）, steps, elapsed_seconds
+        """
+
+        def open_llm_connections() -> None:
+            open_openai_connection(self.llm.root_client, self.llm_model)
+            if loop is not None:
+                open_async_openai_connection(self.llm.root_async_client, self.llm_model, loop)
+
+        return run_warmup_steps([("llm_connection", open_llm_connections)])
+
+    def close(self) -> None:
+        """応答キャッシュの接続を解放（VectorStoreは呼び出し側で解放）"""
+        if self.response_cache is not None:
+            self.response_cache.close()
+
     def _should_include_code(self, question: str) -> bool:
         """
         質問からコード例が必要かを判定
@@ -142,12 +219,53 @@ class RAGChain:
         question_lower = question.lower()
         return any(keyword in question_lower for keyword in code_keywords)
 
+    def _retrieve(self, question: str, k: int, search_mode: str | None = None) -> list[Document]:
+        """
+        指定された検索方式で関連ドキュメントを取得
+
+        Args:
+            question: ユーザーの質問
+            k: 取得するドキュメント数
+            search_mode: 検索方式（未指定時はチェーンの設定値）
+
+        Returns:
+            list[Document]: 関連ドキュメント
+        """
+        search_mode = search_mode or self.search_mode
+        if search_mode == "hybrid":
+            return self.vectorstore.hybrid_search(query=question, k=k)
+        if search_mode == "mmr":
+            return self.vectorstore.mmr_search(query=question, k=k)
+        return self.vectorstore.similarity_search(query=question, k=k)
+
+    async def _aretrieve(
+        self, question: str, k: int, search_mode: str | None = None
+    ) -> list[Document]:
+        """
+        指定された検索方式で関連ドキュメントを非同期に取得
+
+        Args:
+            question: ユーザーの質問
+            k: 取得するドキュメント数
+            search_mode: 検索方式（未指定時はチェーンの設定値）
+
+        Returns:
+            list[Document]: 関連ドキュメント
+        """
+        search_mode = search_mode or self.search_mode
+        if search_mode == "hybrid":
+            return await self.vectorstore.ahybrid_search(query=question, k=k)
+        if search_mode == "mmr":
+            return await self.vectorstore.ammr_search(query=question, k=k)
+        return await self.vectorstore.asimilarity_search(query=question, k=k)
+
     def query(
         self,
         question: str,
         k: int = 5,
         include_sources: bool = True,
         include_code_examples: bool | None = None,
+        search_mode: str | None = None,
     ) -> dict[str, Any]:
         """
         RAGクエリを実行
@@ -160,6 +278,8 @@ class RAGChain:
                 - None: 質問から自動判定（デフォルト）
                 - True: 強制的に含める
                 - False: 含めない
+            search_mode: このリクエストの検索方式（similarity / hybrid / mmr）。
+                未指定時はチェーンの設定値
 
         Returns:
             dict: RAG応答
@@ -168,118 +288,60 @@ class RAGChain:
             ValidationError: バリデーションエラー
             LLMError: LLM呼び出しエラー
         """
-        if not question or not question.strip():
-            raise ValidationError("Question cannot be empty")
-
-        # コード例の自動判定
-        if include_code_examples is None:
-            include_code_examples = self._should_include_code(question)
-            logger.info(
-                f"Auto-detected code requirement: {include_code_examples} for question: {question[:50]}..."
-            )
+        include_code_examples = self._validate_query(question, include_code_examples, search_mode)
 
         logger.info(f"Processing RAG query: {question[:50]}...")
 
         start_time = time.time()
 
         try:
+            # 0. 同一または類似した質問の回答がキャッシュにあればそれを返す
+            cache_params = self._cache_params(
+                k, include_sources, include_code_examples, search_mode
+            )
+            cached_response, corpus_version = self._lookup_response_cache(question, cache_params)
+            if cached_response is not None:
+                return self._cached_result(cached_response, start_time, "exact")
+            cache_hit, cache_key = self._lookup_answer_cache(question, cache_params)
+            if cache_hit is not None:
+                return self._cached_result(
+                    cache_hit.payload, start_time, "semantic", cache_hit.similarity
+                )
+
             # 1. 類似ドキュメントを検索
-            retrieved_docs = self.vectorstore.similarity_search(query=question, k=k)
+            retrieved_docs = self._retrieve(question, k, search_mode)
 
             if not retrieved_docs:
                 logger.warning("No relevant documents found")
-                return {
-                    "answer": "申し訳ありませんが、関連する情報が見つかりませんでした。別の質問を試してみてください。",
-                    "sources": [],
-                    "code_examples": [],
-                    "confidence": 0.0,
-                    "metadata": {
-                        "model": self.llm_model,
-                        "tokens_used": 0,
-                        "response_time": time.time() - start_time,
-                    },
-                }
-
-            # 2. コンテキストを構築
-            context = self._build_context(retrieved_docs)
+                return self._no_documents_result(start_time)
 
-            # 3. プロンプトテンプレートを選択
-            if include_code_examples:
-                prompt_template = self.prompt_template_with_code
-                logger.info("Using code-inclusive prompt template")
-            else:
-                prompt_template = self.prompt_template_learning
-                logger.info("Using learning-focused prompt template")
-
-            # 4. プロンプトを生成
-            prompt = prompt_template.format(context=context, question=question)
+            # 2-4. コンテキストを構築してプロンプトを生成
+            prompt, context_tokens = self._build_prompt(
+                question, retrieved_docs, include_code_examples
+            )
 
             # 5. LLMで回答を生成
             response = self.llm.invoke(prompt)
             answer = response.content
 
-            # 6. ソース情報を抽出
-            sources = []
-            if include_sources:
-                sources = format_sources(retrieved_docs)
-
-            # 7. コード例を抽出（回答 + 検索結果ドキュメントから）
-            # コードが要求されている場合のみ抽出
-            code_examples = []
-            if include_code_examples:
-                # 回答からコードブロックを抽出
-                answer_code_blocks = extract_code_blocks(answer)
-                for block in answer_code_blocks:
-                    code_examples.append(
-                        {
-                            "language": block.get("language", "python"),
-                            "code": block["code"],
-                            "description": "Code example from AI response",
-                        }
-                    )
+            # 6-8. ソース・コード例を抽出してレスポンスを構築
+            result = self._build_result(
+                answer,
+                retrieved_docs,
+                include_sources,
+                include_code_examples,
+                response.response_metadata.get("token_usage", {}).get("total_tokens", 0),
+                context_tokens,
+                start_time,
+            )
 
-                # 検索結果のドキュメントからもコード例を抽出
-                for doc in retrieved_docs[:3]:  # 上位3件から抽出
-                    doc_code_blocks = extract_code_blocks(doc.page_content)
-                    for block in doc_code_blocks[:2]:  # 各ドキュメントから最大2件
-                        code_examples.append(
-                            {
-                                "language": block.get("language", "python"),
-                                "code": block["code"],
-                                "description": f"Example from {doc.metadata.get('title', 'documentation')}",
-                                "source_url": doc.metadata.get("source"),
-                            }
-                        )
-
-                # 重複を除去（コード内容でユニーク化）
-                seen_codes = set()
-                unique_examples = []
-                for example in code_examples:
-                    code_hash = hash(example["code"].strip())
-                    if code_hash not in seen_codes:
-                        seen_codes.add(code_hash)
-                        unique_examples.append(example)
-
-                code_examples = unique_examples[:5]  # 最大5件
-
-            # 8. レスポンスを構築
-            response_time = time.time() - start_time
-
-            result = {
-                "answer": answer,
-                "sources": sources,
-                "code_examples": code_examples,
-                "confidence": self._calculate_confidence(retrieved_docs),
-                "metadata": {
-                    "model": self.llm_model,
-                    "tokens_used": response.response_metadata.get("token_usage", {}).get(
-                        "total_tokens", 0
-                    ),
-                    "response_time": response_time,
-                },
-            }
+            self._store_answer_cache(cache_key, cache_params, result, retrieved_docs)
+            self._store_response_cache(question, cache_params, corpus_version, result)
 
-            logger.info(f"RAG query completed in {response_time:.2f}s with {len(sources)} sources")
+            logger.info(
+                f"RAG query completed in {result['metadata']['response_time']:.2f}s "
+                f"with {len(result['sources'])} sources"
+            )
 
             return result
 
@@ -287,32 +349,634 @@ class RAGChain:
             logger.error(f"Failed to process RAG query: {e}")
             raise LLMError(f"Failed to process RAG query: {e}") from e
 
-    def _build_context(self, documents: list[Document]) -> str:
+    async def aquery(
+        self,
+        question: str,
+        k: int = 5,
+        include_sources: bool = True,
+        include_code_examples: bool | None = None,
+        search_mode: str | None = None,
+    ) -> dict[str, Any]:
         """
-        ドキュメントからコンテキストを構築
+        RAGクエリを非同期に実行（戻り値はqueryと同じ）
+
+        クエリ埋め込みは非同期OpenAIクライアント、ローカルの検索は専用スレッドプール、
+        回答生成はainvokeで行うため、1ワーカーで複数のリクエストを並行して処理できます。
+        タスクがキャンセルされた場合（クライアントの切断など）は、実行中の
+        埋め込み・LLM呼び出しを中断してCancelledErrorを送出します。
 
         Args:
-            documents: 検索されたドキュメントのリスト
+            question: ユーザーの質問
+            k: 検索する関連ドキュメント数
+            include_sources: ソース情報を含めるか
+            include_code_examples: コード例を含めるか（Noneは質問から自動判定）
+            search_mode: このリクエストの検索方式。未指定時はチェーンの設定値
 
         Returns:
-            str: コンテキスト文字列
+            dict: RAG応答
+
+        Raises:
+            ValidationError: バリデーションエラー
+            LLMError: LLM呼び出しエラー
+        """
+        include_code_examples = self._validate_query(question, include_code_examples, search_mode)
+
+        logger.info(f"Processing async RAG query: {question[:50]}...")
+
+        start_time = time.time()
+
+        try:
+            cache_params = self._cache_params(
+                k, include_sources, include_code_examples, search_mode
+            )
+            cached_response, corpus_version = await self._alookup_response_cache(
+                question, cache_params
+            )
+            if cached_response is not None:
+                return self._cached_result(cached_response, start_time, "exact")
+            cache_hit, cache_key = await self._alookup_answer_cache(question, cache_params)
+            if cache_hit is not None:
+                return self._cached_result(
+                    cache_hit.payload, start_time, "semantic", cache_hit.similarity
+                )
+
+            retrieved_docs = await self._aretrieve(question, k, search_mode)
+
+            if not retrieved_docs:
+                logger.warning("No relevant documents found")
+                return self._no_documents_result(start_time)
+
+            if self.parent_store is not None:
+                # 親ドキュメントストア（SQLite）の参照はスレッドで実行
+                prompt, context_tokens = await asyncio.to_thread(
+                    self._build_prompt, question, retrieved_docs, include_code_examples
+                )
+            else:
+                prompt, context_tokens = self._build_prompt(
+                    question, retrieved_docs, include_code_examples
+                )
+
+            response = await self.llm.ainvoke(prompt)
+
+            result = self._build_result(
+                response.content,
+                retrieved_docs,
+                include_sources,
+                include_code_examples,
+                response.response_metadata.get("token_usage", {}).get("total_tokens", 0),
+                context_tokens,
+                start_time,
+            )
+
+            self._store_answer_cache(cache_key, cache_params, result, retrieved_docs)
+            if self.response_cache is not None:
+                await asyncio.to_thread(
+                    self._store_response_cache, question, cache_params, corpus_version, result
+                )
+
+            logger.info(
+                f"Async RAG query completed in {result['metadata']['response_time']:.2f}s "
+                f"with {len(result['sources'])} sources"
+            )
+
+            return result
+
+        except asyncio.CancelledError:
+            logger.info(f"RAG query cancelled after {time.time() - start_time:.2f}s")
+            raise
+        except Exception as e:
+            logger.error(f"Failed to process RAG query: {e}")
+            raise LLMError(f"Failed to process RAG query: {e}") from e
+
+    def stream(
+        self,
+        question: str,
+        k: int = 5,
+        include_sources: bool = True,
+        include_code_examples: bool | None = None,
+        search_mode: str | None = None,
+    ) -> Iterator[tuple[str, dict[str, Any]]]:
         """
+        RAGクエリをストリーミングで実行
+
+        検索が終わった時点でソースを返し、その後LLMの生成に合わせてトークン差分を返します。
+        最後にコード例・信頼度・メタデータ（使用トークン数は生成全体で1回だけ集計）を返します。
+
+        Args:
+            question: ユーザーの質問
+            k: 検索する関連ドキュメント数
+            include_sources: ソース情報を含めるか
+            include_code_examples: コード例を含めるか（Noneは質問から自動判定）
+            search_mode: このリクエストの検索方式。未指定時はチェーンの設定値
+
+        Yields:
+            tuple[str, dict]: (イベント名, データ)
+                - ("sources", {"sources": [...]})
+                - ("token", {"delta": "..."})
+                - ("final", {"code_examples": [...], "confidence": ..., "metadata": {...}})
+
+        Raises:
+            ValidationError: バリデーションエラー（最初のイベントの前に送出）
+            LLMError: 検索・LLM呼び出しエラー
+        """
+        include_code_examples = self._validate_query(question, include_code_examples, search_mode)
+
+        logger.info(f"Processing streaming RAG query: {question[:50]}...")
+
+        start_time = time.time()
+
+        try:
+            cache_params = self._cache_params(
+                k, include_sources, include_code_examples, search_mode
+            )
+            cached, corpus_version = self._lookup_response_cache(question, cache_params)
+            if cached is not None:
+                cached = self._cached_result(cached, start_time, "exact")
+            else:
+                cache_hit, cache_key = self._lookup_answer_cache(question, cache_params)
+                if cache_hit is not None:
+                    cached = self._cached_result(
+                        cache_hit.payload, start_time, "semantic", cache_hit.similarity
+                    )
+                else:
+                    retrieved_docs = self._retrieve(question, k, search_mode)
+        except Exception as e:
+            logger.error(f"Failed to process RAG query: {e}")
+            raise LLMError(f"Failed to process RAG query: {e}") from e
+
+        if cached is not None:
+            yield "sources", {"sources": cached["sources"]}
+            yield "token", {"delta": cached["answer"]}
+            yield "final", self._final_event(cached)
+            return
+
+        yield "sources", {"sources": format_sources(retrieved_docs) if include_sources else []}
+
+        if not retrieved_docs:
+            logger.warning("No relevant documents found")
+            result = self._no_documents_result(start_time)
+            yield "token", {"delta": result["answer"]}
+            yield "final", self._final_event(result)
+            return
+
+        try:
+            prompt, context_tokens = self._build_prompt(
+                question, retrieved_docs, include_code_examples
+            )
+
+            answer_parts: list[str] = []
+            tokens_used = 0
+            for chunk in self.llm.stream(prompt, stream_usage=True):
+                if chunk.content:
+                    answer_parts.append(chunk.content)
+                    yield "token", {"delta": chunk.content}
+                # 使用量は最後のチャンクにのみ含まれる
+                if chunk.usage_metadata:
+                    tokens_used += chunk.usage_metadata.get("total_tokens", 0)
+
+            result = self._build_result(
+                "".join(answer_parts),
+                retrieved_docs,
+                include_sources,
+                include_code_examples,
+                tokens_used,
+                context_tokens,
+                start_time,
+            )
+            self._store_answer_cache(cache_key, cache_params, result, retrieved_docs)
+            self._store_response_cache(question, cache_params, corpus_version, result)
+        except Exception as e:
+            logger.error(f"Failed to stream RAG answer: {e}")
+            raise LLMError(f"Failed to stream RAG answer: {e}") from e
+
+        logger.info(f"Streaming RAG query completed in {result['metadata']['response_time']:.2f}s")
+        yield "final", self._final_event(result)
+
+    def _validate_query(
+        self, question: str, include_code_examples: bool | None, search_mode: str | None
+    ) -> bool:
+        """
+        クエリの入力を検証し、コード例を含めるかを決定
+
+        Args:
+            question: ユーザーの質問
+            include_code_examples: コード例を含めるか（Noneは質問から自動判定）
+            search_mode: 検索方式
+
+        Returns:
+            bool: コード例を含めるか
+
+        Raises:
+            ValidationError: バリデーションエラー
+        """
+        if not question or not question.strip():
+            raise ValidationError("Question cannot be empty")
+        if search_mode is not None and search_mode not in SEARCH_MODES:
+            raise ValidationError(f"Unsupported search mode: {search_mode}")
+
+        # コード例の自動判定
+        if include_code_examples is None:
+            include_code_examples = self._should_include_code(question)
+            logger.info(
+                f"Auto-detected code requirement: {include_code_examples} for question: {question[:50]}..."
+            )
+        return include_code_examples
+
+    def _cache_params(
+        self,
+        k: int,
+        include_sources: bool,
+        include_code_examples: bool,
+        search_mode: str | None,
+    ) -> str:
+        """
+        回答に影響するリクエストパラメータ（キャッシュの一致条件）
+
+        リクエストの指定に加えて、プロンプトの組み立てを変える設定（トークン予算、
+        親ドキュメント展開の有無とその予算）も含めます。
+        """
+        parent_tokens = settings.rag_parent_context_tokens if self.parent_store is not None else 0
+        return (
+            f"{self.llm_model}|{search_mode or self.search_mode}|k={k}"
+            f"|sources={include_sources}|code={include_code_examples}"
+            f"|max_tokens={self.max_tokens}|parents={parent_tokens}"
+        )
+
+    def _lookup_response_cache(
+        self, question: str, params: str
+    ) -> tuple[dict[str, Any] | None, str | None]:
+        """
+        応答キャッシュを検索（正規化した質問とパラメータ、コーパスバージョンの完全一致）
+
+        Args:
+            question: ユーザーの質問
+            params: リクエストパラメータ
+
+        Returns:
+            tuple: (保存済みの応答またはNone, 保存時に使うコーパスバージョンまたはNone)
+        """
+        if self.response_cache is None:
+            return None, None
+        try:
+            corpus_version = self.vectorstore.get_cached_corpus_version()
+        except Exception as e:
+            logger.warning(f"Response cache unavailable, skipping lookup: {e}")
+            return None, None
+        return self.response_cache.get(question, params, corpus_version), corpus_version
+
+    async def _alookup_response_cache(
+        self, question: str, params: str
+    ) -> tuple[dict[str, Any] | None, str | None]:
+        """応答キャッシュ（SQLite）をスレッドで検索（戻り値は_lookup_response_cacheと同じ）"""
+        if self.response_cache is None:
+            return None, None
+        return await asyncio.to_thread(self._lookup_response_cache, question, params)
+
+    def _store_response_cache(
+        self, question: str, params: str, corpus_version: str | None, result: dict[str, Any]
+    ) -> None:
+        """生成した応答を応答キャッシュに保存"""
+        if self.response_cache is None or corpus_version is None:
+            return
+        self.response_cache.put(question, params, corpus_version, result)
+
+    def _lookup_answer_cache(
+        self, question: str, params: str
+    ) -> tuple[SemanticCacheHit | None, tuple[list[float], str] | None]:
+        """
+        セマンティックキャッシュを検索
+
+        質問の埋め込みはクエリ埋め込みキャッシュに残るため、続く検索で再計算されません。
+
+        Args:
+            question: ユーザーの質問
+            params: リクエストパラメータ
+
+        Returns:
+            tuple: (ヒットした回答またはNone, 保存時のキー(埋め込み, コーパスバージョン)またはNone)
+        """
+        if self.answer_cache is None:
+            return None, None
+        try:
+            embedding = self.vectorstore.embeddings.embed_query(question)
+            corpus_version = self.vectorstore.get_cached_corpus_version()
+        except Exception as e:
+            logger.warning(f"Semantic cache unavailable, skipping lookup: {e}")
+            return None, None
+        return self.answer_cache.lookup(embedding, corpus_version, params), (
+            embedding,
+            corpus_version,
+        )
+
+    async def _alookup_answer_cache(
+        self, question: str, params: str
+    ) -> tuple[SemanticCacheHit | None, tuple[list[float], str] | None]:
+        """セマンティックキャッシュを非同期に検索（戻り値は_lookup_answer_cacheと同じ）"""
+        if self.answer_cache is None:
+            return None, None
+        try:
+            embedding = await self.vectorstore.embeddings.aembed_query(question)
+            corpus_version = await asyncio.to_thread(self.vectorstore.get_cached_corpus_version)
+        except Exception as e:
+            logger.warning(f"Semantic cache unavailable, skipping lookup: {e}")
+            return None, None
+        return self.answer_cache.lookup(embedding, corpus_version, params), (
+            embedding,
+            corpus_version,
+        )
+
+    def _store_answer_cache(
+        self,
+        cache_key: tuple[list[float], str] | None,
+        params: str,
+        result: dict[str, Any],
+        retrieved_docs: list[Document],
+    ) -> None:
+        """生成した回答をセマンティックキャッシュに保存"""
+        if self.answer_cache is None or cache_key is None:
+            return
+        embedding, corpus_version = cache_key
+        self.answer_cache.store(
+            embedding,
+            corpus_version,
+            params,
+            result,
+            [doc.id or make_chunk_id(doc) for doc in retrieved_docs],
+        )
+
+    def _cached_result(
+        self,
+        payload: dict[str, Any],
+        start_time: float,
+        cache_type: str,
+        similarity: float | None = None,
+    ) -> dict[str, Any]:
+        """
+        キャッシュした回答をこのリクエストの応答として返す
+
+        Args:
+            payload: キャッシュから取り出したRAG応答
+            start_time: 処理開始時刻
+            cache_type: ヒットしたキャッシュ（exact / semantic）
+            similarity: セマンティックキャッシュでの質問の類似度
+
+        Returns:
+            dict: RAG応答
+        """
+        payload["metadata"].update(
+            {
+                "tokens_used": 0,
+                "response_time": time.time() - start_time,
+                "cache_hit": True,
+                "cache_type": cache_type,
+                "cache_similarity": similarity,
+            }
+        )
+        logger.info(
+            f"{cache_type.capitalize()} cache hit"
+            + (f" (similarity {similarity:.3f})" if similarity is not None else "")
+        )
+        return payload
+
+    def _no_documents_result(self, start_time: float) -> dict[str, Any]:
+        """関連ドキュメントが見つからなかった場合の応答"""
+        return {
+            "answer": "申し訳ありませんが、関連する情報が見つかりませんでした。別の質問を試してみてください。",
+            "sources": [],
+            "code_examples": [],
+            "confidence": 0.0,
+            "metadata": {
+                "model": self.llm_model,
+                "tokens_used": 0,
+                "context_tokens": 0,
+                "response_time": time.time() - start_time,
+                "cache_hit": False,
+            },
+        }
+
+    def _build_prompt(
+        self, question: str, retrieved_docs: list[Document], include_code_examples: bool
+    ) -> tuple[str, int]:
+        """
+        検索結果からコンテキストを構築してプロンプトを生成
+
+        コンテキストには、プロンプトのトークン予算からテンプレートと質問の分を除いた
+        トークン数まで検索結果を詰めます。
+
+        Args:
+            question: ユーザーの質問
+            retrieved_docs: 検索されたドキュメント
+            include_code_examples: コード提示版のテンプレートを使うか
+
+        Returns:
+            tuple[str, int]: (LLMに渡すプロンプト, コンテキストのトークン数)
+        """
+        # コンテキストを構築（親ドキュメントストアがあれば親セクションに展開）
+        context_docs = retrieved_docs
+        if self.parent_store is not None:
+            context_docs = self.parent_store.expand(retrieved_docs)
+        budget = (
+            self.max_tokens
+            - self._template_tokens[include_code_examples]
+            - calculate_token_count(question)
+        )
+        context, context_tokens = self._build_context(context_docs, budget)
+
+        # プロンプトテンプレートを選択
+        if include_code_examples:
+            prompt_template = self.prompt_template_with_code
+            logger.info("Using code-inclusive prompt template")
+        else:
+            prompt_template = self.prompt_template_learning
+            logger.info("Using learning-focused prompt template")
+
+        return prompt_template.format(context=context, question=question), context_tokens
+
+    def _build_result(
+        self,
+        answer: str,
+        retrieved_docs: list[Document],
+        include_sources: bool,
+        include_code_examples: bool,
+        tokens_used: int,
+        context_tokens: int,
+        start_time: float,
+    ) -> dict[str, Any]:
+        """
+        回答と検索結果からRAG応答を構築
+
+        Args:
+            answer: LLMの回答
+            retrieved_docs: 検索されたドキュメント
+            include_sources: ソース情報を含めるか
+            include_code_examples: コード例を含めるか
+            tokens_used: 使用トークン数
+            context_tokens: プロンプトに含めたコンテキストのトークン数
+            start_time: 処理開始時刻
+
+        Returns:
+            dict: RAG応答
+        """
+        # ソース情報を抽出
+        sources = []
+        if include_sources:
+            sources = format_sources(retrieved_docs)
+
+        # コード例を抽出（回答 + 検索結果ドキュメントから）
+        # コードが要求されている場合のみ抽出
+        code_examples = []
+        if include_code_examples:
+            code_examples = self._extract_code_examples(answer, retrieved_docs)
+
+        return {
+            "answer": answer,
+            "sources": sources,
+            "code_examples": code_examples,
+            "confidence": self._calculate_confidence(retrieved_docs),
+            "metadata": {
+                "model": self.llm_model,
+                "tokens_used": tokens_used,
+                "context_tokens": context_tokens,
+                "response_time": time.time() - start_time,
+                "cache_hit": False,
+            },
+        }
+
+    def _extract_code_examples(
+        self, answer: str, retrieved_docs: list[Document]
+    ) -> list[dict[str, Any]]:
+        """
+        回答と検索結果のドキュメントからコード例を抽出
+
+        Args:
+            answer: LLMの回答
+            retrieved_docs: 検索されたドキュメント
+
+        Returns:
+            list[dict]: 重複を除いたコード例（最大5件）
+        """
+        code_examples = []
+
+        # 回答からコードブロックを抽出
+        answer_code_blocks = extract_code_blocks(answer)
+        for block in answer_code_blocks:
+            code_examples.append(
+                {
+                    "language": block.get("language", "python"),
+                    "code": block["code"],
+                    "description": "Code example from AI response",
+                }
+            )
+
+        # 検索結果のドキュメントからもコード例を抽出
+        for doc in retrieved_docs[:3]:  # 上位3件から抽出
+            doc_code_blocks = extract_code_blocks(doc.page_content)
+            for block in doc_code_blocks[:2]:  # 各ドキュメントから最大2件
+                code_examples.append(
+                    {
+                        "language": block.get("language", "python"),
+                        "code": block["code"],
+                        "description": f"Example from {doc.metadata.get('title', 'documentation')}",
+                        "source_url": doc.metadata.get("source"),
+                    }
+                )
+
+        # 重複を除去（コード内容でユニーク化）
+        seen_codes = set()
+        unique_examples = []
+        for example in code_examples:
+            code_hash = hash(example["code"].strip())
+            if code_hash not in seen_codes:
+                seen_codes.add(code_hash)
+                unique_examples.append(example)
+
+        return unique_examples[:5]  # 最大5件
+
+    @staticmethod
+    def _final_event(result: dict[str, Any]) -> dict[str, Any]:
+        """ストリーミングの最終イベント（回答本文とソースは送信済みのため除く）"""
+        return {
+            "code_examples": result["code_examples"],
+            "confidence": result["confidence"],
+            "metadata": result["metadata"],
+        }
+
+    def _build_context(
+        self, documents: list[Document], max_tokens: int | None = None
+    ) -> tuple[str, int]:
+        """
+        ドキュメントからトークン予算内のコンテキストを構築
+
+        ドキュメントを関連度順に追加し、予算に収まらなくなったドキュメントは
+        文の区切りで切り詰めて最後に含めます（残りが少ない場合は含めません）。
+        kが大きいリクエストでもプロンプトが予算を超えないため、最初のトークンまでの
+        時間が検索件数に比例して延びません。
+
+        Args:
+            documents: 検索されたドキュメントのリスト（関連度順）
+            max_tokens: コンテキストのトークン予算（未指定時はプロンプトのトークン予算）
+
+        Returns:
+            tuple[str, int]: (コンテキスト文字列, コンテキストのトークン数)
+        """
+        budget = max_tokens if max_tokens is not None else self.max_tokens
         context_parts = []
+        used = 0
 
         for i, doc in enumerate(documents, 1):
             source = doc.metadata.get("source", "Unknown source")
             title = doc.metadata.get("title", "Untitled")
             content = doc.page_content
 
-            context_part = f"""
+            header = f"""
 ### ソース {i}: {title}
 URL: {source}
 
-{content}
 """
-            context_parts.append(context_part)
+            # 区切りの改行を含めて数える
+            header_tokens = calculate_token_count(header) + 1
+            content_tokens = calculate_token_count(content)
+            remaining = budget - used - header_tokens
+
+            trimmed = content_tokens > remaining
+            if trimmed:
+                if remaining < MIN_TRIMMED_CHUNK_TOKENS:
+                    break
+                content = self._trim_to_sentence(content, remaining)
+                if not content:
+                    break
+                content_tokens = calculate_token_count(content)
+
+            context_parts.append(f"{header}{content}\n")
+            used += header_tokens + content_tokens
+
+            # 切り詰めたドキュメントで予算を使い切ったので、以降は含めない
+            if trimmed:
+                break
+
+        if len(context_parts) < len(documents):
+            logger.info(
+                f"Packed {len(context_parts)}/{len(documents)} documents into context "
+                f"({used}/{budget} tokens)"
+            )
 
-        return "\n".join(context_parts)
+        return "\n".join(context_parts), used
+
+    @staticmethod
+    def _trim_to_sentence(text: str, max_tokens: int) -> str:
+        """
+        テキストをトークン数以内に収め、最後の文の区切りで切り詰める
+
+        Args:
+            text: 切り詰めるテキスト
+            max_tokens: 最大トークン数
+
+        Returns:
+            str: 切り詰めたテキスト（区切りが見つからない場合は空文字列）
+        """
+        truncated = truncate_to_token_limit(text, max_tokens)
+        ends = [match.end() for match in SENTENCE_END_PATTERN.finditer(truncated)]
+        return truncated[: ends[-1]].rstrip() if ends else ""
 
     def _calculate_confidence(self, documents: list[Document]) -> float:
         """
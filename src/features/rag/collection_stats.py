@@ -0,0 +1,167 @@
+"""
+LangGraph Catalyst - Collection Statistics
+
+コレクションの統計情報（doc_typeごとの件数・埋め込み次元数・最終インジェスト時刻）を
+メモリ上に保持するモジュール。書き込み時に差分で更新し、JSONに永続化することで、
+ヘルスチェックなどの参照時にデータベースへ問い合わせずに応答します。
+"""
+
+import json
+import logging
+import threading
+from collections.abc import Iterable
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from src.utils.helpers import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+# doc_typeを持たないチャンクの集計キー
+UNKNOWN_DOC_TYPE = "unknown"
+
+
+def directory_size(path: str | Path) -> int:
+    """
+    ディレクトリ配下のファイルサイズ合計（バイト）
+
+    Args:
+        path: 対象ディレクトリ
+
+    Returns:
+        int: 合計サイズ（存在しない場合は0）
+    """
+    path = Path(path)
+    if not path.exists():
+        return 0
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+class CollectionStats:
+    """コレクション統計情報のインメモリキャッシュ（スレッドセーフ）"""
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        counts: dict[str, int] | None = None,
+        embedding_dimension: int | None = None,
+        last_ingest_at: str | None = None,
+        disk_size_bytes: int = 0,
+    ):
+        """
+        初期化
+
+        Args:
+            path: 永続化先のJSONパス（Noneの場合はメモリのみ）
+            counts: doc_type→チャンク数
+            embedding_dimension: 埋め込み次元数
+            last_ingest_at: 最終インジェスト時刻（ISO 8601）
+            disk_size_bytes: 永続化ディレクトリのサイズ
+        """
+        self.path = Path(path) if path else None
+        self.counts = dict(counts or {})
+        self.embedding_dimension = embedding_dimension
+        self.last_ingest_at = last_ingest_at
+        self.disk_size_bytes = disk_size_bytes
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str | Path) -> "CollectionStats | None":
+        """
+        永続化された統計情報を読み込む
+
+        Args:
+            path: JSONパス
+
+        Returns:
+            CollectionStats | None: 統計情報（存在しない・読めない場合はNone）
+        """
+        path = Path(path)
+        if not path.exists():
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            return cls(
+                path,
+                counts=data["documents_by_type"],
+                embedding_dimension=data.get("embedding_dimension"),
+                last_ingest_at=data.get("last_ingest_at"),
+                disk_size_bytes=data.get("disk_size_bytes", 0),
+            )
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Failed to load collection stats from {path}: {e}")
+            return None
+
+    @property
+    def document_count(self) -> int:
+        """チャンク数の合計"""
+        return sum(self.counts.values())
+
+    def record_added(self, metadatas: Iterable[dict[str, Any] | None]) -> None:
+        """
+        追加したチャンクを集計に反映
+
+        Args:
+            metadatas: 追加したチャンクのメタデータ
+        """
+        with self._lock:
+            for metadata in metadatas:
+                doc_type = (metadata or {}).get("doc_type") or UNKNOWN_DOC_TYPE
+                self.counts[doc_type] = self.counts.get(doc_type, 0) + 1
+
+    def record_deleted(self, metadatas: Iterable[dict[str, Any] | None]) -> None:
+        """
+        削除したチャンクを集計に反映
+
+        Args:
+            metadatas: 削除したチャンクのメタデータ
+        """
+        with self._lock:
+            for metadata in metadatas:
+                doc_type = (metadata or {}).get("doc_type") or UNKNOWN_DOC_TYPE
+                remaining = self.counts.get(doc_type, 0) - 1
+                if remaining > 0:
+                    self.counts[doc_type] = remaining
+                else:
+                    self.counts.pop(doc_type, None)
+
+    def record_ingest(self, persist_directory: str | Path) -> None:
+        """
+        インジェスト完了時刻とディスクサイズを更新して永続化
+
+        Args:
+            persist_directory: ベクトルストアの永続化ディレクトリ
+        """
+        with self._lock:
+            self.last_ingest_at = datetime.utcnow().isoformat() + "Z"
+            self.disk_size_bytes = directory_size(persist_directory)
+        self.save()
+
+    def save(self) -> None:
+        """統計情報をJSONに保存（失敗しても参照には影響しない）"""
+        if self.path is None:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            write_json_atomic(self.path, self.to_dict())
+        except OSError as e:
+            logger.warning(f"Failed to save collection stats: {e}")
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        統計情報を辞書として取得
+
+        Returns:
+            dict: document_count, documents_by_type, embedding_dimension,
+                disk_size_bytes, last_ingest_at
+        """
+        with self._lock:
+            return {
+                "document_count": sum(self.counts.values()),
+                "documents_by_type": dict(sorted(self.counts.items())),
+                "embedding_dimension": self.embedding_dimension,
+                "disk_size_bytes": self.disk_size_bytes,
+                "last_ingest_at": self.last_ingest_at,
+            }
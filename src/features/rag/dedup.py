@@ -0,0 +1,209 @@
+"""
+LangGraph Catalyst - Near-Duplicate Chunk Elimination
+
+インジェスト時にほぼ重複するチャンクを除去するモジュール。
+WebBaseLoaderで取得したページのナビゲーション・フッターなどの定型文は、
+多数のページでほぼ同じチャンクになり、埋め込み・保存のコストと検索結果の枠を無駄にします。
+
+各チャンクをMinHashで指紋化し、LSHのバンド分割で候補ペアを線形時間に近い計算量で求め、
+推定Jaccard類似度が閾値以上のペアをクラスタにまとめて、各クラスタの先頭チャンクのみ残します。
+"""
+
+import logging
+import re
+import time
+import unicodedata
+import zlib
+from typing import Any
+
+import numpy as np
+from langchain_core.documents import Document
+
+from src.config.settings import settings
+from src.features.rag.lexical_index import tokenize
+
+logger = logging.getLogger(__name__)
+
+# MinHashのハッシュ空間（メルセンヌ素数 2^31 - 1、32bitハッシュ × 係数がuint64に収まる）
+MINHASH_PRIME = (1 << 31) - 1
+
+# 指紋化に使うトークンshingleの長さ
+SHINGLE_SIZE = 3
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def shingle_hashes(text: str, size: int = SHINGLE_SIZE) -> np.ndarray:
+    """
+    テキストをトークンshingleに分割してハッシュ化
+
+    トークン化はBM25と同じ（英数字は識別子単位、日本語は文字bigram）で、
+    空白や全角半角の違いは無視します。
+
+    Args:
+        text: 対象テキスト
+        size: shingleのトークン数
+
+    Returns:
+        np.ndarray: 重複を除いたshingleのハッシュ値 (m,) uint64
+    """
+    normalized = WHITESPACE_PATTERN.sub(" ", unicodedata.normalize("NFKC", text)).strip()
+    tokens = tokenize(normalized)
+    if not tokens:
+        return np.empty(0, dtype=np.uint64)
+
+    width = min(size, len(tokens))
+    shingles = {" ".join(tokens[i : i + width]) for i in range(len(tokens) - width + 1)}
+    return np.fromiter(
+        (zlib.crc32(shingle.encode("utf-8")) & MINHASH_PRIME for shingle in shingles),
+        dtype=np.uint64,
+        count=len(shingles),
+    )
+
+
+class MinHasher:
+    """MinHash署名を計算するクラス（ハッシュ関数は (a * x + b) mod p の族）"""
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        """
+        初期化
+
+        Args:
+            num_perm: ハッシュ関数の数（署名の長さ）
+            seed: 係数生成の乱数シード
+        """
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.a = rng.integers(1, MINHASH_PRIME, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, MINHASH_PRIME, size=num_perm, dtype=np.uint64)
+
+    def signature(self, hashes: np.ndarray) -> np.ndarray:
+        """
+        shingleハッシュからMinHash署名を計算
+
+        Args:
+            hashes: shingleのハッシュ値 (m,)
+
+        Returns:
+            np.ndarray: MinHash署名 (num_perm,) uint64（空のテキストは全要素が最大値）
+        """
+        if hashes.size == 0:
+            return np.full(self.num_perm, MINHASH_PRIME, dtype=np.uint64)
+        return ((np.outer(hashes, self.a) + self.b) % MINHASH_PRIME).min(axis=0)
+
+
+def lsh_parameters(num_perm: int, threshold: float) -> tuple[int, int]:
+    """
+    閾値に合わせてLSHのバンド数と1バンドあたりの行数を選択
+
+    候補になる確率が0.5となる類似度 (1/b)^(1/r) が閾値以下で最も近い組み合わせを選び、
+    取りこぼしを抑えます（誤検出は署名の一致率で検証して除外）。
+
+    Args:
+        num_perm: 署名の長さ
+        threshold: 重複とみなすJaccard類似度
+
+    Returns:
+        tuple[int, int]: (バンド数, 1バンドあたりの行数)
+    """
+    best = (num_perm, 1)
+    best_gap = float("inf")
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        midpoint = (1.0 / bands) ** (1.0 / rows)
+        if midpoint <= threshold and threshold - midpoint < best_gap:
+            best, best_gap = (bands, rows), threshold - midpoint
+    return best
+
+
+def find_near_duplicates(
+    signatures: np.ndarray, threshold: float, bands: int, rows: int
+) -> list[int]:
+    """
+    LSHで候補ペアを求め、各チャンクが属するクラスタの代表（最小インデックス）を返す
+
+    Args:
+        signatures: MinHash署名 (n, num_perm)
+        threshold: 重複とみなす推定Jaccard類似度
+        bands: バンド数
+        rows: 1バンドあたりの行数
+
+    Returns:
+        list[int]: 各チャンクのクラスタ代表のインデックス
+    """
+    parent = list(range(len(signatures)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for band in range(bands):
+        buckets: dict[bytes, int] = {}
+        block = np.ascontiguousarray(signatures[:, band * rows : (band + 1) * rows])
+        for i, key in enumerate(block):
+            first = buckets.setdefault(key.tobytes(), i)
+            if first == i:
+                continue
+            root_i, root_first = find(i), find(first)
+            if root_i == root_first:
+                continue
+            # 同じバケットに入った候補ペアは署名の一致率（推定Jaccard）で検証
+            if np.mean(signatures[i] == signatures[first]) >= threshold:
+                parent[max(root_i, root_first)] = min(root_i, root_first)
+
+    return [find(i) for i in range(len(signatures))]
+
+
+def deduplicate_documents(
+    documents: list[Document],
+    threshold: float | None = None,
+    num_perm: int | None = None,
+) -> tuple[list[Document], dict[str, Any]]:
+    """
+    ほぼ重複するチャンクを除去（各クラスタで最初に現れたチャンクを残す）
+
+    split_documentsの後、add_documentsの前に呼び出します。
+
+    Args:
+        documents: 分割済みのチャンク
+        threshold: 重複とみなすJaccard類似度（デフォルトは設定から取得）
+        num_perm: MinHash署名の長さ（デフォルトは設定から取得）
+
+    Returns:
+        tuple[list[Document], dict]: (残したチャンク, 統計情報)
+            統計情報: input_count, kept_count, removed_count, duplicate_clusters,
+            threshold, bands, rows, elapsed_seconds
+    """
+    threshold = threshold if threshold is not None else settings.ingest_dedup_threshold
+    num_perm = num_perm or settings.ingest_dedup_num_perm
+    bands, rows = lsh_parameters(num_perm, threshold)
+    start_time = time.time()
+
+    hasher = MinHasher(num_perm)
+    signatures = np.empty((len(documents), num_perm), dtype=np.uint64)
+    for i, doc in enumerate(documents):
+        signatures[i] = hasher.signature(shingle_hashes(doc.page_content))
+
+    representatives = find_near_duplicates(signatures, threshold, bands, rows)
+    kept = [doc for i, doc in enumerate(documents) if representatives[i] == i]
+    clusters = {root for i, root in enumerate(representatives) if root != i}
+
+    stats = {
+        "input_count": len(documents),
+        "kept_count": len(kept),
+        "removed_count": len(documents) - len(kept),
+        "duplicate_clusters": len(clusters),
+        "threshold": threshold,
+        "bands": bands,
+        "rows": rows,
+        "elapsed_seconds": time.time() - start_time,
+    }
+    logger.info(
+        f"Removed {stats['removed_count']} near-duplicate chunks in {len(clusters)} clusters "
+        f"({len(documents)} -> {len(kept)}) in {stats['elapsed_seconds']:.2f}s"
+    )
+    return kept, stats
@@ -0,0 +1,231 @@
+"""
+LangGraph Catalyst - Embedding Dimension Migration
+
+埋め込みの次元数を変更するための移行モジュール。
+保存済みのチャンク本文・ベクトルから移行先コレクションを構築するため、再クロールは不要です。
+
+- truncate: 保存済みベクトルの先頭d次元を切り出してL2正規化（埋め込みAPIを呼び出さない）
+- reembed: 保存済みの本文を指定次元で埋め込み直す
+
+text-embedding-3系は先頭の次元ほど情報を多く持つよう学習されているため、
+truncateでも再埋め込みに近い検索品質が得られます。移行後は元の次元の
+インデックスとの再現率（recall@k）で品質を確認します。
+"""
+
+import logging
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from langchain_core.documents import Document
+
+from src.features.rag.snapshot import VectorSnapshot
+from src.features.rag.vectorstore import ChromaVectorStore
+from src.utils.exceptions import VectorStoreError
+
+logger = logging.getLogger(__name__)
+
+# サポートする移行方式
+MIGRATION_METHODS = ("truncate", "reembed")
+
+# 切り詰め・正規化を行う際の行ブロックサイズ
+TRUNCATE_BLOCK_ROWS = 8192
+
+
+def truncate_embeddings(embeddings: Any, dimensions: int) -> np.ndarray:
+    """
+    埋め込みを先頭d次元に切り詰めてL2正規化
+
+    Args:
+        embeddings: 埋め込み行列 (n, dim)
+        dimensions: 切り詰め後の次元数
+
+    Returns:
+        np.ndarray: 切り詰め・正規化した行列 (n, dimensions) float32
+
+    Raises:
+        VectorStoreError: 元の次元数以上を指定した場合
+    """
+    matrix = np.asarray(embeddings)
+    if matrix.size == 0:
+        return np.empty((0, dimensions), dtype=np.float32)
+    if dimensions >= matrix.shape[1]:
+        raise VectorStoreError(
+            f"Cannot truncate {matrix.shape[1]}-dimensional embeddings to {dimensions} dimensions"
+        )
+
+    truncated = np.empty((len(matrix), dimensions), dtype=np.float32)
+    for start in range(0, len(matrix), TRUNCATE_BLOCK_ROWS):
+        block = np.asarray(matrix[start : start + TRUNCATE_BLOCK_ROWS, :dimensions], np.float32)
+        norms = np.linalg.norm(block, axis=1, keepdims=True)
+        truncated[start : start + len(block)] = block / np.where(norms > 0, norms, 1.0)
+    return truncated
+
+
+def migrate_embedding_dimensions(
+    source: ChromaVectorStore,
+    target: ChromaVectorStore,
+    method: str = "truncate",
+    work_directory: str | Path | None = None,
+) -> dict[str, Any]:
+    """
+    元のコレクションから、指定次元の移行先コレクションを構築
+
+    Args:
+        source: 元の次元のベクトルストア
+        target: 移行先のベクトルストア（embedding_dimensionsを設定済みのもの）
+        method: 移行方式（truncate / reembed）
+        work_directory: truncate時に元のスナップショットを書き出すディレクトリ
+            （未指定時は一時ディレクトリを使用し、終了後に削除）
+
+    Returns:
+        dict: 移行結果（method, dimensions, source_dimension, migrated_count,
+            total_documents_in_store, elapsed_seconds, status）
+
+    Raises:
+        VectorStoreError: 不正な移行指定、または移行エラー
+    """
+    if method not in MIGRATION_METHODS:
+        raise VectorStoreError(f"Unsupported migration method: {method}")
+    if not target.embedding_dimensions:
+        raise VectorStoreError("Target store must be configured with embedding_dimensions")
+    if (target.persist_directory, target.collection_name) == (
+        source.persist_directory,
+        source.collection_name,
+    ):
+        raise VectorStoreError("Target collection must differ from the source collection")
+
+    start_time = time.time()
+    logger.info(
+        f"Migrating {source.collection_name} -> {target.collection_name} "
+        f"({method}, {target.embedding_dimensions} dimensions)"
+    )
+
+    if method == "reembed":
+        # 保存済みの本文とメタデータから同じチャンクIDで埋め込み直す（再実行時は未移行分のみ）
+        documents = [
+            Document(page_content=text, metadata=metadata or {})
+            for page in source._iter_collection(["documents", "metadatas"])
+            for text, metadata in zip(page["documents"], page["metadatas"], strict=True)
+        ]
+        source_dimension = source.get_collection_info()["embedding_dimension"]
+        result = target.add_documents_concurrent(documents)
+        migrated = result["added_count"] + result["skipped_unchanged"]
+        total = result["total_documents_in_store"]
+        status = result["status"]
+    else:
+        with tempfile.TemporaryDirectory(prefix="dimension_migration_") as tmp:
+            work = Path(work_directory) if work_directory else Path(tmp)
+            source.export_snapshot(work / "full")
+            snapshot = VectorSnapshot.load(work / "full")
+            source_dimension = snapshot.manifest["dimension"]
+
+            reduced = VectorSnapshot(
+                snapshot.ids,
+                truncate_embeddings(snapshot.embeddings, target.embedding_dimensions),
+                snapshot.documents,
+                snapshot.metadatas,
+                {
+                    **snapshot.manifest,
+                    "collection_name": target.collection_name,
+                    "embedding_dimensions": target.embedding_dimensions,
+                },
+            )
+            reduced.save(work / f"{target.embedding_dimensions}d")
+            result = target.import_snapshot(work / f"{target.embedding_dimensions}d")
+            migrated = result["added_count"]
+            total = result["total_documents_in_store"]
+            status = result["status"]
+
+    summary = {
+        "method": method,
+        "dimensions": target.embedding_dimensions,
+        "source_dimension": source_dimension,
+        "migrated_count": migrated,
+        "total_documents_in_store": total,
+        "elapsed_seconds": time.time() - start_time,
+        "status": status,
+    }
+    logger.info(
+        f"Migrated {migrated} chunks to {target.embedding_dimensions} dimensions "
+        f"in {summary['elapsed_seconds']:.2f}s"
+    )
+    return summary
+
+
+def evaluate_recall(
+    source: ChromaVectorStore,
+    target: ChromaVectorStore,
+    sample_size: int = 200,
+    k: int = 10,
+    seed: int = 0,
+) -> dict[str, Any]:
+    """
+    移行先コレクションの検索結果を元の次元のインデックスと比較
+
+    保存済みチャンクを無作為に選んでクエリとし、元のベクトルで元のコレクションを、
+    移行後のベクトルで移行先コレクションを検索して、上位k件の一致率を求めます
+    （クエリ自身のチャンクは除外）。
+
+    Args:
+        source: 元の次元のベクトルストア
+        target: 移行先のベクトルストア
+        sample_size: クエリに使うチャンク数
+        k: 比較する上位件数
+        seed: サンプリングの乱数シード
+
+    Returns:
+        dict: recall_at_k, k, queries, source_dimension, target_dimension
+    """
+    source_vectors: dict[str, Any] = {}
+    for page in source._iter_collection(["embeddings"]):
+        source_vectors.update(zip(page["ids"], page["embeddings"], strict=True))
+
+    rng = np.random.default_rng(seed)
+    sample = [
+        str(cid)
+        for cid in rng.choice(
+            sorted(source_vectors), min(sample_size, len(source_vectors)), replace=False
+        )
+    ]
+    wanted = set(sample)
+    target_vectors: dict[str, Any] = {}
+    for page in target._iter_collection(["embeddings"]):
+        target_vectors.update(
+            (cid, vector)
+            for cid, vector in zip(page["ids"], page["embeddings"], strict=True)
+            if cid in wanted
+        )
+    sample = [cid for cid in sample if cid in target_vectors]
+    if not sample:
+        return {
+            "recall_at_k": 0.0,
+            "k": k,
+            "queries": 0,
+            "source_dimension": None,
+            "target_dimension": None,
+        }
+
+    full_hits = source._query_by_vectors(
+        np.asarray([source_vectors[cid] for cid in sample], dtype=np.float32).tolist(), k + 1, None
+    )
+    reduced_hits = target._query_by_vectors(
+        np.asarray([target_vectors[cid] for cid in sample], dtype=np.float32).tolist(), k + 1, None
+    )
+
+    recalls = []
+    for cid, full, reduced in zip(sample, full_hits, reduced_hits, strict=True):
+        expected = [doc.id for doc, _ in full if doc.id != cid][:k]
+        actual = [doc.id for doc, _ in reduced if doc.id != cid][:k]
+        if expected:
+            recalls.append(len(set(actual).intersection(expected)) / len(expected))
+
+    return {
+        "recall_at_k": float(np.mean(recalls)) if recalls else 0.0,
+        "k": k,
+        "queries": len(sample),
+        "source_dimension": len(source_vectors[sample[0]]),
+        "target_dimension": len(target_vectors[sample[0]]),
+    }
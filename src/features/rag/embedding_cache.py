@@ -0,0 +1,405 @@
+"""
+LangGraph Catalyst - Query Embedding Cache
+
+検索クエリの埋め込みベクトルをキャッシュするモジュール。
+インメモリLRUとSQLiteによるディスク永続化の2段構成で、
+同じ質問に対する埋め込みAPI呼び出しを省略します。
+"""
+
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+import unicodedata
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from langchain_core.embeddings import Embeddings
+
+from src.features.rag.embedding_store import EmbeddingStore
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_query(text: str) -> str:
+    """
+    キャッシュキー用にクエリを正規化
+
+    NFKC正規化（全角英数・半角カナの統一）と空白の畳み込みを行います。
+
+    Args:
+        text: 元のクエリ
+
+    Returns:
+        str: 正規化されたクエリ
+    """
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+class QueryEmbeddingCache:
+    """クエリ埋め込みの2段キャッシュ（メモリLRU + ディスク）"""
+
+    def __init__(
+        self,
+        model_name: str,
+        max_size: int = 1024,
+        persist_path: str | Path | None = None,
+    ):
+        """
+        初期化
+
+        Args:
+            model_name: 埋め込みモデル名（キャッシュキーの名前空間）
+            max_size: メモリ上に保持する最大エントリ数
+            persist_path: ディスクキャッシュ（SQLite）のパス。Noneの場合はメモリのみ
+        """
+        self.model_name = model_name
+        self.max_size = max_size
+        self.persist_path = Path(persist_path) if persist_path else None
+
+        self._memory: OrderedDict[str, list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _key(self, query: str) -> str:
+        """モデル名と正規化済みクエリからキーを生成"""
+        normalized = normalize_query(query)
+        return hashlib.sha256(f"{self.model_name}\n{normalized}".encode()).hexdigest()
+
+    def _connection(self) -> sqlite3.Connection | None:
+        """ディスクキャッシュの接続を取得（初回アクセス時に作成）"""
+        if self.persist_path is None:
+            return None
+
+        if self._conn is None:
+            try:
+                self.persist_path.parent.mkdir(parents=True, exist_ok=True)
+                self._conn = sqlite3.connect(str(self.persist_path), check_same_thread=False)
+                self._conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS query_embeddings (
+                        key TEXT PRIMARY KEY,
+                        model TEXT NOT NULL,
+                        embedding BLOB NOT NULL,
+                        created_at REAL NOT NULL
+                    )
+                    """
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                # ディスクキャッシュが使えなくてもメモリキャッシュで継続
+                logger.warning(f"Disabling on-disk query embedding cache: {e}")
+                self.persist_path = None
+                self._conn = None
+
+        return self._conn
+
+    @property
+    def persistent(self) -> bool:
+        """ディスクキャッシュを使用しているか"""
+        return self.persist_path is not None
+
+    def get(self, query: str) -> list[float] | None:
+        """
+        キャッシュから埋め込みを取得（メモリ→ディスクの順）
+
+        Args:
+            query: 検索クエリ
+
+        Returns:
+            埋め込みベクトル、存在しない場合はNone
+        """
+        embedding = self.get_from_memory(query)
+        if embedding is not None:
+            return embedding
+        return self.get_from_disk(query)
+
+    def get_from_memory(self, query: str) -> list[float] | None:
+        """
+        メモリLRUのみから埋め込みを取得（I/Oを行わないためイベントループ上で呼び出せる）
+
+        Args:
+            query: 検索クエリ
+
+        Returns:
+            埋め込みベクトル、メモリにない場合はNone（ミスとしては数えない）
+        """
+        key = self._key(query)
+
+        with self._lock:
+            embedding = self._memory.get(key)
+            if embedding is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+            return embedding
+
+    def get_from_disk(self, query: str) -> list[float] | None:
+        """
+        ディスクキャッシュから埋め込みを取得し、見つかればメモリLRUにも載せる
+
+        Args:
+            query: 検索クエリ
+
+        Returns:
+            埋め込みベクトル、存在しない場合はNone
+        """
+        key = self._key(query)
+
+        with self._lock:
+            conn = self._connection()
+            if conn is not None:
+                try:
+                    row = conn.execute(
+                        "SELECT embedding FROM query_embeddings WHERE key = ?", (key,)
+                    ).fetchone()
+                except sqlite3.Error as e:
+                    logger.warning(f"Failed to read query embedding cache: {e}")
+                    row = None
+
+                if row is not None:
+                    embedding = array("f", row[0]).tolist()
+                    self._remember(key, embedding)
+                    self.disk_hits += 1
+                    return embedding
+
+            self.misses += 1
+            return None
+
+    def set(self, query: str, embedding: list[float]) -> None:
+        """
+        埋め込みをキャッシュに保存（メモリとディスク）
+
+        Args:
+            query: 検索クエリ
+            embedding: 埋め込みベクトル
+        """
+        self.set_in_memory(query, embedding)
+        self.set_on_disk(query, embedding)
+
+    def set_in_memory(self, query: str, embedding: list[float]) -> None:
+        """
+        埋め込みをメモリLRUのみに保存
+
+        Args:
+            query: 検索クエリ
+            embedding: 埋め込みベクトル
+        """
+        key = self._key(query)
+        with self._lock:
+            self._remember(key, list(embedding))
+
+    def set_on_disk(self, query: str, embedding: list[float]) -> None:
+        """
+        埋め込みをディスクキャッシュのみに保存（ディスクキャッシュがない場合は何もしない）
+
+        Args:
+            query: 検索クエリ
+            embedding: 埋め込みベクトル
+        """
+        key = self._key(query)
+
+        with self._lock:
+            conn = self._connection()
+            if conn is not None:
+                try:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO query_embeddings VALUES (?, ?, ?, ?)",
+                        (key, self.model_name, array("f", embedding).tobytes(), time.time()),
+                    )
+                    conn.commit()
+                except sqlite3.Error as e:
+                    logger.warning(f"Failed to write query embedding cache: {e}")
+
+    def preload(self, limit: int) -> list[list[float]]:
+        """
+        ディスクキャッシュの新しいエントリをメモリLRUに読み込む（起動時のウォームアップ用）
+
+        Args:
+            limit: 読み込む最大エントリ数
+
+        Returns:
+            list[list[float]]: 読み込んだ埋め込みベクトル（新しい順）
+        """
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return []
+            try:
+                rows = conn.execute(
+                    "SELECT key, embedding FROM query_embeddings WHERE model = ? "
+                    "ORDER BY created_at DESC LIMIT ?",
+                    (self.model_name, min(limit, self.max_size)),
+                ).fetchall()
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to preload query embedding cache: {e}")
+                return []
+
+            embeddings = []
+            # 古い順に追加し、最も新しいエントリがLRUの末尾に来るようにする
+            for key, blob in reversed(rows):
+                embedding = array("f", blob).tolist()
+                self._remember(key, embedding)
+                embeddings.append(embedding)
+            return embeddings[::-1]
+
+    def _remember(self, key: str, embedding: list[float]) -> None:
+        """メモリLRUに追加（上限を超えたら最も古いエントリを削除）"""
+        self._memory[key] = embedding
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
+
+    def stats(self) -> dict[str, Any]:
+        """
+        キャッシュの統計情報を取得
+
+        Returns:
+            dict: ヒット/ミス数とヒット率
+        """
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_ratio": hits / lookups if lookups else 0.0,
+            "memory_entries": len(self._memory),
+        }
+
+    def clear(self) -> None:
+        """メモリ・ディスク両方のキャッシュをクリア"""
+        with self._lock:
+            self._memory.clear()
+            conn = self._connection()
+            if conn is not None:
+                conn.execute("DELETE FROM query_embeddings")
+                conn.commit()
+
+    def close(self) -> None:
+        """ディスクキャッシュの接続を閉じる"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class CachedEmbeddings(Embeddings):
+    """クエリ埋め込みをキャッシュするEmbeddingsラッパー"""
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        cache: QueryEmbeddingCache,
+        document_store: EmbeddingStore | None = None,
+    ):
+        """
+        初期化
+
+        Args:
+            embeddings: ラップする埋め込みモデル
+            cache: クエリ埋め込みキャッシュ
+            document_store: ドキュメント埋め込みの内容アドレスストア（Noneの場合は毎回埋め込む）
+        """
+        self.embeddings = embeddings
+        self.cache = cache
+        self.document_store = document_store
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        """
+        ドキュメントの埋め込み（内容アドレスストアにない本文のみ埋め込みAPIを呼び出す）
+
+        名前空間はクエリキャッシュと同じ（モデル名@次元数）です。
+
+        Args:
+            texts: チャンク本文のリスト
+
+        Returns:
+            list[list[float]]: 入力順の埋め込みベクトル
+        """
+        if self.document_store is None:
+            return self.embeddings.embed_documents(texts)
+
+        namespace = self.cache.model_name
+        embeddings = self.document_store.get_many(namespace, texts)
+
+        missing: dict[str, list[int]] = {}
+        for i, (text, embedding) in enumerate(zip(texts, embeddings, strict=True)):
+            if embedding is None:
+                missing.setdefault(text, []).append(i)
+
+        if missing:
+            computed = self.embeddings.embed_documents(list(missing))
+            self.document_store.put_many(namespace, list(missing), computed)
+            for positions, embedding in zip(missing.values(), computed, strict=True):
+                for i in positions:
+                    embeddings[i] = embedding
+
+        return embeddings
+
+    def embed_query(self, text: str) -> list[float]:
+        """クエリの埋め込み（キャッシュ経由）"""
+        embedding = self.cache.get(text)
+        if embedding is None:
+            embedding = self.embeddings.embed_query(normalize_query(text))
+            self.cache.set(text, embedding)
+        return embedding
+
+    async def aembed_query(self, text: str) -> list[float]:
+        """
+        クエリの非同期埋め込み（キャッシュ経由、ミス時は非同期クライアントを使用）
+
+        イベントループ上ではメモリLRUのみを参照し、ディスクキャッシュ（SQLite）の
+        読み書きはスレッドで行うため、他のリクエストの処理を止めません。
+        """
+        embedding = self.cache.get_from_memory(text)
+        if embedding is not None:
+            return embedding
+
+        if self.cache.persistent:
+            embedding = await asyncio.to_thread(self.cache.get_from_disk, text)
+        else:
+            embedding = self.cache.get_from_disk(text)
+        if embedding is not None:
+            return embedding
+
+        embedding = await self.embeddings.aembed_query(normalize_query(text))
+        self.cache.set_in_memory(text, embedding)
+        if self.cache.persistent:
+            await asyncio.to_thread(self.cache.set_on_disk, text, embedding)
+        return embedding
+
+    def embed_queries(self, texts: list[str]) -> list[list[float]]:
+        """
+        複数クエリをまとめて埋め込み（キャッシュ経由）
+
+        キャッシュにないクエリだけを重複排除し、1回の埋め込みAPI呼び出しで取得します。
+
+        Args:
+            texts: クエリのリスト
+
+        Returns:
+            list[list[float]]: 入力順の埋め込みベクトル
+        """
+        embeddings: list[list[float] | None] = [self.cache.get(text) for text in texts]
+
+        missing: dict[str, list[int]] = {}
+        for i, (text, embedding) in enumerate(zip(texts, embeddings, strict=True)):
+            if embedding is None:
+                missing.setdefault(normalize_query(text), []).append(i)
+
+        if missing:
+            computed = self.embeddings.embed_documents(list(missing))
+            for (normalized, positions), embedding in zip(missing.items(), computed, strict=True):
+                self.cache.set(normalized, embedding)
+                for i in positions:
+                    embeddings[i] = embedding
+
+        return embeddings
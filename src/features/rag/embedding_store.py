@@ -0,0 +1,201 @@
+"""
+LangGraph Catalyst - Content-Addressed Embedding Store
+
+チャンク本文の埋め込みを内容アドレスで保存するモジュール。
+キーは (埋め込みの名前空間 = モデル名@次元数, sha256(本文)) で、コレクションや
+インジェストをまたいで共有します。再クロール・--recreate・チャンク設定の実験などで
+同じ本文を再度埋め込む場合は保存済みのベクトルを使い、未知の本文だけ埋め込みAPIを呼び出します。
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from array import array
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# SQLiteのIN句に渡すキーの最大数（SQLITE_MAX_VARIABLE_NUMBERの既定値未満）
+LOOKUP_BATCH_SIZE = 500
+
+
+def text_hash(text: str) -> str:
+    """本文のSHA-256ハッシュ（チャンクメタデータのcontent_hashと同じ値）"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingStore:
+    """本文ハッシュをキーとするドキュメント埋め込みのストア（SQLite）"""
+
+    def __init__(self, path: str | Path):
+        """
+        初期化
+
+        Args:
+            path: SQLiteファイルのパス
+        """
+        self.path = Path(path)
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        """SQLite接続を取得（初回アクセス時に作成）"""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS document_embeddings (
+                    namespace TEXT NOT NULL,
+                    text_hash TEXT NOT NULL,
+                    embedding BLOB NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (namespace, text_hash)
+                )
+                """
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get_many(self, namespace: str, texts: list[str]) -> list[list[float] | None]:
+        """
+        保存済みの埋め込みを取得
+
+        Args:
+            namespace: 埋め込みの名前空間（モデル名@次元数）
+            texts: チャンク本文
+
+        Returns:
+            list: 入力順の埋め込み（保存されていない本文はNone）
+        """
+        hashes = [text_hash(text) for text in texts]
+        found: dict[str, list[float]] = {}
+
+        with self._lock:
+            try:
+                conn = self._connection()
+                unique = list(dict.fromkeys(hashes))
+                for i in range(0, len(unique), LOOKUP_BATCH_SIZE):
+                    batch = unique[i : i + LOOKUP_BATCH_SIZE]
+                    rows = conn.execute(
+                        "SELECT text_hash, embedding FROM document_embeddings "
+                        f"WHERE namespace = ? AND text_hash IN ({','.join('?' * len(batch))})",
+                        (namespace, *batch),
+                    ).fetchall()
+                    found.update((key, array("f", blob).tolist()) for key, blob in rows)
+            except sqlite3.Error as e:
+                # 読み込めなくても埋め込みAPIで継続
+                logger.warning(f"Failed to read embedding store: {e}")
+
+            embeddings = [found.get(key) for key in hashes]
+            hit_count = sum(embedding is not None for embedding in embeddings)
+            self.hits += hit_count
+            self.misses += len(embeddings) - hit_count
+            return embeddings
+
+    def put_many(self, namespace: str, texts: list[str], embeddings: list[list[float]]) -> None:
+        """
+        埋め込みを保存
+
+        Args:
+            namespace: 埋め込みの名前空間（モデル名@次元数）
+            texts: チャンク本文
+            embeddings: 本文と同じ順の埋め込み
+        """
+        now = time.time()
+        rows = [
+            (namespace, text_hash(text), array("f", embedding).tobytes(), now)
+            for text, embedding in zip(texts, embeddings, strict=True)
+        ]
+
+        with self._lock:
+            try:
+                conn = self._connection()
+                conn.executemany(
+                    "INSERT OR REPLACE INTO document_embeddings VALUES (?, ?, ?, ?)", rows
+                )
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to write embedding store: {e}")
+
+    def gc(self, live_hashes: Iterable[str], dry_run: bool = False) -> dict[str, int]:
+        """
+        どのコレクションからも参照されていない埋め込みを削除
+
+        Args:
+            live_hashes: 現存するチャンク本文のハッシュ（全コレクション分）
+            dry_run: 削除せず件数のみ数えるか
+
+        Returns:
+            dict: total_entries, live_entries, orphaned_entries, deleted_entries
+        """
+        with self._lock:
+            conn = self._connection()
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS live_hashes (text_hash TEXT PRIMARY KEY)")
+            conn.execute("DELETE FROM live_hashes")
+            conn.executemany(
+                "INSERT OR IGNORE INTO live_hashes VALUES (?)", ((key,) for key in live_hashes)
+            )
+
+            total = conn.execute("SELECT COUNT(*) FROM document_embeddings").fetchone()[0]
+            orphaned = conn.execute(
+                "SELECT COUNT(*) FROM document_embeddings "
+                "WHERE text_hash NOT IN (SELECT text_hash FROM live_hashes)"
+            ).fetchone()[0]
+
+            deleted = 0
+            if not dry_run and orphaned:
+                deleted = conn.execute(
+                    "DELETE FROM document_embeddings "
+                    "WHERE text_hash NOT IN (SELECT text_hash FROM live_hashes)"
+                ).rowcount
+            conn.execute("DROP TABLE live_hashes")
+            conn.commit()
+            if deleted:
+                conn.execute("VACUUM")
+
+        logger.info(f"Embedding store GC: {orphaned} orphaned of {total} entries")
+        return {
+            "total_entries": total,
+            "live_entries": total - orphaned,
+            "orphaned_entries": orphaned,
+            "deleted_entries": deleted,
+        }
+
+    def stats(self) -> dict[str, Any]:
+        """
+        ストアの統計情報を取得
+
+        Returns:
+            dict: このプロセスでのヒット/ミス数とヒット率、保存件数
+        """
+        lookups = self.hits + self.misses
+        with self._lock:
+            try:
+                entries = (
+                    self._connection()
+                    .execute("SELECT COUNT(*) FROM document_embeddings")
+                    .fetchone()[0]
+                )
+            except sqlite3.Error:
+                entries = None
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+        }
+
+    def close(self) -> None:
+        """SQLite接続を閉じる"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,296 @@
+"""
+LangGraph Catalyst - Lexical Index
+
+BM25による語彙検索インデックスを提供するモジュール。
+API名（add_conditional_edges, MemorySaver など）をそのまま含むクエリを拾うため、
+英数字は識別子単位、日本語は文字bigramで索引付けし、ベクトル検索の順位と
+Reciprocal Rank Fusion (RRF) で統合します。
+"""
+
+import json
+import logging
+import math
+import re
+import unicodedata
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from langchain_core.documents import Document
+
+from src.features.rag.metadata_filter import MetadataMasks
+from src.utils.helpers import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+# BM25パラメータ
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# RRFの平滑化定数（元論文の推奨値）
+DEFAULT_RRF_K = 60
+
+# 識別子（snake_case / CamelCase / ドット区切りを含まない単語）と数値
+IDENTIFIER_PATTERN = re.compile(r"[A-Za-z_][A-Za-z0-9_]*|[0-9]+")
+
+# 識別子をサブワードに分割（MemorySaver -> memory, saver）
+SUBWORD_PATTERN = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+")
+
+# ひらがな・カタカナ・CJK統合漢字の連続
+CJK_PATTERN = re.compile(r"[ぁ-ヿ㐀-䶿一-鿿]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    日英混在テキストをBM25用のトークンに分割
+
+    英数字は識別子全体（小文字化）に加えて、snake_case / CamelCase の構成語も出力します。
+    日本語は分かち書きせず、連続部分を文字bigram（1文字のみの場合はunigram）にします。
+
+    Args:
+        text: 対象テキスト
+
+    Returns:
+        list[str]: トークンのリスト
+    """
+    text = unicodedata.normalize("NFKC", text)
+    tokens: list[str] = []
+
+    for match in IDENTIFIER_PATTERN.finditer(text):
+        word = match.group()
+        tokens.append(word.lower())
+        subwords = [
+            part.lower() for piece in word.split("_") for part in SUBWORD_PATTERN.findall(piece)
+        ]
+        if len(subwords) > 1:
+            tokens.extend(subwords)
+
+    for match in CJK_PATTERN.finditer(text):
+        run = match.group()
+        if len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i : i + 2] for i in range(len(run) - 1))
+
+    return tokens
+
+
+def reciprocal_rank_fusion(
+    rankings: list[list[str]],
+    rrf_k: int = DEFAULT_RRF_K,
+) -> list[tuple[str, float]]:
+    """
+    複数の順位リストをReciprocal Rank Fusionで統合
+
+    score(d) = Σ 1 / (rrf_k + rank(d)) で、スコアの尺度が異なる検索器でも
+    順位だけで統合できます。
+
+    Args:
+        rankings: 検索器ごとのキーの順位リスト（上位から）
+        rrf_k: 平滑化定数
+
+    Returns:
+        list[tuple[str, float]]: (キー, RRFスコア)のリスト（スコアの降順）
+    """
+    scores: dict[str, float] = {}
+    for ranking in rankings:
+        for rank, key in enumerate(ranking, start=1):
+            scores[key] = scores.get(key, 0.0) + 1.0 / (rrf_k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+class LexicalIndex:
+    """BM25転置インデックス"""
+
+    def __init__(
+        self,
+        ids: list[str],
+        documents: list[str],
+        metadatas: list[dict[str, Any]],
+        postings: dict[str, tuple[list[int], list[int]]],
+        doc_lengths: list[int],
+        manifest: dict[str, Any] | None = None,
+    ):
+        """
+        初期化
+
+        Args:
+            ids: チャンクID
+            documents: チャンク本文
+            metadatas: チャンクメタデータ
+            postings: トークン -> (行番号のリスト, 出現回数のリスト)
+            doc_lengths: 行ごとのトークン数
+            manifest: インデックスのマニフェスト
+        """
+        self.ids = ids
+        self.documents = documents
+        self.metadatas = metadatas
+        self.postings = postings
+        self.doc_lengths = doc_lengths
+        self.manifest = manifest or {}
+        self.filters = MetadataMasks(self.metadatas)
+
+        # 検索時は加算だけで済むよう、BM25の重みを事前計算しておく
+        self._weights = self._compute_weights()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _compute_weights(self) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+        """トークンごとに (行番号, BM25重み) の配列を計算"""
+        n_docs = len(self)
+        if n_docs == 0:
+            return {}
+
+        lengths = np.asarray(self.doc_lengths, dtype=np.float32)
+        avg_length = float(lengths.mean()) or 1.0
+        norms = BM25_K1 * (1.0 - BM25_B + BM25_B * lengths / avg_length)
+
+        weights: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        for term, (rows, tfs) in self.postings.items():
+            rows_arr = np.asarray(rows, dtype=np.int32)
+            tf = np.asarray(tfs, dtype=np.float32)
+            df = len(rows)
+            idf = math.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+            weights[term] = (rows_arr, idf * tf * (BM25_K1 + 1.0) / (tf + norms[rows_arr]))
+        return weights
+
+    # ========================================================================
+    # Build / Persist
+    # ========================================================================
+
+    @classmethod
+    def from_records(
+        cls,
+        ids: list[str],
+        documents: list[str],
+        metadatas: list[dict[str, Any]],
+        manifest: dict[str, Any] | None = None,
+    ) -> "LexicalIndex":
+        """
+        レコードからインデックスを作成
+
+        Args:
+            ids: チャンクID
+            documents: チャンク本文
+            metadatas: チャンクメタデータ
+            manifest: マニフェスト
+
+        Returns:
+            LexicalIndex: 作成したインデックス
+        """
+        postings: dict[str, tuple[list[int], list[int]]] = {}
+        doc_lengths: list[int] = []
+
+        for row, text in enumerate(documents):
+            counts = Counter(tokenize(text or ""))
+            doc_lengths.append(sum(counts.values()))
+            for term, tf in counts.items():
+                rows, tfs = postings.setdefault(term, ([], []))
+                rows.append(row)
+                tfs.append(tf)
+
+        return cls(
+            list(ids),
+            list(documents),
+            [dict(m or {}) for m in metadatas],
+            postings,
+            doc_lengths,
+            manifest,
+        )
+
+    def save(self, path: str | Path) -> None:
+        """
+        インデックスをJSONファイルにアトミックに保存
+
+        Args:
+            path: 保存先ファイル
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_json_atomic(
+            path,
+            {
+                "manifest": self.manifest,
+                "ids": self.ids,
+                "documents": self.documents,
+                "metadatas": self.metadatas,
+                "doc_lengths": self.doc_lengths,
+                "postings": self.postings,
+            },
+        )
+
+    @classmethod
+    def load(cls, path: str | Path) -> "LexicalIndex":
+        """
+        保存済みインデックスを読み込む
+
+        Args:
+            path: インデックスファイル
+
+        Returns:
+            LexicalIndex: 読み込んだインデックス
+        """
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(
+            data["ids"],
+            data["documents"],
+            data["metadatas"],
+            {term: (rows, tfs) for term, (rows, tfs) in data["postings"].items()},
+            data["doc_lengths"],
+            data.get("manifest"),
+        )
+
+    # ========================================================================
+    # Search
+    # ========================================================================
+
+    def search(
+        self,
+        query: str,
+        k: int = 5,
+        where: dict[str, Any] | None = None,
+    ) -> list[tuple[int, float]]:
+        """
+        BM25スコアの上位k件を取得
+
+        Args:
+            query: 検索クエリ
+            k: 取得件数
+            where: メタデータフィルタ（Chroma互換）
+
+        Returns:
+            list[tuple[int, float]]: (行番号, BM25スコア)のリスト（スコアの降順）
+                クエリのトークンを1つも含まない行は返しません。
+        """
+        if len(self) == 0 or k <= 0:
+            return []
+
+        scores = np.zeros(len(self), dtype=np.float32)
+        for term in set(tokenize(query)):
+            posting = self._weights.get(term)
+            if posting is not None:
+                rows, weights = posting
+                scores[rows] += weights
+
+        if where:
+            scores[~self.filters.build_mask(where)] = 0.0
+
+        candidates = np.flatnonzero(scores > 0.0)
+        if candidates.size == 0:
+            return []
+
+        k = min(k, candidates.size)
+        top = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(int(row), float(scores[row])) for row in top]
+
+    def document(self, row: int) -> Document:
+        """行番号からDocumentを復元"""
+        return Document(
+            id=self.ids[row],
+            page_content=self.documents[row],
+            metadata=dict(self.metadatas[row]),
+        )
@@ -0,0 +1,127 @@
+"""
+LangGraph Catalyst - Metadata Filter
+
+Chroma互換のwhere句をNumPyのブールマスクに変換するモジュール。
+NumPy厳密検索バックエンドと語彙インデックスで共有します。
+"""
+
+from typing import Any
+
+import numpy as np
+
+from src.utils.exceptions import VectorStoreError
+
+# 事前にマスクを計算するメタデータフィールドの最大カーディナリティ
+MASK_MAX_CARDINALITY = 256
+
+
+class MetadataMasks:
+    """メタデータ値ごとのブールマスクを保持し、where句を評価するクラス"""
+
+    def __init__(self, metadatas: list[dict[str, Any]]):
+        """
+        初期化
+
+        Args:
+            metadatas: 行ごとのメタデータ
+        """
+        self.metadatas = metadatas
+        self._masks: dict[tuple[str, Any], np.ndarray] = {}
+        self._precompute_masks()
+
+    def __len__(self) -> int:
+        return len(self.metadatas)
+
+    def _precompute_masks(self) -> None:
+        """低カーディナリティのメタデータ値ごとのブールマスクを事前計算"""
+        values_by_field: dict[str, dict[Any, list[int]]] = {}
+        for row, metadata in enumerate(self.metadatas):
+            for field, value in metadata.items():
+                if isinstance(value, str | int | float | bool):
+                    values_by_field.setdefault(field, {}).setdefault(value, []).append(row)
+
+        for field, rows_by_value in values_by_field.items():
+            if len(rows_by_value) > MASK_MAX_CARDINALITY:
+                continue
+            for value, rows in rows_by_value.items():
+                mask = np.zeros(len(self), dtype=bool)
+                mask[rows] = True
+                self._masks[(field, value)] = mask
+
+    def _eq_mask(self, field: str, value: Any) -> np.ndarray:
+        """field == value のマスク（事前計算がなければ計算してキャッシュ）"""
+        key = (field, value)
+        mask = self._masks.get(key)
+        if mask is None:
+            mask = np.fromiter(
+                (m.get(field) == value for m in self.metadatas), dtype=bool, count=len(self)
+            )
+            self._masks[key] = mask
+        return mask
+
+    def _compare_mask(self, field: str, op: str, value: Any) -> np.ndarray:
+        """数値比較演算子のマスク"""
+        column = np.array(
+            [
+                m.get(field, np.nan) if isinstance(m.get(field), int | float) else np.nan
+                for m in self.metadatas
+            ],
+            dtype=np.float64,
+        )
+        with np.errstate(invalid="ignore"):
+            if op == "$gt":
+                return column > value
+            if op == "$gte":
+                return column >= value
+            if op == "$lt":
+                return column < value
+            return column <= value
+
+    def build_mask(self, where: dict[str, Any]) -> np.ndarray:
+        """
+        Chroma互換のwhere句をブールマスクに変換
+
+        対応演算子: 等価（省略形）, $eq, $ne, $in, $nin, $gt, $gte, $lt, $lte, $and, $or
+
+        Args:
+            where: メタデータフィルタ
+
+        Returns:
+            np.ndarray: 条件を満たす行のマスク
+
+        Raises:
+            VectorStoreError: 未対応の演算子
+        """
+        mask = np.ones(len(self), dtype=bool)
+
+        for field, condition in where.items():
+            if field == "$and":
+                for clause in condition:
+                    mask &= self.build_mask(clause)
+            elif field == "$or":
+                any_mask = np.zeros(len(self), dtype=bool)
+                for clause in condition:
+                    any_mask |= self.build_mask(clause)
+                mask &= any_mask
+            elif isinstance(condition, dict):
+                for op, value in condition.items():
+                    mask &= self._operator_mask(field, op, value)
+            else:
+                mask &= self._eq_mask(field, condition)
+
+        return mask
+
+    def _operator_mask(self, field: str, op: str, value: Any) -> np.ndarray:
+        """単一フィールドの演算子をマスクに変換"""
+        if op == "$eq":
+            return self._eq_mask(field, value)
+        if op == "$ne":
+            return ~self._eq_mask(field, value)
+        if op in ("$in", "$nin"):
+            mask = np.zeros(len(self), dtype=bool)
+            for item in value:
+                mask |= self._eq_mask(field, item)
+            return mask if op == "$in" else ~mask
+        if op in ("$gt", "$gte", "$lt", "$lte"):
+            return self._compare_mask(field, op, value)
+        raise VectorStoreError(f"Unsupported filter operator: {op}")
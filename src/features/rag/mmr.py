@@ -0,0 +1,63 @@
+"""
+LangGraph Catalyst - Maximal Marginal Relevance
+
+検索候補を多様化するMMR（Maximal Marginal Relevance）選択のモジュール。
+同じページから分割された重複気味のチャンクが上位を占めないよう、
+クエリとの類似度と選択済みチャンクとの類似度のバランスで順に選びます。
+"""
+
+import numpy as np
+
+
+def maximal_marginal_relevance(
+    query: list[float] | np.ndarray,
+    candidates: list[list[float]] | np.ndarray,
+    k: int,
+    lambda_mult: float = 0.5,
+    norms: np.ndarray | None = None,
+) -> list[int]:
+    """
+    MMRで候補から多様なk件を選択
+
+    候補を事前計算したノルムで一度だけ正規化し、選択ごとに1回の行列ベクトル積で
+    「選択済みとの最大コサイン類似度」を更新します（候補数n・次元dに対しO(k·n·d)）。
+
+    Args:
+        query: クエリ埋め込み
+        candidates: 候補の埋め込み行列 (n, dim)
+        k: 選択する件数
+        lambda_mult: 関連度の重み（1.0で類似度順、0.0で多様性のみ）
+        norms: 候補のL2ノルム (n,)。未指定時は計算
+
+    Returns:
+        list[int]: 選択した候補の行番号（選択順）
+    """
+    candidates = np.asarray(candidates, dtype=np.float32)
+    if k <= 0 or candidates.size == 0:
+        return []
+
+    if norms is None:
+        norms = np.sqrt(np.einsum("ij,ij->i", candidates, candidates))
+    unit = candidates / np.where(norms > 0, norms, 1.0)[:, None]
+
+    query = np.asarray(query, dtype=np.float32)
+    query_norm = float(np.linalg.norm(query))
+    relevance = unit @ (query / query_norm if query_norm > 0 else query)
+
+    k = min(k, len(unit))
+    first = int(np.argmax(relevance))
+    selected = [first]
+    # 各候補と選択済みチャンクとの最大類似度
+    redundancy = unit @ unit[first]
+    available = np.ones(len(unit), dtype=bool)
+    available[first] = False
+
+    while len(selected) < k:
+        scores = lambda_mult * relevance - (1.0 - lambda_mult) * redundancy
+        scores[~available] = -np.inf
+        chosen = int(np.argmax(scores))
+        selected.append(chosen)
+        available[chosen] = False
+        np.maximum(redundancy, unit @ unit[chosen], out=redundancy)
+
+    return selected
@@ -0,0 +1,664 @@
+"""
+LangGraph Catalyst - NumPy Exact Search Backend
+
+小規模コーパス向けの厳密ベクトル検索バックエンド。
+全埋め込みを1つのメモリマップ行列に載せ、1回のベクトル化された内積と
+argpartitionで上位k件を求めます。書き込みは従来どおりChromaに行い、
+Chromaの内容からインデックスを構築します。
+量子化を有効にした場合は、int8/バイナリの埋め込みで候補を抽出し、
+上位候補だけをfull-precisionの行列で再スコアリングします。
+"""
+
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from langchain_core.documents import Document
+
+from src.config.settings import settings
+from src.features.rag.metadata_filter import MetadataMasks
+from src.features.rag.quantization import (
+    Quantizer,
+    fit_quantizer,
+    load_quantizer,
+    save_quantizer,
+)
+from src.features.rag.vectorstore import ChromaVectorStore, compute_corpus_version
+from src.utils.exceptions import VectorStoreError
+from src.utils.helpers import atomic_write, file_lock, write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+# float16行列をfloat32に変換しながら内積を取る際の行ブロックサイズ
+SCORE_BLOCK_ROWS = 4096
+
+
+class ExactVectorIndex:
+    """メモリマップされた埋め込み行列による厳密検索インデックス"""
+
+    EMBEDDINGS_FILE = "embeddings.npy"
+    RECORDS_FILE = "records.json"
+    MANIFEST_FILE = "manifest.json"
+    QUANTIZED_FILE = "quantized.npz"
+
+    def __init__(
+        self,
+        matrix: np.ndarray,
+        ids: list[str],
+        documents: list[str],
+        metadatas: list[dict[str, Any]],
+        manifest: dict[str, Any] | None = None,
+        quantizer: Quantizer | None = None,
+        rescore_multiplier: int | None = None,
+    ):
+        """
+        初期化
+
+        Args:
+            matrix: 埋め込み行列 (n, dim)。float32またはfloat16
+            ids: チャンクID
+            documents: チャンク本文
+            metadatas: チャンクメタデータ
+            manifest: インデックスのマニフェスト
+            quantizer: 一次検索用の量子化インデックス（Noneの場合は全件を厳密計算）
+            rescore_multiplier: 再スコアリングする候補数のk倍率
+        """
+        self.matrix = matrix
+        self.ids = ids
+        self.documents = documents
+        self.metadatas = metadatas
+        self.manifest = manifest or {}
+        self.quantizer = quantizer
+        self.rescore_multiplier = rescore_multiplier or settings.numpy_index_rescore_multiplier
+
+        # L2距離計算用の二乗ノルム（常にfloat32で保持）。
+        # 量子化時は行列全体を読み込まないよう、候補行についてのみ計算する
+        self.sq_norms: np.ndarray | None = None
+        if quantizer is None:
+            full = matrix.astype(np.float32, copy=False)
+            self.sq_norms = np.einsum("ij,ij->i", full, full).astype(np.float32)
+
+        self.filters = MetadataMasks(self.metadatas)
+
+    @property
+    def space(self) -> str:
+        """距離空間（l2 / cosine / ip、マニフェストに記録）"""
+        return self.manifest.get("space", "l2")
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def dimension(self) -> int:
+        """埋め込み次元数"""
+        return int(self.matrix.shape[1]) if self.matrix.ndim == 2 else 0
+
+    @property
+    def quantization(self) -> str:
+        """一次検索の量子化方式（none / int8 / binary）"""
+        return self.quantizer.kind if self.quantizer is not None else "none"
+
+    @property
+    def resident_bytes(self) -> int:
+        """検索時にメモリへ常駐させる埋め込みデータのサイズ（バイト）"""
+        if self.quantizer is not None:
+            return self.quantizer.nbytes
+        return int(self.matrix.nbytes + self.sq_norms.nbytes)
+
+    # ========================================================================
+    # Build / Persist
+    # ========================================================================
+
+    @classmethod
+    def from_records(
+        cls,
+        ids: list[str],
+        embeddings: Any,
+        documents: list[str],
+        metadatas: list[dict[str, Any]],
+        dtype: str = "float32",
+        manifest: dict[str, Any] | None = None,
+        quantization: str = "none",
+    ) -> "ExactVectorIndex":
+        """
+        レコードからインデックスを作成
+
+        Args:
+            ids: チャンクID
+            embeddings: 埋め込みベクトル
+            documents: チャンク本文
+            metadatas: チャンクメタデータ
+            dtype: 行列の型（float32 / float16）
+            manifest: マニフェスト
+            quantization: 一次検索の量子化方式（none / int8 / binary）
+
+        Returns:
+            ExactVectorIndex: 作成したインデックス
+
+        Raises:
+            VectorStoreError: 未対応の量子化方式
+        """
+        matrix = np.ascontiguousarray(np.asarray(embeddings, dtype=dtype))
+        if matrix.size == 0:
+            matrix = matrix.reshape(0, 0)
+            quantization = "none"
+        return cls(
+            matrix,
+            list(ids),
+            list(documents),
+            [dict(m or {}) for m in metadatas],
+            manifest,
+            quantizer=fit_quantizer(quantization, matrix),
+        )
+
+    def save(self, directory: str | Path) -> None:
+        """
+        インデックスをディレクトリに保存（各ファイルはアトミックに置き換え）
+
+        ファイルごとの置き換えのため、同じディレクトリを読み書きする他のプロセスとは
+        呼び出し側でロックして排他すること（NumpyVectorStore.refresh_index）。
+
+        Args:
+            directory: 保存先ディレクトリ
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        with atomic_write(directory / self.EMBEDDINGS_FILE, "wb") as f:
+            np.save(f, np.ascontiguousarray(self.matrix))
+
+        write_json_atomic(
+            directory / self.RECORDS_FILE,
+            {"ids": self.ids, "documents": self.documents, "metadatas": self.metadatas},
+        )
+        if self.quantizer is not None:
+            save_quantizer(self.quantizer, directory / self.QUANTIZED_FILE)
+        else:
+            (directory / self.QUANTIZED_FILE).unlink(missing_ok=True)
+        write_json_atomic(
+            directory / self.MANIFEST_FILE, {**self.manifest, "quantization": self.quantization}
+        )
+
+    @classmethod
+    def load(cls, directory: str | Path, mmap: bool = True) -> "ExactVectorIndex":
+        """
+        保存済みインデックスを読み込む
+
+        量子化インデックスがある場合はそれだけをメモリに読み込み、
+        full-precisionの行列はメモリマップのまま再スコアリングに使用します。
+
+        Args:
+            directory: インデックスディレクトリ
+            mmap: 埋め込み行列を読み取り専用でメモリマップするか
+
+        Returns:
+            ExactVectorIndex: 読み込んだインデックス
+
+        Raises:
+            ValueError: 埋め込み行列・レコード・量子化インデックスの件数が一致しない場合
+                （別々のバージョンのファイルを読み込んだ場合）
+        """
+        directory = Path(directory)
+        matrix = np.load(directory / cls.EMBEDDINGS_FILE, mmap_mode="r" if mmap else None)
+        with open(directory / cls.RECORDS_FILE, encoding="utf-8") as f:
+            records = json.load(f)
+        with open(directory / cls.MANIFEST_FILE, encoding="utf-8") as f:
+            manifest = json.load(f)
+
+        quantization = manifest.get("quantization", "none")
+        quantizer = None
+        if quantization != "none":
+            quantizer = load_quantizer(quantization, directory / cls.QUANTIZED_FILE)
+
+        counts = {
+            "embeddings": len(matrix),
+            "ids": len(records["ids"]),
+            "documents": len(records["documents"]),
+            "manifest": manifest.get("count", len(matrix)),
+        }
+        if quantizer is not None:
+            counts["quantized"] = len(quantizer)
+        if len(set(counts.values())) != 1:
+            raise ValueError(f"NumPy index files in {directory} are inconsistent: {counts}")
+
+        return cls(
+            matrix,
+            records["ids"],
+            records["documents"],
+            records["metadatas"],
+            manifest,
+            quantizer=quantizer,
+        )
+
+    @classmethod
+    def read_manifest(cls, directory: str | Path) -> dict[str, Any] | None:
+        """保存済みマニフェストを読み込む（存在しない場合はNone）"""
+        path = Path(directory) / cls.MANIFEST_FILE
+        if not path.exists():
+            return None
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    # ========================================================================
+    # Filtering
+    # ========================================================================
+
+    def build_mask(self, where: dict[str, Any]) -> np.ndarray:
+        """
+        Chroma互換のwhere句をブールマスクに変換
+
+        Args:
+            where: メタデータフィルタ
+
+        Returns:
+            np.ndarray: 条件を満たす行のマスク
+
+        Raises:
+            VectorStoreError: 未対応の演算子
+        """
+        return self.filters.build_mask(where)
+
+    # ========================================================================
+    # Search
+    # ========================================================================
+
+    def _dot(self, rows: np.ndarray | None, queries: np.ndarray) -> np.ndarray:
+        """行列（または指定行）とクエリ行列 (dim, q) の内積をfloat32で計算"""
+        matrix = self.matrix if rows is None else self.matrix[rows]
+        if matrix.dtype == np.float32:
+            return matrix @ queries
+
+        # float16はブロックごとにfloat32へ変換して計算（一時メモリを抑える）
+        scores = np.empty((matrix.shape[0], queries.shape[1]), dtype=np.float32)
+        for start in range(0, matrix.shape[0], SCORE_BLOCK_ROWS):
+            block = matrix[start : start + SCORE_BLOCK_ROWS].astype(np.float32)
+            scores[start : start + SCORE_BLOCK_ROWS] = block @ queries
+        return scores
+
+    def search(
+        self,
+        embedding: list[float] | np.ndarray,
+        k: int = 5,
+        where: dict[str, Any] | None = None,
+    ) -> list[tuple[int, float]]:
+        """
+        上位k件の行番号と距離を取得
+
+        距離はインデックスの距離空間でのChromaと同じ値です（l2: 二乗L2距離、
+        cosine: 1 - コサイン類似度、ip: 1 - 内積）。
+
+        Args:
+            embedding: クエリ埋め込み
+            k: 取得件数
+            where: メタデータフィルタ
+
+        Returns:
+            list[tuple[int, float]]: (行番号, 距離)のリスト（距離の昇順）
+        """
+        return self.search_batch([embedding], k=k, where=where)[0]
+
+    def search_batch(
+        self,
+        embeddings: list[list[float]] | np.ndarray,
+        k: int = 5,
+        where: dict[str, Any] | None = None,
+    ) -> list[list[tuple[int, float]]]:
+        """
+        複数クエリの上位k件を1回の行列積で取得
+
+        Args:
+            embeddings: クエリ埋め込みのリスト
+            k: クエリごとの取得件数
+            where: 全クエリに適用するメタデータフィルタ
+
+        Returns:
+            list[list[tuple[int, float]]]: クエリごとの(行番号, 距離)のリスト
+        """
+        queries = np.asarray(embeddings, dtype=np.float32)
+        if len(self) == 0 or k <= 0 or queries.size == 0:
+            return [[] for _ in range(len(embeddings))]
+
+        rows = None
+        if where:
+            rows = np.flatnonzero(self.build_mask(where))
+            if rows.size == 0:
+                return [[] for _ in range(len(queries))]
+
+        if self.quantizer is not None:
+            return self._search_quantized(rows, queries, k)
+
+        dots = self._dot(rows, queries.T)
+        norms = self.sq_norms if rows is None else self.sq_norms[rows]
+        q_norms = np.einsum("ij,ij->i", queries, queries)
+        distances = self._distances(dots, norms, q_norms)
+
+        k = min(k, distances.shape[0])
+        results = []
+        for column in distances.T:
+            top = np.argpartition(column, k - 1)[:k]
+            top = top[np.argsort(column[top])]
+            positions = top if rows is None else rows[top]
+            results.append(
+                [(int(pos), float(column[i])) for pos, i in zip(positions, top, strict=True)]
+            )
+        return results
+
+    def _distances(self, dots: np.ndarray, sq_norms: np.ndarray, q_norms: np.ndarray) -> np.ndarray:
+        """
+        内積 (n, q) から距離空間に応じた距離を計算（小さいほど類似）
+
+        Args:
+            dots: 行とクエリの内積
+            sq_norms: 行の二乗ノルム (n,)
+            q_norms: クエリの二乗ノルム (q,)
+
+        Returns:
+            np.ndarray: 距離 (n, q)
+        """
+        if self.space == "ip":
+            return 1.0 - dots
+        if self.space == "cosine":
+            denominator = np.sqrt(sq_norms)[:, None] * np.sqrt(q_norms)[None, :]
+            return 1.0 - dots / np.maximum(denominator, np.finfo(np.float32).tiny)
+        return sq_norms[:, None] - 2.0 * dots + q_norms[None, :]
+
+    def _search_quantized(
+        self, rows: np.ndarray | None, queries: np.ndarray, k: int
+    ) -> list[list[tuple[int, float]]]:
+        """量子化インデックスで候補を抽出し、full-precisionの行列で再スコアリング"""
+        approximate = self.quantizer.approximate_distances(rows, queries)
+        n_rows = approximate.shape[0]
+        k = min(k, n_rows)
+        n_candidates = min(n_rows, k * self.rescore_multiplier)
+
+        results = []
+        for query, column in zip(queries, approximate.T, strict=True):
+            candidates = np.argpartition(column, n_candidates - 1)[:n_candidates]
+            positions = candidates if rows is None else rows[candidates]
+            # メモリマップの読み込みが連続するよう行番号順に取り出す
+            positions = np.sort(positions)
+
+            full = np.asarray(self.matrix[positions], dtype=np.float32)
+            distances = self._distances(
+                (full @ query)[:, None],
+                np.einsum("ij,ij->i", full, full),
+                np.array([query @ query], dtype=np.float32),
+            )[:, 0]
+            top = np.argpartition(distances, k - 1)[:k]
+            top = top[np.argsort(distances[top])]
+            results.append([(int(positions[i]), float(distances[i])) for i in top])
+        return results
+
+    def document(self, row: int) -> Document:
+        """行番号からDocumentを復元"""
+        return Document(
+            id=self.ids[row],
+            page_content=self.documents[row],
+            metadata=dict(self.metadatas[row]),
+        )
+
+
+class NumpyVectorStore(ChromaVectorStore):
+    """
+    NumPy厳密検索バックエンド
+
+    書き込み・削除はChromaに委譲し、検索はメモリマップした埋め込み行列で行います。
+    インデックスはChromaの内容（コーパスバージョン）や距離空間が変わった場合に再構築されます。
+    """
+
+    def __init__(
+        self,
+        collection_name: str | None = None,
+        persist_directory: str | None = None,
+        embedding_model: str | None = None,
+        embedding_dimensions: int | None = None,
+        dtype: str | None = None,
+        quantization: str | None = None,
+    ):
+        """
+        NumpyVectorStoreの初期化
+
+        Args:
+            collection_name: コレクション名。未指定時は設定値
+            persist_directory: 永続化ディレクトリ
+            embedding_model: 埋め込みモデル名
+            embedding_dimensions: 埋め込みの次元数。未指定時は設定値
+            dtype: 埋め込み行列の型（float32 / float16）
+            quantization: 一次検索の量子化方式（none / int8 / binary）
+
+        Raises:
+            VectorStoreError: 初期化エラー
+        """
+        super().__init__(
+            collection_name=collection_name,
+            persist_directory=persist_directory,
+            embedding_model=embedding_model,
+            embedding_dimensions=embedding_dimensions,
+        )
+        self.dtype = dtype or settings.numpy_index_dtype
+        self.quantization = quantization or settings.numpy_index_quantization
+        # 検索結果の順位と距離をChromaのHNSW設定（chroma_hnsw_space）に合わせる
+        self.space = self.hnsw_config["space"]
+        # Chromaディレクトリの中ではなく隣に配置（字句インデックスと同じ）
+        self.index_directory = (
+            Path(self.persist_directory).parent / "numpy_index" / self.collection_name
+        )
+        self.index: ExactVectorIndex | None = None
+
+        try:
+            self.refresh_index()
+        except Exception as e:
+            raise VectorStoreError(f"Failed to build NumPy index: {e}") from e
+
+    def refresh_index(self, force: bool = False) -> bool:
+        """
+        必要に応じてインデックスを（再）構築して読み込む
+
+        Args:
+            force: コーパスが変わっていなくても再構築するか
+
+        Returns:
+            bool: 再構築した場合True
+        """
+        ids = self.vector_store.get(include=[])["ids"]
+        corpus_version = compute_corpus_version(ids)
+
+        if (
+            not force
+            and self.index is not None
+            and self._is_current(self.index.manifest, corpus_version)
+        ):
+            return False
+
+        # 同じディレクトリを使う他のワーカーと再構築・読み込みが重ならないようにする
+        # （書き込み途中の別バージョンのファイルを組み合わせて読み込まない）
+        with file_lock(self.index_directory.with_name(f"{self.index_directory.name}.lock")):
+            manifest = ExactVectorIndex.read_manifest(self.index_directory)
+            if not force and self._is_current(manifest, corpus_version):
+                # ロック待ちの間に他のワーカーが再構築した場合はそれを使う
+                self.index = ExactVectorIndex.load(self.index_directory)
+                logger.info(f"Loaded NumPy index with {len(self.index)} vectors")
+                return False
+
+            self._build_index(corpus_version, ids).save(self.index_directory)
+            # 保存したファイルをメモリマップで開き直す
+            self.index = ExactVectorIndex.load(self.index_directory)
+            return True
+
+    def _is_current(self, manifest: dict[str, Any] | None, corpus_version: str) -> bool:
+        """マニフェストが現在のコーパス・型・量子化方式・距離空間のインデックスか"""
+        return (
+            manifest is not None
+            and manifest.get("corpus_version") == corpus_version
+            and manifest.get("dtype") == self.dtype
+            and manifest.get("quantization", "none") == self.quantization
+            and manifest.get("space", "l2") == self.space
+        )
+
+    def _build_index(self, corpus_version: str, ids: list[str]) -> ExactVectorIndex:
+        """
+        Chromaの内容からインデックスを作成（保存はしない）
+
+        Args:
+            corpus_version: 現在のコーパスバージョン
+            ids: 現在のチャンクID（ログ用）
+
+        Returns:
+            ExactVectorIndex: 作成したインデックス
+        """
+        logger.info(
+            f"Building NumPy index for {len(ids)} vectors "
+            f"(dtype={self.dtype}, quantization={self.quantization})"
+        )
+
+        ids_all: list[str] = []
+        embeddings: list[Any] = []
+        documents: list[str] = []
+        metadatas: list[dict[str, Any]] = []
+        for page in self._iter_collection(["embeddings", "documents", "metadatas"]):
+            ids_all.extend(page["ids"])
+            embeddings.extend(page["embeddings"])
+            documents.extend(page["documents"])
+            metadatas.extend(page["metadatas"])
+
+        return ExactVectorIndex.from_records(
+            ids_all,
+            embeddings,
+            documents,
+            metadatas,
+            dtype=self.dtype,
+            manifest={
+                "collection_name": self.collection_name,
+                "embedding_model": self.embedding_model_name,
+                "corpus_version": corpus_version,
+                "count": len(ids_all),
+                "dtype": self.dtype,
+                "space": self.space,
+                "built_at": datetime.utcnow().isoformat() + "Z",
+            },
+            quantization=self.quantization,
+        )
+
+    def add_documents(self, *args: Any, **kwargs: Any) -> dict[str, Any]:
+        """ドキュメントをChromaに追加し、インデックスを更新"""
+        result = super().add_documents(*args, **kwargs)
+        self.refresh_index()
+        return result
+
+    def add_documents_concurrent(self, *args: Any, **kwargs: Any) -> dict[str, Any]:
+        """ドキュメントを並列にChromaへ追加し、インデックスを更新"""
+        result = super().add_documents_concurrent(*args, **kwargs)
+        self.refresh_index()
+        return result
+
+    def import_snapshot(self, *args: Any, **kwargs: Any) -> dict[str, Any]:
+        """スナップショットをChromaへ一括投入し、インデックスを更新"""
+        result = super().import_snapshot(*args, **kwargs)
+        self.refresh_index()
+        return result
+
+    def similarity_search(
+        self,
+        query: str,
+        k: int = 5,
+        filter_metadata: dict[str, Any] | None = None,
+    ) -> list[Document]:
+        """
+        類似度検索を実行（NumPy厳密検索）
+
+        Args:
+            query: 検索クエリ
+            k: 取得する上位k件
+            filter_metadata: メタデータフィルタ
+
+        Returns:
+            list[Document]: 検索結果のドキュメントリスト
+
+        Raises:
+            VectorStoreError: 検索エラー
+        """
+        return [doc for doc, _ in self.similarity_search_with_score(query, k, filter_metadata)]
+
+    def similarity_search_with_score(
+        self,
+        query: str,
+        k: int = 5,
+        filter_metadata: dict[str, Any] | None = None,
+    ) -> list[tuple[Document, float]]:
+        """
+        スコア付き類似度検索を実行（NumPy厳密検索）
+
+        Args:
+            query: 検索クエリ
+            k: 取得する上位k件
+            filter_metadata: メタデータフィルタ
+
+        Returns:
+            list[tuple[Document, float]]: (ドキュメント, 二乗L2距離)のリスト
+
+        Raises:
+            VectorStoreError: 検索エラー
+        """
+        if not query or not query.strip():
+            logger.warning("Empty query provided")
+            return []
+
+        try:
+            embedding = self.embeddings.embed_query(query)
+            index = self.index
+            hits = index.search(embedding, k=k, where=filter_metadata)
+            logger.info(f"Found {len(hits)} similar documents (NumPy exact search)")
+            return [(index.document(row), distance) for row, distance in hits]
+
+        except Exception as e:
+            raise VectorStoreError(f"Failed to perform similarity search: {e}") from e
+
+    def _query_by_vectors(
+        self,
+        embeddings: list[list[float]],
+        k: int,
+        filter_metadata: dict[str, Any] | None,
+    ) -> list[list[tuple[Document, float]]]:
+        """埋め込み行列をNumPyインデックスで一括検索"""
+        index = self.index
+        return [
+            [(index.document(row), distance) for row, distance in hits]
+            for hits in index.search_batch(embeddings, k=k, where=filter_metadata)
+        ]
+
+    def _query_candidates(
+        self,
+        embedding: list[float],
+        fetch_k: int,
+        filter_metadata: dict[str, Any] | None,
+    ) -> tuple[list[tuple[Document, float]], np.ndarray, np.ndarray]:
+        """MMR用の候補をNumPyインデックスから取得（ノルムはインデックスのキャッシュを使用）"""
+        index = self.index
+        hits = index.search(embedding, k=fetch_k, where=filter_metadata)
+        if not hits:
+            return [], np.empty((0, 0), dtype=np.float32), np.empty(0, dtype=np.float32)
+
+        rows = np.array([row for row, _ in hits], dtype=np.int64)
+        vectors = np.asarray(index.matrix[rows], dtype=np.float32)
+        if index.sq_norms is not None:
+            norms = np.sqrt(index.sq_norms[rows])
+        else:
+            norms = np.sqrt(np.einsum("ij,ij->i", vectors, vectors))
+
+        return [(index.document(row), distance) for row, distance in hits], vectors, norms
+
+    def delete_collection(self) -> bool:
+        """コレクションとNumPyインデックスを削除"""
+        result = super().delete_collection()
+        for name in (
+            ExactVectorIndex.EMBEDDINGS_FILE,
+            ExactVectorIndex.RECORDS_FILE,
+            ExactVectorIndex.MANIFEST_FILE,
+            ExactVectorIndex.QUANTIZED_FILE,
+        ):
+            (self.index_directory / name).unlink(missing_ok=True)
+        self.index = None
+        return result
@@ -0,0 +1,276 @@
+"""
+LangGraph Catalyst - Parent Document Store
+
+検索用の小さなチャンクを、回答生成用のより大きな親セクションに展開するモジュール。
+インジェスト時に元ドキュメントを親セクションに分割してSQLiteに保存し
+（キーはソースURLと元ドキュメント内の開始位置）、検索時はヒットしたチャンクの
+start_indexから親セクションを引いて、重複を除きつつトークン予算内で返します。
+
+チャンクの分割・ID・埋め込みは従来のまま変更しないため、既存のベクトルストアを
+再埋め込みせずに導入できます。
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+from langchain_core.documents import Document
+
+from src.config.settings import settings
+from src.utils.helpers import calculate_token_count, create_text_splitter
+
+logger = logging.getLogger(__name__)
+
+# 親セクションの列（スナップショットの書き出し・復元で使用）
+SECTION_COLUMNS = ("source", "start_index", "content", "metadata", "tokens")
+
+
+class ParentDocumentStore:
+    """親セクションのローカルストア（SQLite、ソースURL + 開始位置をキーとする）"""
+
+    def __init__(self, path: str | Path, parent_chunk_size: int | None = None):
+        """
+        初期化
+
+        Args:
+            path: SQLiteファイルのパス
+            parent_chunk_size: 親セクションの最大文字数（デフォルトは設定から取得）
+        """
+        self.path = Path(path)
+        self.parent_chunk_size = parent_chunk_size or settings.rag_parent_chunk_size
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        """SQLite接続を取得（初回アクセス時に作成）"""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS parent_documents (
+                    source TEXT NOT NULL,
+                    start_index INTEGER NOT NULL,
+                    content TEXT NOT NULL,
+                    metadata TEXT NOT NULL,
+                    tokens INTEGER NOT NULL,
+                    PRIMARY KEY (source, start_index)
+                )
+                """
+            )
+            self._conn.commit()
+        return self._conn
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection().execute("SELECT COUNT(*) FROM parent_documents").fetchone()[0]
+
+    def add_documents(self, documents: list[Document]) -> int:
+        """
+        元ドキュメントを親セクションに分割して保存
+
+        同じソースの既存セクションは置き換えます（再クロール時に古いセクションを残さない）。
+        チャンクのstart_indexと対応させるため、split_documents前のドキュメントを渡してください。
+
+        Args:
+            documents: クロールした元ドキュメント
+
+        Returns:
+            int: 保存した親セクション数
+        """
+        splitter = create_text_splitter(chunk_size=self.parent_chunk_size, chunk_overlap=0)
+        parents = [
+            parent
+            for parent in splitter.split_documents(documents)
+            if parent.metadata.get("source")
+        ]
+        sources = {parent.metadata["source"] for parent in parents}
+
+        rows = [
+            (
+                parent.metadata["source"],
+                parent.metadata["start_index"],
+                parent.page_content,
+                json.dumps(
+                    {k: v for k, v in parent.metadata.items() if k != "start_index"},
+                    ensure_ascii=False,
+                ),
+                calculate_token_count(parent.page_content),
+            )
+            for parent in parents
+        ]
+
+        with self._lock:
+            conn = self._connection()
+            conn.executemany(
+                "DELETE FROM parent_documents WHERE source = ?", [(s,) for s in sources]
+            )
+            conn.executemany("INSERT OR REPLACE INTO parent_documents VALUES (?, ?, ?, ?, ?)", rows)
+            conn.commit()
+
+        logger.info(f"Stored {len(rows)} parent sections for {len(sources)} sources")
+        return len(rows)
+
+    def get_parent(self, source: str, start_index: int) -> tuple[Document, int] | None:
+        """
+        チャンクの開始位置を含む親セクションを取得
+
+        Args:
+            source: ソースURL
+            start_index: 元ドキュメント内のチャンク開始位置
+
+        Returns:
+            tuple[Document, int] | None: (親セクション, トークン数)。見つからない場合はNone
+        """
+        with self._lock:
+            row = (
+                self._connection()
+                .execute(
+                    "SELECT start_index, content, metadata, tokens FROM parent_documents "
+                    "WHERE source = ? AND start_index <= ? ORDER BY start_index DESC LIMIT 1",
+                    (source, start_index),
+                )
+                .fetchone()
+            )
+        if row is None:
+            return None
+
+        parent_start, content, metadata, tokens = row
+        if start_index >= parent_start + len(content):
+            # 親セクション間の空白部分など、どのセクションにも含まれない位置
+            return None
+        document = Document(
+            page_content=content,
+            metadata={**json.loads(metadata), "start_index": parent_start},
+        )
+        return document, tokens
+
+    def expand(self, chunks: Iterable[Document], max_tokens: int | None = None) -> list[Document]:
+        """
+        検索されたチャンクを親セクションに展開（重複除去・トークン予算内）
+
+        チャンクの順位順に親セクションを追加し、同じ親は1回だけ含めます。
+        予算に収まらない親セクションはチャンク自体で代替し、それも収まらなければ除外します。
+        親が見つからないチャンク（親ストア導入前のソースなど）はそのまま使います。
+
+        Args:
+            chunks: 検索結果のチャンク（関連度順）
+            max_tokens: コンテキストのトークン予算（デフォルトは設定から取得）
+
+        Returns:
+            list[Document]: 展開後のドキュメント（関連度順）
+        """
+        budget = max_tokens or settings.rag_parent_context_tokens
+        expanded: list[Document] = []
+        seen: set[tuple[str, int]] = set()
+        used = 0
+
+        for chunk in chunks:
+            source = chunk.metadata.get("source")
+            start_index = chunk.metadata.get("start_index")
+
+            parent = None
+            if source and isinstance(start_index, int):
+                parent = self.get_parent(source, start_index)
+
+            if parent is not None:
+                document, tokens = parent
+                key = (source, document.metadata["start_index"])
+                if key in seen:
+                    continue
+                if used + tokens <= budget:
+                    seen.add(key)
+                    expanded.append(document)
+                    used += tokens
+                    continue
+
+            tokens = calculate_token_count(chunk.page_content)
+            if used + tokens <= budget:
+                expanded.append(chunk)
+                used += tokens
+
+        logger.info(f"Expanded chunks to {len(expanded)} parent sections ({used}/{budget} tokens)")
+        return expanded
+
+    def export_sections(self) -> list[dict[str, Any]]:
+        """
+        全親セクションを取得（スナップショットの書き出し用）
+
+        Returns:
+            list[dict]: source, start_index, content, metadata（JSON文字列）, tokens
+        """
+        with self._lock:
+            rows = (
+                self._connection()
+                .execute(
+                    f"SELECT {', '.join(SECTION_COLUMNS)} FROM parent_documents "
+                    "ORDER BY source, start_index"
+                )
+                .fetchall()
+            )
+        return [dict(zip(SECTION_COLUMNS, row, strict=True)) for row in rows]
+
+    def import_sections(self, sections: list[dict[str, Any]], replace: bool = True) -> int:
+        """
+        書き出した親セクションを保存（スナップショットからの復元用）
+
+        Args:
+            sections: export_sections()の戻り値と同じ形式の親セクション
+            replace: 既存の親セクションをすべて置き換えるか（Falseの場合は同じキーのみ上書き）
+
+        Returns:
+            int: 保存した親セクション数
+        """
+        rows = [tuple(section[column] for column in SECTION_COLUMNS) for section in sections]
+        with self._lock:
+            conn = self._connection()
+            if replace:
+                conn.execute("DELETE FROM parent_documents")
+            conn.executemany("INSERT OR REPLACE INTO parent_documents VALUES (?, ?, ?, ?, ?)", rows)
+            conn.commit()
+
+        logger.info(f"Imported {len(rows)} parent sections")
+        return len(rows)
+
+    def delete_sources(self, sources: Iterable[str]) -> None:
+        """
+        指定ソースの親セクションを削除
+
+        Args:
+            sources: ソースURL
+        """
+        with self._lock:
+            conn = self._connection()
+            conn.executemany(
+                "DELETE FROM parent_documents WHERE source = ?", [(s,) for s in sources]
+            )
+            conn.commit()
+
+    def stats(self) -> dict[str, Any]:
+        """
+        親ストアの統計情報を取得
+
+        Returns:
+            dict: parent_count, source_count, total_tokens
+        """
+        with self._lock:
+            parents, sources, tokens = (
+                self._connection()
+                .execute(
+                    "SELECT COUNT(*), COUNT(DISTINCT source), COALESCE(SUM(tokens), 0) "
+                    "FROM parent_documents"
+                )
+                .fetchone()
+            )
+        return {"parent_count": parents, "source_count": sources, "total_tokens": tokens}
+
+    def close(self) -> None:
+        """SQLite接続を閉じる"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,574 @@
+"""
+LangGraph Catalyst - Partitioned Vector Store
+
+doc_typeごとにChromaコレクションを分割するベクトルストア。
+インジェスト時にチャンクのdoc_typeに応じたパーティションへ書き込み、
+検索時はフィルタが選択するパーティションのみを検索します。
+フィルタがない場合は全パーティションを並列に検索して上位k件をマージします。
+"""
+
+import heapq
+import logging
+import re
+import threading
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from operator import itemgetter
+from typing import Any
+
+import numpy as np
+from langchain_core.documents import Document
+
+from src.config.settings import settings
+from src.features.rag.vectorstore import ChromaVectorStore, compute_corpus_version
+from src.utils.exceptions import VectorStoreError
+
+logger = logging.getLogger(__name__)
+
+# ベースコレクション名とdoc_typeの区切り（例: langgraph_docs__blog）
+PARTITION_SEPARATOR = "__"
+
+# doc_typeを持たないチャンクのパーティション
+DEFAULT_PARTITION = "unknown"
+
+
+def partition_key(doc_type: Any) -> str:
+    """
+    doc_typeをパーティションキー（コレクション名に使える文字列）に変換
+
+    Args:
+        doc_type: メタデータのdoc_type
+
+    Returns:
+        str: パーティションキー
+    """
+    if doc_type is None or doc_type == "":
+        return DEFAULT_PARTITION
+    return re.sub(r"[^A-Za-z0-9_-]", "-", str(doc_type))
+
+
+def route_filter(
+    where: dict[str, Any] | None,
+    partitions: list[str],
+) -> tuple[list[str], dict[str, Any] | None]:
+    """
+    メタデータフィルタから検索対象のパーティションを決定
+
+    トップレベル（または$andの直下）のdoc_type条件（等価, $eq, $in, $ne, $nin）は
+    パーティションの選択に置き換え、残りの条件をパーティション内のwhere句として返します。
+    それ以外の形のフィルタは全パーティションにそのまま適用します。
+
+    Args:
+        where: メタデータフィルタ
+        partitions: 既存のパーティションキー
+
+    Returns:
+        tuple: (検索するパーティションキーのリスト, パーティション内で適用するフィルタ)
+    """
+    if not where:
+        return list(partitions), None
+
+    selected = set(partitions)
+
+    if "$and" in where and len(where) == 1:
+        residual_clauses = []
+        for clause in where["$and"]:
+            keys = _doc_type_selection(clause, partitions)
+            if keys is None:
+                residual_clauses.append(clause)
+            else:
+                selected &= keys
+        residual: dict[str, Any] | None
+        if not residual_clauses:
+            residual = None
+        elif len(residual_clauses) == 1:
+            residual = residual_clauses[0]
+        else:
+            residual = {"$and": residual_clauses}
+        return [key for key in partitions if key in selected], residual
+
+    keys = (
+        _doc_type_selection({"doc_type": where["doc_type"]}, partitions)
+        if "doc_type" in where
+        else None
+    )
+    if keys is None:
+        return list(partitions), where
+
+    residual = {field: condition for field, condition in where.items() if field != "doc_type"}
+    return [key for key in partitions if key in keys], residual or None
+
+
+def _doc_type_selection(clause: dict[str, Any], partitions: list[str]) -> set[str] | None:
+    """{"doc_type": 条件} の形の句をパーティションキーの集合に変換（変換できなければNone）"""
+    if set(clause) != {"doc_type"}:
+        return None
+
+    condition = clause["doc_type"]
+    if not isinstance(condition, dict):
+        return {partition_key(condition)}
+    if len(condition) != 1:
+        return None
+
+    op, value = next(iter(condition.items()))
+    if op == "$eq":
+        return {partition_key(value)}
+    if op == "$in":
+        return {partition_key(v) for v in value}
+    if op == "$ne":
+        return set(partitions) - {partition_key(value)}
+    if op == "$nin":
+        return set(partitions) - {partition_key(v) for v in value}
+    return None
+
+
+class PartitionedVectorStore(ChromaVectorStore):
+    """
+    doc_typeごとのパーティションに分割したベクトルストア
+
+    各パーティションは `<collection_name>__<doc_type>` という名前のChromaコレクションです。
+    埋め込みモデルとクエリ埋め込みキャッシュは全パーティションで共有し、
+    語彙インデックスは全パーティションをまとめて1つ構築します。
+    """
+
+    def __init__(
+        self,
+        collection_name: str | None = None,
+        persist_directory: str | None = None,
+        embedding_model: str | None = None,
+        **kwargs: Any,
+    ):
+        """
+        PartitionedVectorStoreの初期化
+
+        Args:
+            collection_name: ベースコレクション名。未指定時は設定値
+            persist_directory: 永続化ディレクトリ
+            embedding_model: 埋め込みモデル名
+            **kwargs: ChromaVectorStoreに渡す追加引数（埋め込み次元数・HNSWパラメータ）
+
+        Raises:
+            VectorStoreError: 初期化エラー
+        """
+        super().__init__(
+            collection_name=collection_name,
+            persist_directory=persist_directory,
+            embedding_model=embedding_model,
+            **kwargs,
+        )
+        self.partitions: dict[str, ChromaVectorStore] = {}
+        self._partitions_lock = threading.Lock()
+        self._partition_executor: ThreadPoolExecutor | None = None
+
+        try:
+            prefix = f"{self.collection_name}{PARTITION_SEPARATOR}"
+            for collection in self.vector_store._client.list_collections():
+                name = getattr(collection, "name", collection)
+                if name.startswith(prefix):
+                    self._partition(name[len(prefix) :])
+        except Exception as e:
+            raise VectorStoreError(f"Failed to discover partitions: {e}") from e
+
+        unpartitioned = super()._get_collection_count()
+        if unpartitioned:
+            logger.warning(
+                f"Collection '{self.collection_name}' still holds {unpartitioned} unpartitioned chunks; "
+                "re-run ingestion to populate the per-doc_type partitions"
+            )
+
+        logger.info(
+            f"Initialized PartitionedVectorStore with partitions: {sorted(self.partitions)}"
+        )
+
+    def _partition(self, key: str) -> ChromaVectorStore:
+        """パーティションを取得（存在しなければコレクションを作成）"""
+        store = self.partitions.get(key)
+        if store is None:
+            with self._partitions_lock:
+                store = self.partitions.get(key)
+                if store is None:
+                    store = ChromaVectorStore(
+                        collection_name=f"{self.collection_name}{PARTITION_SEPARATOR}{key}",
+                        persist_directory=self.persist_directory,
+                        embedding_model=self.embedding_model_name,
+                        embedding_dimensions=self.embedding_dimensions,
+                        embeddings=self.embeddings,
+                        hnsw_space=self.hnsw_config["space"],
+                        hnsw_m=self.hnsw_config["max_neighbors"],
+                        hnsw_construction_ef=self.hnsw_config["ef_construction"],
+                        hnsw_search_ef=self.hnsw_config["ef_search"],
+                    )
+                    # 語彙インデックスは親で全パーティション分をまとめて構築する
+                    store.lexical_index_enabled = False
+                    self.partitions[key] = store
+        return store
+
+    def _get_partition_executor(self) -> ThreadPoolExecutor:
+        """パーティション並列検索用のスレッドプールを取得"""
+        if self._partition_executor is None:
+            with self._executor_lock:
+                if self._partition_executor is None:
+                    self._partition_executor = ThreadPoolExecutor(
+                        max_workers=settings.vector_search_max_workers,
+                        thread_name_prefix="partition-search",
+                    )
+        return self._partition_executor
+
+    # ========================================================================
+    # Ingestion
+    # ========================================================================
+
+    def add_documents(
+        self,
+        documents: list[Document],
+        batch_size: int = 100,
+        prune_stale: bool = False,
+    ) -> dict[str, Any]:
+        """
+        ドキュメントをdoc_typeごとのパーティションに追加
+
+        Args:
+            documents: 追加するドキュメントのリスト
+            batch_size: バッチ処理サイズ
+            prune_stale: 投入したソースについて、今回含まれなかった古いチャンクを削除するか
+
+        Returns:
+            dict: 追加結果の統計情報（partitionsにパーティションごとの追加数）
+
+        Raises:
+            VectorStoreError: ドキュメント追加エラー
+        """
+        return self._add_partitioned(
+            documents,
+            lambda store, docs: store.add_documents(
+                docs, batch_size=batch_size, prune_stale=prune_stale
+            ),
+        )
+
+    def add_documents_concurrent(self, documents: list[Document], **kwargs: Any) -> dict[str, Any]:
+        """
+        ドキュメントをdoc_typeごとのパーティションに並列埋め込みで追加
+
+        Args:
+            documents: 追加するドキュメントのリスト
+            **kwargs: ChromaVectorStore.add_documents_concurrentの引数
+
+        Returns:
+            dict: 追加結果とスループットの統計情報
+
+        Raises:
+            VectorStoreError: ドキュメント追加エラー
+        """
+        return self._add_partitioned(
+            documents, lambda store, docs: store.add_documents_concurrent(docs, **kwargs)
+        )
+
+    def _add_partitioned(
+        self,
+        documents: list[Document],
+        add: Callable[[ChromaVectorStore, list[Document]], dict[str, Any]],
+    ) -> dict[str, Any]:
+        """doc_typeでグループ化して各パーティションに追加し、結果を集計"""
+        if not documents:
+            return super().add_documents([])
+
+        groups: dict[str, list[Document]] = {}
+        for doc in documents:
+            groups.setdefault(partition_key(doc.metadata.get("doc_type")), []).append(doc)
+
+        logger.info(
+            f"Adding {len(documents)} documents to partitions: "
+            + ", ".join(f"{key}={len(docs)}" for key, docs in sorted(groups.items()))
+        )
+
+        summary: dict[str, Any] = {}
+        partitions: dict[str, int] = {}
+        for key, docs in groups.items():
+            result = add(self._partition(key), docs)
+            partitions[key] = result["added_count"]
+            for field, value in result.items():
+                if isinstance(value, int | float) and not field.endswith("_per_second"):
+                    summary[field] = summary.get(field, 0) + value
+
+        summary["total_documents_in_store"] = self.get_collection_info()["document_count"]
+        summary["status"] = "success" if summary["failed_count"] == 0 else "partial"
+        summary["partitions"] = partitions
+
+        # 比率は合算できないため、合計したヒット/ミス数から求め直す
+        store_lookups = summary.get("embedding_store_hits", 0) + summary.get(
+            "embedding_store_misses", 0
+        )
+        summary["embedding_store_hit_ratio"] = (
+            summary.get("embedding_store_hits", 0) / store_lookups if store_lookups else 0.0
+        )
+
+        elapsed = summary.get("elapsed_seconds")
+        if elapsed:
+            summary["chunks_per_second"] = (
+                summary["added_count"] + summary["failed_count"]
+            ) / elapsed
+            summary["tokens_per_second"] = summary.get("total_tokens", 0) / elapsed
+
+        self._refresh_lexical_index(summary)
+        return summary
+
+    def _iter_collection(self, include: list[str]) -> Iterator[dict[str, Any]]:
+        """全パーティションの内容をページ単位で取得"""
+        for store in list(self.partitions.values()):
+            yield from store._iter_collection(include)
+
+    def _upsert_records(
+        self,
+        ids: list[str],
+        embeddings: np.ndarray,
+        documents: list[str],
+        metadatas: list[dict[str, Any]],
+    ) -> None:
+        """埋め込み済みのレコードをdoc_typeごとのパーティションに書き込む"""
+        groups: dict[str, list[int]] = {}
+        for row, metadata in enumerate(metadatas):
+            groups.setdefault(partition_key(metadata.get("doc_type")), []).append(row)
+
+        for key, rows in groups.items():
+            self._partition(key)._upsert_records(
+                [ids[row] for row in rows],
+                embeddings[rows],
+                [documents[row] for row in rows],
+                [metadatas[row] for row in rows],
+            )
+
+    def _delete_ids(self, ids: list[str]) -> None:
+        """指定したチャンクIDを全パーティションから削除"""
+        for store in list(self.partitions.values()):
+            store._delete_ids(ids)
+
+    # ========================================================================
+    # Search
+    # ========================================================================
+
+    def similarity_search(
+        self,
+        query: str,
+        k: int = 5,
+        filter_metadata: dict[str, Any] | None = None,
+    ) -> list[Document]:
+        """
+        類似度検索を実行（フィルタが選択するパーティションのみ）
+
+        Args:
+            query: 検索クエリ
+            k: 取得する上位k件
+            filter_metadata: メタデータフィルタ
+
+        Returns:
+            list[Document]: 検索結果のドキュメントリスト
+
+        Raises:
+            VectorStoreError: 検索エラー
+        """
+        return [doc for doc, _ in self.similarity_search_with_score(query, k, filter_metadata)]
+
+    def similarity_search_with_score(
+        self,
+        query: str,
+        k: int = 5,
+        filter_metadata: dict[str, Any] | None = None,
+    ) -> list[tuple[Document, float]]:
+        """
+        スコア付き類似度検索を実行（フィルタが選択するパーティションのみ）
+
+        Args:
+            query: 検索クエリ
+            k: 取得する上位k件
+            filter_metadata: メタデータフィルタ
+
+        Returns:
+            list[tuple[Document, float]]: (ドキュメント, 距離)のリスト（距離の昇順）
+
+        Raises:
+            VectorStoreError: 検索エラー
+        """
+        if not query or not query.strip():
+            logger.warning("Empty query provided")
+            return []
+
+        try:
+            embedding = self.embeddings.embed_query(query)
+            results = self._query_by_vectors([embedding], k, filter_metadata)[0]
+            logger.info(f"Found {len(results)} similar documents across partitions")
+            return results
+
+        except Exception as e:
+            raise VectorStoreError(f"Failed to perform similarity search: {e}") from e
+
+    def _query_by_vectors(
+        self,
+        embeddings: list[list[float]],
+        k: int,
+        filter_metadata: dict[str, Any] | None,
+    ) -> list[list[tuple[Document, float]]]:
+        """選択したパーティションを並列に検索し、クエリごとに上位k件をマージ"""
+        keys, where = route_filter(filter_metadata, sorted(self.partitions))
+        if not keys:
+            return [[] for _ in embeddings]
+
+        logger.debug(f"Searching partitions {keys} with filter {where}")
+
+        stores = [self.partitions[key] for key in keys]
+        if len(stores) == 1:
+            per_partition = [stores[0]._query_by_vectors(embeddings, k, where)]
+        else:
+            executor = self._get_partition_executor()
+            futures = [
+                executor.submit(store._query_by_vectors, embeddings, k, where) for store in stores
+            ]
+            per_partition = [future.result() for future in futures]
+
+        return [
+            heapq.nsmallest(
+                k, chain.from_iterable(hits[i] for hits in per_partition), key=itemgetter(1)
+            )
+            for i in range(len(embeddings))
+        ]
+
+    def _probe_embedding(self) -> list[float] | None:
+        """いずれかのパーティションから保存済みの埋め込みを1件取得"""
+        for key in sorted(self.partitions):
+            embedding = self.partitions[key]._probe_embedding()
+            if embedding is not None:
+                return embedding
+        return None
+
+    def _query_candidates(
+        self,
+        embedding: list[float],
+        fetch_k: int,
+        filter_metadata: dict[str, Any] | None,
+    ) -> tuple[list[tuple[Document, float]], np.ndarray, np.ndarray]:
+        """選択したパーティションからMMR用の候補を取得し、距離の小さい順にfetch_k件へ絞る"""
+        keys, where = route_filter(filter_metadata, sorted(self.partitions))
+        stores = [self.partitions[key] for key in keys]
+        if not stores:
+            return [], np.empty((0, 0), dtype=np.float32), np.empty(0, dtype=np.float32)
+
+        executor = self._get_partition_executor()
+        futures = [
+            executor.submit(store._query_candidates, embedding, fetch_k, where) for store in stores
+        ]
+        per_partition = [future.result() for future in futures]
+
+        hits = [hit for partition_hits, _, _ in per_partition for hit in partition_hits]
+        vectors = [v for _, v, _ in per_partition if len(v)]
+        if not vectors:
+            return [], np.empty((0, 0), dtype=np.float32), np.empty(0, dtype=np.float32)
+
+        order = np.argsort([distance for _, distance in hits], kind="stable")[:fetch_k]
+        return (
+            [hits[i] for i in order],
+            np.concatenate(vectors)[order],
+            np.concatenate([norms for _, _, norms in per_partition])[order],
+        )
+
+    # ========================================================================
+    # Collection Management
+    # ========================================================================
+
+    def delete_collection(self) -> bool:
+        """
+        全パーティションとベースコレクションを削除
+
+        Returns:
+            bool: 成功時True
+
+        Raises:
+            VectorStoreError: 削除エラー
+        """
+        with self._partitions_lock:
+            for store in self.partitions.values():
+                store.delete_collection()
+            self.partitions.clear()
+        return super().delete_collection()
+
+    def _get_collection_count(self) -> int:
+        """全パーティションのドキュメント数の合計"""
+        return sum(store._get_collection_count() for store in list(self.partitions.values()))
+
+    def get_collection_info(self) -> dict[str, Any]:
+        """
+        全パーティションの統計情報を集計して取得（各パーティションのキャッシュから）
+
+        Returns:
+            dict: collection_name, document_count, documents_by_type,
+                embedding_dimension, disk_size_bytes, last_ingest_at, partitions
+
+        Raises:
+            VectorStoreError: 統計情報の集計エラー
+        """
+        infos = {key: store.get_collection_info() for key, store in list(self.partitions.items())}
+
+        documents_by_type: dict[str, int] = {}
+        for info in infos.values():
+            for doc_type, count in info["documents_by_type"].items():
+                documents_by_type[doc_type] = documents_by_type.get(doc_type, 0) + count
+
+        dimensions = [i["embedding_dimension"] for i in infos.values() if i["embedding_dimension"]]
+        ingests = [i["last_ingest_at"] for i in infos.values() if i["last_ingest_at"]]
+        return {
+            "collection_name": self.collection_name,
+            "document_count": sum(documents_by_type.values()),
+            "documents_by_type": dict(sorted(documents_by_type.items())),
+            "embedding_dimension": dimensions[0] if dimensions else None,
+            # パーティションは同じ永続化ディレクトリを共有する
+            "disk_size_bytes": max((i["disk_size_bytes"] for i in infos.values()), default=0),
+            "last_ingest_at": max(ingests) if ingests else None,
+            "partitions": {key: info["document_count"] for key, info in sorted(infos.items())},
+        }
+
+    def _record_ingest(self) -> int:
+        """スナップショット投入後に各パーティションの統計を再集計して記録"""
+        for store in list(self.partitions.values()):
+            store._stats = None
+            store._record_ingest()
+        return self.get_collection_info()["document_count"]
+
+    def get_corpus_version(self) -> str:
+        """
+        全パーティションをまとめたコーパスバージョンを取得
+
+        Returns:
+            str: コーパスバージョン
+        """
+        try:
+            return compute_corpus_version(
+                chunk_id for page in self._iter_collection([]) for chunk_id in page["ids"]
+            )
+        except Exception as e:
+            raise VectorStoreError(f"Failed to compute corpus version: {e}") from e
+
+    def _corpus_signature(self) -> tuple[Any, ...]:
+        """全パーティションの統計ファイルの(inode, 更新時刻)"""
+        return tuple(
+            (key, store._corpus_signature()) for key, store in sorted(self.partitions.items())
+        )
+
+    def as_retriever(self, search_kwargs: dict[str, Any] | None = None):
+        """
+        Retrieverとして取得（パーティション構成では未対応）
+
+        Raises:
+            VectorStoreError: 常に送出
+        """
+        raise VectorStoreError(
+            "as_retriever is not supported by the partitioned layout; use similarity_search"
+        )
+
+    def close(self) -> None:
+        """各パーティションのストアとパーティション検索用スレッドプールを含めて解放"""
+        with self._executor_lock:
+            if self._partition_executor is not None:
+                self._partition_executor.shutdown(wait=False)
+                self._partition_executor = None
+        for store in list(self.partitions.values()):
+            store.close()
+        super().close()
@@ -0,0 +1,265 @@
+"""
+LangGraph Catalyst - Embedding Quantization
+
+NumPy厳密検索バックエンドの一次検索（候補抽出）に使う量子化インデックス。
+int8（次元ごとのスカラー量子化）またはバイナリ（符号ビット）の埋め込みだけを
+メモリに置き、full-precisionの行列はディスク上のメモリマップのまま、
+上位候補の再スコアリングにのみ使用します。
+"""
+
+from pathlib import Path
+
+import numpy as np
+
+from src.utils.exceptions import VectorStoreError
+from src.utils.helpers import atomic_write
+
+# 量子化・距離計算で一度に変換する行ブロックサイズ
+QUANTIZE_BLOCK_ROWS = 4096
+
+# 1バイトあたりの立っているビット数（バイナリ量子化のハミング距離用）
+POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+class ScalarQuantizer:
+    """
+    次元ごとのmin/maxによるint8スカラー量子化
+
+    x ≈ offset + scale * code として近似し、近似二乗L2距離で候補を抽出します。
+    メモリ使用量はfloat32の1/4です。
+    """
+
+    kind = "int8"
+
+    def __init__(
+        self,
+        codes: np.ndarray,
+        offset: np.ndarray,
+        scale: np.ndarray,
+        sq_norms: np.ndarray,
+    ):
+        """
+        初期化
+
+        Args:
+            codes: 量子化コード (n, dim) int8
+            offset: 次元ごとのオフセット (dim,)
+            scale: 次元ごとのスケール (dim,)
+            sq_norms: 復元ベクトルの二乗ノルム (n,)
+        """
+        self.codes = codes
+        self.offset = offset
+        self.scale = scale
+        self.sq_norms = sq_norms
+
+    @classmethod
+    def fit(cls, matrix: np.ndarray) -> "ScalarQuantizer":
+        """
+        埋め込み行列から量子化パラメータを求めてコード化
+
+        Args:
+            matrix: 埋め込み行列 (n, dim)。メモリマップでもよい
+
+        Returns:
+            ScalarQuantizer: 量子化インデックス
+        """
+        n, dim = matrix.shape
+        low = np.full(dim, np.inf, dtype=np.float32)
+        high = np.full(dim, -np.inf, dtype=np.float32)
+        for start in range(0, n, QUANTIZE_BLOCK_ROWS):
+            block = np.asarray(matrix[start : start + QUANTIZE_BLOCK_ROWS], dtype=np.float32)
+            low = np.minimum(low, block.min(axis=0))
+            high = np.maximum(high, block.max(axis=0))
+
+        offset = ((high + low) / 2.0).astype(np.float32)
+        scale = ((high - low) / 254.0).astype(np.float32)
+        # 全行で同じ値の次元はゼロ除算を避ける
+        scale[scale == 0] = 1.0
+
+        codes = np.empty((n, dim), dtype=np.int8)
+        sq_norms = np.empty(n, dtype=np.float32)
+        for start in range(0, n, QUANTIZE_BLOCK_ROWS):
+            block = np.asarray(matrix[start : start + QUANTIZE_BLOCK_ROWS], dtype=np.float32)
+            block_codes = np.clip(np.rint((block - offset) / scale), -127, 127).astype(np.int8)
+            restored = offset + scale * block_codes.astype(np.float32)
+            codes[start : start + len(block)] = block_codes
+            sq_norms[start : start + len(block)] = np.einsum("ij,ij->i", restored, restored)
+
+        return cls(codes, offset, scale, sq_norms)
+
+    @property
+    def nbytes(self) -> int:
+        """メモリ上の量子化データのサイズ（バイト）"""
+        return int(
+            self.codes.nbytes + self.offset.nbytes + self.scale.nbytes + self.sq_norms.nbytes
+        )
+
+    def approximate_distances(self, rows: np.ndarray | None, queries: np.ndarray) -> np.ndarray:
+        """
+        近似二乗L2距離を計算
+
+        Args:
+            rows: 対象の行番号（Noneの場合は全行）
+            queries: クエリ行列 (q, dim) float32
+
+        Returns:
+            np.ndarray: 近似距離 (n_rows, q)
+        """
+        codes = self.codes if rows is None else self.codes[rows]
+        norms = self.sq_norms if rows is None else self.sq_norms[rows]
+
+        # q·x̂ = q·offset + (q*scale)·code
+        weighted = (queries * self.scale).T
+        dots = np.empty((codes.shape[0], queries.shape[0]), dtype=np.float32)
+        for start in range(0, codes.shape[0], QUANTIZE_BLOCK_ROWS):
+            block = codes[start : start + QUANTIZE_BLOCK_ROWS].astype(np.float32)
+            dots[start : start + QUANTIZE_BLOCK_ROWS] = block @ weighted
+        dots += queries @ self.offset
+
+        return norms[:, None] - 2.0 * dots
+
+    def __len__(self) -> int:
+        """量子化した行数"""
+        return len(self.codes)
+
+    def arrays(self) -> dict[str, np.ndarray]:
+        """保存用の配列"""
+        return {
+            "codes": self.codes,
+            "offset": self.offset,
+            "scale": self.scale,
+            "sq_norms": self.sq_norms,
+        }
+
+
+class BinaryQuantizer:
+    """
+    符号ビットによるバイナリ量子化
+
+    各次元を1ビットに詰め、ハミング距離で候補を抽出します。
+    メモリ使用量はfloat32の1/32です（正規化済みのOpenAI埋め込みを想定）。
+    """
+
+    kind = "binary"
+
+    def __init__(self, bits: np.ndarray):
+        """
+        初期化
+
+        Args:
+            bits: packbits済みの符号ビット (n, ceil(dim / 8)) uint8
+        """
+        self.bits = bits
+
+    @classmethod
+    def fit(cls, matrix: np.ndarray) -> "BinaryQuantizer":
+        """
+        埋め込み行列を符号ビットに変換
+
+        Args:
+            matrix: 埋め込み行列 (n, dim)。メモリマップでもよい
+
+        Returns:
+            BinaryQuantizer: 量子化インデックス
+        """
+        n, dim = matrix.shape
+        bits = np.empty((n, (dim + 7) // 8), dtype=np.uint8)
+        for start in range(0, n, QUANTIZE_BLOCK_ROWS):
+            block = np.asarray(matrix[start : start + QUANTIZE_BLOCK_ROWS])
+            bits[start : start + len(block)] = np.packbits(block > 0, axis=1)
+        return cls(bits)
+
+    @property
+    def nbytes(self) -> int:
+        """メモリ上の量子化データのサイズ（バイト）"""
+        return int(self.bits.nbytes)
+
+    def approximate_distances(self, rows: np.ndarray | None, queries: np.ndarray) -> np.ndarray:
+        """
+        ハミング距離を計算
+
+        Args:
+            rows: 対象の行番号（Noneの場合は全行）
+            queries: クエリ行列 (q, dim) float32
+
+        Returns:
+            np.ndarray: ハミング距離 (n_rows, q)
+        """
+        bits = self.bits if rows is None else self.bits[rows]
+        query_bits = np.packbits(queries > 0, axis=1)
+
+        distances = np.empty((bits.shape[0], len(query_bits)), dtype=np.int32)
+        for column, query in enumerate(query_bits):
+            distances[:, column] = POPCOUNT_TABLE[np.bitwise_xor(bits, query)].sum(
+                axis=1, dtype=np.int32
+            )
+        return distances
+
+    def __len__(self) -> int:
+        """量子化した行数"""
+        return len(self.bits)
+
+    def arrays(self) -> dict[str, np.ndarray]:
+        """保存用の配列"""
+        return {"bits": self.bits}
+
+
+QUANTIZERS: dict[str, type[ScalarQuantizer] | type[BinaryQuantizer]] = {
+    ScalarQuantizer.kind: ScalarQuantizer,
+    BinaryQuantizer.kind: BinaryQuantizer,
+}
+
+Quantizer = ScalarQuantizer | BinaryQuantizer
+
+
+def fit_quantizer(kind: str, matrix: np.ndarray) -> Quantizer | None:
+    """
+    指定した方式で量子化インデックスを作成
+
+    Args:
+        kind: 量子化方式（none / int8 / binary）
+        matrix: 埋め込み行列 (n, dim)
+
+    Returns:
+        Quantizer | None: 量子化インデックス（noneの場合はNone）
+
+    Raises:
+        VectorStoreError: 未対応の量子化方式
+    """
+    if kind == "none":
+        return None
+    if kind not in QUANTIZERS:
+        raise VectorStoreError(f"Unsupported quantization: {kind}")
+    return QUANTIZERS[kind].fit(matrix)
+
+
+def save_quantizer(quantizer: Quantizer, path: str | Path) -> None:
+    """
+    量子化インデックスをnpzとしてアトミックに保存
+
+    Args:
+        quantizer: 量子化インデックス
+        path: 保存先ファイル
+    """
+    with atomic_write(path, "wb") as f:
+        np.savez(f, **quantizer.arrays())
+
+
+def load_quantizer(kind: str, path: str | Path) -> Quantizer:
+    """
+    保存済みの量子化インデックスをメモリに読み込む
+
+    Args:
+        kind: 量子化方式（int8 / binary）
+        path: npzファイル
+
+    Returns:
+        Quantizer: 量子化インデックス
+
+    Raises:
+        VectorStoreError: 未対応の量子化方式
+    """
+    if kind not in QUANTIZERS:
+        raise VectorStoreError(f"Unsupported quantization: {kind}")
+    with np.load(path) as data:
+        return QUANTIZERS[kind](**{name: data[name] for name in data.files})
@@ -0,0 +1,287 @@
+"""
+LangGraph Catalyst - Exact-Match Response Cache
+
+同一のRAGリクエストに対して、検索・LLM呼び出しを行わずに保存済みの応答を返すキャッシュ。
+
+キーは正規化した質問（NFKC・空白の圧縮・大文字小文字の無視）と、回答に影響する
+リクエストパラメータ（モデル・検索方式・k・include_sources・include_code_examples・
+プロンプトのトークン予算・親ドキュメント展開）、コーパスバージョンから作ります。コーパスバージョンはインジェストのたびに変わるため、
+再インジェスト後は古い応答が自動的に使われなくなります。
+ストアはローカルのSQLite（WALモード）で、同じホストの複数ワーカーで共有し、
+ヒット/ミス数もワーカー全体で集計します。検索時は読み込みのみ行い、ヒット/ミス数は
+プロセス内で数えて、保存・統計取得・クローズの際にまとめてSQLiteに反映します。
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Any
+
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# 複数ワーカーが同時に書き込んだ場合にロック解放を待つ時間（秒）
+BUSY_TIMEOUT_SECONDS = 5.0
+
+# 失効した応答を削除する間隔（秒、コーパスバージョンが変わった場合は即座に削除）
+SWEEP_INTERVAL_SECONDS = 300.0
+
+
+def normalize_question(question: str) -> str:
+    """
+    キャッシュキー用に質問を正規化
+
+    NFKCで全角英数字・半角カナなどを揃え、空白を1つにまとめ、大文字小文字を区別しません。
+
+    Args:
+        question: ユーザーの質問
+
+    Returns:
+        str: 正規化した質問
+    """
+    return " ".join(unicodedata.normalize("NFKC", question).split()).casefold()
+
+
+def make_cache_key(question: str, params: str, corpus_version: str) -> str:
+    """
+    応答キャッシュのキーを作成
+
+    Args:
+        question: ユーザーの質問
+        params: 回答に影響するリクエストパラメータを表す文字列
+        corpus_version: コーパスバージョン
+
+    Returns:
+        str: SHA-256ハッシュ
+    """
+    material = "\x1f".join((normalize_question(question), params, corpus_version))
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """正規化したリクエストをキーとするRAG応答のキャッシュ（SQLite、複数ワーカーで共有）"""
+
+    def __init__(self, path: str | Path, ttl_seconds: float | None = None):
+        """
+        初期化
+
+        Args:
+            path: SQLiteファイルのパス
+            ttl_seconds: 応答の有効期間（秒、未指定時は設定値）
+        """
+        self.path = Path(path)
+        self.ttl_seconds = (
+            ttl_seconds if ttl_seconds is not None else settings.response_cache_ttl_seconds
+        )
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+        # このプロセスでのヒット/ミス数（ワーカー全体の値はstats()でSQLiteから取得）
+        self.hits = 0
+        self.misses = 0
+        # SQLiteに未反映のヒット/ミス数
+        self._pending = {"hits": 0, "misses": 0}
+        # 直近に失効した応答を削除したときのコーパスバージョンと時刻
+        self._swept_version: str | None = None
+        self._swept_at = 0.0
+
+    def _connection(self) -> sqlite3.Connection:
+        """SQLite接続を取得（初回アクセス時に作成）"""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                str(self.path), timeout=BUSY_TIMEOUT_SECONDS, check_same_thread=False
+            )
+            # 読み込みを書き込みでブロックしない（複数ワーカーからの同時アクセス用）
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    corpus_version TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_responses_corpus_version "
+                "ON responses (corpus_version)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_responses_created_at ON responses (created_at)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO counters VALUES (?, 0)", (("hits",), ("misses",))
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _flush_counters(self, conn: sqlite3.Connection) -> None:
+        """未反映のヒット/ミス数をSQLiteに加算（呼び出し側でロックを取得しcommitする）"""
+        conn.executemany(
+            "UPDATE counters SET value = value + ? WHERE name = ?",
+            [(count, name) for name, count in self._pending.items() if count],
+        )
+        self._pending = {"hits": 0, "misses": 0}
+
+    def get(self, question: str, params: str, corpus_version: str) -> dict[str, Any] | None:
+        """
+        保存済みの応答を取得（SQLiteへの書き込みは行わない）
+
+        Args:
+            question: ユーザーの質問
+            params: 回答に影響するリクエストパラメータを表す文字列
+            corpus_version: 現在のコーパスバージョン
+
+        Returns:
+            dict | None: 保存済みのRAG応答（なければNone）
+        """
+        key = make_cache_key(question, params, corpus_version)
+
+        with self._lock:
+            try:
+                conn = self._connection()
+                row = conn.execute(
+                    "SELECT payload, created_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                payload = None
+                if row is not None and time.time() - row[1] <= self.ttl_seconds:
+                    payload = json.loads(row[0])
+            except (sqlite3.Error, ValueError) as e:
+                # 読み込めなくても通常の処理で継続
+                logger.warning(f"Failed to read response cache: {e}")
+                payload = None
+
+            counter = "misses" if payload is None else "hits"
+            self._pending[counter] += 1
+            if payload is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return payload
+
+    def put(self, question: str, params: str, corpus_version: str, payload: dict[str, Any]) -> None:
+        """
+        応答を保存
+
+        他のコーパスバージョンの応答と失効した応答は、コーパスバージョンが変わったときと
+        一定間隔（SWEEP_INTERVAL_SECONDS）ごとに保存時にまとめて削除します。
+        未反映のヒット/ミス数も同じトランザクションで反映します。
+
+        Args:
+            question: ユーザーの質問
+            params: 回答に影響するリクエストパラメータを表す文字列
+            corpus_version: 応答を生成したときのコーパスバージョン
+            payload: RAG応答（JSONに変換できること）
+        """
+        now = time.time()
+        key = make_cache_key(question, params, corpus_version)
+
+        with self._lock:
+            sweep = (
+                corpus_version != self._swept_version
+                or now - self._swept_at >= SWEEP_INTERVAL_SECONDS
+            )
+            stale = 0
+            try:
+                conn = self._connection()
+                if sweep:
+                    stale = conn.execute(
+                        "DELETE FROM responses WHERE corpus_version != ? OR created_at < ?",
+                        (corpus_version, now - self.ttl_seconds),
+                    ).rowcount
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                    (key, corpus_version, json.dumps(payload, ensure_ascii=False), now),
+                )
+                self._flush_counters(conn)
+                conn.commit()
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                logger.warning(f"Failed to write response cache: {e}")
+                return
+
+            if sweep:
+                self._swept_version = corpus_version
+                self._swept_at = now
+
+        if stale:
+            logger.info(f"Dropped {stale} stale response cache entries")
+
+    def stats(self) -> dict[str, Any]:
+        """
+        キャッシュの統計情報を取得
+
+        Returns:
+            dict: entries, ttl_seconds, hits, misses, hit_ratio（全ワーカー）,
+                process_hits, process_misses, process_hit_ratio（このプロセス）
+        """
+        process_lookups = self.hits + self.misses
+        result: dict[str, Any] = {
+            "entries": None,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": None,
+            "misses": None,
+            "hit_ratio": None,
+            "process_hits": self.hits,
+            "process_misses": self.misses,
+            "process_hit_ratio": self.hits / process_lookups if process_lookups else 0.0,
+        }
+
+        with self._lock:
+            try:
+                conn = self._connection()
+                if any(self._pending.values()):
+                    self._flush_counters(conn)
+                    conn.commit()
+                counters = dict(conn.execute("SELECT name, value FROM counters").fetchall())
+                entries = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to read response cache stats: {e}")
+                return result
+
+        hits, misses = counters.get("hits", 0), counters.get("misses", 0)
+        result.update(
+            {
+                "entries": entries,
+                "hits": hits,
+                "misses": misses,
+                "hit_ratio": hits / (hits + misses) if hits + misses else 0.0,
+            }
+        )
+        return result
+
+    def clear(self) -> None:
+        """全応答を削除し、ヒット/ミス数をリセット"""
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM responses")
+            conn.execute("UPDATE counters SET value = 0")
+            conn.commit()
+            self.hits = 0
+            self.misses = 0
+            self._pending = {"hits": 0, "misses": 0}
+
+    def close(self) -> None:
+        """未反映のヒット/ミス数を反映してSQLite接続を閉じる"""
+        with self._lock:
+            if self._conn is not None:
+                if any(self._pending.values()):
+                    try:
+                        self._flush_counters(self._conn)
+                        self._conn.commit()
+                    except sqlite3.Error as e:
+                        logger.warning(f"Failed to flush response cache counters: {e}")
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,229 @@
+"""
+LangGraph Catalyst - Semantic Answer Cache
+
+言い換えられた質問（「LangGraphとは何ですか？」「LangGraphって何？」など）に対して、
+過去の回答を再利用するセマンティックキャッシュ。
+
+質問の埋め込み・回答・参照したチャンクID・コーパスバージョンを小さなインメモリの
+ベクトルインデックスに保持し、コサイン類似度がしきい値以上の質問には
+LLMを呼び出さずに保存済みの回答を返します。エントリはTTLで失効し、
+上限を超えると最も長く使われていないもの（LRU）から削除します。
+コーパスバージョンが変わった（再インジェストされた）場合は古い回答を使いません。
+"""
+
+import copy
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SemanticCacheEntry:
+    """セマンティックキャッシュの1エントリ"""
+
+    slot: int
+    corpus_version: str
+    params: str
+    payload: dict[str, Any]
+    source_ids: list[str]
+    created_at: float
+
+
+@dataclass
+class SemanticCacheHit:
+    """キャッシュヒットの結果"""
+
+    payload: dict[str, Any]
+    similarity: float
+    source_ids: list[str]
+    age_seconds: float
+
+
+class SemanticAnswerCache:
+    """
+    質問の埋め込みをキーとするRAG回答のキャッシュ（プロセス内、スレッドセーフ）
+
+    埋め込みは正規化して容量分の行列に保持し、検索は行列とクエリの内積1回で行います。
+    """
+
+    def __init__(
+        self,
+        threshold: float | None = None,
+        ttl_seconds: float | None = None,
+        max_entries: int | None = None,
+    ):
+        """
+        初期化
+
+        Args:
+            threshold: ヒットとみなすコサイン類似度（未指定時は設定値）
+            ttl_seconds: エントリの有効期間（秒、未指定時は設定値）
+            max_entries: 保持する最大エントリ数（未指定時は設定値）
+        """
+        self.threshold = threshold if threshold is not None else settings.semantic_cache_threshold
+        self.ttl_seconds = (
+            ttl_seconds if ttl_seconds is not None else settings.semantic_cache_ttl_seconds
+        )
+        self.max_entries = max_entries or settings.semantic_cache_max_entries
+
+        self._matrix: np.ndarray | None = None
+        # スロット番号→エントリ（末尾が最近使われたもの）
+        self._entries: OrderedDict[int, SemanticCacheEntry] = OrderedDict()
+        self._free_slots: list[int] = []
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _normalize(embedding: list[float] | np.ndarray) -> np.ndarray:
+        """埋め込みを単位ベクトルに正規化"""
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm > 0 else vector
+
+    def lookup(
+        self, embedding: list[float], corpus_version: str, params: str
+    ) -> SemanticCacheHit | None:
+        """
+        類似した質問の回答を検索
+
+        Args:
+            embedding: 質問の埋め込み
+            corpus_version: 現在のコーパスバージョン
+            params: 回答に影響するリクエストパラメータ（k・モデル等）を表す文字列
+
+        Returns:
+            SemanticCacheHit | None: しきい値以上で最も類似したエントリ（なければNone）
+        """
+        query = self._normalize(embedding)
+
+        with self._lock:
+            if self._matrix is None or not self._entries or self._matrix.shape[1] != query.shape[0]:
+                self.misses += 1
+                return None
+
+            now = time.time()
+            similarities = self._matrix @ query
+            slots = np.fromiter(self._entries.keys(), dtype=np.intp, count=len(self._entries))
+            candidates = slots[similarities[slots] >= self.threshold]
+
+            for slot in candidates[np.argsort(-similarities[candidates])]:
+                entry = self._entries[int(slot)]
+                if now - entry.created_at > self.ttl_seconds:
+                    self._remove(entry.slot)
+                    self.evictions += 1
+                    continue
+                if entry.corpus_version != corpus_version or entry.params != params:
+                    continue
+
+                self._entries.move_to_end(entry.slot)
+                self.hits += 1
+                return SemanticCacheHit(
+                    payload=copy.deepcopy(entry.payload),
+                    similarity=float(similarities[slot]),
+                    source_ids=list(entry.source_ids),
+                    age_seconds=now - entry.created_at,
+                )
+
+            self.misses += 1
+            return None
+
+    def store(
+        self,
+        embedding: list[float],
+        corpus_version: str,
+        params: str,
+        payload: dict[str, Any],
+        source_ids: list[str],
+    ) -> None:
+        """
+        回答を保存
+
+        コーパスバージョンが変わった場合は、古いバージョンのエントリをまとめて削除します。
+
+        Args:
+            embedding: 質問の埋め込み
+            corpus_version: 回答を生成したときのコーパスバージョン
+            params: 回答に影響するリクエストパラメータを表す文字列
+            payload: RAG応答
+            source_ids: 回答の根拠にしたチャンクID
+        """
+        vector = self._normalize(embedding)
+
+        with self._lock:
+            if self._matrix is None or self._matrix.shape[1] != vector.shape[0]:
+                # 初回（または埋め込みモデルの変更時）に容量分の行列を確保
+                self._matrix = np.zeros((self.max_entries, vector.shape[0]), dtype=np.float32)
+                self._entries.clear()
+                self._free_slots = list(range(self.max_entries - 1, -1, -1))
+
+            stale = [e.slot for e in self._entries.values() if e.corpus_version != corpus_version]
+            for slot in stale:
+                self._remove(slot)
+            if stale:
+                logger.info(f"Dropped {len(stale)} semantic cache entries for an old corpus")
+
+            if not self._free_slots:
+                self._evict(time.time())
+
+            slot = self._free_slots.pop()
+            self._matrix[slot] = vector
+            self._entries[slot] = SemanticCacheEntry(
+                slot=slot,
+                corpus_version=corpus_version,
+                params=params,
+                payload=copy.deepcopy(payload),
+                source_ids=list(source_ids),
+                created_at=time.time(),
+            )
+
+    def _evict(self, now: float) -> None:
+        """失効したエントリを削除し、空きがなければ最も長く使われていないエントリを削除"""
+        expired = [e.slot for e in self._entries.values() if now - e.created_at > self.ttl_seconds]
+        for slot in expired:
+            self._remove(slot)
+        if not expired:
+            self._remove(next(iter(self._entries)))
+        self.evictions += max(len(expired), 1)
+
+    def _remove(self, slot: int) -> None:
+        """エントリを削除してスロットを空ける（ロック取得済みで呼び出す）"""
+        del self._entries[slot]
+        self._matrix[slot] = 0.0
+        self._free_slots.append(slot)
+
+    def stats(self) -> dict[str, Any]:
+        """
+        キャッシュの統計情報を取得
+
+        Returns:
+            dict: entries, max_entries, threshold, ttl_seconds, hits, misses, hit_ratio, evictions
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "threshold": self.threshold,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+    def clear(self) -> None:
+        """全エントリを削除"""
+        with self._lock:
+            for slot in list(self._entries):
+                self._remove(slot)
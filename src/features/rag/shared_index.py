@@ -0,0 +1,252 @@
+"""
+LangGraph Catalyst - Shared Read-Only Index
+
+複数のuvicornワーカーで1つの検索インデックスを共有するバックエンド。
+インデックスはバージョンごとの不変なディレクトリ（NumPyインデックス形式）として公開し、
+どのバージョンが現在のものかはポインタファイル（CURRENT.json）で示します。
+
+- 公開: 新しいバージョンのディレクトリを書き終えてから、ポインタをアトミックに置き換える
+- 参照: 各ワーカーはポインタが指すバージョンの埋め込み行列を読み取り専用でメモリマップする
+
+埋め込み行列はOSのページキャッシュ上で全ワーカーに共有されるため、
+ワーカー数を増やしても行列のメモリは増えません。ワーカーはポインタの変更を
+定期的に確認し、新しいバージョンに切り替えます（検索中のリクエストは旧バージョンのまま完了）。
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from src.config.settings import settings
+from src.features.rag.numpy_store import ExactVectorIndex, NumpyVectorStore
+from src.features.rag.vectorstore import compute_corpus_version
+from src.utils.helpers import file_lock, write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+# 現在のバージョンを示すポインタファイル
+POINTER_FILE = "CURRENT.json"
+
+# 公開処理を1プロセスに限定するためのロックファイル
+LOCK_FILE = ".publish.lock"
+
+
+def read_pointer(root: str | Path) -> dict[str, Any] | None:
+    """
+    ポインタファイルを読み込む
+
+    Args:
+        root: 共有インデックスのルートディレクトリ
+
+    Returns:
+        dict | None: version, corpus_version, count, dtype, quantization, published_at。
+            未公開の場合はNone
+    """
+    path = Path(root) / POINTER_FILE
+    if not path.exists():
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@contextmanager
+def publish_lock(root: str | Path) -> Iterator[None]:
+    """
+    公開処理の排他ロック（プロセス間、fcntlが使えない環境ではロックしない）
+
+    Args:
+        root: 共有インデックスのルートディレクトリ
+    """
+    with file_lock(Path(root) / LOCK_FILE):
+        yield
+
+
+def publish_index(
+    index: ExactVectorIndex, root: str | Path, keep_versions: int | None = None
+) -> dict[str, Any]:
+    """
+    インデックスを新しいバージョンとして公開
+
+    バージョンのディレクトリを書き終えてからポインタを置き換えるため、
+    ワーカーが書き込み途中のファイルを読むことはありません。
+    古いバージョンは直近のものを残して削除します（メモリマップ中のファイルは
+    削除後もマップしたプロセスから読み続けられます）。
+
+    Args:
+        index: 公開するインデックス
+        root: 共有インデックスのルートディレクトリ
+        keep_versions: 残すバージョン数（現在のものを含む、デフォルトは設定から取得）
+
+    Returns:
+        dict: 書き込んだポインタ
+    """
+    root = Path(root)
+    keep_versions = keep_versions or settings.shared_index_keep_versions
+    corpus_version = index.manifest.get("corpus_version", "")
+    version = f"{datetime.utcnow().strftime('%Y%m%dT%H%M%S%fZ')}-{corpus_version[:12]}"
+
+    index.save(root / version)
+    pointer = {
+        "version": version,
+        "corpus_version": corpus_version,
+        "count": len(index),
+        "dtype": index.manifest.get("dtype"),
+        "quantization": index.quantization,
+        "published_at": datetime.utcnow().isoformat() + "Z",
+    }
+    write_json_atomic(root / POINTER_FILE, pointer)
+    logger.info(f"Published shared index version {version} ({len(index)} vectors)")
+
+    versions = sorted(path for path in root.iterdir() if path.is_dir())
+    for stale in versions[:-keep_versions]:
+        if stale.name != version:
+            shutil.rmtree(stale, ignore_errors=True)
+    return pointer
+
+
+class SharedIndexVectorStore(NumpyVectorStore):
+    """
+    複数ワーカーで共有する読み取り専用インデックスのバックエンド
+
+    初期化時に公開済みのバージョンがあれば、Chromaを走査せずにそれをメモリマップします。
+    未公開の場合は1プロセスだけがChromaから構築して公開し、他のプロセスはそれを待って読み込みます。
+    書き込み（add_documents等）を行ったプロセスは新しいバージョンを公開し、
+    他のワーカーはポインタの変更を検知して切り替えます。
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        """
+        SharedIndexVectorStoreの初期化（引数はNumpyVectorStoreと同じ）
+
+        Raises:
+            VectorStoreError: 初期化エラー
+        """
+        self._index: ExactVectorIndex | None = None
+        self._pointer_stat: tuple[int, int] | None = None
+        self._pointer_checked_at = 0.0
+        self._reload_lock = threading.Lock()
+        self.poll_interval = settings.shared_index_poll_interval
+        super().__init__(*args, **kwargs)
+
+    @property
+    def shared_root(self) -> Path:
+        """共有インデックスのルートディレクトリ（Chromaディレクトリの隣）"""
+        return Path(self.persist_directory).parent / "shared_index" / self.collection_name
+
+    @property
+    def index(self) -> ExactVectorIndex | None:
+        """現在のインデックス（一定間隔でポインタを確認し、新しいバージョンに切り替える）"""
+        if time.monotonic() - self._pointer_checked_at >= self.poll_interval:
+            self.reload_index()
+        return self._index
+
+    @index.setter
+    def index(self, value: ExactVectorIndex | None) -> None:
+        self._index = value
+
+    def _stat_pointer(self) -> tuple[int, int] | None:
+        """ポインタファイルの(inode, 更新時刻)。置き換えられると変わる"""
+        try:
+            stat = os.stat(self.shared_root / POINTER_FILE)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns
+
+    def reload_index(self) -> bool:
+        """
+        ポインタが変わっていれば新しいバージョンを読み込んで切り替える
+
+        読み込みに失敗した場合（公開直後に削除されたバージョン等）は現在のインデックスを使い続け、
+        次回の確認時に再試行します。
+
+        Returns:
+            bool: 切り替えた場合True
+        """
+        with self._reload_lock:
+            self._pointer_checked_at = time.monotonic()
+            stat = self._stat_pointer()
+            if stat is None or (stat == self._pointer_stat and self._index is not None):
+                return False
+
+            try:
+                pointer = read_pointer(self.shared_root)
+                index = ExactVectorIndex.load(self.shared_root / pointer["version"])
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Failed to load shared index, keeping current version: {e}")
+                return False
+
+            # 参照の置き換えのみで切り替え（検索中のリクエストは旧インデックスを保持）
+            self._index = index
+            self._pointer_stat = stat
+            logger.info(
+                f"Switched to shared index version {pointer['version']} ({len(index)} vectors)"
+            )
+            return True
+
+    def refresh_index(self, force: bool = False) -> bool:
+        """
+        Chromaの内容が公開中のバージョンと異なれば新しいバージョンを公開して切り替える
+
+        初回（未読み込み）で公開済みのバージョンがある場合は、Chromaを走査せずに読み込みます。
+
+        Args:
+            force: コーパスが変わっていなくても再構築・公開するか
+
+        Returns:
+            bool: 新しいバージョンを公開した場合True
+        """
+        if not force and self._index is None and self.reload_index():
+            return False
+
+        with publish_lock(self.shared_root):
+            # ロック待ちの間に他のプロセスが公開した場合はそれを使う
+            pointer = read_pointer(self.shared_root)
+            ids = self.vector_store.get(include=[])["ids"]
+            corpus_version = compute_corpus_version(ids)
+
+            published = False
+            if (
+                force
+                or pointer is None
+                or pointer.get("corpus_version") != corpus_version
+                or pointer.get("dtype") != self.dtype
+                or pointer.get("quantization", "none") != self.quantization
+            ):
+                publish_index(self._build_index(corpus_version, ids), self.shared_root)
+                published = True
+
+        self.reload_index()
+        return published
+
+    def get_shared_index_info(self) -> dict[str, Any]:
+        """
+        公開中のバージョンとこのプロセスが使用中のバージョンを取得
+
+        Returns:
+            dict: pointer（公開中のポインタ）, loaded_corpus_version, loaded_count
+        """
+        index = self.index
+        return {
+            "pointer": read_pointer(self.shared_root),
+            "loaded_corpus_version": index.manifest.get("corpus_version") if index else None,
+            "loaded_count": len(index) if index else 0,
+        }
+
+    def delete_collection(self) -> bool:
+        """コレクションと共有インデックスの全バージョンを削除"""
+        result = super().delete_collection()
+        with publish_lock(self.shared_root):
+            (self.shared_root / POINTER_FILE).unlink(missing_ok=True)
+            for path in self.shared_root.iterdir():
+                if path.is_dir():
+                    shutil.rmtree(path, ignore_errors=True)
+        self._pointer_stat = None
+        return result
@@ -0,0 +1,214 @@
+"""
+LangGraph Catalyst - Vector Store Snapshot
+
+ベクトルストアの内容をコンパクトなスナップショットとして書き出し・読み込むモジュール。
+埋め込みは1つの `.npy`（メモリマップ可能）、本文とメタデータは列指向のJSON、
+埋め込みモデル名とコーパスバージョンはマニフェストに保存します。
+small-to-big検索用の親セクション（ParentDocumentStore）も列指向のJSONとして含めます。
+ディスクが揮発するホストで、再クロール・再埋め込みなしにコールドスタートするために使用します。
+"""
+
+import json
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from src.features.rag.vectorstore import compute_corpus_version
+from src.utils.exceptions import VectorStoreError
+from src.utils.helpers import atomic_write, write_json_atomic
+
+# スナップショット形式のバージョン（互換性のない変更時に更新）
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+def to_columns(metadatas: list[dict[str, Any]]) -> dict[str, list[Any]]:
+    """
+    行ごとのメタデータを列指向に変換（存在しないキーはNone）
+
+    Args:
+        metadatas: 行ごとのメタデータ
+
+    Returns:
+        dict: キー→値のリスト
+    """
+    keys = sorted({key for metadata in metadatas for key in metadata})
+    return {key: [metadata.get(key) for metadata in metadatas] for key in keys}
+
+
+def from_columns(columns: dict[str, list[Any]], count: int) -> list[dict[str, Any]]:
+    """
+    列指向のメタデータを行ごとに戻す（Noneのキーは除外）
+
+    Args:
+        columns: キー→値のリスト
+        count: 行数
+
+    Returns:
+        list[dict]: 行ごとのメタデータ
+    """
+    metadatas: list[dict[str, Any]] = [{} for _ in range(count)]
+    for key, values in columns.items():
+        for metadata, value in zip(metadatas, values, strict=True):
+            if value is not None:
+                metadata[key] = value
+    return metadatas
+
+
+class VectorSnapshot:
+    """ベクトルストアのスナップショット（埋め込み行列 + 列指向レコード + 親セクション + マニフェスト）"""
+
+    EMBEDDINGS_FILE = "embeddings.npy"
+    RECORDS_FILE = "records.json"
+    PARENTS_FILE = "parents.json"
+    MANIFEST_FILE = "manifest.json"
+
+    def __init__(
+        self,
+        ids: list[str],
+        embeddings: np.ndarray,
+        documents: list[str],
+        metadatas: list[dict[str, Any]],
+        manifest: dict[str, Any] | None = None,
+        parents: list[dict[str, Any]] | None = None,
+    ):
+        """
+        初期化
+
+        Args:
+            ids: チャンクID
+            embeddings: 埋め込み行列 (n, dim) float32
+            documents: チャンク本文
+            metadatas: チャンクメタデータ
+            manifest: マニフェスト
+            parents: 親セクション（ParentDocumentStore.export_sections()の形式）
+        """
+        self.ids = ids
+        self.embeddings = embeddings
+        self.documents = documents
+        self.metadatas = metadatas
+        self.manifest = manifest or {}
+        self.parents = parents or []
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def save(self, directory: str | Path) -> dict[str, Any]:
+        """
+        スナップショットをディレクトリに保存
+
+        マニフェストは最後に書き込むため、マニフェストが存在すれば
+        埋め込みとレコードは書き込み済みです。
+
+        Args:
+            directory: 保存先ディレクトリ
+
+        Returns:
+            dict: 書き込んだマニフェスト
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / self.MANIFEST_FILE).unlink(missing_ok=True)
+
+        with atomic_write(directory / self.EMBEDDINGS_FILE, "wb") as f:
+            np.save(f, np.ascontiguousarray(self.embeddings, dtype=np.float32))
+
+        write_json_atomic(
+            directory / self.RECORDS_FILE,
+            {
+                "ids": self.ids,
+                "documents": self.documents,
+                "metadata": to_columns(self.metadatas),
+            },
+        )
+        write_json_atomic(directory / self.PARENTS_FILE, to_columns(self.parents))
+
+        manifest = {
+            **self.manifest,
+            "format_version": SNAPSHOT_FORMAT_VERSION,
+            "count": len(self.ids),
+            "dimension": int(self.embeddings.shape[1]) if len(self.ids) else 0,
+            "corpus_version": compute_corpus_version(self.ids),
+            "parent_count": len(self.parents),
+        }
+        write_json_atomic(directory / self.MANIFEST_FILE, manifest)
+        self.manifest = manifest
+        return manifest
+
+    @classmethod
+    def read_manifest(cls, directory: str | Path) -> dict[str, Any]:
+        """
+        マニフェストを読み込む
+
+        Args:
+            directory: スナップショットディレクトリ
+
+        Returns:
+            dict: マニフェスト
+
+        Raises:
+            VectorStoreError: マニフェストが存在しない、または形式が未対応
+        """
+        path = Path(directory) / cls.MANIFEST_FILE
+        if not path.exists():
+            raise VectorStoreError(f"Snapshot manifest not found: {path}")
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+            raise VectorStoreError(
+                f"Unsupported snapshot format version: {manifest.get('format_version')}"
+            )
+        return manifest
+
+    @classmethod
+    def load(cls, directory: str | Path, mmap: bool = True) -> "VectorSnapshot":
+        """
+        スナップショットを読み込み、件数とコーパスバージョンを検証
+
+        Args:
+            directory: スナップショットディレクトリ
+            mmap: 埋め込み行列を読み取り専用でメモリマップするか
+
+        Returns:
+            VectorSnapshot: 読み込んだスナップショット
+
+        Raises:
+            VectorStoreError: ファイルの欠落・破損
+        """
+        directory = Path(directory)
+        manifest = cls.read_manifest(directory)
+
+        try:
+            embeddings = np.load(directory / cls.EMBEDDINGS_FILE, mmap_mode="r" if mmap else None)
+            with open(directory / cls.RECORDS_FILE, encoding="utf-8") as f:
+                records = json.load(f)
+        except (OSError, ValueError) as e:
+            raise VectorStoreError(f"Failed to read snapshot: {e}") from e
+
+        ids = records["ids"]
+        if len(ids) != manifest["count"] or len(embeddings) != manifest["count"]:
+            raise VectorStoreError(
+                f"Snapshot is incomplete: manifest has {manifest['count']} chunks, "
+                f"found {len(ids)} records and {len(embeddings)} embeddings"
+            )
+        if compute_corpus_version(ids) != manifest["corpus_version"]:
+            raise VectorStoreError("Snapshot corpus version does not match its records")
+
+        # 親セクションを含まない以前のスナップショットはparent_countがない
+        parent_count = manifest.get("parent_count", 0)
+        parents: list[dict[str, Any]] = []
+        if parent_count:
+            try:
+                with open(directory / cls.PARENTS_FILE, encoding="utf-8") as f:
+                    parents = from_columns(json.load(f), parent_count)
+            except (OSError, ValueError) as e:
+                raise VectorStoreError(f"Failed to read snapshot parent sections: {e}") from e
+
+        return cls(
+            ids,
+            embeddings,
+            records["documents"],
+            from_columns(records["metadata"], len(ids)),
+            manifest,
+            parents=parents,
+        )
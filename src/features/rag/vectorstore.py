@@ -5,48 +5,330 @@ Chromaベクトルストアを管理するモジュール。
 ドキュメントの埋め込み、検索、コレクション管理を提供します。
 """
 
+import asyncio
+import hashlib
 import logging
+import os
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
 from typing import Any
 
+import numpy as np
 from langchain_chroma import Chroma
 from langchain_core.documents import Document
 from langchain_openai import OpenAIEmbeddings
 
 from src.config.settings import settings
+from src.features.rag.collection_stats import CollectionStats, directory_size
+from src.features.rag.embedding_cache import CachedEmbeddings, QueryEmbeddingCache
+from src.features.rag.embedding_store import EmbeddingStore
+from src.features.rag.lexical_index import LexicalIndex, reciprocal_rank_fusion
+from src.features.rag.mmr import maximal_marginal_relevance
+from src.features.rag.parent_store import ParentDocumentStore
+from src.features.rag.warmup import (
+    WARMUP_PROBE_QUERIES,
+    open_async_openai_connection,
+    open_openai_connection,
+    run_warmup_steps,
+)
 from src.utils.exceptions import VectorStoreError
+from src.utils.helpers import calculate_token_count
 
 logger = logging.getLogger(__name__)
 
+# OpenAI Embeddings APIの1リクエストあたりの最大入力数
+EMBEDDING_MAX_BATCH_SIZE = 2048
+
+# Chromaからコレクションの内容を読み出す際のページサイズ
+FETCH_PAGE_SIZE = 1000
+
+# スナップショットをChromaへ一括投入する際のバッチサイズ（Chromaの上限以下）
+SNAPSHOT_WRITE_BATCH_SIZE = 5000
+
+
+def compute_content_hash(text: str) -> str:
+    """
+    チャンク内容のハッシュを計算
+
+    Args:
+        text: チャンクのテキスト
+
+    Returns:
+        str: SHA-256ハッシュ（16進数）
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def make_chunk_id(document: Document) -> str:
+    """
+    ソースURL・start_index・内容ハッシュから決定的なチャンクIDを生成
+
+    Args:
+        document: チャンク
+
+    Returns:
+        str: チャンクID
+    """
+    metadata = document.metadata
+    content_hash = metadata.get("content_hash") or compute_content_hash(document.page_content)
+    key = f"{metadata.get('source', '')}\n{metadata.get('start_index', '')}\n{content_hash}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def compute_corpus_version(ids: Iterable[str]) -> str:
+    """
+    チャンクIDの集合からコーパスバージョンを計算
+
+    チャンクIDは内容アドレス方式のため、コーパスの内容が変わると必ず値が変わります。
+
+    Args:
+        ids: コレクション内の全チャンクID
+
+    Returns:
+        str: コーパスバージョン（16進数16文字）
+    """
+    digest = hashlib.sha256()
+    for chunk_id in sorted(ids):
+        digest.update(chunk_id.encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()[:16]
+
+
+def create_vectorstore(
+    collection_name: str | None = None,
+    persist_directory: str | None = None,
+    embedding_model: str | None = None,
+    backend: str | None = None,
+    embedding_dimensions: int | None = None,
+) -> "ChromaVectorStore":
+    """
+    設定された検索バックエンドのベクトルストアを作成
+
+    Args:
+        collection_name: コレクション名。未指定時は設定値
+        persist_directory: 永続化ディレクトリ
+        embedding_model: 埋め込みモデル名
+        backend: 検索バックエンド（chroma / numpy / partitioned / shared）。未指定時は設定値
+        embedding_dimensions: 埋め込みの次元数。未指定時は設定値
+
+    Returns:
+        ChromaVectorStore: ベクトルストア（chroma以外の場合は対応するサブクラス）
+    """
+    backend = backend or settings.vectorstore_backend
+
+    if backend == "numpy":
+        from src.features.rag.numpy_store import NumpyVectorStore
+
+        return NumpyVectorStore(
+            collection_name=collection_name,
+            persist_directory=persist_directory,
+            embedding_model=embedding_model,
+            embedding_dimensions=embedding_dimensions,
+        )
+
+    if backend == "shared":
+        from src.features.rag.shared_index import SharedIndexVectorStore
+
+        return SharedIndexVectorStore(
+            collection_name=collection_name,
+            persist_directory=persist_directory,
+            embedding_model=embedding_model,
+            embedding_dimensions=embedding_dimensions,
+        )
+
+    if backend == "partitioned":
+        from src.features.rag.partitioned_store import PartitionedVectorStore
+
+        return PartitionedVectorStore(
+            collection_name=collection_name,
+            persist_directory=persist_directory,
+            embedding_model=embedding_model,
+            embedding_dimensions=embedding_dimensions,
+        )
+
+    return ChromaVectorStore(
+        collection_name=collection_name,
+        persist_directory=persist_directory,
+        embedding_model=embedding_model,
+        embedding_dimensions=embedding_dimensions,
+    )
+
+
+def build_hnsw_configuration(
+    space: str | None = None,
+    m: int | None = None,
+    construction_ef: int | None = None,
+    search_ef: int | None = None,
+) -> dict[str, Any]:
+    """
+    Chromaコレクション作成用のHNSW設定を作成
+
+    Args:
+        space: 距離空間（l2 / cosine / ip）
+        m: 各ノードの最大近傍数
+        construction_ef: 構築時の探索幅
+        search_ef: 検索時の探索幅
+
+    Returns:
+        dict: Chromaの collection_configuration["hnsw"] 形式の設定（未指定は設定値）
+    """
+    return {
+        "space": space or settings.chroma_hnsw_space,
+        "max_neighbors": m or settings.chroma_hnsw_m,
+        "ef_construction": construction_ef or settings.chroma_hnsw_construction_ef,
+        "ef_search": search_ef or settings.chroma_hnsw_search_ef,
+    }
+
+
+def pack_token_batches(
+    chunks: list[tuple[str, Document]],
+    max_batch_tokens: int,
+    max_batch_size: int = EMBEDDING_MAX_BATCH_SIZE,
+) -> list[list[tuple[str, Document, int]]]:
+    """
+    チャンクをトークン予算ごとのバッチにまとめる
+
+    Args:
+        chunks: (チャンクID, ドキュメント)のリスト
+        max_batch_tokens: 1バッチあたりの最大トークン数
+        max_batch_size: 1バッチあたりの最大チャンク数
+
+    Returns:
+        list: (チャンクID, ドキュメント, トークン数)のバッチのリスト
+            予算を単独で超えるチャンクは1件のみのバッチになります。
+    """
+    batches: list[list[tuple[str, Document, int]]] = []
+    current: list[tuple[str, Document, int]] = []
+    current_tokens = 0
+
+    for chunk_id, doc in chunks:
+        tokens = calculate_token_count(doc.page_content)
+        if current and (
+            current_tokens + tokens > max_batch_tokens or len(current) >= max_batch_size
+        ):
+            batches.append(current)
+            current = []
+            current_tokens = 0
+        current.append((chunk_id, doc, tokens))
+        current_tokens += tokens
+
+    if current:
+        batches.append(current)
+
+    return batches
+
 
 class ChromaVectorStore:
     """Chromaベクトルストアの操作を管理するクラス"""
 
     def __init__(
         self,
-        collection_name: str = "langgraph_docs",
+        collection_name: str | None = None,
         persist_directory: str | None = None,
         embedding_model: str | None = None,
+        embedding_dimensions: int | None = None,
+        embeddings: CachedEmbeddings | None = None,
+        hnsw_space: str | None = None,
+        hnsw_m: int | None = None,
+        hnsw_construction_ef: int | None = None,
+        hnsw_search_ef: int | None = None,
     ):
         """
         ChromaVectorStoreの初期化
 
         Args:
-            collection_name: コレクション名
+            collection_name: コレクション名。未指定時は設定値
             persist_directory: 永続化ディレクトリ
             embedding_model: 埋め込みモデル名
+            embedding_dimensions: 埋め込みの次元数（text-embedding-3系のみ）。未指定時は設定値
+            embeddings: 共有する埋め込みモデル（パーティション間でキャッシュを共有する場合）
+            hnsw_space: HNSWの距離空間（l2 / cosine / ip）
+            hnsw_m: HNSWの最大近傍数（M）
+            hnsw_construction_ef: HNSW構築時の探索幅
+            hnsw_search_ef: HNSW検索時の探索幅
 
         Raises:
             VectorStoreError: 初期化エラー
         """
-        self.collection_name = collection_name
+        self.collection_name = collection_name or settings.chroma_collection_name
         self.persist_directory = persist_directory or settings.chroma_persist_dir
         self.embedding_model_name = embedding_model or settings.default_embedding_model
+        self.embedding_dimensions = embedding_dimensions or settings.embedding_dimensions
+        self.hnsw_config = build_hnsw_configuration(
+            hnsw_space, hnsw_m, hnsw_construction_ef, hnsw_search_ef
+        )
+
+        # クエリ埋め込みキャッシュ（ディスク層はChromaディレクトリの隣に配置）
+        if embeddings is not None:
+            self.query_cache = embeddings.cache
+        else:
+            cache_path = None
+            if settings.query_embedding_cache_persist:
+                cache_path = Path(self.persist_directory).parent / "query_embeddings.sqlite3"
+            self.query_cache = QueryEmbeddingCache(
+                model_name=self.embedding_namespace,
+                max_size=settings.query_embedding_cache_size,
+                persist_path=cache_path,
+            )
+
+        # ドキュメント埋め込みの内容アドレスストア（コレクション間で共有、Chromaディレクトリの隣）
+        if embeddings is not None:
+            self.embedding_store = embeddings.document_store
+        elif settings.embedding_store_enabled:
+            self.embedding_store = EmbeddingStore(
+                Path(self.persist_directory).parent / "embedding_store.sqlite3"
+            )
+        else:
+            self.embedding_store = None
+
+        # BM25語彙インデックス（Chromaディレクトリの隣に永続化、初回検索時に読み込み）
+        self.lexical_index_path = (
+            Path(self.persist_directory).parent / "lexical_index" / f"{self.collection_name}.json"
+        )
+        self.lexical_index_enabled = settings.lexical_index_enabled
+        self._lexical_index: LexicalIndex | None = None
+        self._lexical_lock = threading.Lock()
+
+        # コレクション統計のキャッシュ（初回参照時に読み込み、書き込み時に差分更新）
+        self.stats_path = (
+            Path(self.persist_directory).parent
+            / "collection_stats"
+            / f"{self.collection_name}.json"
+        )
+        self._stats: CollectionStats | None = None
+        self._stats_signature: tuple[int, int] | None = None
+        self._stats_lock = threading.Lock()
+
+        # コーパスバージョンのメモ（統計ファイルが置き換えられたら再計算）
+        self._corpus_version: tuple[Any, str] | None = None
+
+        # 親セクションのストア（small-to-big検索用、初回参照時に作成）
+        self.parent_store_path = (
+            Path(self.persist_directory).parent
+            / "parent_documents"
+            / f"{self.collection_name}.sqlite3"
+        )
+        self._parent_store: ParentDocumentStore | None = None
+        self._parent_lock = threading.Lock()
+
+        # ベクトル検索用の専用スレッドプール（初回使用時に作成）
+        self._search_executor: ThreadPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
 
         try:
-            # OpenAI Embeddings初期化
-            self.embeddings = OpenAIEmbeddings(
-                model=self.embedding_model_name,
-                openai_api_key=settings.openai_api_key,
+            # OpenAI Embeddings初期化（クエリ埋め込みはキャッシュ経由）
+            self.embeddings = embeddings or CachedEmbeddings(
+                OpenAIEmbeddings(
+                    model=self.embedding_model_name,
+                    dimensions=self.embedding_dimensions,
+                    openai_api_key=settings.openai_api_key,
+                ),
+                self.query_cache,
+                self.embedding_store,
             )
 
             # Chromaベクトルストア初期化
@@ -54,20 +336,70 @@ class ChromaVectorStore:
                 collection_name=self.collection_name,
                 embedding_function=self.embeddings,
                 persist_directory=self.persist_directory,
+                collection_configuration={"hnsw": self.hnsw_config},
             )
+            self._sync_hnsw_configuration()
 
             logger.info(f"Initialized ChromaVectorStore with collection: {self.collection_name}")
 
         except Exception as e:
             raise VectorStoreError(f"Failed to initialize vector store: {e}") from e
 
-    def add_documents(self, documents: list[Document], batch_size: int = 100) -> dict[str, Any]:
+    @property
+    def embedding_namespace(self) -> str:
+        """埋め込みの名前空間（モデル名と次元数。次元数を変えたベクトルとキャッシュを区別する）"""
+        if self.embedding_dimensions:
+            return f"{self.embedding_model_name}@{self.embedding_dimensions}"
+        return self.embedding_model_name
+
+    def _sync_hnsw_configuration(self) -> None:
+        """
+        既存コレクションのHNSW設定を確認し、変更可能なsearch_efを反映
+
+        space / M / construction_ef はコレクション作成時に固定されるため、
+        設定と異なる場合は警告のみ出します（削除して再インジェストすると反映されます）。
+        """
+        try:
+            current = self.vector_store._collection.configuration.get("hnsw")
+        except Exception as e:
+            logger.debug(f"Could not read HNSW configuration: {e}")
+            return
+        if not isinstance(current, dict):
+            return
+
+        mismatched = {
+            key: current[key]
+            for key in ("space", "max_neighbors", "ef_construction")
+            if key in current and current[key] != self.hnsw_config[key]
+        }
+        if mismatched:
+            logger.warning(
+                f"Collection '{self.collection_name}' was created with different HNSW settings "
+                f"{mismatched}; delete and re-ingest the collection to apply the configured values"
+            )
+
+        if current.get("ef_search") != self.hnsw_config["ef_search"]:
+            self.vector_store._collection.modify(
+                configuration={"hnsw": {"ef_search": self.hnsw_config["ef_search"]}}
+            )
+            logger.info(f"Updated HNSW search_ef to {self.hnsw_config['ef_search']}")
+
+    def add_documents(
+        self,
+        documents: list[Document],
+        batch_size: int = 100,
+        prune_stale: bool = False,
+    ) -> dict[str, Any]:
         """
         ドキュメントをベクトルストアに追加
 
+        チャンクIDはソースURL・start_index・内容ハッシュから決定的に生成するため、
+        同じドキュメントを再投入しても重複せず、新規・変更チャンクのみ埋め込みます。
+
         Args:
             documents: 追加するドキュメントのリスト
             batch_size: バッチ処理サイズ
+            prune_stale: 投入したソースについて、今回含まれなかった古いチャンクを削除するか
 
         Returns:
             dict: 追加結果の統計情報
@@ -80,46 +412,371 @@ class ChromaVectorStore:
             return {
                 "added_count": 0,
                 "failed_count": 0,
-                "total_documents_in_store": self._get_collection_count(),
+                "skipped_unchanged": 0,
+                "deleted_stale": 0,
+                "total_documents_in_store": self.get_collection_info()["document_count"],
                 "status": "success",
             }
 
         logger.info(f"Adding {len(documents)} documents to vector store")
 
         try:
+            self._get_stats()
+            chunks, pending = self._prepare_chunks(documents)
+            skipped_unchanged = len(chunks) - len(pending)
+            store_counters = self._embedding_store_counters()
+
             added_count = 0
             failed_count = 0
 
             # バッチ処理でドキュメントを追加
-            for i in range(0, len(documents), batch_size):
-                batch = documents[i : i + batch_size]
+            for i in range(0, len(pending), batch_size):
+                batch = pending[i : i + batch_size]
 
                 try:
-                    self.vector_store.add_documents(documents=batch)
+                    self.vector_store.add_documents(
+                        documents=[doc for _, doc in batch],
+                        ids=[cid for cid, _ in batch],
+                    )
                     added_count += len(batch)
+                    self._record_added([doc.metadata for _, doc in batch])
                     logger.debug(f"Added batch {i // batch_size + 1}: {len(batch)} documents")
                 except Exception as e:
                     failed_count += len(batch)
                     logger.error(f"Failed to add batch {i // batch_size + 1}: {e}")
 
-            total_in_store = self._get_collection_count()
+            deleted_stale = 0
+            if prune_stale:
+                deleted_stale = self._delete_stale_chunks(chunks.values(), set(chunks))
+
+            total_in_store = self._record_ingest()
+
+            result = {
+                "added_count": added_count,
+                "failed_count": failed_count,
+                "skipped_unchanged": skipped_unchanged,
+                "deleted_stale": deleted_stale,
+                "total_documents_in_store": total_in_store,
+                "status": "success" if failed_count == 0 else "partial",
+                **self._embedding_store_usage(store_counters),
+            }
+
+            logger.info(
+                f"Document addition completed. Added: {added_count}, Failed: {failed_count}, "
+                f"Unchanged: {skipped_unchanged}, Stale deleted: {deleted_stale}, "
+                f"Total in store: {total_in_store}"
+            )
+
+            self._refresh_lexical_index(result)
+            return result
+
+        except Exception as e:
+            raise VectorStoreError(f"Failed to add documents: {e}") from e
+
+    def add_documents_concurrent(
+        self,
+        documents: list[Document],
+        max_batch_tokens: int | None = None,
+        max_workers: int | None = None,
+        max_retries: int | None = None,
+        prune_stale: bool = False,
+        retry_backoff: float = 1.0,
+        progress_callback: Callable[[dict[str, Any]], None] | None = None,
+    ) -> dict[str, Any]:
+        """
+        トークン数ベースのバッチを並列に埋め込んでベクトルストアに追加
+
+        チャンクをtiktokenで数えたトークン予算ごとにまとめ、上限付きのワーカープールで
+        複数バッチを同時に送信します。失敗したバッチはそのバッチだけを再試行し、
+        それでも失敗した場合は二分割して原因のチャンクを切り分けます。
+
+        Args:
+            documents: 追加するドキュメントのリスト
+            max_batch_tokens: 1バッチあたりの最大トークン数
+            max_workers: 同時に送信するバッチ数
+            max_retries: バッチごとの最大再試行回数
+            prune_stale: 投入したソースについて、今回含まれなかった古いチャンクを削除するか
+            retry_backoff: 再試行の初回待機秒数（指数的に増加）
+            progress_callback: 進捗を受け取るコールバック
+
+        Returns:
+            dict: 追加結果とスループットの統計情報
+
+        Raises:
+            VectorStoreError: ドキュメント追加エラー
+        """
+        max_batch_tokens = max_batch_tokens or settings.embedding_batch_max_tokens
+        max_workers = max_workers or settings.embedding_max_workers
+        max_retries = settings.embedding_max_retries if max_retries is None else max_retries
+
+        if not documents:
+            return self.add_documents([])
+
+        logger.info(
+            f"Adding {len(documents)} documents concurrently "
+            f"(max_batch_tokens={max_batch_tokens}, max_workers={max_workers})"
+        )
+
+        try:
+            self._get_stats()
+            chunks, pending = self._prepare_chunks(documents)
+            skipped_unchanged = len(chunks) - len(pending)
+
+            store_counters = self._embedding_store_counters()
+            batches = pack_token_batches(pending, max_batch_tokens)
+            total_chunks = len(pending)
+            total_tokens = sum(tokens for batch in batches for _, _, tokens in batch)
+
+            added_count = 0
+            failed_count = 0
+            embedded_tokens = 0
+            retried_batches = 0
+            start_time = time.perf_counter()
+
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    executor.submit(self._write_batch, batch, max_retries, retry_backoff): batch
+                    for batch in batches
+                }
+
+                for future in as_completed(futures):
+                    batch = futures[future]
+                    added, failed, retried = future.result()
+                    added_count += added
+                    failed_count += failed
+                    retried_batches += retried
+                    embedded_tokens += sum(tokens for _, _, tokens in batch)
+
+                    elapsed = max(time.perf_counter() - start_time, 1e-9)
+                    progress = {
+                        "processed_chunks": added_count + failed_count,
+                        "total_chunks": total_chunks,
+                        "processed_tokens": embedded_tokens,
+                        "total_tokens": total_tokens,
+                        "chunks_per_second": (added_count + failed_count) / elapsed,
+                        "tokens_per_second": embedded_tokens / elapsed,
+                    }
+                    logger.info(
+                        f"Embedded {progress['processed_chunks']}/{total_chunks} chunks "
+                        f"({progress['chunks_per_second']:.1f} chunks/s, "
+                        f"{progress['tokens_per_second']:.0f} tokens/s)"
+                    )
+                    if progress_callback is not None:
+                        progress_callback(progress)
+
+            elapsed = time.perf_counter() - start_time
+
+            deleted_stale = 0
+            if prune_stale:
+                deleted_stale = self._delete_stale_chunks(chunks.values(), set(chunks))
+
+            total_in_store = self._record_ingest()
 
             result = {
                 "added_count": added_count,
                 "failed_count": failed_count,
+                "skipped_unchanged": skipped_unchanged,
+                "deleted_stale": deleted_stale,
                 "total_documents_in_store": total_in_store,
                 "status": "success" if failed_count == 0 else "partial",
+                "batch_count": len(batches),
+                "retried_batches": retried_batches,
+                "total_tokens": total_tokens,
+                "elapsed_seconds": elapsed,
+                "chunks_per_second": total_chunks / elapsed if elapsed > 0 else 0.0,
+                "tokens_per_second": total_tokens / elapsed if elapsed > 0 else 0.0,
+                **self._embedding_store_usage(store_counters),
             }
 
             logger.info(
-                f"Document addition completed. Added: {added_count}, Failed: {failed_count}, Total in store: {total_in_store}"
+                f"Concurrent addition completed. Added: {added_count}, Failed: {failed_count}, "
+                f"Unchanged: {skipped_unchanged}, Batches: {len(batches)}, "
+                f"Throughput: {result['chunks_per_second']:.1f} chunks/s, "
+                f"{result['tokens_per_second']:.0f} tokens/s"
             )
 
+            self._refresh_lexical_index(result)
             return result
 
         except Exception as e:
             raise VectorStoreError(f"Failed to add documents: {e}") from e
 
+    def _write_batch(
+        self,
+        batch: list[tuple[str, Document, int]],
+        max_retries: int,
+        retry_backoff: float,
+    ) -> tuple[int, int, int]:
+        """
+        1バッチを埋め込んで書き込む（失敗時は再試行、最終的に二分割）
+
+        Args:
+            batch: (チャンクID, ドキュメント, トークン数)のリスト
+            max_retries: 最大再試行回数
+            retry_backoff: 再試行の初回待機秒数
+
+        Returns:
+            tuple[int, int, int]: (追加数, 失敗数, 再試行したバッチ数)
+        """
+        retried = 0
+        for attempt in range(max_retries + 1):
+            try:
+                self.vector_store.add_documents(
+                    documents=[doc for _, doc, _ in batch],
+                    ids=[cid for cid, _, _ in batch],
+                )
+                self._record_added([doc.metadata for _, doc, _ in batch])
+                return len(batch), 0, retried
+            except Exception as e:
+                logger.warning(
+                    f"Embedding batch of {len(batch)} chunks failed "
+                    f"(attempt {attempt + 1}/{max_retries + 1}): {e}"
+                )
+                if attempt < max_retries:
+                    retried = 1
+                    time.sleep(retry_backoff * (2**attempt))
+
+        if len(batch) == 1:
+            logger.error(f"Giving up on chunk {batch[0][0]}")
+            return 0, 1, retried
+
+        # 問題のあるチャンクだけを失敗扱いにするため、二分割して再送
+        middle = len(batch) // 2
+        added_left, failed_left, _ = self._write_batch(batch[:middle], 0, retry_backoff)
+        added_right, failed_right, _ = self._write_batch(batch[middle:], 0, retry_backoff)
+        return added_left + added_right, failed_left + failed_right, 1
+
+    def _embedding_store_counters(self) -> tuple[int, int]:
+        """埋め込みストアの現在のヒット/ミス数（ストアが無効な場合は0）"""
+        if self.embedding_store is None:
+            return 0, 0
+        return self.embedding_store.hits, self.embedding_store.misses
+
+    def _embedding_store_usage(self, before: tuple[int, int]) -> dict[str, Any]:
+        """
+        インジェスト中の埋め込みストアの利用状況
+
+        Args:
+            before: インジェスト開始時のヒット/ミス数
+
+        Returns:
+            dict: embedding_store_hits, embedding_store_misses, embedding_store_hit_ratio
+        """
+        hits, misses = self._embedding_store_counters()
+        hits, misses = hits - before[0], misses - before[1]
+        return {
+            "embedding_store_hits": hits,
+            "embedding_store_misses": misses,
+            "embedding_store_hit_ratio": hits / (hits + misses) if hits + misses else 0.0,
+        }
+
+    def _prepare_chunks(
+        self, documents: list[Document]
+    ) -> tuple[dict[str, Document], list[tuple[str, Document]]]:
+        """
+        チャンクIDを付与し、未保存のチャンクを抽出
+
+        Args:
+            documents: 追加するドキュメントのリスト
+
+        Returns:
+            tuple: (チャンクID→ドキュメント, 埋め込みが必要な(チャンクID, ドキュメント)のリスト)
+        """
+        # 決定的IDを付与（入力内の重複は1件にまとめる）
+        chunks: dict[str, Document] = {}
+        for doc in documents:
+            chunk_id, chunk = self._with_content_hash(doc)
+            chunks.setdefault(chunk_id, chunk)
+
+        # 既に保存済みのチャンクは埋め込みをスキップ
+        existing_ids = self._get_existing_ids(list(chunks))
+        pending = [(cid, doc) for cid, doc in chunks.items() if cid not in existing_ids]
+        return chunks, pending
+
+    def _with_content_hash(self, document: Document) -> tuple[str, Document]:
+        """
+        チャンクIDを計算し、内容ハッシュをメタデータに付与したコピーを返す
+
+        Args:
+            document: 元のドキュメント
+
+        Returns:
+            tuple[str, Document]: (チャンクID, メタデータ付与済みドキュメント)
+        """
+        content_hash = compute_content_hash(document.page_content)
+        metadata = {**document.metadata, "content_hash": content_hash}
+        chunk = Document(page_content=document.page_content, metadata=metadata)
+        return make_chunk_id(chunk), chunk
+
+    def _get_existing_ids(self, ids: list[str], lookup_size: int = 500) -> set[str]:
+        """
+        指定IDのうちコレクションに存在するものを取得
+
+        取得に失敗した場合は空集合を返し、全件を埋め込み対象とします
+        （書き込みはupsertのため重複は発生しません）。
+
+        Args:
+            ids: 確認するチャンクIDのリスト
+            lookup_size: 1回の問い合わせで確認するID数
+
+        Returns:
+            set[str]: 存在するチャンクID
+        """
+        existing: set[str] = set()
+        try:
+            for i in range(0, len(ids), lookup_size):
+                found = self.vector_store.get(ids=ids[i : i + lookup_size], include=[])
+                existing.update(found["ids"])
+        except Exception as e:
+            logger.warning(f"Failed to look up existing chunk IDs, re-embedding all: {e}")
+            # 上書きされるチャンクを差分で数えられないため、統計は次回参照時に再集計する
+            self._stats = None
+            return set()
+        return existing
+
+    def _delete_stale_chunks(self, documents: Iterable[Document], keep_ids: set[str]) -> int:
+        """
+        投入したソースのうち、今回のチャンクに含まれない古いチャンクを削除
+
+        Args:
+            documents: 今回投入したドキュメント
+            keep_ids: 残すチャンクID
+
+        Returns:
+            int: 削除したチャンク数
+        """
+        sources = sorted({doc.metadata["source"] for doc in documents if "source" in doc.metadata})
+        if not sources:
+            return 0
+
+        try:
+            found = self.vector_store.get(where={"source": {"$in": sources}}, include=["metadatas"])
+            stale = [
+                (cid, metadata)
+                for cid, metadata in zip(found["ids"], found["metadatas"], strict=True)
+                if cid not in keep_ids
+            ]
+            stale_ids = [cid for cid, _ in stale]
+            if stale_ids:
+                self.vector_store.delete(ids=stale_ids)
+                if self._stats is not None:
+                    self._stats.record_deleted(metadata for _, metadata in stale)
+                logger.info(f"Deleted {len(stale_ids)} stale chunks from {len(sources)} sources")
+            return len(stale_ids)
+        except Exception as e:
+            logger.warning(f"Failed to delete stale chunks: {e}")
+            return 0
+
+    def _iter_collection(self, include: list[str]) -> Iterator[dict[str, Any]]:
+        """コレクションの内容をページ単位で取得"""
+        offset = 0
+        while True:
+            page = self.vector_store.get(include=include, limit=FETCH_PAGE_SIZE, offset=offset)
+            if not page["ids"]:
+                return
+            yield page
+            offset += len(page["ids"])
+
     def similarity_search(
         self,
         query: str,
@@ -204,49 +861,1051 @@ class ChromaVectorStore:
         except Exception as e:
             raise VectorStoreError(f"Failed to perform similarity search with score: {e}") from e
 
-    def delete_collection(self) -> bool:
+    async def asimilarity_search(
+        self,
+        query: str,
+        k: int = 5,
+        filter_metadata: dict[str, Any] | None = None,
+    ) -> list[Document]:
         """
-        コレクションを削除
+        類似度検索を非同期に実行
+
+        Args:
+            query: 検索クエリ
+            k: 取得する上位k件
+            filter_metadata: メタデータフィルタ
 
         Returns:
-            bool: 成功時True
+            list[Document]: 検索結果のドキュメントリスト
 
         Raises:
-            VectorStoreError: 削除エラー
+            VectorStoreError: 検索エラー
         """
-        logger.warning(f"Deleting collection: {self.collection_name}")
+        results = await self.asimilarity_search_with_score(query, k, filter_metadata)
+        return [doc for doc, _ in results]
+
+    async def asimilarity_search_with_score(
+        self,
+        query: str,
+        k: int = 5,
+        filter_metadata: dict[str, Any] | None = None,
+    ) -> list[tuple[Document, float]]:
+        """
+        スコア付き類似度検索を非同期に実行
+
+        クエリ埋め込みは非同期OpenAIクライアントで取得し、ローカルのChroma検索は
+        上限付きの専用スレッドプールで実行するため、イベントループを塞ぎません。
+
+        Args:
+            query: 検索クエリ
+            k: 取得する上位k件
+            filter_metadata: メタデータフィルタ
+
+        Returns:
+            list[tuple[Document, float]]: (ドキュメント, スコア)のリスト
+
+        Raises:
+            VectorStoreError: 検索エラー
+        """
+        if not query or not query.strip():
+            logger.warning("Empty query provided")
+            return []
+
+        logger.info(f"Performing async similarity search for query: {query[:50]}...")
 
         try:
-            self.vector_store.delete_collection()
-            logger.info(f"Successfully deleted collection: {self.collection_name}")
-            return True
+            embedding = await self.embeddings.aembed_query(query)
+            loop = asyncio.get_running_loop()
+            hits = await loop.run_in_executor(
+                self._get_search_executor(),
+                self._query_by_vectors,
+                [embedding],
+                k,
+                filter_metadata,
+            )
+
+            logger.info(f"Found {len(hits[0])} similar documents")
+
+            return hits[0]
 
         except Exception as e:
-            raise VectorStoreError(f"Failed to delete collection: {e}") from e
+            raise VectorStoreError(f"Failed to perform async similarity search: {e}") from e
 
-    def get_collection_count(self) -> int:
+    def similarity_search_batch(
+        self,
+        queries: list[str],
+        k: int = 5,
+        filter_metadata: dict[str, Any] | None = None,
+    ) -> list[list[tuple[Document, float]]]:
         """
-        コレクション内のドキュメント数を取得
+        複数クエリのスコア付き類似度検索をまとめて実行
+
+        全クエリを1回の埋め込みAPI呼び出しでベクトル化し、埋め込み行列を
+        1回のChroma queryで検索します。
+
+        Args:
+            queries: 検索クエリのリスト
+            k: クエリごとに取得する上位k件
+            filter_metadata: 全クエリに適用するメタデータフィルタ
 
         Returns:
-            int: ドキュメント数
+            list[list[tuple[Document, float]]]: 入力順の(ドキュメント, スコア)のリスト
+                空のクエリに対応する位置は空リストになります。
+
+        Raises:
+            VectorStoreError: 検索エラー
         """
-        return self._get_collection_count()
+        positions = [i for i, query in enumerate(queries) if query and query.strip()]
+        results: list[list[tuple[Document, float]]] = [[] for _ in queries]
+        if not positions:
+            return results
 
-    def _get_collection_count(self) -> int:
+        logger.info(f"Performing batch similarity search for {len(positions)} queries")
+
+        try:
+            embeddings = self.embeddings.embed_queries([queries[i] for i in positions])
+            hits = self._query_by_vectors(embeddings, k, filter_metadata)
+            for i, query_hits in zip(positions, hits, strict=True):
+                results[i] = query_hits
+
+            logger.info(f"Batch search returned {sum(len(r) for r in results)} documents")
+
+            return results
+
+        except Exception as e:
+            raise VectorStoreError(f"Failed to perform batch similarity search: {e}") from e
+
+    def _query_by_vectors(
+        self,
+        embeddings: list[list[float]],
+        k: int,
+        filter_metadata: dict[str, Any] | None,
+    ) -> list[list[tuple[Document, float]]]:
+        """埋め込み行列を1回のChroma queryで検索"""
+        response = self.vector_store._collection.query(
+            query_embeddings=embeddings,
+            n_results=k,
+            where=filter_metadata,
+            include=["documents", "metadatas", "distances"],
+        )
+
+        return [
+            [
+                (Document(id=chunk_id, page_content=text or "", metadata=metadata or {}), distance)
+                for chunk_id, text, metadata, distance in zip(
+                    ids, documents, metadatas, distances, strict=True
+                )
+            ]
+            for ids, documents, metadatas, distances in zip(
+                response["ids"],
+                response["documents"],
+                response["metadatas"],
+                response["distances"],
+                strict=True,
+            )
+        ]
+
+    def mmr_search(
+        self,
+        query: str,
+        k: int = 5,
+        filter_metadata: dict[str, Any] | None = None,
+        fetch_k: int | None = None,
+        lambda_mult: float | None = None,
+    ) -> list[Document]:
         """
-        コレクション内のドキュメント数を取得（内部用）
+        MMR検索を実行（類似度上位の候補から重複の少ないk件を選択）
+
+        Args:
+            query: 検索クエリ
+            k: 取得する件数
+            filter_metadata: メタデータフィルタ
+            fetch_k: 多様化の対象とする候補数（未指定時は設定値とkの大きい方）
+            lambda_mult: 関連度の重み（未指定時は設定値）
 
         Returns:
-            int: ドキュメント数
+            list[Document]: 検索結果のドキュメントリスト（MMRの選択順）
+
+        Raises:
+            VectorStoreError: 検索エラー
         """
-        try:
-            collection = self.vector_store._collection
+        return [
+            doc
+            for doc, _ in self.mmr_search_with_score(
+                query, k, filter_metadata, fetch_k=fetch_k, lambda_mult=lambda_mult
+            )
+        ]
+
+    def mmr_search_with_score(
+        self,
+        query: str,
+        k: int = 5,
+        filter_metadata: dict[str, Any] | None = None,
+        fetch_k: int | None = None,
+        lambda_mult: float | None = None,
+    ) -> list[tuple[Document, float]]:
+        """
+        スコア付きMMR検索を実行
+
+        埋め込み付きで候補を1回取得し、事前計算したノルムで正規化した行列に対して
+        NumPyでMMR選択を行います（候補の再取得や再埋め込みはしません）。
+
+        Args:
+            query: 検索クエリ
+            k: 取得する件数
+            filter_metadata: メタデータフィルタ
+            fetch_k: 多様化の対象とする候補数（未指定時は設定値とkの大きい方）
+            lambda_mult: 関連度の重み（未指定時は設定値）
+
+        Returns:
+            list[tuple[Document, float]]: (ドキュメント, 距離)のリスト（MMRの選択順）
+
+        Raises:
+            VectorStoreError: 検索エラー
+        """
+        if not query or not query.strip():
+            logger.warning("Empty query provided")
+            return []
+
+        fetch_k = max(fetch_k or settings.mmr_fetch_k, k)
+        lambda_mult = settings.mmr_lambda if lambda_mult is None else lambda_mult
+
+        try:
+            logger.info(f"Performing MMR search for query: {query[:50]}...")
+            embedding = self.embeddings.embed_query(query)
+            hits, vectors, norms = self._query_candidates(embedding, fetch_k, filter_metadata)
+            selected = maximal_marginal_relevance(
+                embedding, vectors, k, lambda_mult=lambda_mult, norms=norms
+            )
+            logger.info(f"MMR selected {len(selected)} of {len(hits)} candidates")
+            return [hits[i] for i in selected]
+
+        except Exception as e:
+            raise VectorStoreError(f"Failed to perform MMR search: {e}") from e
+
+    async def ammr_search(
+        self,
+        query: str,
+        k: int = 5,
+        filter_metadata: dict[str, Any] | None = None,
+        fetch_k: int | None = None,
+        lambda_mult: float | None = None,
+    ) -> list[Document]:
+        """
+        MMR検索を非同期に実行
+
+        クエリ埋め込みは非同期OpenAIクライアントで取得し、候補の取得とMMR選択は
+        専用スレッドプールで実行します。
+
+        Args:
+            query: 検索クエリ
+            k: 取得する件数
+            filter_metadata: メタデータフィルタ
+            fetch_k: 多様化の対象とする候補数（未指定時は設定値とkの大きい方）
+            lambda_mult: 関連度の重み（未指定時は設定値）
+
+        Returns:
+            list[Document]: 検索結果のドキュメントリスト（MMRの選択順）
+
+        Raises:
+            VectorStoreError: 検索エラー
+        """
+        if not query or not query.strip():
+            logger.warning("Empty query provided")
+            return []
+
+        fetch_k = max(fetch_k or settings.mmr_fetch_k, k)
+        lambda_mult = settings.mmr_lambda if lambda_mult is None else lambda_mult
+
+        def select(embedding: list[float]) -> list[Document]:
+            hits, vectors, norms = self._query_candidates(embedding, fetch_k, filter_metadata)
+            selected = maximal_marginal_relevance(
+                embedding, vectors, k, lambda_mult=lambda_mult, norms=norms
+            )
+            logger.info(f"MMR selected {len(selected)} of {len(hits)} candidates")
+            return [hits[i][0] for i in selected]
+
+        try:
+            logger.info(f"Performing async MMR search for query: {query[:50]}...")
+            embedding = await self.embeddings.aembed_query(query)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_search_executor(), select, embedding)
+
+        except Exception as e:
+            raise VectorStoreError(f"Failed to perform async MMR search: {e}") from e
+
+    def _query_candidates(
+        self,
+        embedding: list[float],
+        fetch_k: int,
+        filter_metadata: dict[str, Any] | None,
+    ) -> tuple[list[tuple[Document, float]], np.ndarray, np.ndarray]:
+        """
+        MMR用に候補を埋め込み付きで取得
+
+        Returns:
+            tuple: ((ドキュメント, 距離)のリスト, 埋め込み行列 (n, dim), L2ノルム (n,))
+        """
+        response = self.vector_store._collection.query(
+            query_embeddings=[embedding],
+            n_results=fetch_k,
+            where=filter_metadata,
+            include=["documents", "metadatas", "distances", "embeddings"],
+        )
+
+        hits = [
+            (Document(id=chunk_id, page_content=text or "", metadata=metadata or {}), distance)
+            for chunk_id, text, metadata, distance in zip(
+                response["ids"][0],
+                response["documents"][0],
+                response["metadatas"][0],
+                response["distances"][0],
+                strict=True,
+            )
+        ]
+        if not hits:
+            return [], np.empty((0, 0), dtype=np.float32), np.empty(0, dtype=np.float32)
+
+        vectors = np.asarray(response["embeddings"][0], dtype=np.float32)
+        norms = np.sqrt(np.einsum("ij,ij->i", vectors, vectors))
+        return hits, vectors, norms
+
+    def hybrid_search(
+        self,
+        query: str,
+        k: int = 5,
+        filter_metadata: dict[str, Any] | None = None,
+    ) -> list[Document]:
+        """
+        ハイブリッド検索を実行（BM25 + ベクトル検索をRRFで統合）
+
+        Args:
+            query: 検索クエリ
+            k: 取得する上位k件
+            filter_metadata: メタデータフィルタ
+
+        Returns:
+            list[Document]: 検索結果のドキュメントリスト
+
+        Raises:
+            VectorStoreError: 検索エラー
+        """
+        return [doc for doc, _ in self.hybrid_search_with_score(query, k, filter_metadata)]
+
+    def hybrid_search_with_score(
+        self,
+        query: str,
+        k: int = 5,
+        filter_metadata: dict[str, Any] | None = None,
+        fetch_k: int | None = None,
+    ) -> list[tuple[Document, float]]:
+        """
+        スコア付きハイブリッド検索を実行
+
+        ベクトル検索（クエリ埋め込みを含む）を専用スレッドプールで開始し、その間に
+        呼び出し元スレッドでBM25検索を行います。語彙検索は埋め込みAPIの応答を待たず、
+        ベクトル検索が失敗した場合は語彙検索の結果のみで応答します。
+
+        Args:
+            query: 検索クエリ
+            k: 取得する上位k件
+            filter_metadata: メタデータフィルタ
+            fetch_k: 各検索器から取得する候補数（未指定時は設定値とkの大きい方）
+
+        Returns:
+            list[tuple[Document, float]]: (ドキュメント, RRFスコア)のリスト
+                スコアは大きいほど関連度が高い値です（距離ではありません）。
+
+        Raises:
+            VectorStoreError: 検索エラー
+        """
+        if not query or not query.strip():
+            logger.warning("Empty query provided")
+            return []
+
+        fetch_k = max(fetch_k or settings.hybrid_fetch_k, k)
+        logger.info(f"Performing hybrid search for query: {query[:50]}...")
+
+        vector_future = self._get_search_executor().submit(
+            self.similarity_search_with_score, query, fetch_k, filter_metadata
+        )
+
+        try:
+            lexical_index = self.get_lexical_index()
+            lexical_hits = lexical_index.search(query, k=fetch_k, where=filter_metadata)
+        except Exception as e:
+            logger.warning(f"Lexical search unavailable, using vector results only: {e}")
+            lexical_index = None
+            lexical_hits = []
+
+        try:
+            vector_results = vector_future.result()
+        except VectorStoreError as e:
+            if not lexical_hits:
+                raise
+            logger.warning(f"Vector search failed, using lexical results only: {e}")
+            vector_results = []
+
+        return self._fuse_hybrid_results(vector_results, lexical_index, lexical_hits, k)
+
+    async def ahybrid_search(
+        self,
+        query: str,
+        k: int = 5,
+        filter_metadata: dict[str, Any] | None = None,
+    ) -> list[Document]:
+        """
+        ハイブリッド検索を非同期に実行
+
+        Args:
+            query: 検索クエリ
+            k: 取得する上位k件
+            filter_metadata: メタデータフィルタ
+
+        Returns:
+            list[Document]: 検索結果のドキュメントリスト
+
+        Raises:
+            VectorStoreError: 検索エラー
+        """
+        results = await self.ahybrid_search_with_score(query, k, filter_metadata)
+        return [doc for doc, _ in results]
+
+    async def ahybrid_search_with_score(
+        self,
+        query: str,
+        k: int = 5,
+        filter_metadata: dict[str, Any] | None = None,
+        fetch_k: int | None = None,
+    ) -> list[tuple[Document, float]]:
+        """
+        スコア付きハイブリッド検索を非同期に実行
+
+        ベクトル検索（非同期クライアントでのクエリ埋め込みを含む）とBM25検索を並行して行い、
+        RRFで統合します。BM25検索は専用スレッドプールで実行するため、イベントループを塞ぎません。
+
+        Args:
+            query: 検索クエリ
+            k: 取得する上位k件
+            filter_metadata: メタデータフィルタ
+            fetch_k: 各検索器から取得する候補数（未指定時は設定値とkの大きい方）
+
+        Returns:
+            list[tuple[Document, float]]: (ドキュメント, RRFスコア)のリスト
+
+        Raises:
+            VectorStoreError: 検索エラー
+        """
+        if not query or not query.strip():
+            logger.warning("Empty query provided")
+            return []
+
+        fetch_k = max(fetch_k or settings.hybrid_fetch_k, k)
+        logger.info(f"Performing async hybrid search for query: {query[:50]}...")
+
+        def lexical_search() -> tuple[LexicalIndex, list[tuple[int, float]]]:
+            lexical_index = self.get_lexical_index()
+            return lexical_index, lexical_index.search(query, k=fetch_k, where=filter_metadata)
+
+        loop = asyncio.get_running_loop()
+        vector_task = asyncio.ensure_future(
+            self.asimilarity_search_with_score(query, fetch_k, filter_metadata)
+        )
+        try:
+            try:
+                lexical_index, lexical_hits = await loop.run_in_executor(
+                    self._get_search_executor(), lexical_search
+                )
+            except Exception as e:
+                logger.warning(f"Lexical search unavailable, using vector results only: {e}")
+                lexical_index = None
+                lexical_hits = []
+
+            try:
+                vector_results = await vector_task
+            except VectorStoreError as e:
+                if not lexical_hits:
+                    raise
+                logger.warning(f"Vector search failed, using lexical results only: {e}")
+                vector_results = []
+        finally:
+            # キャンセル時に埋め込みリクエストを残さない
+            vector_task.cancel()
+
+        return self._fuse_hybrid_results(vector_results, lexical_index, lexical_hits, k)
+
+    def _fuse_hybrid_results(
+        self,
+        vector_results: list[tuple[Document, float]],
+        lexical_index: LexicalIndex | None,
+        lexical_hits: list[tuple[int, float]],
+        k: int,
+    ) -> list[tuple[Document, float]]:
+        """ベクトル検索とBM25検索の順位をRRFで統合"""
+        candidates: dict[str, Document] = {}
+        vector_ranking: list[str] = []
+        for doc, _ in vector_results:
+            key = doc.id or make_chunk_id(doc)
+            candidates.setdefault(key, doc)
+            vector_ranking.append(key)
+
+        lexical_ranking: list[str] = []
+        for row, _ in lexical_hits:
+            key = lexical_index.ids[row]
+            if key not in candidates:
+                candidates[key] = lexical_index.document(row)
+            lexical_ranking.append(key)
+
+        fused = reciprocal_rank_fusion(
+            [vector_ranking, lexical_ranking], rrf_k=settings.hybrid_rrf_k
+        )[:k]
+
+        logger.info(
+            f"Hybrid search fused {len(vector_ranking)} vector and "
+            f"{len(lexical_ranking)} lexical candidates into {len(fused)} results"
+        )
+
+        return [(candidates[key], score) for key, score in fused]
+
+    def get_parent_store(self) -> ParentDocumentStore:
+        """
+        親セクションのストアを取得（Chromaディレクトリの隣のSQLiteを使用）
+
+        Returns:
+            ParentDocumentStore: 親ドキュメントストア
+        """
+        if self._parent_store is None:
+            with self._parent_lock:
+                if self._parent_store is None:
+                    self._parent_store = ParentDocumentStore(self.parent_store_path)
+        return self._parent_store
+
+    def get_lexical_index(self) -> LexicalIndex:
+        """
+        BM25語彙インデックスを取得（保存済みがあれば読み込み、なければ構築）
+
+        Returns:
+            LexicalIndex: 語彙インデックス
+        """
+        if self._lexical_index is None:
+            with self._lexical_lock:
+                if self._lexical_index is None:
+                    if self.lexical_index_path.exists():
+                        self._lexical_index = LexicalIndex.load(self.lexical_index_path)
+                        logger.info(
+                            f"Loaded lexical index with {len(self._lexical_index)} documents"
+                        )
+                    else:
+                        self._lexical_index = self._build_lexical_index()
+        return self._lexical_index
+
+    def rebuild_lexical_index(self) -> LexicalIndex:
+        """
+        コレクションの内容からBM25語彙インデックスを再構築して保存
+
+        Returns:
+            LexicalIndex: 再構築したインデックス
+
+        Raises:
+            VectorStoreError: 構築エラー
+        """
+        try:
+            with self._lexical_lock:
+                self._lexical_index = self._build_lexical_index()
+            return self._lexical_index
+        except Exception as e:
+            raise VectorStoreError(f"Failed to build lexical index: {e}") from e
+
+    def _build_lexical_index(self) -> LexicalIndex:
+        """コレクションの全チャンクを読み出して語彙インデックスを構築・保存"""
+        ids: list[str] = []
+        documents: list[str] = []
+        metadatas: list[dict[str, Any]] = []
+        for page in self._iter_collection(["documents", "metadatas"]):
+            ids.extend(page["ids"])
+            documents.extend(page["documents"])
+            metadatas.extend(page["metadatas"])
+
+        index = LexicalIndex.from_records(
+            ids,
+            documents,
+            metadatas,
+            manifest={
+                "collection_name": self.collection_name,
+                "corpus_version": compute_corpus_version(ids),
+                "count": len(ids),
+                "built_at": datetime.utcnow().isoformat() + "Z",
+            },
+        )
+        index.save(self.lexical_index_path)
+        logger.info(f"Built lexical index with {len(index)} documents")
+        return index
+
+    def _refresh_lexical_index(self, result: dict[str, Any]) -> None:
+        """インジェストでコーパスが変わった場合に語彙インデックスを再構築"""
+        if not self.lexical_index_enabled:
+            return
+        if not (result["added_count"] or result["deleted_stale"]):
+            return
+        try:
+            self.rebuild_lexical_index()
+        except VectorStoreError as e:
+            # 語彙インデックスはベクトル検索の補助のため、失敗してもインジェストは成功扱い
+            logger.warning(f"{e}")
+
+    def _get_search_executor(self) -> ThreadPoolExecutor:
+        """ベクトル検索用の専用スレッドプールを取得"""
+        if self._search_executor is None:
+            with self._executor_lock:
+                if self._search_executor is None:
+                    self._search_executor = ThreadPoolExecutor(
+                        max_workers=settings.vector_search_max_workers,
+                        thread_name_prefix="vector-search",
+                    )
+        return self._search_executor
+
+    def delete_collection(self) -> bool:
+        """
+        コレクションを削除
+
+        Returns:
+            bool: 成功時True
+
+        Raises:
+            VectorStoreError: 削除エラー
+        """
+        logger.warning(f"Deleting collection: {self.collection_name}")
+
+        try:
+            self.vector_store.delete_collection()
+            self.lexical_index_path.unlink(missing_ok=True)
+            self._lexical_index = None
+            self.stats_path.unlink(missing_ok=True)
+            self._stats = None
+            self._corpus_version = None
+            if self._parent_store is not None:
+                self._parent_store.close()
+                self._parent_store = None
+            self.parent_store_path.unlink(missing_ok=True)
+            logger.info(f"Successfully deleted collection: {self.collection_name}")
+            return True
+
+        except Exception as e:
+            raise VectorStoreError(f"Failed to delete collection: {e}") from e
+
+    def get_collection_count(self) -> int:
+        """
+        コレクション内のドキュメント数を取得
+
+        Returns:
+            int: ドキュメント数
+        """
+        return self._get_collection_count()
+
+    def _get_collection_count(self) -> int:
+        """
+        コレクション内のドキュメント数を取得（内部用）
+
+        Returns:
+            int: ドキュメント数
+        """
+        try:
+            collection = self.vector_store._collection
             return collection.count()
         except Exception as e:
             logger.error(f"Failed to get collection count: {e}")
             return 0
 
+    def get_collection_info(self) -> dict[str, Any]:
+        """
+        コレクションの統計情報を取得
+
+        初回参照時を除き、書き込み時に更新されるメモリ上のキャッシュから返すため、
+        データベースへの問い合わせは発生しません。他のプロセス（インジェストスクリプトや
+        別ワーカー）が統計ファイルを書き換えた場合は読み込み直します。
+
+        Returns:
+            dict: collection_name, document_count, documents_by_type,
+                embedding_dimension, disk_size_bytes, last_ingest_at
+
+        Raises:
+            VectorStoreError: 統計情報の集計エラー
+        """
+        return {"collection_name": self.collection_name, **self._get_stats().to_dict()}
+
+    def _get_stats(self) -> CollectionStats:
+        """
+        統計情報のキャッシュを取得（未読み込みの場合は読み込み、必要なら再集計）
+
+        永続化された統計は件数がコレクションと一致する場合のみ使用します。
+        統計ファイルの(inode, 更新時刻)が読み込み時から変わっていれば、
+        他のプロセスが書き込んだものとして読み込み直します。
+
+        Returns:
+            CollectionStats: 統計情報
+
+        Raises:
+            VectorStoreError: 集計エラー
+        """
+        stats = self._stats
+        if stats is not None and self._stats_signature == self._corpus_signature():
+            return stats
+
+        with self._stats_lock:
+            stats = self._stats
+            if stats is not None and self._stats_signature == self._corpus_signature():
+                return stats
+
+            try:
+                stats = CollectionStats.load(self.stats_path)
+                if stats is None or stats.document_count != self._get_collection_count():
+                    stats = self._scan_stats(stats)
+            except Exception as e:
+                raise VectorStoreError(f"Failed to collect collection stats: {e}") from e
+
+            self._stats = stats
+            self._stats_signature = self._corpus_signature()
+            return stats
+
+    def _scan_stats(self, previous: CollectionStats | None) -> CollectionStats:
+        """コレクション全体のメタデータを走査して統計情報を作り直す"""
+        stats = CollectionStats(
+            self.stats_path,
+            last_ingest_at=previous.last_ingest_at if previous else None,
+        )
+        for page in self._iter_collection(["metadatas"]):
+            stats.record_added(page["metadatas"])
+        stats.embedding_dimension = self._probe_dimension()
+        stats.disk_size_bytes = directory_size(self.persist_directory)
+        stats.save()
+        logger.info(f"Collected stats for {stats.document_count} chunks in {self.collection_name}")
+        return stats
+
+    def _probe_dimension(self) -> int | None:
+        """保存済みの埋め込みを1件取得して次元数を調べる（空の場合はNone）"""
+        embedding = self._probe_embedding()
+        return None if embedding is None else len(embedding)
+
+    def _probe_embedding(self) -> list[float] | None:
+        """保存済みの埋め込みを1件取得（空の場合はNone）"""
+        page = self.vector_store.get(limit=1, include=["embeddings"])
+        embeddings = page.get("embeddings")
+        if embeddings is None or len(embeddings) == 0:
+            return None
+        return list(embeddings[0])
+
+    def _record_added(self, metadatas: list[dict[str, Any]]) -> None:
+        """書き込んだチャンクを統計に反映（未読み込みの場合は次回の集計に任せる）"""
+        stats = self._stats
+        if stats is not None:
+            stats.record_added(metadatas)
+
+    def _record_ingest(self) -> int:
+        """
+        インジェスト完了を統計に記録
+
+        Returns:
+            int: コレクション内のチャンク数
+        """
+        self._corpus_version = None
+        stats = self._get_stats()
+        if stats.embedding_dimension is None and stats.document_count:
+            stats.embedding_dimension = self._probe_dimension()
+        stats.record_ingest(self.persist_directory)
+        # 自身の書き込みで変わった署名を記録し、次回参照時に読み込み直さないようにする
+        self._stats_signature = self._corpus_signature()
+        return stats.document_count
+
+    def get_corpus_version(self) -> str:
+        """
+        現在のコーパスバージョンを取得
+
+        Returns:
+            str: コーパスバージョン
+        """
+        try:
+            return compute_corpus_version(self.vector_store.get(include=[])["ids"])
+        except Exception as e:
+            raise VectorStoreError(f"Failed to compute corpus version: {e}") from e
+
+    def get_cached_corpus_version(self) -> str:
+        """
+        現在のコーパスバージョンを取得（メモ化）
+
+        インジェストのたびに統計ファイルが置き換えられるため、そのinodeと更新時刻が
+        変わるまでは前回の値を返します。他のプロセス（インジェストスクリプトや別ワーカー）の
+        書き込みも検知できるため、リクエストごとの参照に使えます。
+
+        Returns:
+            str: コーパスバージョン
+
+        Raises:
+            VectorStoreError: 計算エラー
+        """
+        signature = self._corpus_signature()
+        memo = self._corpus_version
+        if memo is not None and memo[0] == signature:
+            return memo[1]
+
+        version = self.get_corpus_version()
+        self._corpus_version = (signature, version)
+        return version
+
+    def _corpus_signature(self) -> tuple[int, int] | None:
+        """統計ファイルの(inode, 更新時刻)。インジェスト・削除のたびに変わる"""
+        try:
+            stat = os.stat(self.stats_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns
+
+    def export_snapshot(self, directory: str | Path) -> dict[str, Any]:
+        """
+        コレクションの内容をスナップショットとして書き出す
+
+        埋め込みは1つの `.npy`、本文とメタデータは列指向のJSON、
+        埋め込みモデル名とコーパスバージョンはマニフェストに保存します。
+        親ドキュメントストアの親セクションも含めます（復元後もsmall-to-big検索を使えるように）。
+
+        Args:
+            directory: 書き出し先ディレクトリ
+
+        Returns:
+            dict: 書き出したスナップショットのマニフェスト
+
+        Raises:
+            VectorStoreError: 書き出しエラー
+        """
+        from src.features.rag.snapshot import VectorSnapshot
+
+        start_time = time.time()
+        try:
+            ids: list[str] = []
+            pages: list[Any] = []
+            documents: list[str] = []
+            metadatas: list[dict[str, Any]] = []
+            for page in self._iter_collection(["embeddings", "documents", "metadatas"]):
+                ids.extend(page["ids"])
+                pages.append(page["embeddings"])
+                documents.extend(page["documents"])
+                metadatas.extend(dict(m or {}) for m in page["metadatas"])
+
+            embeddings = (
+                np.concatenate([np.asarray(p, dtype=np.float32) for p in pages])
+                if pages
+                else np.empty((0, 0), dtype=np.float32)
+            )
+            snapshot = VectorSnapshot(
+                ids,
+                embeddings,
+                documents,
+                metadatas,
+                manifest={
+                    "collection_name": self.collection_name,
+                    "embedding_model": self.embedding_model_name,
+                    "embedding_dimensions": self.embedding_dimensions,
+                    "hnsw": self.hnsw_config,
+                    "created_at": datetime.utcnow().isoformat() + "Z",
+                },
+                parents=self.get_parent_store().export_sections(),
+            )
+            manifest = snapshot.save(directory)
+
+        except Exception as e:
+            raise VectorStoreError(f"Failed to export snapshot: {e}") from e
+
+        logger.info(
+            f"Exported snapshot of {manifest['count']} chunks to {directory} "
+            f"in {time.time() - start_time:.2f}s"
+        )
+        return manifest
+
+    def import_snapshot(self, directory: str | Path, prune: bool = True) -> dict[str, Any]:
+        """
+        スナップショットをコレクションに一括投入（埋め込みAPIは呼び出さない）
+
+        スナップショットに親セクションが含まれていれば親ドキュメントストアも復元します。
+        含まれておらず親ドキュメントストアも空の場合、親ドキュメント展開（rag_parent_expansion）が
+        有効なら警告を出します（再インジェストするまでチャンクは展開されません）。
+
+        Args:
+            directory: スナップショットディレクトリ
+            prune: スナップショットに含まれないチャンク・親セクションを削除するか
+
+        Returns:
+            dict: 投入結果の統計情報
+
+        Raises:
+            VectorStoreError: 埋め込みモデルの不一致、スナップショットの破損、書き込みエラー
+        """
+        from src.features.rag.snapshot import VectorSnapshot
+
+        start_time = time.time()
+        snapshot = VectorSnapshot.load(directory)
+        model = snapshot.manifest.get("embedding_model")
+        if model != self.embedding_model_name:
+            raise VectorStoreError(
+                f"Snapshot was built with embedding model '{model}', "
+                f"but the store uses '{self.embedding_model_name}'"
+            )
+        dimension = snapshot.manifest.get("dimension")
+        if self.embedding_dimensions and len(snapshot) and dimension != self.embedding_dimensions:
+            raise VectorStoreError(
+                f"Snapshot has {dimension}-dimensional embeddings, "
+                f"but the store is configured for {self.embedding_dimensions} dimensions"
+            )
+
+        try:
+            for start in range(0, len(snapshot), SNAPSHOT_WRITE_BATCH_SIZE):
+                end = start + SNAPSHOT_WRITE_BATCH_SIZE
+                self._upsert_records(
+                    snapshot.ids[start:end],
+                    np.asarray(snapshot.embeddings[start:end], dtype=np.float32),
+                    snapshot.documents[start:end],
+                    snapshot.metadatas[start:end],
+                )
+
+            deleted = 0
+            if prune:
+                keep = set(snapshot.ids)
+                stale_ids = [
+                    cid
+                    for page in self._iter_collection([])
+                    for cid in page["ids"]
+                    if cid not in keep
+                ]
+                if stale_ids:
+                    self._delete_ids(stale_ids)
+                deleted = len(stale_ids)
+
+            parent_store = self.get_parent_store()
+            if snapshot.parents:
+                parent_sections = parent_store.import_sections(snapshot.parents, replace=prune)
+            else:
+                parent_sections = len(parent_store)
+
+        except Exception as e:
+            raise VectorStoreError(f"Failed to import snapshot: {e}") from e
+
+        if settings.rag_parent_expansion and not parent_sections:
+            logger.warning(
+                "Snapshot has no parent sections and the parent store is empty; "
+                "chunks will not be expanded to parent sections until ingestion is re-run"
+            )
+
+        # 上書き・削除されたチャンクを差分で数えられないため再集計する
+        self._stats = None
+        result = {
+            "added_count": len(snapshot),
+            "deleted_stale": deleted,
+            "total_documents_in_store": self._record_ingest(),
+            "corpus_version": snapshot.manifest["corpus_version"],
+            "parent_sections": parent_sections,
+            "elapsed_seconds": time.time() - start_time,
+            "status": "success",
+        }
+        self._refresh_lexical_index(result)
+
+        logger.info(
+            f"Imported snapshot of {len(snapshot)} chunks from {directory} "
+            f"in {result['elapsed_seconds']:.2f}s (deleted {deleted} stale chunks)"
+        )
+        return result
+
+    def _upsert_records(
+        self,
+        ids: list[str],
+        embeddings: np.ndarray,
+        documents: list[str],
+        metadatas: list[dict[str, Any]],
+    ) -> None:
+        """埋め込み済みのレコードをそのままコレクションに書き込む"""
+        self.vector_store._collection.upsert(
+            ids=ids,
+            embeddings=embeddings,
+            documents=documents,
+            metadatas=[metadata or None for metadata in metadatas],
+        )
+
+    def _delete_ids(self, ids: list[str]) -> None:
+        """指定したチャンクIDをコレクションから削除"""
+        self.vector_store.delete(ids=ids)
+
+    def warmup(self, loop: asyncio.AbstractEventLoop | None = None) -> dict[str, Any]:
+        """
+        初回検索の遅延要因を事前に解消（起動時に呼び出す）
+
+        1. コレクションを開く（SQLiteのオープン）
+        2. キャッシュ済みのクエリ埋め込みをメモリに読み込む
+        3. その埋め込み（なければ保存済みのチャンク埋め込み）でプローブ検索し、
+           インデックスをメモリに載せる
+        4. 語彙インデックスを読み込む
+        5. 埋め込みAPIへのHTTP接続を確立する（loop指定時は非同期クライアントも）
+
+        Args:
+            loop: asimilarity_search()などを処理するイベントループ
+
+        Returns:
+            dict: status（ready / degraded）, steps（ステップごとの所要時間・エラー）,
+                elapsed_seconds
+        """
+        probes: list[list[float]] = []
+
+        def load_query_cache() -> None:
+            probes.extend(self.query_cache.preload(self.query_cache.max_size))
+
+        def probe_index() -> None:
+            queries = probes[:WARMUP_PROBE_QUERIES]
+            if not queries:
+                embedding = self._probe_embedding()
+                if embedding is None:
+                    return
+                queries = [embedding]
+            self._query_by_vectors(queries, 1, None)
+
+        steps = [
+            ("collection", self._get_collection_count),
+            ("query_cache", load_query_cache),
+            ("index", probe_index),
+        ]
+        if self.lexical_index_enabled:
+            steps.append(("lexical_index", self.get_lexical_index))
+
+        def open_embeddings_connections() -> None:
+            embeddings = self.embeddings.embeddings
+            open_openai_connection(embeddings.client._client, self.embedding_model_name)
+            if loop is not None:
+                open_async_openai_connection(
+                    embeddings.async_client._client, self.embedding_model_name, loop
+                )
+
+        steps.append(("embeddings_connection", open_embeddings_connections))
+
+        result = run_warmup_steps(steps)
+        result["probe_queries"] = min(len(probes), WARMUP_PROBE_QUERIES)
+        return result
+
+    def get_query_cache_stats(self) -> dict[str, Any]:
+        """
+        クエリ埋め込みキャッシュの統計情報を取得
+
+        Returns:
+            dict: ヒット/ミス数とヒット率
+        """
+        return self.query_cache.stats()
+
+    def close(self) -> None:
+        """検索用スレッドプールとクエリ埋め込みキャッシュの接続を解放"""
+        with self._executor_lock:
+            if self._search_executor is not None:
+                self._search_executor.shutdown(wait=False)
+                self._search_executor = None
+        if self._parent_store is not None:
+            self._parent_store.close()
+        if self.embedding_store is not None:
+            self.embedding_store.close()
+        self.query_cache.close()
+
     def as_retriever(self, search_kwargs: dict[str, Any] | None = None):
         """
         Retrieverとして取得
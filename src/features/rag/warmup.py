@@ -0,0 +1,105 @@
+"""
+LangGraph Catalyst - Retrieval Warmup
+
+起動直後の初回リクエストが遅くならないよう、検索スタックを事前に温めるモジュール。
+SQLiteのオープン・HNSWセグメントの読み込み・OpenAIクライアント（同期・非同期）の
+TLSハンドシェイクをリクエストの外で済ませます。各ステップの失敗は起動を止めず、結果として報告します。
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from typing import Any
+
+import openai
+
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# プローブ検索に使うキャッシュ済みクエリ埋め込みの最大件数
+WARMUP_PROBE_QUERIES = 8
+
+
+def run_warmup_steps(steps: list[tuple[str, Callable[[], Any]]]) -> dict[str, Any]:
+    """
+    ウォームアップの各ステップを順に実行して所要時間を記録
+
+    Args:
+        steps: (ステップ名, 実行関数)のリスト
+
+    Returns:
+        dict: status（ready / degraded）, steps（ステップ名→seconds, error）, elapsed_seconds
+    """
+    start = time.perf_counter()
+    results: dict[str, dict[str, Any]] = {}
+
+    for name, step in steps:
+        step_start = time.perf_counter()
+        result: dict[str, Any] = {}
+        try:
+            step()
+        except Exception as e:
+            logger.warning(f"Warmup step '{name}' failed: {e}")
+            result["error"] = str(e)
+        result["seconds"] = time.perf_counter() - step_start
+        results[name] = result
+
+    elapsed = time.perf_counter() - start
+    status = "degraded" if any("error" in result for result in results.values()) else "ready"
+    logger.info(f"Warmup finished in {elapsed:.2f}s ({status})")
+    return {"status": status, "steps": results, "elapsed_seconds": elapsed}
+
+
+def open_openai_connection(client: openai.OpenAI, model: str) -> None:
+    """
+    OpenAIクライアントのHTTP接続を事前に確立
+
+    トークンを消費しないモデル情報の取得で接続プールにTLS接続を作ります。
+    コピーしたクライアントは元のHTTPクライアント（接続プール）を共有します。
+
+    Args:
+        client: OpenAIクライアント
+        model: 問い合わせるモデル名
+    """
+    try:
+        client.with_options(timeout=settings.warmup_http_timeout, max_retries=0).models.retrieve(
+            model
+        )
+    except openai.APIStatusError as e:
+        # HTTPレスポンスが返っていれば接続は確立済み
+        logger.debug(f"Warmup request for {model} returned {e.status_code}")
+
+
+def open_async_openai_connection(
+    client: openai.AsyncOpenAI, model: str, loop: asyncio.AbstractEventLoop
+) -> None:
+    """
+    非同期OpenAIクライアントのHTTP接続を、リクエストを処理するイベントループ上で事前に確立
+
+    httpxの非同期接続はイベントループに結び付くため、別のループ（asyncio.run）で開いた
+    接続はリクエスト処理で再利用できません。ウォームアップのスレッドからサーバーの
+    イベントループにモデル情報の取得を投入し、完了を待ちます。
+
+    Args:
+        client: 非同期OpenAIクライアント
+        model: 問い合わせるモデル名
+        loop: リクエストを処理するイベントループ（呼び出し元とは別スレッドで動いていること）
+    """
+
+    async def retrieve() -> None:
+        try:
+            await client.with_options(
+                timeout=settings.warmup_http_timeout, max_retries=0
+            ).models.retrieve(model)
+        except openai.APIStatusError as e:
+            # HTTPレスポンスが返っていれば接続は確立済み
+            logger.debug(f"Async warmup request for {model} returned {e.status_code}")
+
+    future = asyncio.run_coroutine_threadsafe(retrieve(), loop)
+    try:
+        future.result(timeout=settings.warmup_http_timeout + 1.0)
+    except TimeoutError:
+        future.cancel()
+        raise
@@ -8,6 +8,7 @@ import hashlib
 import logging
 from collections.abc import Callable
 from functools import wraps
+from pathlib import Path
 from typing import Any, TypeVar
 
 import streamlit as st
@@ -25,14 +26,14 @@ def get_vectorstore_cached():
     アプリケーション全体で共有されるベクトルストアをキャッシュします。
 
     Returns:
-        ChromaVectorStore: キャッシュされたベクトルストア
+        ChromaVectorStore: キャッシュされたベクトルストア（設定された検索バックエンド）
     """
-    from src.features.rag.vectorstore import ChromaVectorStore
+    from src.features.rag.vectorstore import create_vectorstore
 
     @st.cache_resource(show_spinner=False)
     def _create_vectorstore():
         logger.info("Creating new vectorstore instance (cached)")
-        return ChromaVectorStore()
+        return create_vectorstore()
 
     return _create_vectorstore()
 
@@ -44,13 +45,28 @@ def get_rag_chain_cached():
     Returns:
         RAGChain: キャッシュされたRAGチェーン
     """
+    from src.config.settings import settings
     from src.features.rag.chain import RAGChain
+    from src.features.rag.response_cache import ResponseCache
+    from src.features.rag.semantic_cache import SemanticAnswerCache
 
     @st.cache_resource(show_spinner=False)
     def _create_rag_chain():
         logger.info("Creating new RAG chain instance (cached)")
         vectorstore = get_vectorstore_cached()
-        return RAGChain(vectorstore=vectorstore)
+        parent_store = vectorstore.get_parent_store() if settings.rag_parent_expansion else None
+        answer_cache = SemanticAnswerCache() if settings.semantic_cache_enabled else None
+        response_cache = (
+            ResponseCache(Path(settings.chroma_persist_dir).parent / "response_cache.sqlite3")
+            if settings.response_cache_enabled
+            else None
+        )
+        return RAGChain(
+            vectorstore=vectorstore,
+            parent_store=parent_store,
+            answer_cache=answer_cache,
+            response_cache=response_cache,
+        )
 
     return _create_rag_chain()
 
@@ -5,18 +5,39 @@ LangGraph Catalyst - Helper Functions
 テキスト分割、ログ設定、エラーハンドリングなど。
 """
 
+import json
 import logging
 import os
+import tempfile
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Any
+from pathlib import Path
+from typing import IO, Any
 
 from langchain_core.documents import Document
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 from src.config.settings import settings
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
 logger = logging.getLogger(__name__)
 
+# tiktokenエンコーダーの取得に失敗した後、再試行するまでの間隔（秒）
+TOKEN_ENCODER_RETRY_SECONDS = 60.0
+
+# 取得できたエンコーダー（エンコーディング名→tiktoken.Encoding）
+_token_encoders: dict[str, Any] = {}
+# 取得に失敗したエンコーディング名→失敗時刻（再試行までは推定値で数える）
+_token_encoder_failures: dict[str, float] = {}
+_token_encoder_lock = threading.Lock()
+
 
 def create_text_splitter(
     chunk_size: int | None = None,
@@ -33,7 +54,7 @@ def create_text_splitter(
         RecursiveCharacterTextSplitter: テキスト分割器
     """
     chunk_size = chunk_size or settings.rag_chunk_size
-    chunk_overlap = chunk_overlap or settings.rag_chunk_overlap
+    chunk_overlap = chunk_overlap if chunk_overlap is not None else settings.rag_chunk_overlap
 
     return RecursiveCharacterTextSplitter(
         chunk_size=chunk_size,
@@ -267,6 +288,49 @@ def split_text_into_chunks(
     return chunks
 
 
+def get_token_encoder(encoding_name: str = "cl100k_base") -> Any | None:
+    """
+    tiktokenエンコーダーを取得（取得できたものだけをプロセス内でキャッシュ）
+
+    取得に失敗した場合はTOKEN_ENCODER_RETRY_SECONDSの間Noneを返し、その後に再試行します。
+    一時的なダウンロード失敗でプロセスの間ずっと推定値に固定されないようにするためです。
+
+    Args:
+        encoding_name: エンコーディング名
+
+    Returns:
+        tiktoken.Encoding、利用できない場合はNone
+    """
+    encoding = _token_encoders.get(encoding_name)
+    if encoding is not None:
+        return encoding
+
+    with _token_encoder_lock:
+        encoding = _token_encoders.get(encoding_name)
+        if encoding is not None:
+            return encoding
+
+        failed_at = _token_encoder_failures.get(encoding_name)
+        if failed_at is not None and time.monotonic() - failed_at < TOKEN_ENCODER_RETRY_SECONDS:
+            return None
+
+        try:
+            import tiktoken
+
+            encoding = tiktoken.get_encoding(encoding_name)
+        except Exception as e:
+            # tiktoken未インストール、またはエンコーディングファイルを取得できない場合
+            logger.warning(
+                f"tiktoken encoding '{encoding_name}' unavailable, estimating tokens: {e}"
+            )
+            _token_encoder_failures[encoding_name] = time.monotonic()
+            return None
+
+        _token_encoders[encoding_name] = encoding
+        _token_encoder_failures.pop(encoding_name, None)
+        return encoding
+
+
 def calculate_token_count(text: str, encoding_name: str = "cl100k_base") -> int:
     """
     テキストのトークン数を計算
@@ -278,17 +342,40 @@ def calculate_token_count(text: str, encoding_name: str = "cl100k_base") -> int:
     Returns:
         int: トークン数
     """
-    try:
-        import tiktoken
-
-        encoding = tiktoken.get_encoding(encoding_name)
-        tokens = encoding.encode(text)
-        return len(tokens)
-    except ImportError:
-        # tiktokenがインストールされていない場合は概算
+    encoding = get_token_encoder(encoding_name)
+    if encoding is None:
+        # tiktokenが使えない場合は概算
         # 平均的に1トークン ≈ 4文字
         return len(text) // 4
 
+    return len(encoding.encode(text))
+
+
+def truncate_to_token_limit(text: str, max_tokens: int, encoding_name: str = "cl100k_base") -> str:
+    """
+    テキストを先頭からmax_tokensトークン以内に切り詰め
+
+    Args:
+        text: 切り詰めるテキスト
+        max_tokens: 最大トークン数
+        encoding_name: エンコーディング名
+
+    Returns:
+        str: 切り詰めたテキスト（収まる場合はそのまま）
+    """
+    if max_tokens <= 0:
+        return ""
+
+    encoding = get_token_encoder(encoding_name)
+    if encoding is None:
+        # calculate_token_countの概算（1トークン ≈ 4文字）に合わせる
+        return text[: max_tokens * 4]
+
+    tokens = encoding.encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])
+
 
 def format_source_metadata(metadata: dict[str, Any]) -> str:
     """
@@ -313,6 +400,66 @@ def format_source_metadata(metadata: dict[str, Any]) -> str:
     return " | ".join(parts) if parts else "No metadata"
 
 
+@contextmanager
+def atomic_write(path: str | Path, mode: str = "w", encoding: str | None = None) -> Iterator[IO]:
+    """
+    一時ファイル経由でファイルをアトミックに書き込む
+
+    一時ファイルは書き込み先と同じディレクトリに一意な名前で作成するため、
+    複数のプロセスが同じファイルを同時に書き込んでも互いの一時ファイルを壊しません。
+    書き込みに失敗した場合は一時ファイルを削除し、書き込み先は変更しません。
+
+    Args:
+        path: 書き込み先のパス
+        mode: ファイルモード（"w" または "wb"）
+        encoding: テキストモードのエンコーディング
+
+    Yields:
+        IO: 一時ファイル
+    """
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode, encoding=encoding) as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+def write_json_atomic(path: str | Path, data: Any) -> None:
+    """
+    JSONを一時ファイル経由でアトミックに書き込む
+
+    Args:
+        path: 書き込み先のパス
+        data: JSONシリアライズ可能なデータ
+    """
+    with atomic_write(path, encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+
+
+@contextmanager
+def file_lock(path: str | Path) -> Iterator[None]:
+    """
+    ロックファイルによるプロセス間の排他ロック（fcntlが使えない環境ではロックしない）
+
+    Args:
+        path: ロックファイルのパス（親ディレクトリがなければ作成）
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
 def sanitize_filename(filename: str, max_length: int = 255) -> str:
     """
     ファイル名をサニタイズ
@@ -145,6 +145,33 @@ def auto_mock_langchain_openai(mocker):
             pass
 
 
+@pytest.fixture(autouse=True)
+def disable_query_embedding_disk_cache(monkeypatch):
+    """
+    クエリ埋め込みキャッシュのディスク層とドキュメント埋め込みストアを無効化
+
+    どちらもテスト実行をまたいで残るため、埋め込み呼び出しの検証が
+    前回の実行結果に左右されないようにします。
+    """
+    from src.config.settings import settings
+
+    monkeypatch.setattr(settings, "query_embedding_cache_persist", False)
+    monkeypatch.setattr(settings, "embedding_store_enabled", False)
+
+
+@pytest.fixture(autouse=True)
+def isolate_chroma_persist_dir(monkeypatch, tmp_path):
+    """
+    Chromaの永続化ディレクトリをテストごとの一時ディレクトリに切り替え
+
+    コレクション統計・語彙インデックス・応答キャッシュなどの付随ファイルは
+    永続化ディレクトリの隣に作られるため、./tests/data に書き込まないようにします。
+    """
+    from src.config.settings import settings
+
+    monkeypatch.setattr(settings, "chroma_persist_dir", str(tmp_path / "chroma"))
+
+
 # ============================================================================
 # Sample Test Data
 # ============================================================================
@@ -329,6 +356,9 @@ def mock_chroma(mocker):
             # add_documentsのモック
             mock_instance.add_documents.return_value = None
 
+            # getのモック（既存チャンクなし）
+            mock_instance.get.return_value = {"ids": []}
+
             # delete_collectionのモック
             mock_instance.delete_collection.return_value = None
 
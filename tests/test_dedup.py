@@ -0,0 +1,96 @@
+"""
+LangGraph Catalyst - Near-Duplicate Elimination Tests
+
+インジェスト時の重複チャンク除去のユニットテスト
+"""
+
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+
+from src.features.rag.dedup import (
+    MinHasher,
+    deduplicate_documents,
+    lsh_parameters,
+    shingle_hashes,
+)
+
+FOOTER = (
+    "Home Docs Tutorials How-to guides Conceptual guides API reference GitHub Blog "
+    "Discord Copyright 2024 LangChain Inc. All rights reserved. Privacy policy Terms of service"
+)
+
+
+def _page(source: str, text: str) -> Document:
+    return Document(page_content=text, metadata={"source": source})
+
+
+@pytest.mark.unit
+class TestNearDuplicateElimination:
+    """MinHash + LSHによる重複除去のテスト"""
+
+    def test_minhash_estimates_jaccard_similarity(self):
+        """署名の一致率がshingle集合のJaccard類似度に近いこと"""
+        # Arrange
+        hasher = MinHasher(num_perm=256)
+        base = " ".join(f"token{i}" for i in range(200))
+        variant = base.replace("token199", "changed")
+
+        # Act
+        a = hasher.signature(shingle_hashes(base))
+        b = hasher.signature(shingle_hashes(variant))
+        c = hasher.signature(shingle_hashes("completely different text about graphs"))
+
+        # Assert
+        assert np.mean(a == b) > 0.9
+        assert np.mean(a == c) < 0.1
+
+    def test_shingles_ignore_whitespace_and_width(self):
+        """空白の違いや全角半角の違いは同じshingleになること"""
+        assert set(shingle_hashes("StateGraph  compile\n\nＡＰＩ")) == set(
+            shingle_hashes("StateGraph compile API")
+        )
+
+    def test_lsh_parameters_match_threshold(self):
+        """バンド分割の候補確率0.5の類似度が閾値以下で近いこと"""
+        # Act
+        bands, rows = lsh_parameters(128, 0.85)
+
+        # Assert
+        assert bands * rows == 128
+        assert 0.7 < (1 / bands) ** (1 / rows) <= 0.85
+
+    def test_deduplicate_keeps_first_of_each_cluster(self):
+        """ほぼ重複するチャンクは最初に現れたものだけ残し、件数を報告すること"""
+        # Arrange
+        documents = [
+            _page("https://a", "StateGraph nodes communicate through a shared state object."),
+            _page("https://a", f"{FOOTER} page 1"),
+            _page("https://b", "Checkpointers such as MemorySaver persist the graph state."),
+            _page("https://b", f"{FOOTER} page 2"),
+            _page("https://c", f"{FOOTER} page 3"),
+        ]
+
+        # Act
+        kept, stats = deduplicate_documents(documents, threshold=0.8)
+
+        # Assert
+        assert kept == documents[:3]
+        assert stats["input_count"] == 5
+        assert stats["removed_count"] == 2
+        assert stats["duplicate_clusters"] == 1
+
+    def test_deduplicate_keeps_distinct_chunks(self):
+        """類似度が閾値未満のチャンクは除去しないこと"""
+        # Arrange
+        documents = [
+            _page("https://a", "add_conditional_edges routes to the next node by a function."),
+            _page("https://b", "interrupt_before pauses execution for human approval."),
+        ]
+
+        # Act
+        kept, stats = deduplicate_documents(documents)
+
+        # Assert
+        assert kept == documents
+        assert stats["removed_count"] == 0
@@ -0,0 +1,155 @@
+"""
+LangGraph Catalyst - Embedding Dimension Migration Tests
+
+埋め込み次元数の移行のユニットテスト
+"""
+
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+
+from src.features.rag.dimension_migration import (
+    evaluate_recall,
+    migrate_embedding_dimensions,
+    truncate_embeddings,
+)
+from src.features.rag.snapshot import VectorSnapshot
+from src.features.rag.vectorstore import ChromaVectorStore
+from src.utils.exceptions import VectorStoreError
+
+
+def _mock_store(mocker, collection_name, embedding_dimensions=None):
+    """移行テスト用のベクトルストアのモック"""
+    store = mocker.Mock(spec=ChromaVectorStore)
+    store.collection_name = collection_name
+    store.persist_directory = "/tmp/chroma"
+    store.embedding_dimensions = embedding_dimensions
+    return store
+
+
+@pytest.mark.unit
+class TestDimensionMigration:
+    """埋め込み次元数の移行のテスト"""
+
+    def test_truncate_embeddings_renormalizes(self):
+        """先頭d次元に切り詰め、単位ベクトルに正規化すること"""
+        # Arrange
+        embeddings = np.array([[3.0, 4.0, 12.0], [0.0, 2.0, 1.0]], dtype=np.float32)
+
+        # Act
+        truncated = truncate_embeddings(embeddings, 2)
+
+        # Assert
+        np.testing.assert_allclose(truncated, [[0.6, 0.8], [0.0, 1.0]], rtol=1e-6)
+
+    def test_truncate_embeddings_rejects_larger_dimension(self):
+        """元の次元数以上への切り詰めはVectorStoreError"""
+        with pytest.raises(VectorStoreError, match="Cannot truncate"):
+            truncate_embeddings(np.ones((2, 4)), 4)
+
+    def test_migrate_truncate_without_embedding_calls(self, mocker, tmp_path):
+        """truncateでは保存済みベクトルを切り詰めたスナップショットを投入すること"""
+        # Arrange
+        rng = np.random.default_rng(0)
+        embeddings = rng.normal(size=(5, 8)).astype(np.float32)
+        source = _mock_store(mocker, "langgraph_docs")
+        source.export_snapshot.side_effect = lambda directory: VectorSnapshot(
+            [f"id-{i}" for i in range(5)],
+            embeddings,
+            [f"chunk {i}" for i in range(5)],
+            [{"doc_type": "blog"}] * 5,
+            {"embedding_model": "text-embedding-3-small"},
+        ).save(directory)
+
+        target = _mock_store(mocker, "langgraph_docs_4d", embedding_dimensions=4)
+        imported = {}
+
+        def import_snapshot(directory):
+            imported["snapshot"] = VectorSnapshot.load(directory, mmap=False)
+            return {"added_count": 5, "total_documents_in_store": 5, "status": "success"}
+
+        target.import_snapshot.side_effect = import_snapshot
+
+        # Act
+        result = migrate_embedding_dimensions(source, target, work_directory=tmp_path)
+
+        # Assert
+        assert result["migrated_count"] == 5
+        assert result["source_dimension"] == 8
+        assert result["dimensions"] == 4
+        snapshot = imported["snapshot"]
+        assert snapshot.manifest["dimension"] == 4
+        assert snapshot.manifest["embedding_dimensions"] == 4
+        np.testing.assert_allclose(snapshot.embeddings, truncate_embeddings(embeddings, 4))
+        target.add_documents_concurrent.assert_not_called()
+
+    def test_migrate_reembed_from_stored_texts(self, mocker):
+        """reembedでは保存済みの本文とメタデータを移行先で埋め込み直すこと"""
+        # Arrange
+        source = _mock_store(mocker, "langgraph_docs")
+        source._iter_collection.return_value = iter(
+            [{"ids": ["a", "b"], "documents": ["x", "y"], "metadatas": [{"source": "s"}, None]}]
+        )
+        source.get_collection_info.return_value = {"embedding_dimension": 1536}
+        target = _mock_store(mocker, "langgraph_docs_512d", embedding_dimensions=512)
+        target.add_documents_concurrent.return_value = {
+            "added_count": 2,
+            "skipped_unchanged": 0,
+            "total_documents_in_store": 2,
+            "status": "success",
+        }
+
+        # Act
+        result = migrate_embedding_dimensions(source, target, method="reembed")
+
+        # Assert
+        assert result["migrated_count"] == 2
+        assert result["source_dimension"] == 1536
+        documents = target.add_documents_concurrent.call_args.args[0]
+        assert [doc.page_content for doc in documents] == ["x", "y"]
+        assert documents[0].metadata == {"source": "s"}
+
+    def test_migrate_rejects_same_collection(self, mocker):
+        """移行元と同じコレクションへの移行はVectorStoreError"""
+        source = _mock_store(mocker, "langgraph_docs")
+        target = _mock_store(mocker, "langgraph_docs", embedding_dimensions=512)
+
+        with pytest.raises(VectorStoreError, match="must differ"):
+            migrate_embedding_dimensions(source, target)
+
+    def test_migrate_requires_target_dimensions(self, mocker):
+        """移行先に次元数が設定されていなければVectorStoreError"""
+        source = _mock_store(mocker, "langgraph_docs")
+        target = _mock_store(mocker, "langgraph_docs_512d")
+
+        with pytest.raises(VectorStoreError, match="embedding_dimensions"):
+            migrate_embedding_dimensions(source, target)
+
+    def test_evaluate_recall(self, mocker):
+        """クエリ自身を除いた上位k件の一致率を返すこと"""
+        # Arrange
+        ids = ["a", "b", "c", "d"]
+        source = _mock_store(mocker, "langgraph_docs")
+        source._iter_collection.return_value = iter(
+            [{"ids": ids, "embeddings": np.eye(4, 8).tolist()}]
+        )
+        target = _mock_store(mocker, "langgraph_docs_4d", embedding_dimensions=4)
+        target._iter_collection.return_value = iter(
+            [{"ids": ids, "embeddings": np.eye(4).tolist()}]
+        )
+
+        def hits(*order):
+            return [(Document(id=cid, page_content=""), 0.0) for cid in order]
+
+        # 元のインデックスはa,b,c、移行先はa,d,cの順に返す
+        source._query_by_vectors.return_value = [hits("a", "b", "c")] * 4
+        target._query_by_vectors.return_value = [hits("a", "d", "c")] * 4
+
+        # Act
+        result = evaluate_recall(source, target, sample_size=4, k=2)
+
+        # Assert
+        assert result["queries"] == 4
+        assert result["source_dimension"] == 8
+        assert result["target_dimension"] == 4
+        assert result["recall_at_k"] == pytest.approx(0.5)
@@ -0,0 +1,194 @@
+"""
+LangGraph Catalyst - Query Embedding Cache Tests
+
+クエリ埋め込みキャッシュのユニットテスト
+"""
+
+import asyncio
+import threading
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.features.rag.embedding_cache import (
+    CachedEmbeddings,
+    QueryEmbeddingCache,
+    normalize_query,
+)
+
+
+@pytest.mark.unit
+class TestQueryEmbeddingCache:
+    """QueryEmbeddingCacheのテスト"""
+
+    def test_normalize_query(self):
+        """NFKC正規化と空白の畳み込み"""
+        assert normalize_query("  ＬａｎｇＧｒａｐｈ　とは\n何？ ") == "LangGraph とは 何?"
+
+    def test_memory_hit_and_miss(self):
+        """メモリ層のヒット/ミスが計上されること"""
+        # Arrange
+        cache = QueryEmbeddingCache(model_name="test-model")
+
+        # Act
+        assert cache.get("What is LangGraph?") is None
+        cache.set("What is LangGraph?", [0.1, 0.2])
+        result = cache.get("What  is LangGraph?")
+
+        # Assert
+        assert result == [0.1, 0.2]
+        stats = cache.stats()
+        assert stats["memory_hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_ratio"] == 0.5
+
+    def test_lru_eviction(self):
+        """上限を超えると最も古いエントリが削除されること"""
+        # Arrange
+        cache = QueryEmbeddingCache(model_name="test-model", max_size=2)
+
+        # Act
+        cache.set("a", [1.0])
+        cache.set("b", [2.0])
+        cache.get("a")
+        cache.set("c", [3.0])
+
+        # Assert
+        assert cache.get("b") is None
+        assert cache.get("a") == [1.0]
+        assert cache.get("c") == [3.0]
+
+    def test_disk_tier_survives_restart(self, tmp_path):
+        """ディスク層のエントリが再生成後も取得できること"""
+        # Arrange
+        path = tmp_path / "query_embeddings.sqlite3"
+        first = QueryEmbeddingCache(model_name="test-model", persist_path=path)
+        first.set("What is LangGraph?", [0.5, 0.25])
+        first.close()
+
+        # Act
+        second = QueryEmbeddingCache(model_name="test-model", persist_path=path)
+        result = second.get("What is LangGraph?")
+
+        # Assert
+        assert result == [0.5, 0.25]
+        assert second.stats()["disk_hits"] == 1
+
+    def test_preload_warms_memory_tier(self, tmp_path):
+        """preloadでディスク層のエントリをメモリ層に読み込むこと"""
+        # Arrange
+        path = tmp_path / "query_embeddings.sqlite3"
+        first = QueryEmbeddingCache(model_name="test-model", persist_path=path)
+        first.set("StateGraph", [1.0, 0.0])
+        first.set("MemorySaver", [0.0, 1.0])
+        first.close()
+        QueryEmbeddingCache(model_name="other-model", persist_path=path).set("x", [9.0, 9.0])
+
+        # Act
+        second = QueryEmbeddingCache(model_name="test-model", persist_path=path)
+        embeddings = second.preload(10)
+
+        # Assert
+        assert sorted(embeddings) == [[0.0, 1.0], [1.0, 0.0]]
+        assert second.get("StateGraph") == [1.0, 0.0]
+        assert second.stats()["memory_hits"] == 1
+        assert second.stats()["disk_hits"] == 0
+
+    def test_key_includes_model_name(self, tmp_path):
+        """モデル名が異なる場合は別エントリとして扱うこと"""
+        # Arrange
+        path = tmp_path / "query_embeddings.sqlite3"
+        QueryEmbeddingCache(model_name="model-a", persist_path=path).set("query", [1.0])
+
+        # Act
+        result = QueryEmbeddingCache(model_name="model-b", persist_path=path).get("query")
+
+        # Assert
+        assert result is None
+
+
+@pytest.mark.unit
+class TestCachedEmbeddings:
+    """CachedEmbeddingsのテスト"""
+
+    def test_embed_query_uses_cache(self):
+        """同じクエリは一度だけ埋め込みAPIを呼ぶこと"""
+        # Arrange
+        inner = Mock()
+        inner.embed_query.return_value = [0.1] * 4
+        embeddings = CachedEmbeddings(inner, QueryEmbeddingCache(model_name="test-model"))
+
+        # Act
+        first = embeddings.embed_query("LangGraphとは？")
+        second = embeddings.embed_query("LangGraphとは?")
+
+        # Assert
+        assert first == second
+        inner.embed_query.assert_called_once()
+
+    def test_embed_documents_passthrough(self):
+        """ドキュメント埋め込みはそのまま委譲されること"""
+        # Arrange
+        inner = Mock()
+        inner.embed_documents.return_value = [[0.1], [0.2]]
+        embeddings = CachedEmbeddings(inner, QueryEmbeddingCache(model_name="test-model"))
+
+        # Act
+        result = embeddings.embed_documents(["a", "b"])
+
+        # Assert
+        assert result == [[0.1], [0.2]]
+        inner.embed_documents.assert_called_once_with(["a", "b"])
+
+    def test_embed_queries_single_call_for_misses(self):
+        """キャッシュにないクエリだけを1回の呼び出しで埋め込むこと"""
+        # Arrange
+        inner = Mock()
+        inner.embed_query.return_value = [0.1]
+        inner.embed_documents.return_value = [[0.2], [0.3]]
+        embeddings = CachedEmbeddings(inner, QueryEmbeddingCache(model_name="test-model"))
+        embeddings.embed_query("cached")
+
+        # Act
+        result = embeddings.embed_queries(["b", "cached", "c", "b "])
+
+        # Assert
+        assert result == [[0.2], [0.1], [0.3], [0.2]]
+        inner.embed_documents.assert_called_once_with(["b", "c"])
+        assert embeddings.embed_query("c") == [0.3]
+
+    def test_aembed_query_disk_io_off_event_loop(self, tmp_path, monkeypatch):
+        """非同期埋め込みではディスクキャッシュの読み書きをイベントループのスレッドで行わないこと"""
+        # Arrange
+        inner = Mock()
+        inner.aembed_query = AsyncMock(return_value=[0.1, 0.2])
+        cache = QueryEmbeddingCache(model_name="test-model", persist_path=tmp_path / "q.sqlite3")
+        embeddings = CachedEmbeddings(inner, cache)
+        io_threads = []
+        for name in ("get_from_disk", "set_on_disk"):
+            original = getattr(cache, name)
+
+            def record(*args, _original=original, **kwargs):
+                io_threads.append(threading.get_ident())
+                return _original(*args, **kwargs)
+
+            monkeypatch.setattr(cache, name, record)
+
+        async def run():
+            loop_thread = threading.get_ident()
+            first = await embeddings.aembed_query("query")
+            second = await embeddings.aembed_query("query")
+            return loop_thread, first, second
+
+        # Act
+        loop_thread, first, second = asyncio.run(run())
+
+        # Assert
+        assert first == second == [0.1, 0.2]
+        inner.aembed_query.assert_awaited_once()
+        assert len(io_threads) == 2
+        assert loop_thread not in io_threads
+        assert cache.memory_hits == 1
+        assert QueryEmbeddingCache(
+            model_name="test-model", persist_path=tmp_path / "q.sqlite3"
+        ).get("query") == pytest.approx([0.1, 0.2])
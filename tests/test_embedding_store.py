@@ -0,0 +1,99 @@
+"""
+LangGraph Catalyst - Content-Addressed Embedding Store Tests
+
+ドキュメント埋め込みの内容アドレスストアのユニットテスト
+"""
+
+from unittest.mock import Mock
+
+import pytest
+
+from src.features.rag.embedding_cache import CachedEmbeddings, QueryEmbeddingCache
+from src.features.rag.embedding_store import EmbeddingStore, text_hash
+
+
+@pytest.fixture
+def store(tmp_path):
+    """一時ディレクトリのEmbeddingStore"""
+    store = EmbeddingStore(tmp_path / "embedding_store.sqlite3")
+    yield store
+    store.close()
+
+
+@pytest.mark.unit
+class TestEmbeddingStore:
+    """EmbeddingStoreのテスト"""
+
+    def test_roundtrip_and_hit_ratio(self, store):
+        """保存した本文はヒットし、ヒット率が計上されること"""
+        # Arrange
+        store.put_many("model@512", ["alpha", "beta"], [[0.5, 0.25], [1.0, 0.0]])
+
+        # Act
+        result = store.get_many("model@512", ["beta", "gamma", "alpha"])
+
+        # Assert
+        assert result == [[1.0, 0.0], None, [0.5, 0.25]]
+        stats = store.stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+        assert stats["hit_ratio"] == pytest.approx(2 / 3)
+        assert stats["entries"] == 2
+
+    def test_key_includes_namespace(self, store):
+        """モデル・次元数（名前空間）が異なる埋め込みは共有しないこと"""
+        store.put_many("model@512", ["alpha"], [[0.5, 0.25]])
+
+        assert store.get_many("model@1536", ["alpha"]) == [None]
+
+    def test_gc_deletes_orphaned_entries(self, store):
+        """どのコレクションにも存在しない本文の埋め込みを削除すること"""
+        # Arrange
+        store.put_many("model", ["alpha", "beta", "gamma"], [[0.1], [0.2], [0.3]])
+
+        # Act
+        dry_run = store.gc({text_hash("alpha")}, dry_run=True)
+        result = store.gc({text_hash("alpha")})
+
+        # Assert
+        assert dry_run["orphaned_entries"] == 2
+        assert dry_run["deleted_entries"] == 0
+        assert result["deleted_entries"] == 2
+        assert store.get_many("model", ["alpha", "beta"]) == [[pytest.approx(0.1)], None]
+
+
+@pytest.mark.unit
+class TestCachedEmbeddingsDocumentStore:
+    """CachedEmbeddingsのドキュメント埋め込みストア連携のテスト"""
+
+    def test_embeds_only_unseen_texts(self, store):
+        """ストアにない本文だけを（重複を除いて）埋め込みAPIに送ること"""
+        # Arrange
+        inner = Mock()
+        inner.embed_documents.return_value = [[2.0], [3.0]]
+        embeddings = CachedEmbeddings(inner, QueryEmbeddingCache(model_name="model"), store)
+        store.put_many("model", ["seen"], [[1.0]])
+
+        # Act
+        result = embeddings.embed_documents(["seen", "new-a", "new-b", "new-a"])
+
+        # Assert
+        assert result == [[1.0], [2.0], [3.0], [2.0]]
+        inner.embed_documents.assert_called_once_with(["new-a", "new-b"])
+        assert store.get_many("model", ["new-b"]) == [[3.0]]
+
+    def test_rebuild_reuses_all_embeddings(self, store):
+        """同じ本文の再インジェストでは埋め込みAPIを呼び出さないこと"""
+        # Arrange
+        inner = Mock()
+        inner.embed_documents.return_value = [[1.0], [2.0]]
+        embeddings = CachedEmbeddings(inner, QueryEmbeddingCache(model_name="model"), store)
+        embeddings.embed_documents(["alpha", "beta"])
+        inner.embed_documents.reset_mock()
+
+        # Act
+        result = embeddings.embed_documents(["beta", "alpha"])
+
+        # Assert
+        assert result == [[2.0], [1.0]]
+        inner.embed_documents.assert_not_called()
@@ -4,15 +4,21 @@ LangGraph Catalyst - Helpers Tests
 ユーティリティヘルパー関数のユニットテスト
 """
 
+from unittest.mock import Mock
+
 import pytest
 
+from src.utils import helpers
 from src.utils.helpers import (
+    atomic_write,
     calculate_token_count,
     extract_code_blocks,
     format_source_metadata,
+    get_token_encoder,
     parse_mermaid_diagram,
     sanitize_filename,
     split_text_into_chunks,
+    truncate_to_token_limit,
 )
 
 
@@ -232,6 +238,67 @@ class TestHelpers:
         assert short_count > 0
         assert long_count > short_count
 
+    def test_truncate_to_token_limit(self):
+        """
+        トークン数による切り詰めのテスト
+
+        テスト内容:
+        - 上限以内のテキストはそのまま返されること
+        - 上限を超えるテキストは上限以内の先頭部分が返されること
+        """
+        # Arrange
+        text = "Hello world. " * 100
+
+        # Act
+        truncated = truncate_to_token_limit(text, 10)
+
+        # Assert
+        assert truncate_to_token_limit("Hello", 10) == "Hello"
+        assert text.startswith(truncated)
+        assert 0 < calculate_token_count(truncated) <= 10
+        assert truncate_to_token_limit(text, 0) == ""
+
+    def test_token_encoder_retried_after_failure(self, monkeypatch):
+        """取得に失敗したエンコーダーはキャッシュせず、再試行間隔の後に取得し直すこと"""
+        # Arrange
+        import tiktoken
+
+        encoder = Mock()
+        get_encoding = Mock(side_effect=[OSError("download failed"), encoder])
+        monkeypatch.setattr(tiktoken, "get_encoding", get_encoding)
+        monkeypatch.setattr(helpers, "_token_encoders", {})
+        monkeypatch.setattr(helpers, "_token_encoder_failures", {})
+
+        # Act
+        failed = get_token_encoder("test_base")
+        within_retry_interval = get_token_encoder("test_base")
+        monkeypatch.setattr(helpers, "TOKEN_ENCODER_RETRY_SECONDS", 0.0)
+        recovered = get_token_encoder("test_base")
+        cached = get_token_encoder("test_base")
+
+        # Assert
+        assert failed is None
+        assert within_retry_interval is None
+        assert recovered is encoder
+        assert cached is encoder
+        assert get_encoding.call_count == 2
+
+    def test_atomic_write_uses_unique_temp_files(self, tmp_path):
+        """同じファイルへの同時書き込みが互いの一時ファイルを壊さないこと"""
+        # Arrange
+        path = tmp_path / "index.json"
+
+        # Act
+        with atomic_write(path) as first, atomic_write(path) as second:
+            first.write("first")
+            second.write("second")
+            temp_files = list(tmp_path.glob(".index.json.*.tmp"))
+
+        # Assert
+        assert len(temp_files) == 2
+        assert path.read_text() == "first"
+        assert [p.name for p in tmp_path.iterdir()] == ["index.json"]
+
     def test_calculate_token_count_empty_text(self):
         """
         空のテキストのトークン数計算テスト
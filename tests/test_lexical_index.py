@@ -0,0 +1,125 @@
+"""
+LangGraph Catalyst - Lexical Index Tests
+
+BM25語彙インデックスとRRF統合のユニットテスト
+"""
+
+import pytest
+
+from src.features.rag.lexical_index import LexicalIndex, reciprocal_rank_fusion, tokenize
+
+
+@pytest.fixture
+def lexical_records():
+    """語彙検索テスト用のレコード"""
+    documents = [
+        "graph.add_conditional_edges('agent', should_continue) で条件分岐を追加します。",
+        "MemorySaverはチェックポイントをメモリに保存します。",
+        "interrupt()を使うと人間の承認を待つことができます。",
+        "StateGraphはノードとエッジでワークフローを定義します。",
+        "エッジを追加するにはadd_edgeを使います。",
+    ]
+    return {
+        "ids": [f"id-{i}" for i in range(len(documents))],
+        "documents": documents,
+        "metadatas": [
+            {"doc_type": "official_docs" if i % 2 == 0 else "blog", "start_index": i}
+            for i in range(len(documents))
+        ],
+    }
+
+
+@pytest.mark.unit
+class TestTokenize:
+    """tokenizeのテスト"""
+
+    def test_identifier_tokens(self):
+        """識別子全体と構成語の両方が出力されること"""
+        tokens = tokenize("add_conditional_edges MemorySaver")
+
+        assert "add_conditional_edges" in tokens
+        assert {"add", "conditional", "edges"} <= set(tokens)
+        assert {"memorysaver", "memory", "saver"} <= set(tokens)
+
+    def test_japanese_bigrams(self):
+        """日本語は文字bigramに分割されること"""
+        assert tokenize("状態管理") == ["状態", "態管", "管理"]
+
+    def test_nfkc_normalization(self):
+        """全角英数字が半角として扱われること"""
+        assert tokenize("ＳｔａｔｅＧｒａｐｈ")[0] == "stategraph"
+
+
+@pytest.mark.unit
+class TestLexicalIndex:
+    """LexicalIndexのテスト"""
+
+    def test_exact_api_name_ranks_first(self, lexical_records):
+        """API名を含むチャンクが最上位になること"""
+        # Arrange
+        index = LexicalIndex.from_records(**lexical_records)
+
+        # Act
+        hits = index.search("add_conditional_edgesの使い方", k=3)
+
+        # Assert
+        assert hits[0][0] == 0
+        scores = [score for _, score in hits]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_camel_case_query(self, lexical_records):
+        """CamelCaseのAPI名で検索できること"""
+        index = LexicalIndex.from_records(**lexical_records)
+
+        hits = index.search("MemorySaver", k=3)
+
+        assert [row for row, _ in hits] == [1]
+
+    def test_search_with_filter(self, lexical_records):
+        """フィルタ条件を満たす行のみが返ること"""
+        index = LexicalIndex.from_records(**lexical_records)
+
+        hits = index.search("エッジを追加", k=5, where={"doc_type": "blog"})
+
+        assert hits
+        assert all(lexical_records["metadatas"][row]["doc_type"] == "blog" for row, _ in hits)
+
+    def test_no_matching_tokens(self, lexical_records):
+        """一致するトークンがなければ空の結果を返すこと"""
+        index = LexicalIndex.from_records(**lexical_records)
+
+        assert index.search("zzz", k=3) == []
+
+    def test_save_and_load(self, lexical_records, tmp_path):
+        """保存したインデックスを読み込んで同じ結果が得られること"""
+        # Arrange
+        index = LexicalIndex.from_records(**lexical_records, manifest={"corpus_version": "abc"})
+        path = tmp_path / "lexical_index" / "test.json"
+
+        # Act
+        index.save(path)
+        loaded = LexicalIndex.load(path)
+
+        # Assert
+        assert loaded.manifest["corpus_version"] == "abc"
+        assert loaded.search("interrupt", k=2) == index.search("interrupt", k=2)
+        assert loaded.document(2).id == "id-2"
+
+    def test_empty_index(self):
+        """空のインデックスは空の結果を返すこと"""
+        index = LexicalIndex.from_records([], [], [])
+
+        assert index.search("StateGraph", k=3) == []
+
+
+@pytest.mark.unit
+class TestReciprocalRankFusion:
+    """reciprocal_rank_fusionのテスト"""
+
+    def test_documents_in_both_rankings_win(self):
+        """両方の順位リストに現れるキーが上位になること"""
+        fused = reciprocal_rank_fusion([["a", "b", "c"], ["c", "d"]], rrf_k=60)
+
+        assert fused[0][0] == "c"
+        assert fused[0][1] == pytest.approx(1 / 63 + 1 / 61)
+        assert {key for key, _ in fused} == {"a", "b", "c", "d"}
@@ -0,0 +1,356 @@
+"""
+LangGraph Catalyst - NumPy Exact Search Backend Tests
+
+NumPy厳密検索バックエンドのユニットテスト
+"""
+
+import numpy as np
+import pytest
+
+from src.features.rag.numpy_store import ExactVectorIndex, NumpyVectorStore
+from src.features.rag.quantization import BinaryQuantizer, ScalarQuantizer
+from src.features.rag.vectorstore import create_vectorstore
+from src.utils.exceptions import VectorStoreError
+from src.utils.helpers import write_json_atomic
+
+
+@pytest.fixture
+def index_records():
+    """検索テスト用のレコード"""
+    rng = np.random.default_rng(0)
+    embeddings = rng.normal(size=(50, 8)).astype(np.float32)
+    doc_types = ["official_docs", "blog", "github"]
+    return {
+        "ids": [f"id-{i}" for i in range(50)],
+        "embeddings": embeddings,
+        "documents": [f"chunk {i}" for i in range(50)],
+        "metadatas": [
+            {"doc_type": doc_types[i % 3], "source": f"https://example.com/{i}", "start_index": i}
+            for i in range(50)
+        ],
+    }
+
+
+def _brute_force(embeddings, query, k, rows=None):
+    """比較用の素朴な全件探索"""
+    rows = np.arange(len(embeddings)) if rows is None else np.asarray(rows)
+    distances = ((embeddings[rows] - query) ** 2).sum(axis=1)
+    return list(rows[np.argsort(distances)[:k]])
+
+
+@pytest.mark.unit
+class TestExactVectorIndex:
+    """ExactVectorIndexのテスト"""
+
+    def test_search_matches_brute_force(self, index_records):
+        """上位k件が全件探索と一致すること"""
+        # Arrange
+        index = ExactVectorIndex.from_records(**index_records)
+        query = index_records["embeddings"][7] + 0.01
+
+        # Act
+        hits = index.search(query, k=5)
+
+        # Assert
+        assert [row for row, _ in hits] == _brute_force(index_records["embeddings"], query, 5)
+        assert hits[0][0] == 7
+        distances = [distance for _, distance in hits]
+        assert distances == sorted(distances)
+
+    def test_search_with_filter(self, index_records):
+        """フィルタ条件を満たす行のみが返ること"""
+        # Arrange
+        index = ExactVectorIndex.from_records(**index_records)
+        query = index_records["embeddings"][0]
+
+        # Act
+        hits = index.search(query, k=4, where={"doc_type": "blog"})
+
+        # Assert
+        blog_rows = [i for i in range(50) if i % 3 == 1]
+        expected = _brute_force(index_records["embeddings"], query, 4, blog_rows)
+        assert [row for row, _ in hits] == expected
+
+    def test_search_batch_matches_single_search(self, index_records):
+        """一括検索の結果が1件ずつの検索と一致すること"""
+        # Arrange
+        index = ExactVectorIndex.from_records(**index_records, dtype="float16")
+        queries = index_records["embeddings"][[2, 9, 30]] + 0.01
+
+        # Act
+        batch = index.search_batch(queries, k=4, where={"doc_type": {"$ne": "blog"}})
+
+        # Assert
+        for hits, query in zip(batch, queries, strict=True):
+            single = index.search(query, k=4, where={"doc_type": {"$ne": "blog"}})
+            assert [row for row, _ in hits] == [row for row, _ in single]
+            assert [d for _, d in hits] == pytest.approx([d for _, d in single], abs=1e-4)
+        assert [hits[0][0] for hits in batch] == [2, 9, 30]
+
+    def test_filter_operators(self, index_records):
+        """Chroma互換の演算子がマスクに変換されること"""
+        index = ExactVectorIndex.from_records(**index_records)
+
+        in_mask = index.build_mask({"doc_type": {"$in": ["blog", "github"]}})
+        ne_mask = index.build_mask({"doc_type": {"$ne": "official_docs"}})
+        and_mask = index.build_mask({"$and": [{"doc_type": "blog"}, {"start_index": {"$lt": 10}}]})
+        or_mask = index.build_mask({"$or": [{"start_index": 0}, {"start_index": 1}]})
+
+        assert in_mask.sum() == ne_mask.sum() == 33
+        assert list(np.flatnonzero(and_mask)) == [1, 4, 7]
+        assert list(np.flatnonzero(or_mask)) == [0, 1]
+
+    def test_unsupported_operator(self, index_records):
+        """未対応の演算子はVectorStoreError"""
+        index = ExactVectorIndex.from_records(**index_records)
+
+        with pytest.raises(VectorStoreError, match="Unsupported filter operator"):
+            index.build_mask({"doc_type": {"$regex": "blog"}})
+
+    def test_save_and_load_memory_mapped(self, index_records, tmp_path):
+        """保存したインデックスがメモリマップで読み込めること"""
+        # Arrange
+        index = ExactVectorIndex.from_records(**index_records, dtype="float16")
+        index.manifest = {"corpus_version": "abc"}
+
+        # Act
+        index.save(tmp_path)
+        loaded = ExactVectorIndex.load(tmp_path)
+
+        # Assert
+        assert isinstance(loaded.matrix, np.memmap)
+        assert loaded.matrix.dtype == np.float16
+        assert loaded.manifest["corpus_version"] == "abc"
+        query = index_records["embeddings"][3]
+        assert loaded.search(query, k=1)[0][0] == 3
+
+    def test_load_rejects_files_from_different_builds(self, index_records, tmp_path):
+        """埋め込み行列とレコードの件数が食い違う場合は読み込まないこと"""
+        # Arrange
+        index = ExactVectorIndex.from_records(**index_records)
+        index.manifest = {"corpus_version": "abc", "count": len(index)}
+        index.save(tmp_path)
+        write_json_atomic(
+            tmp_path / ExactVectorIndex.RECORDS_FILE,
+            {"ids": ["id-0"], "documents": ["chunk 0"], "metadatas": [{}]},
+        )
+
+        # Act & Assert
+        with pytest.raises(ValueError, match="inconsistent"):
+            ExactVectorIndex.load(tmp_path)
+        assert not list(tmp_path.glob("*.tmp"))
+
+    @pytest.mark.parametrize("space", ["cosine", "ip"])
+    def test_search_in_configured_space(self, space):
+        """距離空間に応じて順位と距離を計算すること（l2とは異なる順位になる例）"""
+        # Arrange: 向きが近いが長いベクトルと、向きは遠いが短いベクトル
+        embeddings = np.array([[10.0, 0.0], [0.5, 0.5]], dtype=np.float32)
+        index = ExactVectorIndex.from_records(
+            ["long", "short"],
+            embeddings,
+            ["long", "short"],
+            [{}, {}],
+            manifest={"space": space},
+        )
+        query = np.array([1.0, 0.1], dtype=np.float32)
+
+        # Act
+        hits = index.search(query, k=2)
+        l2_hits = ExactVectorIndex.from_records(
+            ["long", "short"], embeddings, ["long", "short"], [{}, {}]
+        ).search(query, k=2)
+
+        # Assert
+        assert [row for row, _ in hits] == [0, 1]
+        assert [row for row, _ in l2_hits] == [1, 0]
+        expected = {
+            "cosine": 1.0 - float(embeddings[0] @ query) / (10.0 * np.linalg.norm(query)),
+            "ip": 1.0 - float(embeddings[0] @ query),
+        }[space]
+        assert hits[0][1] == pytest.approx(expected, abs=1e-5)
+
+    def test_empty_index(self):
+        """空のインデックスは空の結果を返すこと"""
+        index = ExactVectorIndex.from_records([], [], [], [])
+
+        assert index.search([0.1, 0.2], k=3) == []
+
+
+@pytest.mark.unit
+class TestQuantizedSearch:
+    """量子化一次検索 + 再スコアリングのテスト"""
+
+    @pytest.mark.parametrize("quantization", ["int8", "binary"])
+    def test_rescored_results_match_exact_search(self, index_records, quantization):
+        """候補数が十分なら厳密検索と同じ結果・距離になること"""
+        # Arrange
+        exact = ExactVectorIndex.from_records(**index_records)
+        quantized = ExactVectorIndex.from_records(**index_records, quantization=quantization)
+        quantized.rescore_multiplier = 10
+        query = index_records["embeddings"][7] + 0.01
+
+        # Act
+        hits = quantized.search(query, k=5)
+
+        # Assert
+        expected = exact.search(query, k=5)
+        assert [row for row, _ in hits] == [row for row, _ in expected]
+        assert [d for _, d in hits] == pytest.approx([d for _, d in expected], abs=1e-4)
+        assert quantized.sq_norms is None
+
+    def test_quantized_search_with_filter(self, index_records):
+        """フィルタ条件を満たす行の中から候補を抽出すること"""
+        index = ExactVectorIndex.from_records(**index_records, quantization="int8")
+
+        hits = index.search(index_records["embeddings"][4], k=3, where={"doc_type": "blog"})
+
+        assert hits[0][0] == 4
+        assert all(row % 3 == 1 for row, _ in hits)
+
+    def test_quantizer_memory(self, index_records):
+        """int8は1/4、バイナリは1/32程度のメモリになること"""
+        matrix = index_records["embeddings"]
+
+        scalar = ScalarQuantizer.fit(matrix)
+        binary = BinaryQuantizer.fit(matrix)
+
+        assert scalar.codes.dtype == np.int8
+        assert scalar.codes.nbytes == matrix.nbytes // 4
+        assert binary.bits.shape == (50, 1)
+
+    def test_save_and_load_keeps_full_matrix_on_disk(self, index_records, tmp_path):
+        """量子化データだけをメモリに読み込み、full-precision行列はメモリマップのままであること"""
+        # Arrange
+        index = ExactVectorIndex.from_records(**index_records, quantization="int8")
+
+        # Act
+        index.save(tmp_path)
+        loaded = ExactVectorIndex.load(tmp_path)
+
+        # Assert
+        assert loaded.quantization == "int8"
+        assert loaded.manifest["quantization"] == "int8"
+        assert isinstance(loaded.matrix, np.memmap)
+        assert not isinstance(loaded.quantizer.codes, np.memmap)
+        assert loaded.resident_bytes < index_records["embeddings"].nbytes
+        assert loaded.search(index_records["embeddings"][3], k=1)[0][0] == 3
+
+    def test_unsupported_quantization(self, index_records):
+        """未対応の量子化方式はVectorStoreError"""
+        with pytest.raises(VectorStoreError, match="Unsupported quantization"):
+            ExactVectorIndex.from_records(**index_records, quantization="pq")
+
+
+@pytest.mark.unit
+class TestNumpyVectorStore:
+    """NumpyVectorStoreのテスト"""
+
+    @pytest.fixture
+    def numpy_store(self, mocker, mock_openai_embeddings, index_records, tmp_path):
+        """Chromaの内容をモックしたNumpyVectorStore"""
+        mock_openai_embeddings()
+        mock_chroma = mocker.patch("src.features.rag.vectorstore.Chroma")
+        records = index_records
+
+        def get(ids=None, where=None, limit=None, offset=None, include=None):
+            if not include:
+                return {"ids": records["ids"]}
+            offset = offset or 0
+            end = offset + (limit or len(records["ids"]))
+            return {
+                "ids": records["ids"][offset:end],
+                "embeddings": records["embeddings"][offset:end],
+                "documents": records["documents"][offset:end],
+                "metadatas": records["metadatas"][offset:end],
+            }
+
+        mock_chroma.return_value.get.side_effect = get
+        store = NumpyVectorStore(persist_directory=str(tmp_path / "chroma"))
+        store.embeddings.embeddings.embed_query.return_value = list(records["embeddings"][11])
+        return store
+
+    def test_builds_and_searches(self, numpy_store):
+        """Chromaの内容からインデックスを構築して検索できること"""
+        results = numpy_store.similarity_search_with_score("StateGraph", k=3)
+
+        assert len(results) == 3
+        assert results[0][0].page_content == "chunk 11"
+        assert results[0][1] == pytest.approx(0.0, abs=1e-4)
+
+    def test_filter_metadata(self, numpy_store):
+        """filter_metadataがChromaと同じ意味で適用されること"""
+        results = numpy_store.similarity_search(
+            "StateGraph", k=5, filter_metadata={"doc_type": "github"}
+        )
+
+        assert len(results) == 5
+        assert all(doc.metadata["doc_type"] == "github" for doc in results)
+
+    def test_reuses_index_when_corpus_unchanged(self, numpy_store):
+        """コーパスが変わっていなければ再構築しないこと"""
+        assert numpy_store.refresh_index() is False
+        assert numpy_store.refresh_index(force=True) is True
+
+    def test_rebuilds_when_quantization_changes(self, numpy_store):
+        """量子化方式を変更するとインデックスを再構築すること"""
+        numpy_store.quantization = "binary"
+
+        assert numpy_store.refresh_index() is True
+        assert numpy_store.index.quantization == "binary"
+        results = numpy_store.similarity_search("StateGraph", k=1)
+        assert results[0].page_content == "chunk 11"
+
+    def test_uses_index_rebuilt_by_another_worker(self, numpy_store, mocker):
+        """他のワーカーが再構築済みの場合は再構築せずに読み込み直すこと"""
+        # Arrange: メモリ上のインデックスだけが古い状態
+        numpy_store.index.manifest = {**numpy_store.index.manifest, "corpus_version": "old"}
+        build = mocker.spy(numpy_store, "_build_index")
+
+        # Act
+        rebuilt = numpy_store.refresh_index()
+
+        # Assert
+        assert rebuilt is False
+        build.assert_not_called()
+        assert numpy_store.index.manifest["corpus_version"] != "old"
+
+    def test_index_beside_chroma_and_follows_space(self, numpy_store, tmp_path):
+        """インデックスはChromaディレクトリの隣に置き、距離空間を変えると再構築すること"""
+        assert numpy_store.index_directory == tmp_path / "numpy_index" / "langgraph_docs"
+        assert numpy_store.index.space == "l2"
+
+        numpy_store.space = "cosine"
+
+        assert numpy_store.refresh_index() is True
+        assert numpy_store.index.space == "cosine"
+
+    def test_mmr_search(self, numpy_store):
+        """MMR検索がインデックスの候補から重複なくk件を選ぶこと"""
+        results = numpy_store.mmr_search_with_score(
+            "StateGraph", k=4, filter_metadata={"doc_type": "github"}, fetch_k=10
+        )
+
+        assert len(results) == 4
+        assert results[0][0].page_content == "chunk 11"
+        assert len({doc.id for doc, _ in results}) == 4
+        assert all(doc.metadata["doc_type"] == "github" for doc, _ in results)
+
+    def test_similarity_search_batch(self, numpy_store, index_records):
+        """一括検索がNumPyインデックスで実行されること"""
+        inner = numpy_store.embeddings.embeddings
+        inner.embed_documents.return_value = [
+            list(index_records["embeddings"][4]),
+            list(index_records["embeddings"][20]),
+        ]
+
+        results = numpy_store.similarity_search_batch(["q1", "q2"], k=2)
+
+        assert [hits[0][0].page_content for hits in results] == ["chunk 4", "chunk 20"]
+        numpy_store.vector_store._collection.query.assert_not_called()
+
+    def test_create_vectorstore_numpy_backend(self, numpy_store, tmp_path):
+        """create_vectorstoreでNumPyバックエンドを選択できること"""
+        store = create_vectorstore(persist_directory=str(tmp_path / "chroma"), backend="numpy")
+
+        assert isinstance(store, NumpyVectorStore)
+        assert len(store.index) == 50
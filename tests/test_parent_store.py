@@ -0,0 +1,114 @@
+"""
+LangGraph Catalyst - Parent Document Store Tests
+
+親ドキュメントストア（small-to-big検索）のユニットテスト
+"""
+
+import pytest
+from langchain_core.documents import Document
+
+from src.features.rag.parent_store import ParentDocumentStore
+from src.utils.helpers import calculate_token_count, split_documents
+
+
+def _section(name: str, length: int = 900) -> str:
+    """指定文字数程度の段落を作成"""
+    sentence = f"{name} explains LangGraph state handling. "
+    return (sentence * (length // len(sentence) + 1))[:length].strip()
+
+
+@pytest.fixture
+def source_document() -> Document:
+    """3つの段落を持つ元ドキュメント"""
+    return Document(
+        page_content="\n\n".join(_section(name) for name in ("Alpha", "Beta", "Gamma")),
+        metadata={"source": "https://docs.example.com/state", "title": "State", "doc_type": "docs"},
+    )
+
+
+@pytest.fixture
+def parent_store(tmp_path) -> ParentDocumentStore:
+    """1段落ずつを親セクションとするストア"""
+    store = ParentDocumentStore(tmp_path / "parents.sqlite3", parent_chunk_size=1000)
+    yield store
+    store.close()
+
+
+@pytest.mark.unit
+class TestParentDocumentStore:
+    """親ドキュメントストアのテスト"""
+
+    def test_add_documents_stores_sections_by_source_and_offset(
+        self, parent_store, source_document
+    ):
+        """元ドキュメントを親セクションに分割し、ソースと開始位置で保存すること"""
+        # Act
+        count = parent_store.add_documents([source_document])
+
+        # Assert
+        assert count == 3
+        stats = parent_store.stats()
+        assert stats["parent_count"] == 3
+        assert stats["source_count"] == 1
+        assert stats["total_tokens"] > 0
+
+    def test_add_documents_replaces_existing_source(self, parent_store, source_document):
+        """同じソースを再投入すると古いセクションを置き換えること"""
+        # Arrange
+        parent_store.add_documents([source_document])
+        shorter = Document(page_content=_section("Delta"), metadata=source_document.metadata)
+
+        # Act
+        parent_store.add_documents([shorter])
+
+        # Assert
+        assert len(parent_store) == 1
+
+    def test_expand_maps_chunks_to_deduplicated_parents(self, parent_store, source_document):
+        """チャンクを含む親セクションに展開し、同じ親は1回だけ返すこと"""
+        # Arrange
+        parent_store.add_documents([source_document])
+        chunks = split_documents([source_document], chunk_size=300, chunk_overlap=50)
+        beta_chunks = [chunk for chunk in chunks if chunk.page_content.startswith("Beta")]
+        alpha_chunks = [chunk for chunk in chunks if chunk.page_content.startswith("Alpha")]
+
+        # Act
+        expanded = parent_store.expand(beta_chunks + alpha_chunks, max_tokens=10000)
+
+        # Assert
+        assert len(expanded) == 2
+        assert expanded[0].page_content == _section("Beta")
+        assert expanded[1].page_content == _section("Alpha")
+        assert expanded[0].metadata["title"] == "State"
+
+    def test_expand_respects_token_budget(self, parent_store, source_document):
+        """予算に収まらない親セクションはチャンクで代替し、それも収まらなければ除外すること"""
+        # Arrange
+        parent_store.add_documents([source_document])
+        chunks = split_documents([source_document], chunk_size=300, chunk_overlap=0)
+        alpha = [chunk for chunk in chunks if chunk.page_content.startswith("Alpha")][0]
+        beta = [chunk for chunk in chunks if chunk.page_content.startswith("Beta")][0]
+        parent_tokens = calculate_token_count(_section("Alpha"))
+        chunk_tokens = calculate_token_count(beta.page_content)
+
+        # Act
+        expanded = parent_store.expand([alpha, beta], max_tokens=parent_tokens + chunk_tokens)
+        tight = parent_store.expand([alpha], max_tokens=parent_tokens - 1)
+
+        # Assert
+        assert [doc.page_content for doc in expanded] == [_section("Alpha"), beta.page_content]
+        assert tight == [alpha]
+
+    def test_expand_falls_back_to_chunk_without_parent(self, parent_store):
+        """親セクションが保存されていないチャンクはそのまま返すこと"""
+        # Arrange
+        chunk = Document(
+            page_content="orphan chunk",
+            metadata={"source": "https://unknown.example.com", "start_index": 0},
+        )
+
+        # Act
+        expanded = parent_store.expand([chunk], max_tokens=100)
+
+        # Assert
+        assert expanded == [chunk]
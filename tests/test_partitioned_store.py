@@ -0,0 +1,222 @@
+"""
+LangGraph Catalyst - Partitioned Vector Store Tests
+
+doc_typeごとのパーティション構成のユニットテスト
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+from langchain_core.documents import Document
+
+from src.features.rag.partitioned_store import (
+    PartitionedVectorStore,
+    partition_key,
+    route_filter,
+)
+from src.features.rag.vectorstore import create_vectorstore
+from src.utils.exceptions import VectorStoreError
+
+PARTITIONS = ["blog", "github", "official_docs"]
+
+INIT_SCRIPT = Path(__file__).parent.parent / "scripts" / "init_vectorstore.py"
+
+
+@pytest.mark.unit
+class TestRouteFilter:
+    """route_filterのテスト"""
+
+    def test_no_filter_selects_all(self):
+        """フィルタなしは全パーティション"""
+        assert route_filter(None, PARTITIONS) == (PARTITIONS, None)
+
+    def test_equality(self):
+        """等価条件は該当パーティションのみ、残りの条件なし"""
+        assert route_filter({"doc_type": "blog"}, PARTITIONS) == (["blog"], None)
+
+    def test_in_and_nin(self):
+        """$in / $nin がパーティション選択に変換されること"""
+        in_filter = {"doc_type": {"$in": ["blog", "github"]}}
+        nin_filter = {"doc_type": {"$nin": ["blog"]}}
+
+        assert route_filter(in_filter, PARTITIONS) == (["blog", "github"], None)
+        assert route_filter(nin_filter, PARTITIONS) == (["github", "official_docs"], None)
+
+    def test_and_keeps_residual_clauses(self):
+        """$and内のdoc_type以外の条件はパーティション内のフィルタとして残ること"""
+        where = {"$and": [{"doc_type": "blog"}, {"start_index": {"$lt": 10}}]}
+
+        assert route_filter(where, PARTITIONS) == (["blog"], {"start_index": {"$lt": 10}})
+
+    def test_unroutable_filter_applies_to_all(self):
+        """$orなどは全パーティションにそのまま適用すること"""
+        where = {"$or": [{"doc_type": "blog"}, {"start_index": 0}]}
+
+        assert route_filter(where, PARTITIONS) == (PARTITIONS, where)
+
+    def test_unknown_doc_type(self):
+        """存在しないdoc_typeはパーティションを選択しないこと"""
+        assert route_filter({"doc_type": "missing"}, PARTITIONS) == ([], None)
+
+    def test_partition_key(self):
+        """doc_typeがコレクション名に使える形に変換されること"""
+        assert partition_key("github_example") == "github_example"
+        assert partition_key(None) == "unknown"
+        assert partition_key("a b/c") == "a-b-c"
+
+
+@pytest.mark.unit
+class TestPartitionedVectorStore:
+    """PartitionedVectorStoreのテスト"""
+
+    @pytest.fixture
+    def collections(self, mocker, mock_openai_embeddings):
+        """コレクション名ごとに別のモックを返すChroma"""
+        mock_openai_embeddings()
+        collections: dict[str, Mock] = {}
+
+        def make_chroma(collection_name, **kwargs):
+            instance = Mock(name=collection_name)
+            instance._collection.count.return_value = 0
+            instance.get.return_value = {"ids": []}
+            instance._client.list_collections.return_value = [
+                "langgraph_docs",
+                "langgraph_docs__blog",
+                "langgraph_docs__official_docs",
+                "other_collection",
+            ]
+            instance._collection.query.return_value = {
+                "ids": [[f"{collection_name}-1", f"{collection_name}-2"]],
+                "documents": [["first", "second"]],
+                "metadatas": [[{}, {}]],
+                "distances": [[0.3, 0.6] if collection_name.endswith("blog") else [0.1, 0.5]],
+            }
+            collections[collection_name] = instance
+            return instance
+
+        mocker.patch("src.features.rag.vectorstore.Chroma", side_effect=make_chroma)
+        return collections
+
+    def test_discovers_existing_partitions(self, collections):
+        """既存のパーティションコレクションを検出すること"""
+        store = PartitionedVectorStore()
+
+        assert sorted(store.partitions) == ["blog", "official_docs"]
+
+    def test_add_documents_routes_by_doc_type(self, collections):
+        """チャンクがdoc_typeごとのパーティションに書き込まれること"""
+        # Arrange
+        store = PartitionedVectorStore()
+        docs = [
+            Document(page_content="a", metadata={"doc_type": "blog", "start_index": 0}),
+            Document(page_content="b", metadata={"doc_type": "github", "start_index": 0}),
+            Document(page_content="c", metadata={"doc_type": "blog", "start_index": 1}),
+        ]
+
+        # Act
+        result = store.add_documents(docs)
+
+        # Assert
+        assert result["partitions"] == {"blog": 2, "github": 1}
+        assert result["added_count"] == 3
+        assert result["status"] == "success"
+        blog_docs = collections["langgraph_docs__blog"].add_documents.call_args.kwargs
+        assert [doc.page_content for doc in blog_docs["documents"]] == ["a", "c"]
+        assert "langgraph_docs__github" in collections
+        collections["langgraph_docs"].add_documents.assert_not_called()
+
+    def test_filtered_search_queries_selected_partition(self, collections):
+        """フィルタで選択したパーティションだけを検索すること"""
+        # Arrange
+        store = PartitionedVectorStore()
+
+        # Act
+        results = store.similarity_search_with_score(
+            "MemorySaver", k=2, filter_metadata={"doc_type": "blog"}
+        )
+
+        # Assert
+        assert [doc.id for doc, _ in results] == [
+            "langgraph_docs__blog-1",
+            "langgraph_docs__blog-2",
+        ]
+        assert (
+            collections["langgraph_docs__blog"]._collection.query.call_args.kwargs["where"] is None
+        )
+        collections["langgraph_docs__official_docs"]._collection.query.assert_not_called()
+
+    def test_unfiltered_search_merges_top_k(self, collections):
+        """フィルタなしでは全パーティションを検索し、距離順にマージすること"""
+        store = PartitionedVectorStore()
+
+        results = store.similarity_search_with_score("MemorySaver", k=3)
+
+        assert [score for _, score in results] == [0.1, 0.3, 0.5]
+        collections["langgraph_docs__blog"]._collection.query.assert_called_once()
+        collections["langgraph_docs__official_docs"]._collection.query.assert_called_once()
+
+    def test_search_error(self, collections):
+        """パーティションの検索エラーはVectorStoreError"""
+        store = PartitionedVectorStore()
+        collections["langgraph_docs__blog"]._collection.query.side_effect = Exception("boom")
+
+        with pytest.raises(VectorStoreError, match="Failed to perform similarity search"):
+            store.similarity_search("MemorySaver")
+
+    def test_create_vectorstore_partitioned_backend(self, collections):
+        """create_vectorstoreでパーティション構成を選択できること"""
+        store = create_vectorstore(backend="partitioned")
+
+        assert isinstance(store, PartitionedVectorStore)
+
+    def test_init_script_ingests_into_partitions(self, collections, monkeypatch):
+        """初期化スクリプトがpartitionedバックエンドのdoc_typeごとのパーティションに投入すること"""
+        # Arrange
+        from src.config.settings import settings
+
+        monkeypatch.setattr(settings, "vectorstore_backend", "partitioned")
+        spec = importlib.util.spec_from_file_location("init_vectorstore", INIT_SCRIPT)
+        script = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(script)
+        docs = {
+            "crawl_langgraph_docs": Document(
+                page_content="LangGraph overview", metadata={"doc_type": "official_docs"}
+            ),
+            "crawl_langchain_docs": Document(
+                page_content="LangChain overview", metadata={"doc_type": "official_docs"}
+            ),
+            "crawl_langchain_blog": Document(
+                page_content="LangGraph release notes", metadata={"doc_type": "blog"}
+            ),
+        }
+        for name, doc in docs.items():
+            monkeypatch.setattr(script, name, Mock(return_value=[doc]))
+        monkeypatch.setattr(sys, "argv", ["init_vectorstore.py", "--skip-github", "--no-dedup"])
+
+        # Act
+        exit_code = script.main()
+
+        # Assert
+        assert exit_code == 0
+        collections["langgraph_docs__blog"].add_documents.assert_called_once()
+        official = collections["langgraph_docs__official_docs"].add_documents.call_args.kwargs
+        assert len(official["documents"]) == 2
+        collections["langgraph_docs"].add_documents.assert_not_called()
+
+    def test_close_releases_partitions(self, collections):
+        """close()で各パーティションのストアも解放すること"""
+        # Arrange
+        store = PartitionedVectorStore()
+        partitions = list(store.partitions.values())
+        for partition in partitions:
+            partition.close = Mock(wraps=partition.close)
+
+        # Act
+        store.close()
+
+        # Assert
+        for partition in partitions:
+            partition.close.assert_called_once()
@@ -4,11 +4,16 @@ LangGraph Catalyst - RAG Chain Tests
 RAGチェーンのユニットテスト
 """
 
+import asyncio
+
 import pytest
+from langchain_core.documents import Document
 
 from src.features.rag.chain import RAGChain
+from src.features.rag.parent_store import ParentDocumentStore
 from src.features.rag.vectorstore import ChromaVectorStore
 from src.utils.exceptions import LLMError, ValidationError
+from src.utils.helpers import calculate_token_count
 
 
 @pytest.mark.unit
@@ -111,6 +116,75 @@ class TestRAGChain:
             assert "title" in source
             assert "url" in source
 
+    def test_query_hybrid_search_mode(self, mocker, mock_openai_chat, sample_documents):
+        """search_mode=hybridの場合はハイブリッド検索を使うこと"""
+        # Arrange
+        mock_openai_chat(response_content="MemorySaver is...", tokens=100)
+
+        mock_vectorstore = mocker.Mock(spec=ChromaVectorStore)
+        mock_vectorstore.hybrid_search.return_value = sample_documents
+
+        rag_chain = RAGChain(vectorstore=mock_vectorstore, search_mode="hybrid")
+
+        # Act
+        response = rag_chain.query("MemorySaverとは？", k=3)
+
+        # Assert
+        assert len(response["sources"]) > 0
+        mock_vectorstore.hybrid_search.assert_called_once_with(query="MemorySaverとは？", k=3)
+        mock_vectorstore.similarity_search.assert_not_called()
+
+    def test_query_mmr_search_mode_per_request(self, mocker, mock_openai_chat, sample_documents):
+        """リクエストごとにsearch_mode=mmrを指定できること"""
+        # Arrange
+        mock_openai_chat(response_content="MemorySaver is...", tokens=100)
+
+        mock_vectorstore = mocker.Mock(spec=ChromaVectorStore)
+        mock_vectorstore.mmr_search.return_value = sample_documents
+
+        rag_chain = RAGChain(vectorstore=mock_vectorstore, search_mode="similarity")
+
+        # Act
+        response = rag_chain.query("MemorySaverとは？", k=3, search_mode="mmr")
+
+        # Assert
+        assert len(response["sources"]) > 0
+        mock_vectorstore.mmr_search.assert_called_once_with(query="MemorySaverとは？", k=3)
+        mock_vectorstore.similarity_search.assert_not_called()
+
+    def test_query_expands_chunks_to_parent_sections(
+        self, mocker, mock_openai_chat, sample_documents
+    ):
+        """親ドキュメントストアがあれば親セクションでコンテキストを構築し、ソースはチャンクのまま"""
+        # Arrange
+        mock_openai_chat(response_content="MemorySaver is...", tokens=100)
+
+        mock_vectorstore = mocker.Mock(spec=ChromaVectorStore)
+        mock_vectorstore.similarity_search.return_value = sample_documents
+        parent_store = mocker.Mock(spec=ParentDocumentStore)
+        parent_store.expand.return_value = [
+            Document(page_content="FULL PARENT SECTION", metadata={"source": "https://a"})
+        ]
+
+        rag_chain = RAGChain(vectorstore=mock_vectorstore, parent_store=parent_store)
+        build_context = mocker.spy(rag_chain, "_build_context")
+
+        # Act
+        response = rag_chain.query("MemorySaverとは？", k=3)
+
+        # Assert
+        parent_store.expand.assert_called_once_with(sample_documents)
+        assert build_context.call_args.args[0] == parent_store.expand.return_value
+        assert len(response["sources"]) == len(sample_documents)
+
+    def test_query_unsupported_search_mode(self, mocker, mock_openai_chat):
+        """未対応のsearch_modeはValidationError"""
+        mock_openai_chat()
+        rag_chain = RAGChain(vectorstore=mocker.Mock(spec=ChromaVectorStore))
+
+        with pytest.raises(ValidationError, match="Unsupported search mode"):
+            rag_chain.query("MemorySaverとは？", search_mode="semantic")
+
     def test_query_with_code_examples_auto_detection(
         self, mocker, mock_openai_chat, sample_documents
     ):
@@ -202,6 +276,100 @@ graph = StateGraph(State)
         with pytest.raises(LLMError, match="Failed to process RAG query"):
             rag_chain.query("What is LangGraph?")
 
+    def test_stream_yields_sources_tokens_and_final(self, mocker, sample_documents):
+        """ソース → トークン差分 → 最終イベントの順に返し、使用量は1回だけ集計すること"""
+        # Arrange
+        from langchain_core.messages import AIMessageChunk
+
+        mock_vectorstore = mocker.Mock(spec=ChromaVectorStore)
+        mock_vectorstore.similarity_search.return_value = sample_documents
+
+        mock_llm = mocker.patch("src.features.rag.chain.ChatOpenAI")
+        mock_llm.return_value.stream.return_value = iter(
+            [
+                AIMessageChunk(content="```python\nx = 1\n"),
+                AIMessageChunk(content="```"),
+                AIMessageChunk(
+                    content="",
+                    usage_metadata={"input_tokens": 90, "output_tokens": 10, "total_tokens": 100},
+                ),
+            ]
+        )
+
+        rag_chain = RAGChain(vectorstore=mock_vectorstore)
+
+        # Act
+        events = list(rag_chain.stream("How to write code?", include_code_examples=True))
+
+        # Assert
+        assert [name for name, _ in events] == ["sources", "token", "token", "final"]
+        assert len(events[0][1]["sources"]) == len(sample_documents)
+        final = events[-1][1]
+        assert final["metadata"]["tokens_used"] == 100
+        assert final["code_examples"][0]["code"].strip() == "x = 1"
+        mock_llm.return_value.stream.assert_called_once()
+        mock_llm.return_value.invoke.assert_not_called()
+
+    def test_stream_validates_before_first_event(self, mocker, mock_openai_chat):
+        """空の質問は最初のイベントの前にValidationError"""
+        mock_openai_chat()
+        rag_chain = RAGChain(vectorstore=mocker.Mock(spec=ChromaVectorStore))
+
+        with pytest.raises(ValidationError, match="Question cannot be empty"):
+            next(rag_chain.stream(""))
+
+    def test_aquery_uses_async_retrieval_and_ainvoke(self, mocker, sample_documents):
+        """非同期の検索とainvokeで実行し、queryと同じ形式で返すこと"""
+        # Arrange
+        from unittest.mock import AsyncMock
+
+        mock_vectorstore = mocker.Mock(spec=ChromaVectorStore)
+        mock_vectorstore.ahybrid_search = AsyncMock(return_value=sample_documents)
+
+        mock_llm = mocker.patch("src.features.rag.chain.ChatOpenAI")
+        response = mocker.Mock(content="MemorySaver is...")
+        response.response_metadata = {"token_usage": {"total_tokens": 120}}
+        mock_llm.return_value.ainvoke = AsyncMock(return_value=response)
+
+        rag_chain = RAGChain(vectorstore=mock_vectorstore)
+
+        # Act
+        result = asyncio.run(rag_chain.aquery("MemorySaverとは？", k=3, search_mode="hybrid"))
+
+        # Assert
+        mock_vectorstore.ahybrid_search.assert_awaited_once_with(query="MemorySaverとは？", k=3)
+        mock_llm.return_value.invoke.assert_not_called()
+        assert result["answer"] == "MemorySaver is..."
+        assert result["metadata"]["tokens_used"] == 120
+        assert len(result["sources"]) == len(sample_documents)
+        assert set(result) == {"answer", "sources", "code_examples", "confidence", "metadata"}
+
+    def test_aquery_cancellation_propagates(self, mocker, sample_documents):
+        """キャンセルされた場合はLLMErrorに変換せずCancelledErrorを送出すること"""
+        # Arrange
+        from unittest.mock import AsyncMock
+
+        mock_vectorstore = mocker.Mock(spec=ChromaVectorStore)
+        mock_vectorstore.asimilarity_search = AsyncMock(return_value=sample_documents)
+
+        async def slow_ainvoke(prompt):
+            await asyncio.sleep(10)
+
+        mock_llm = mocker.patch("src.features.rag.chain.ChatOpenAI")
+        mock_llm.return_value.ainvoke = slow_ainvoke
+
+        rag_chain = RAGChain(vectorstore=mock_vectorstore)
+
+        async def run_and_cancel():
+            task = asyncio.create_task(rag_chain.aquery("What is LangGraph?"))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            await task
+
+        # Act & Assert
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(run_and_cancel())
+
     # ========================================================================
     # Helper Method Tests
     # ========================================================================
@@ -240,15 +408,58 @@ graph = StateGraph(State)
         rag_chain = RAGChain(vectorstore=mock_vectorstore)
 
         # Act
-        context = rag_chain._build_context(sample_documents)
+        context, context_tokens = rag_chain._build_context(sample_documents)
 
         # Assert
         assert context != ""
+        assert context_tokens > 0
         assert "Introduction to LangGraph" in context
         assert "StateGraph Documentation" in context
         # URLが含まれることを確認
         assert "https://langchain-ai.github.io/langgraph/" in context
 
+    def test_build_context_packs_within_token_budget(self, mocker, mock_openai_chat):
+        """関連度順に予算まで詰め、収まらないドキュメントは文の区切りで切り詰めること"""
+        # Arrange
+        mock_openai_chat()
+        rag_chain = RAGChain(vectorstore=mocker.Mock(spec=ChromaVectorStore))
+        sentence = "StateGraph connects nodes with edges. "
+        documents = [
+            Document(page_content=sentence * 10, metadata={"title": f"Doc {i}"}) for i in range(3)
+        ]
+        budget = calculate_token_count(sentence * 10) + 100
+
+        # Act
+        context, context_tokens = rag_chain._build_context(documents, budget)
+
+        # Assert
+        assert context_tokens <= budget
+        assert calculate_token_count(context) <= budget
+        assert "Doc 0" in context and "Doc 1" in context
+        assert "Doc 2" not in context
+        # 2件目は文の途中ではなく文末で切れている
+        assert context.rstrip().endswith("edges.")
+        assert context.count(sentence.strip()) < 20
+
+    def test_query_large_k_bounded_by_max_tokens(self, mocker, mock_openai_chat):
+        """kが大きくてもプロンプトはmax_tokens以内に収まり、context_tokensを返すこと"""
+        # Arrange
+        mock_openai_chat(response_content="answer", tokens=10)
+        mock_vectorstore = mocker.Mock(spec=ChromaVectorStore)
+        mock_vectorstore.similarity_search.return_value = [
+            Document(page_content="Checkpointers persist graph state. " * 50, metadata={})
+            for _ in range(20)
+        ]
+        rag_chain = RAGChain(vectorstore=mock_vectorstore, max_tokens=1000)
+
+        # Act
+        response = rag_chain.query("What is a checkpointer?", k=20, include_code_examples=False)
+
+        # Assert
+        prompt = rag_chain.llm.invoke.call_args.args[0]
+        assert calculate_token_count(prompt) <= 1000
+        assert 0 < response["metadata"]["context_tokens"] < 1000
+
     def test_calculate_confidence(self, mocker, mock_openai_chat, sample_documents):
         """信頼度計算のテスト"""
         # Arrange
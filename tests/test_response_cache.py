@@ -0,0 +1,243 @@
+"""
+LangGraph Catalyst - Response Cache Tests
+
+同一のリクエストに保存済みの応答を返す応答キャッシュのユニットテスト
+"""
+
+from unittest.mock import Mock
+
+import pytest
+from langchain_core.documents import Document
+
+from src.features.rag.chain import RAGChain
+from src.features.rag.response_cache import (
+    SWEEP_INTERVAL_SECONDS,
+    ResponseCache,
+    normalize_question,
+)
+
+PARAMS = "gpt-4o-mini|similarity|k=5|sources=True|code=False"
+
+
+def _payload(answer: str) -> dict:
+    return {
+        "answer": answer,
+        "sources": [],
+        "code_examples": [],
+        "confidence": 0.8,
+        "metadata": {"model": "gpt-4o-mini", "tokens_used": 120, "cache_hit": False},
+    }
+
+
+@pytest.mark.unit
+class TestResponseCache:
+    """ResponseCacheのテスト"""
+
+    def test_normalize_question(self):
+        """NFKC・空白・大文字小文字の違いを同じ質問として扱うこと"""
+        assert normalize_question("  What is　ＬａｎｇＧｒａｐｈ?\n") == "what is langgraph?"
+
+    def test_hit_for_normalized_question(self, tmp_path):
+        """正規化して同じ質問・同じパラメータの場合のみ保存済みの応答を返すこと"""
+        # Arrange
+        cache = ResponseCache(tmp_path / "responses.sqlite3", ttl_seconds=60)
+        cache.put("What is LangGraph?", PARAMS, "v1", _payload("LangGraph is..."))
+
+        # Act
+        hit = cache.get("what  is ＬａｎｇＧｒａｐｈ?", PARAMS, "v1")
+        other_params = cache.get("What is LangGraph?", PARAMS.replace("k=5", "k=10"), "v1")
+        other_question = cache.get("What is LangChain?", PARAMS, "v1")
+
+        # Assert
+        assert hit["answer"] == "LangGraph is..."
+        assert other_params is None
+        assert other_question is None
+
+    def test_new_corpus_version_invalidates(self, tmp_path):
+        """コーパスバージョンが変わったら返さず、次の保存時に古い応答を削除すること"""
+        # Arrange
+        cache = ResponseCache(tmp_path / "responses.sqlite3", ttl_seconds=60)
+        cache.put("What is LangGraph?", PARAMS, "v1", _payload("old"))
+
+        # Act
+        miss = cache.get("What is LangGraph?", PARAMS, "v2")
+        cache.put("What is LangGraph?", PARAMS, "v2", _payload("new"))
+
+        # Assert
+        assert miss is None
+        assert cache.get("What is LangGraph?", PARAMS, "v2")["answer"] == "new"
+        assert cache.stats()["entries"] == 1
+
+    def test_entries_expire_after_ttl(self, tmp_path, monkeypatch):
+        """TTLを過ぎた応答は返さないこと"""
+        # Arrange
+        now = [1000.0]
+        monkeypatch.setattr("src.features.rag.response_cache.time.time", lambda: now[0])
+        cache = ResponseCache(tmp_path / "responses.sqlite3", ttl_seconds=60)
+        cache.put("What is LangGraph?", PARAMS, "v1", _payload("answer"))
+
+        # Act
+        now[0] += 61
+        hit = cache.get("What is LangGraph?", PARAMS, "v1")
+
+        # Assert
+        assert hit is None
+
+    def test_shared_between_workers(self, tmp_path):
+        """同じSQLiteファイルを使う別インスタンス（ワーカー）と応答とヒット率を共有すること"""
+        # Arrange
+        path = tmp_path / "responses.sqlite3"
+        worker_a = ResponseCache(path, ttl_seconds=60)
+        worker_b = ResponseCache(path, ttl_seconds=60)
+
+        # Act
+        worker_a.get("What is LangGraph?", PARAMS, "v1")
+        worker_a.put("What is LangGraph?", PARAMS, "v1", _payload("shared"))
+        hit = worker_b.get("What is LangGraph?", PARAMS, "v1")
+        stats = worker_b.stats()
+
+        # Assert
+        assert hit["answer"] == "shared"
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_ratio"] == pytest.approx(0.5)
+        assert stats["process_hits"] == 1
+        assert stats["process_misses"] == 0
+
+    def test_lookup_does_not_write(self, tmp_path):
+        """検索ではSQLiteに書き込まず、ヒット/ミス数は統計取得時に反映すること"""
+        # Arrange
+        path = tmp_path / "responses.sqlite3"
+        cache = ResponseCache(path, ttl_seconds=60)
+        cache.put("What is LangGraph?", PARAMS, "v1", _payload("answer"))
+        changes = cache._connection().total_changes
+
+        # Act
+        cache.get("What is LangGraph?", PARAMS, "v1")
+        cache.get("What is LangChain?", PARAMS, "v1")
+        changes_after_lookups = cache._connection().total_changes
+        before_stats = ResponseCache(path, ttl_seconds=60).stats()
+        stats = cache.stats()
+
+        # Assert
+        assert changes_after_lookups == changes
+        assert (before_stats["hits"], before_stats["misses"]) == (0, 0)
+        assert (stats["hits"], stats["misses"]) == (1, 1)
+
+    def test_sweeps_expired_entries_periodically(self, tmp_path, monkeypatch):
+        """失効した応答は保存のたびではなく一定間隔で削除すること"""
+        # Arrange
+        now = [1000.0]
+        monkeypatch.setattr("src.features.rag.response_cache.time.time", lambda: now[0])
+        cache = ResponseCache(tmp_path / "responses.sqlite3", ttl_seconds=60)
+        cache.put("first", PARAMS, "v1", _payload("first"))
+
+        # Act
+        now[0] += 61
+        cache.put("second", PARAMS, "v1", _payload("second"))
+        entries_before_sweep = cache.stats()["entries"]
+        now[0] += SWEEP_INTERVAL_SECONDS
+        cache.put("third", PARAMS, "v1", _payload("third"))
+
+        # Assert
+        assert entries_before_sweep == 2
+        assert cache.stats()["entries"] == 1
+
+    def test_sweep_columns_are_indexed(self, tmp_path):
+        """削除条件のコーパスバージョンと作成時刻にインデックスがあること"""
+        # Arrange
+        cache = ResponseCache(tmp_path / "responses.sqlite3", ttl_seconds=60)
+
+        # Act
+        indexed = {
+            row[0]
+            for row in cache._connection().execute(
+                "SELECT il.name FROM sqlite_master m, pragma_index_list(m.name) l, "
+                "pragma_index_info(l.name) il WHERE m.name = 'responses'"
+            )
+        }
+
+        # Assert
+        assert {"corpus_version", "created_at"} <= indexed
+
+
+@pytest.mark.unit
+class TestRAGChainResponseCache:
+    """RAGChainと応答キャッシュの連携のテスト"""
+
+    def test_identical_request_served_from_cache(self, mock_openai_chat, tmp_path):
+        """同一のリクエストでは検索・LLMを呼ばずに保存済みの応答を返し、メタデータで示すこと"""
+        # Arrange
+        mock_openai_chat(response_content="LangGraph is a framework.", tokens=100)
+        vectorstore = Mock()
+        vectorstore.similarity_search.return_value = [
+            Document(id="id-1", page_content="LangGraph overview", metadata={"title": "Intro"})
+        ]
+        vectorstore.get_cached_corpus_version.return_value = "v1"
+        rag_chain = RAGChain(
+            vectorstore=vectorstore,
+            search_mode="similarity",
+            response_cache=ResponseCache(tmp_path / "responses.sqlite3", ttl_seconds=60),
+        )
+
+        # Act
+        first = rag_chain.query("What is LangGraph?", include_code_examples=False)
+        second = rag_chain.query("  what is langgraph? ", include_code_examples=False)
+        other_k = rag_chain.query("What is LangGraph?", k=3, include_code_examples=False)
+
+        # Assert
+        assert first["metadata"]["cache_hit"] is False
+        assert second["metadata"]["cache_hit"] is True
+        assert second["metadata"]["cache_type"] == "exact"
+        assert second["metadata"]["tokens_used"] == 0
+        assert second["answer"] == first["answer"]
+        assert second["sources"] == first["sources"]
+        assert other_k["metadata"]["cache_hit"] is False
+        assert vectorstore.similarity_search.call_count == 2
+        assert rag_chain.llm.invoke.call_count == 2
+
+    def test_reingest_invalidates_cached_response(self, mock_openai_chat, tmp_path):
+        """コーパスバージョンが変わったら同じリクエストでも回答を生成し直すこと"""
+        # Arrange
+        mock_openai_chat(response_content="answer", tokens=10)
+        vectorstore = Mock()
+        vectorstore.similarity_search.return_value = [Document(id="id-1", page_content="doc")]
+        vectorstore.get_cached_corpus_version.side_effect = ["v1", "v2"]
+        rag_chain = RAGChain(
+            vectorstore=vectorstore,
+            search_mode="similarity",
+            response_cache=ResponseCache(tmp_path / "responses.sqlite3", ttl_seconds=60),
+        )
+
+        # Act
+        rag_chain.query("What is LangGraph?", include_code_examples=False)
+        second = rag_chain.query("What is LangGraph?", include_code_examples=False)
+
+        # Assert
+        assert second["metadata"]["cache_hit"] is False
+        assert rag_chain.llm.invoke.call_count == 2
+
+    def test_prompt_budget_is_part_of_cache_key(self, mock_openai_chat, tmp_path):
+        """プロンプトのトークン予算が異なるチェーンとは応答を共有しないこと"""
+        # Arrange
+        mock_openai_chat(response_content="answer", tokens=10)
+        vectorstore = Mock()
+        vectorstore.similarity_search.return_value = [Document(id="id-1", page_content="doc")]
+        vectorstore.get_cached_corpus_version.return_value = "v1"
+        path = tmp_path / "responses.sqlite3"
+        chains = [
+            RAGChain(
+                vectorstore=vectorstore,
+                search_mode="similarity",
+                max_tokens=max_tokens,
+                response_cache=ResponseCache(path, ttl_seconds=60),
+            )
+            for max_tokens in (2000, 4000)
+        ]
+
+        # Act
+        chains[0].query("What is LangGraph?", include_code_examples=False)
+        other_budget = chains[1].query("What is LangGraph?", include_code_examples=False)
+
+        # Assert
+        assert other_budget["metadata"]["cache_hit"] is False
@@ -0,0 +1,184 @@
+"""
+LangGraph Catalyst - Semantic Answer Cache Tests
+
+言い換えられた質問に回答を再利用するセマンティックキャッシュのユニットテスト
+"""
+
+from unittest.mock import Mock
+
+import pytest
+from langchain_core.documents import Document
+
+from src.features.rag.chain import RAGChain
+from src.features.rag.semantic_cache import SemanticAnswerCache
+
+PARAMS = "gpt-4o-mini|similarity|k=5|sources=True|code=False"
+
+
+def _payload(answer: str) -> dict:
+    return {
+        "answer": answer,
+        "sources": [],
+        "code_examples": [],
+        "confidence": 0.8,
+        "metadata": {"model": "gpt-4o-mini", "tokens_used": 120, "cache_hit": False},
+    }
+
+
+@pytest.mark.unit
+class TestSemanticAnswerCache:
+    """SemanticAnswerCacheのテスト"""
+
+    def test_hit_above_threshold(self):
+        """コサイン類似度がしきい値以上の質問には保存済みの回答を返すこと"""
+        # Arrange
+        cache = SemanticAnswerCache(threshold=0.9, ttl_seconds=60, max_entries=10)
+        cache.store([1.0, 0.0, 0.0], "v1", PARAMS, _payload("LangGraph is..."), ["id-1"])
+
+        # Act
+        hit = cache.lookup([0.95, 0.1, 0.0], "v1", PARAMS)
+        miss = cache.lookup([0.5, 0.8, 0.0], "v1", PARAMS)
+
+        # Assert
+        assert hit is not None
+        assert hit.payload["answer"] == "LangGraph is..."
+        assert hit.similarity > 0.9
+        assert hit.source_ids == ["id-1"]
+        assert miss is None
+        assert cache.stats()["hit_ratio"] == pytest.approx(0.5)
+
+    def test_requires_same_corpus_version_and_params(self):
+        """コーパスバージョンやリクエストパラメータが異なる回答は返さないこと"""
+        cache = SemanticAnswerCache(threshold=0.9, ttl_seconds=60, max_entries=10)
+        cache.store([1.0, 0.0], "v1", PARAMS, _payload("old"), [])
+
+        assert cache.lookup([1.0, 0.0], "v1", PARAMS.replace("k=5", "k=10")) is None
+        assert cache.lookup([1.0, 0.0], "v2", PARAMS) is None
+
+        # 新しいコーパスの回答を保存すると古いバージョンのエントリは削除される
+        cache.store([0.0, 1.0], "v2", PARAMS, _payload("new"), [])
+        assert cache.stats()["entries"] == 1
+
+    def test_entries_expire_after_ttl(self, monkeypatch):
+        """TTLを過ぎたエントリは返さずに削除すること"""
+        # Arrange
+        now = [1000.0]
+        monkeypatch.setattr("src.features.rag.semantic_cache.time.time", lambda: now[0])
+        cache = SemanticAnswerCache(threshold=0.9, ttl_seconds=60, max_entries=10)
+        cache.store([1.0, 0.0], "v1", PARAMS, _payload("answer"), [])
+
+        # Act
+        now[0] += 61
+        hit = cache.lookup([1.0, 0.0], "v1", PARAMS)
+
+        # Assert
+        assert hit is None
+        assert cache.stats()["entries"] == 0
+        assert cache.stats()["evictions"] == 1
+
+    def test_evicts_least_recently_used(self):
+        """上限を超えたら最も長く使われていないエントリを削除すること"""
+        # Arrange
+        cache = SemanticAnswerCache(threshold=0.99, ttl_seconds=60, max_entries=2)
+        cache.store([1.0, 0.0, 0.0], "v1", PARAMS, _payload("a"), [])
+        cache.store([0.0, 1.0, 0.0], "v1", PARAMS, _payload("b"), [])
+        cache.lookup([1.0, 0.0, 0.0], "v1", PARAMS)  # aを最近使ったものにする
+
+        # Act
+        cache.store([0.0, 0.0, 1.0], "v1", PARAMS, _payload("c"), [])
+
+        # Assert
+        assert cache.lookup([1.0, 0.0, 0.0], "v1", PARAMS) is not None
+        assert cache.lookup([0.0, 1.0, 0.0], "v1", PARAMS) is None
+        assert cache.lookup([0.0, 0.0, 1.0], "v1", PARAMS) is not None
+
+
+@pytest.mark.unit
+class TestRAGChainSemanticCache:
+    """RAGChainとセマンティックキャッシュの連携のテスト"""
+
+    def test_paraphrased_question_served_from_cache(self, mocker, mock_openai_chat):
+        """言い換えた質問では検索・LLMを呼ばずにキャッシュの回答を返し、メタデータで示すこと"""
+        # Arrange
+        mock_openai_chat(response_content="LangGraph is a framework.", tokens=100)
+        vectorstore = Mock()
+        vectorstore.similarity_search.return_value = [
+            Document(id="id-1", page_content="LangGraph overview", metadata={"title": "Intro"})
+        ]
+        embeddings = {"LangGraphとは何ですか？": [1.0, 0.02], "LangGraphって何？": [1.0, 0.05]}
+        vectorstore.embeddings.embed_query.side_effect = embeddings.__getitem__
+        vectorstore.get_cached_corpus_version.return_value = "v1"
+
+        rag_chain = RAGChain(
+            vectorstore=vectorstore,
+            search_mode="similarity",
+            answer_cache=SemanticAnswerCache(threshold=0.95, ttl_seconds=60, max_entries=10),
+        )
+
+        # Act
+        first = rag_chain.query("LangGraphとは何ですか？", include_code_examples=False)
+        second = rag_chain.query("LangGraphって何？", include_code_examples=False)
+
+        # Assert
+        assert first["metadata"]["cache_hit"] is False
+        assert second["metadata"]["cache_hit"] is True
+        assert second["metadata"]["cache_similarity"] > 0.95
+        assert second["metadata"]["tokens_used"] == 0
+        assert second["answer"] == first["answer"]
+        assert second["sources"] == first["sources"]
+        vectorstore.similarity_search.assert_called_once()
+        rag_chain.llm.invoke.assert_called_once()
+
+    def test_reingest_invalidates_cached_answer(self, mocker, mock_openai_chat):
+        """コーパスバージョンが変わったら同じ質問でも回答を生成し直すこと"""
+        # Arrange
+        mock_openai_chat(response_content="answer", tokens=10)
+        vectorstore = Mock()
+        vectorstore.similarity_search.return_value = [Document(id="id-1", page_content="doc")]
+        vectorstore.embeddings.embed_query.return_value = [1.0, 0.0]
+        vectorstore.get_cached_corpus_version.side_effect = ["v1", "v2"]
+        rag_chain = RAGChain(
+            vectorstore=vectorstore,
+            search_mode="similarity",
+            answer_cache=SemanticAnswerCache(threshold=0.95, ttl_seconds=60, max_entries=10),
+        )
+
+        # Act
+        rag_chain.query("What is LangGraph?", include_code_examples=False)
+        second = rag_chain.query("What is LangGraph?", include_code_examples=False)
+
+        # Assert
+        assert second["metadata"]["cache_hit"] is False
+        assert rag_chain.llm.invoke.call_count == 2
+
+
+@pytest.mark.unit
+class TestCachedCorpusVersion:
+    """ChromaVectorStore.get_cached_corpus_versionのテスト"""
+
+    def test_recomputed_only_when_stats_file_replaced(
+        self, mocker, mock_openai_embeddings, tmp_path
+    ):
+        """統計ファイルが置き換えられるまではChromaを走査せずに前回の値を返すこと"""
+        # Arrange
+        from src.features.rag.vectorstore import ChromaVectorStore, compute_corpus_version
+        from src.utils.helpers import write_json_atomic
+
+        mock_openai_embeddings()
+        mock_chroma = mocker.patch("src.features.rag.vectorstore.Chroma")
+        mock_chroma.return_value.get.return_value = {"ids": ["a", "b"]}
+        store = ChromaVectorStore(persist_directory=str(tmp_path / "chroma"))
+        store.stats_path.parent.mkdir(parents=True)
+        write_json_atomic(store.stats_path, {"documents_by_type": {}})
+
+        # Act
+        first = store.get_cached_corpus_version()
+        second = store.get_cached_corpus_version()
+        mock_chroma.return_value.get.return_value = {"ids": ["a", "b", "c"]}
+        write_json_atomic(store.stats_path, {"documents_by_type": {}})  # 別プロセスのインジェスト
+        third = store.get_cached_corpus_version()
+
+        # Assert
+        assert first == second == compute_corpus_version(["a", "b"])
+        assert third == compute_corpus_version(["a", "b", "c"])
+        assert mock_chroma.return_value.get.call_count == 2
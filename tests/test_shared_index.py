@@ -0,0 +1,129 @@
+"""
+LangGraph Catalyst - Shared Read-Only Index Tests
+
+複数ワーカーで共有する読み取り専用インデックスのユニットテスト
+"""
+
+import numpy as np
+import pytest
+
+from src.features.rag.shared_index import (
+    POINTER_FILE,
+    SharedIndexVectorStore,
+    read_pointer,
+)
+from src.features.rag.vectorstore import create_vectorstore
+
+
+@pytest.fixture
+def chroma_records():
+    """Chromaに保存されている想定のレコード（テスト中に追加できる）"""
+    rng = np.random.default_rng(0)
+    return {
+        "ids": [f"id-{i}" for i in range(20)],
+        "embeddings": list(rng.normal(size=(20, 8)).astype(np.float32)),
+        "documents": [f"chunk {i}" for i in range(20)],
+        "metadatas": [{"doc_type": "official_docs"} for _ in range(20)],
+    }
+
+
+@pytest.fixture
+def mock_chroma(mocker, mock_openai_embeddings, chroma_records):
+    """Chromaの内容をモック"""
+    mock_openai_embeddings()
+    mock_chroma = mocker.patch("src.features.rag.vectorstore.Chroma")
+
+    def get(ids=None, where=None, limit=None, offset=None, include=None):
+        if not include:
+            return {"ids": list(chroma_records["ids"])}
+        offset = offset or 0
+        end = offset + (limit or len(chroma_records["ids"]))
+        return {key: values[offset:end] for key, values in chroma_records.items()}
+
+    mock_chroma.return_value.get.side_effect = get
+    return mock_chroma
+
+
+def _add_record(records, i):
+    records["ids"].append(f"id-{i}")
+    records["embeddings"].append(np.full(8, float(i), dtype=np.float32))
+    records["documents"].append(f"chunk {i}")
+    records["metadatas"].append({"doc_type": "blog"})
+
+
+@pytest.mark.unit
+class TestSharedIndexVectorStore:
+    """共有インデックスのテスト"""
+
+    def test_first_worker_publishes_and_others_map_it(self, mock_chroma, tmp_path):
+        """最初のプロセスが公開し、後続のワーカーはChromaを走査せずにメモリマップすること"""
+        # Arrange
+        owner = SharedIndexVectorStore(persist_directory=str(tmp_path / "chroma"))
+        mock_chroma.return_value.get.reset_mock()
+
+        # Act
+        worker = SharedIndexVectorStore(persist_directory=str(tmp_path / "chroma"))
+
+        # Assert
+        pointer = read_pointer(owner.shared_root)
+        assert pointer["count"] == 20
+        assert len(worker.index) == 20
+        assert isinstance(worker.index.matrix, np.memmap)
+        assert not worker.index.matrix.flags.writeable
+        mock_chroma.return_value.get.assert_not_called()
+
+    def test_workers_switch_to_new_version(self, mock_chroma, chroma_records, tmp_path):
+        """新しいバージョンの公開後、ワーカーはポインタの変更を検知して切り替えること"""
+        # Arrange
+        owner = SharedIndexVectorStore(persist_directory=str(tmp_path / "chroma"))
+        worker = SharedIndexVectorStore(persist_directory=str(tmp_path / "chroma"))
+        worker.poll_interval = 0.0
+        old_index = worker.index
+        _add_record(chroma_records, 20)
+
+        # Act
+        published = owner.refresh_index()
+
+        # Assert
+        assert published is True
+        assert len(worker.index) == 21
+        assert worker.index is not old_index
+        # 切り替え前に取得したインデックスは引き続き検索できる
+        assert len(old_index.search(np.zeros(8, dtype=np.float32), k=3)) == 3
+
+    def test_refresh_without_changes_does_not_publish(self, mock_chroma, tmp_path):
+        """コーパスが変わっていなければ新しいバージョンを公開しないこと"""
+        # Arrange
+        store = SharedIndexVectorStore(persist_directory=str(tmp_path / "chroma"))
+        before = (store.shared_root / POINTER_FILE).read_text()
+
+        # Act
+        published = store.refresh_index()
+
+        # Assert
+        assert published is False
+        assert (store.shared_root / POINTER_FILE).read_text() == before
+
+    def test_keeps_recent_versions_only(self, mock_chroma, chroma_records, tmp_path, monkeypatch):
+        """公開のたびに古いバージョンを削除し、設定した数だけ残すこと"""
+        # Arrange
+        monkeypatch.setattr("src.config.settings.settings.shared_index_keep_versions", 2)
+        store = SharedIndexVectorStore(persist_directory=str(tmp_path / "chroma"))
+
+        # Act
+        for i in range(20, 23):
+            _add_record(chroma_records, i)
+            store.refresh_index()
+
+        # Assert
+        versions = [path for path in store.shared_root.iterdir() if path.is_dir()]
+        assert len(versions) == 2
+        assert read_pointer(store.shared_root)["version"] in {path.name for path in versions}
+        assert len(store.index) == 23
+
+    def test_create_vectorstore_shared_backend(self, mock_chroma, tmp_path):
+        """create_vectorstoreでsharedバックエンドを選択できること"""
+        store = create_vectorstore(persist_directory=str(tmp_path / "chroma"), backend="shared")
+
+        assert isinstance(store, SharedIndexVectorStore)
+        assert len(store.index) == 20
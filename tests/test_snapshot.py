@@ -0,0 +1,216 @@
+"""
+LangGraph Catalyst - Vector Store Snapshot Tests
+
+スナップショットの書き出し・読み込みのユニットテスト
+"""
+
+import json
+
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+
+from src.features.rag.snapshot import VectorSnapshot, from_columns, to_columns
+from src.features.rag.vectorstore import ChromaVectorStore, compute_corpus_version
+from src.utils.exceptions import VectorStoreError
+
+
+@pytest.fixture
+def snapshot_records():
+    """スナップショットテスト用のレコード"""
+    rng = np.random.default_rng(0)
+    return {
+        "ids": [f"id-{i}" for i in range(6)],
+        "embeddings": rng.normal(size=(6, 4)).astype(np.float32),
+        "documents": [f"chunk {i}" for i in range(6)],
+        "metadatas": [
+            {"doc_type": "blog", "start_index": i} if i % 2 else {"source": f"https://x/{i}"}
+            for i in range(6)
+        ],
+    }
+
+
+@pytest.mark.unit
+class TestVectorSnapshot:
+    """VectorSnapshotのテスト"""
+
+    def test_metadata_columns_round_trip(self, snapshot_records):
+        """列指向への変換と復元で欠損キーが増えないこと"""
+        metadatas = snapshot_records["metadatas"]
+
+        columns = to_columns(metadatas)
+
+        assert sorted(columns) == ["doc_type", "source", "start_index"]
+        assert from_columns(columns, len(metadatas)) == metadatas
+
+    def test_save_and_load(self, snapshot_records, tmp_path):
+        """保存したスナップショットがメモリマップで読み込めること"""
+        # Arrange
+        snapshot = VectorSnapshot(**snapshot_records, manifest={"embedding_model": "m"})
+
+        # Act
+        manifest = snapshot.save(tmp_path)
+        loaded = VectorSnapshot.load(tmp_path)
+
+        # Assert
+        assert manifest["count"] == 6
+        assert manifest["dimension"] == 4
+        assert manifest["corpus_version"] == compute_corpus_version(snapshot_records["ids"])
+        assert isinstance(loaded.embeddings, np.memmap)
+        np.testing.assert_array_equal(loaded.embeddings, snapshot_records["embeddings"])
+        assert loaded.documents == snapshot_records["documents"]
+        assert loaded.metadatas == snapshot_records["metadatas"]
+        assert loaded.manifest["embedding_model"] == "m"
+
+    def test_missing_manifest(self, tmp_path):
+        """マニフェストがなければVectorStoreError"""
+        with pytest.raises(VectorStoreError, match="manifest not found"):
+            VectorSnapshot.load(tmp_path)
+
+    def test_mismatched_records(self, snapshot_records, tmp_path):
+        """レコードとマニフェストのコーパスバージョンが異なればVectorStoreError"""
+        # Arrange
+        VectorSnapshot(**snapshot_records).save(tmp_path)
+        records_path = tmp_path / VectorSnapshot.RECORDS_FILE
+        records = json.loads(records_path.read_text(encoding="utf-8"))
+        records["ids"][0] = "tampered"
+        records_path.write_text(json.dumps(records), encoding="utf-8")
+
+        # Act & Assert
+        with pytest.raises(VectorStoreError, match="corpus version"):
+            VectorSnapshot.load(tmp_path)
+
+
+@pytest.mark.unit
+class TestStoreSnapshot:
+    """ChromaVectorStoreのexport_snapshot / import_snapshotのテスト"""
+
+    @pytest.fixture
+    def store(self, mocker, mock_openai_embeddings, snapshot_records):
+        """コレクションの内容をモックしたChromaVectorStore"""
+        mock_openai_embeddings()
+        mock_chroma = mocker.patch("src.features.rag.vectorstore.Chroma")
+        records = snapshot_records
+
+        def get(ids=None, where=None, limit=None, offset=None, include=None):
+            offset = offset or 0
+            end = offset + (limit or len(records["ids"]))
+            return {
+                "ids": records["ids"][offset:end],
+                "embeddings": records["embeddings"][offset:end],
+                "documents": records["documents"][offset:end],
+                "metadatas": records["metadatas"][offset:end],
+            }
+
+        mock_chroma.return_value.get.side_effect = get
+        store = ChromaVectorStore()
+        store.lexical_index_enabled = False
+        return store
+
+    def test_export_snapshot(self, store, snapshot_records, tmp_path):
+        """コレクションの内容と埋め込みモデル名が書き出されること"""
+        manifest = store.export_snapshot(tmp_path)
+
+        assert manifest["count"] == 6
+        assert manifest["embedding_model"] == store.embedding_model_name
+        assert manifest["collection_name"] == "langgraph_docs"
+        loaded = VectorSnapshot.load(tmp_path)
+        np.testing.assert_array_equal(loaded.embeddings, snapshot_records["embeddings"])
+
+    def test_import_snapshot_without_embedding_calls(self, store, snapshot_records, tmp_path):
+        """埋め込み済みのベクトルをそのまま書き込み、埋め込みAPIを呼ばないこと"""
+        # Arrange
+        store.export_snapshot(tmp_path)
+        collection = store.vector_store._collection
+        collection.count.return_value = 6
+
+        # Act
+        result = store.import_snapshot(tmp_path)
+
+        # Assert
+        assert result["added_count"] == 6
+        assert result["deleted_stale"] == 0
+        assert result["status"] == "success"
+        upsert = collection.upsert.call_args.kwargs
+        assert upsert["ids"] == snapshot_records["ids"]
+        np.testing.assert_array_equal(upsert["embeddings"], snapshot_records["embeddings"])
+        store.embeddings.embeddings.embed_documents.assert_not_called()
+
+    def test_import_snapshot_prunes_stale_chunks(self, store, snapshot_records, tmp_path):
+        """スナップショットに含まれないチャンクを削除すること"""
+        # Arrange
+        VectorSnapshot(
+            **{key: value[:4] for key, value in snapshot_records.items()},
+            manifest={"embedding_model": store.embedding_model_name},
+        ).save(tmp_path)
+
+        # Act
+        result = store.import_snapshot(tmp_path)
+
+        # Assert
+        assert result["deleted_stale"] == 2
+        store.vector_store.delete.assert_called_once_with(ids=["id-4", "id-5"])
+
+    def test_import_snapshot_model_mismatch(self, store, snapshot_records, tmp_path):
+        """埋め込みモデルが異なるスナップショットはVectorStoreError"""
+        VectorSnapshot(**snapshot_records, manifest={"embedding_model": "other-model"}).save(
+            tmp_path
+        )
+
+        with pytest.raises(VectorStoreError, match="other-model"):
+            store.import_snapshot(tmp_path)
+
+        store.vector_store._collection.upsert.assert_not_called()
+
+    def test_import_snapshot_dimension_mismatch(self, store, snapshot_records, tmp_path):
+        """設定した次元数と異なるスナップショットはVectorStoreError"""
+        VectorSnapshot(
+            **snapshot_records, manifest={"embedding_model": store.embedding_model_name}
+        ).save(tmp_path)
+        store.embedding_dimensions = 512
+
+        with pytest.raises(VectorStoreError, match="4-dimensional"):
+            store.import_snapshot(tmp_path)
+
+        store.vector_store._collection.upsert.assert_not_called()
+
+    def test_snapshot_restores_parent_sections(self, store, tmp_path):
+        """親セクションを書き出し、別のホスト（空の親ドキュメントストア）で復元すること"""
+        # Arrange
+        source = Document(
+            page_content="LangGraph overview. " * 20,
+            metadata={"source": "https://x/0", "title": "Intro"},
+        )
+        store.get_parent_store().add_documents([source])
+        manifest = store.export_snapshot(tmp_path / "snapshot")
+        restored = ChromaVectorStore(persist_directory=str(tmp_path / "other" / "chroma"))
+        restored.lexical_index_enabled = False
+
+        # Act
+        result = restored.import_snapshot(tmp_path / "snapshot")
+
+        # Assert
+        assert manifest["parent_count"] > 0
+        assert result["parent_sections"] == manifest["parent_count"]
+        parent, _ = restored.get_parent_store().get_parent("https://x/0", 0)
+        assert parent.page_content.startswith("LangGraph overview.")
+        assert parent.metadata["title"] == "Intro"
+
+    def test_import_warns_without_parent_sections(
+        self, store, snapshot_records, tmp_path, monkeypatch, caplog
+    ):
+        """親セクションのないスナップショットで親ドキュメント展開が使えなくなる場合は警告すること"""
+        # Arrange
+        from src.config.settings import settings
+
+        monkeypatch.setattr(settings, "rag_parent_expansion", True)
+        VectorSnapshot(
+            **snapshot_records, manifest={"embedding_model": store.embedding_model_name}
+        ).save(tmp_path)
+
+        # Act
+        result = store.import_snapshot(tmp_path)
+
+        # Assert
+        assert result["parent_sections"] == 0
+        assert "no parent sections" in caplog.text
@@ -4,12 +4,20 @@ LangGraph Catalyst - Vector Store Tests
 ベクトルストアのユニットテスト
 """
 
-from unittest.mock import Mock
+import asyncio
+import threading
+import time
+from unittest.mock import AsyncMock, Mock
 
+import numpy as np
 import pytest
 from langchain_core.documents import Document
 
-from src.features.rag.vectorstore import ChromaVectorStore
+from src.features.rag.collection_stats import CollectionStats
+from src.features.rag.embedding_cache import QueryEmbeddingCache
+from src.features.rag.lexical_index import LexicalIndex
+from src.features.rag.mmr import maximal_marginal_relevance
+from src.features.rag.vectorstore import ChromaVectorStore, make_chunk_id, pack_token_batches
 from src.utils.exceptions import VectorStoreError
 
 
@@ -61,6 +69,71 @@ class TestChromaVectorStore:
         with pytest.raises(VectorStoreError, match="Failed to initialize vector store"):
             ChromaVectorStore()
 
+    def test_hnsw_configuration_from_settings(self, mocker, mock_openai_embeddings):
+        """コレクションが設定値のHNSWパラメータで作成されること"""
+        # Arrange
+        mock_openai_embeddings()
+        mock_chroma = mocker.patch("src.features.rag.vectorstore.Chroma")
+
+        # Act
+        ChromaVectorStore()
+
+        # Assert
+        assert mock_chroma.call_args.kwargs["collection_configuration"] == {
+            "hnsw": {"space": "l2", "max_neighbors": 16, "ef_construction": 100, "ef_search": 100}
+        }
+
+    def test_embedding_dimensions(self, mocker, mock_openai_embeddings):
+        """埋め込み次元数がOpenAIEmbeddingsとクエリキャッシュの名前空間に反映されること"""
+        # Arrange
+        embeddings_cls = mock_openai_embeddings
+        mocker.patch("src.features.rag.vectorstore.Chroma")
+
+        # Act
+        vectorstore = ChromaVectorStore(embedding_dimensions=512)
+
+        # Assert
+        assert embeddings_cls.call_args.kwargs["dimensions"] == 512
+        assert vectorstore.embedding_namespace == "text-embedding-3-small@512"
+        assert vectorstore.query_cache.model_name == "text-embedding-3-small@512"
+
+    def test_hnsw_configuration_constructor_args(self, mocker, mock_openai_embeddings):
+        """コンストラクタ引数でHNSWパラメータを上書きできること"""
+        # Arrange
+        mock_openai_embeddings()
+        mock_chroma = mocker.patch("src.features.rag.vectorstore.Chroma")
+
+        # Act
+        ChromaVectorStore(hnsw_space="cosine", hnsw_m=32, hnsw_search_ef=40)
+
+        # Assert
+        assert mock_chroma.call_args.kwargs["collection_configuration"]["hnsw"] == {
+            "space": "cosine",
+            "max_neighbors": 32,
+            "ef_construction": 100,
+            "ef_search": 40,
+        }
+
+    def test_hnsw_search_ef_applied_to_existing_collection(
+        self, mocker, mock_openai_embeddings, caplog
+    ):
+        """既存コレクションにはsearch_efのみ反映し、変更不可の差分は警告すること"""
+        # Arrange
+        mock_openai_embeddings()
+        mock_chroma = mocker.patch("src.features.rag.vectorstore.Chroma")
+        collection = mock_chroma.return_value._collection
+        collection.configuration = {
+            "hnsw": {"space": "l2", "max_neighbors": 8, "ef_construction": 100, "ef_search": 10}
+        }
+
+        # Act
+        ChromaVectorStore(hnsw_search_ef=64)
+
+        # Assert
+        collection.modify.assert_called_once_with(configuration={"hnsw": {"ef_search": 64}})
+        assert "different HNSW settings" in caplog.text
+        assert "'max_neighbors': 8" in caplog.text
+
     # ========================================================================
     # Add Documents Tests
     # ========================================================================
@@ -110,8 +183,12 @@ class TestChromaVectorStore:
 
         vectorstore = ChromaVectorStore()
 
-        # 大量のドキュメントを生成
-        large_doc_list = sample_documents * 50  # 150件
+        # 大量のドキュメントを生成（start_indexの異なる150件）
+        large_doc_list = [
+            Document(page_content=doc.page_content, metadata={**doc.metadata, "start_index": i})
+            for i in range(50)
+            for doc in sample_documents
+        ]
 
         # Act
         result = vectorstore.add_documents(large_doc_list, batch_size=50)
@@ -139,11 +216,16 @@ class TestChromaVectorStore:
         mock_collection = Mock()
         mock_collection.count.return_value = len(sample_documents)
         mock_instance._collection = mock_collection
+        mock_instance.get.return_value = {"ids": []}
 
         vectorstore = ChromaVectorStore()
 
         # 6件のドキュメント（3件ずつ2バッチ）
-        docs = sample_documents * 2
+        docs = [
+            Document(page_content=doc.page_content, metadata={**doc.metadata, "start_index": i})
+            for i in range(2)
+            for doc in sample_documents
+        ]
 
         # Act
         result = vectorstore.add_documents(docs, batch_size=3)
@@ -153,6 +235,173 @@ class TestChromaVectorStore:
         assert result["added_count"] == 3
         assert result["failed_count"] == 3
 
+    def test_add_documents_skips_unchanged(
+        self, mocker, mock_openai_embeddings, mock_chroma, sample_documents
+    ):
+        """保存済みチャンクは再度埋め込まないことのテスト"""
+        # Arrange
+        mock_openai_embeddings()
+        mock_chroma(sample_documents)
+
+        vectorstore = ChromaVectorStore()
+        existing_id = make_chunk_id(sample_documents[0])
+        # 保存済みIDの照会にのみ既存チャンクを返す（統計の再集計では空のコレクション）
+        vectorstore.vector_store.get.side_effect = lambda ids=None, **_kwargs: {
+            "ids": [existing_id] if ids else [],
+            "metadatas": [],
+        }
+
+        # Act
+        result = vectorstore.add_documents(sample_documents)
+
+        # Assert
+        assert result["added_count"] == 2
+        assert result["skipped_unchanged"] == 1
+        call_kwargs = vectorstore.vector_store.add_documents.call_args.kwargs
+        assert existing_id not in call_kwargs["ids"]
+        assert all("content_hash" in doc.metadata for doc in call_kwargs["documents"])
+
+    def test_add_documents_deduplicates_input(
+        self, mocker, mock_openai_embeddings, mock_chroma, sample_documents
+    ):
+        """入力内の重複チャンクは1件にまとめることのテスト"""
+        # Arrange
+        mock_openai_embeddings()
+        mock_chroma(sample_documents)
+
+        vectorstore = ChromaVectorStore()
+
+        # Act
+        result = vectorstore.add_documents(sample_documents * 2)
+
+        # Assert
+        assert result["added_count"] == len(sample_documents)
+        vectorstore.vector_store.add_documents.assert_called_once()
+
+    def test_add_documents_prune_stale(
+        self, mocker, mock_openai_embeddings, mock_chroma, sample_documents
+    ):
+        """今回含まれなかった同一ソースの古いチャンクを削除するテスト"""
+        # Arrange
+        mock_openai_embeddings()
+        mock_chroma(sample_documents)
+
+        vectorstore = ChromaVectorStore()
+        vectorstore._stats = CollectionStats(counts={"official_docs": 1}, embedding_dimension=8)
+        vectorstore.vector_store.get.side_effect = [
+            {"ids": []},
+            {"ids": ["stale-chunk-id"], "metadatas": [{"doc_type": "official_docs"}]},
+        ]
+
+        # Act
+        result = vectorstore.add_documents(sample_documents, prune_stale=True)
+
+        # Assert
+        assert result["deleted_stale"] == 1
+        vectorstore.vector_store.delete.assert_called_once_with(ids=["stale-chunk-id"])
+        assert vectorstore._stats.counts["official_docs"] == len(sample_documents)
+
+    def test_make_chunk_id_is_deterministic(self, sample_documents):
+        """チャンクIDが内容・ソース・位置から決定的に生成されることのテスト"""
+        doc = sample_documents[0]
+        same = Document(page_content=doc.page_content, metadata=dict(doc.metadata))
+        moved = Document(page_content=doc.page_content, metadata={**doc.metadata, "start_index": 5})
+        edited = Document(page_content=doc.page_content + "!", metadata=dict(doc.metadata))
+
+        assert make_chunk_id(doc) == make_chunk_id(same)
+        assert make_chunk_id(doc) != make_chunk_id(moved)
+        assert make_chunk_id(doc) != make_chunk_id(edited)
+
+    def test_pack_token_batches_respects_budget(self, mocker, sample_documents):
+        """トークン予算ごとにバッチが分割されることのテスト"""
+        # Arrange
+        mocker.patch("src.features.rag.vectorstore.calculate_token_count", return_value=40)
+        chunks = [(f"id-{i}", sample_documents[i % 3]) for i in range(5)]
+
+        # Act
+        batches = pack_token_batches(chunks, max_batch_tokens=100)
+
+        # Assert
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        assert all(tokens == 40 for batch in batches for _, _, tokens in batch)
+
+    def test_add_documents_concurrent_success(
+        self, mocker, mock_openai_embeddings, mock_chroma, sample_documents
+    ):
+        """並列インジェストの成功とスループット報告のテスト"""
+        # Arrange
+        mock_openai_embeddings()
+        mock_chroma(sample_documents)
+        mocker.patch("src.features.rag.vectorstore.calculate_token_count", return_value=100)
+        progress_updates = []
+
+        vectorstore = ChromaVectorStore()
+
+        # Act
+        result = vectorstore.add_documents_concurrent(
+            sample_documents,
+            max_batch_tokens=200,
+            max_workers=2,
+            progress_callback=progress_updates.append,
+        )
+
+        # Assert
+        assert result["status"] == "success"
+        assert result["added_count"] == 3
+        assert result["batch_count"] == 2
+        assert result["total_tokens"] == 300
+        assert "tokens_per_second" in result
+        assert progress_updates[-1]["processed_chunks"] == 3
+        assert vectorstore.vector_store.add_documents.call_count == 2
+
+    def test_add_documents_concurrent_retries_failed_batch(
+        self, mocker, mock_openai_embeddings, mock_chroma, sample_documents
+    ):
+        """失敗したバッチのみ再試行されることのテスト"""
+        # Arrange
+        mock_openai_embeddings()
+        mock_chroma(sample_documents)
+
+        vectorstore = ChromaVectorStore()
+        vectorstore.vector_store.add_documents.side_effect = [Exception("Rate limit"), None]
+
+        # Act
+        result = vectorstore.add_documents_concurrent(
+            sample_documents, max_workers=1, max_retries=2, retry_backoff=0
+        )
+
+        # Assert
+        assert result["status"] == "success"
+        assert result["added_count"] == 3
+        assert result["retried_batches"] == 1
+
+    def test_add_documents_concurrent_isolates_bad_chunk(
+        self, mocker, mock_openai_embeddings, mock_chroma, sample_documents
+    ):
+        """再試行後も失敗するバッチは分割され、問題のチャンクのみ失敗することのテスト"""
+        # Arrange
+        mock_openai_embeddings()
+        mock_chroma(sample_documents)
+
+        vectorstore = ChromaVectorStore()
+        bad_content = sample_documents[1].page_content
+
+        def add_documents(documents, ids):
+            if any(doc.page_content == bad_content for doc in documents):
+                raise Exception("Invalid input")
+
+        vectorstore.vector_store.add_documents.side_effect = add_documents
+
+        # Act
+        result = vectorstore.add_documents_concurrent(
+            sample_documents, max_workers=1, max_retries=1, retry_backoff=0
+        )
+
+        # Assert
+        assert result["status"] == "partial"
+        assert result["added_count"] == 2
+        assert result["failed_count"] == 1
+
     # ========================================================================
     # Similarity Search Tests
     # ========================================================================
@@ -244,6 +493,412 @@ class TestChromaVectorStore:
         with pytest.raises(VectorStoreError, match="Failed to perform similarity search"):
             vectorstore.similarity_search("test query")
 
+    def test_similarity_search_batch(self, mocker, mock_openai_embeddings):
+        """全クエリを1回の埋め込みと1回のqueryで検索し、入力順で返すこと"""
+        # Arrange
+        mock_openai_embeddings()
+        mock_chroma = mocker.patch("src.features.rag.vectorstore.Chroma")
+        collection = mock_chroma.return_value._collection
+        collection.query.return_value = {
+            "ids": [["a", "b"], ["c"]],
+            "documents": [["doc a", "doc b"], ["doc c"]],
+            "metadatas": [[{"doc_type": "blog"}, None], [{"doc_type": "github"}]],
+            "distances": [[0.1, 0.2], [0.3]],
+        }
+
+        vectorstore = ChromaVectorStore()
+        inner = vectorstore.embeddings.embeddings
+        inner.embed_documents.return_value = [[0.1, 0.2], [0.3, 0.4]]
+
+        # Act
+        results = vectorstore.similarity_search_batch(
+            ["StateGraph", "", "MemorySaver"], k=2, filter_metadata={"doc_type": "blog"}
+        )
+
+        # Assert
+        assert [[doc.id for doc, _ in hits] for hits in results] == [["a", "b"], [], ["c"]]
+        assert results[0][0][1] == 0.1
+        assert results[0][1][0].metadata == {}
+        inner.embed_documents.assert_called_once_with(["StateGraph", "MemorySaver"])
+        collection.query.assert_called_once_with(
+            query_embeddings=[[0.1, 0.2], [0.3, 0.4]],
+            n_results=2,
+            where={"doc_type": "blog"},
+            include=["documents", "metadatas", "distances"],
+        )
+
+    def test_similarity_search_batch_error(self, mocker, mock_openai_embeddings):
+        """一括検索のエラーはVectorStoreError"""
+        # Arrange
+        mock_openai_embeddings()
+        mock_chroma = mocker.patch("src.features.rag.vectorstore.Chroma")
+        mock_chroma.return_value._collection.query.side_effect = Exception("Query error")
+        vectorstore = ChromaVectorStore()
+        vectorstore.embeddings.embeddings.embed_documents.return_value = [[0.1]]
+
+        # Act & Assert
+        with pytest.raises(VectorStoreError, match="Failed to perform batch similarity search"):
+            vectorstore.similarity_search_batch(["test query"])
+
+    @pytest.fixture
+    def async_store(self, mocker, mock_openai_embeddings):
+        """非同期埋め込みとChromaの一括queryをモックしたChromaVectorStore"""
+        mock_openai_embeddings()
+        mock_chroma = mocker.patch("src.features.rag.vectorstore.Chroma")
+        mock_chroma.return_value._collection.query.return_value = {
+            "ids": [["a"]],
+            "documents": [["doc a"]],
+            "metadatas": [[{"doc_type": "blog"}]],
+            "distances": [[0.25]],
+        }
+
+        async def aembed_query(text):
+            await asyncio.sleep(0.2)
+            return [0.1, 0.2]
+
+        store = ChromaVectorStore()
+        store.embeddings.embeddings.aembed_query = AsyncMock(side_effect=aembed_query)
+        return store
+
+    def test_asimilarity_search_with_score(self, async_store):
+        """非同期クライアントで埋め込み、専用スレッドプールで検索すること"""
+        # Act
+        results = asyncio.run(
+            async_store.asimilarity_search_with_score(
+                "MemorySaver", k=1, filter_metadata={"doc_type": "blog"}
+            )
+        )
+
+        # Assert
+        assert [(doc.id, score) for doc, score in results] == [("a", 0.25)]
+        async_store.embeddings.embeddings.aembed_query.assert_awaited_once_with("MemorySaver")
+        async_store.embeddings.embeddings.embed_query.assert_not_called()
+        async_store.vector_store._collection.query.assert_called_once_with(
+            query_embeddings=[[0.1, 0.2]],
+            n_results=1,
+            where={"doc_type": "blog"},
+            include=["documents", "metadatas", "distances"],
+        )
+
+    def test_asimilarity_search_overlaps_requests(self, async_store):
+        """同時に発行した検索の待ち時間が重なること"""
+
+        async def run_concurrently():
+            return await asyncio.gather(
+                async_store.asimilarity_search("query 1"),
+                async_store.asimilarity_search("query 2"),
+                async_store.asimilarity_search("query 3"),
+            )
+
+        # Act
+        start = time.perf_counter()
+        results = asyncio.run(run_concurrently())
+        elapsed = time.perf_counter() - start
+
+        # Assert
+        assert all(len(docs) == 1 for docs in results)
+        assert elapsed < 0.5
+
+    def test_asimilarity_search_error(self, async_store):
+        """非同期検索のエラーはVectorStoreError"""
+        async_store.vector_store._collection.query.side_effect = Exception("Query error")
+
+        with pytest.raises(VectorStoreError, match="Failed to perform async similarity search"):
+            asyncio.run(async_store.asimilarity_search("test query"))
+
+    # ========================================================================
+    # Hybrid Search Tests
+    # ========================================================================
+
+    @pytest.fixture
+    def hybrid_store(self, mocker, mock_openai_embeddings, test_chroma_dir):
+        """ベクトル検索結果と語彙インデックスを用意したChromaVectorStore"""
+        mock_openai_embeddings()
+        mock_chroma = mocker.patch("src.features.rag.vectorstore.Chroma")
+        docs = [
+            Document(id=f"id-{i}", page_content=text, metadata={"doc_type": "official_docs"})
+            for i, text in enumerate(
+                [
+                    "StateGraph defines the workflow.",
+                    "Use add_conditional_edges to route between nodes.",
+                    "MemorySaver stores checkpoints in memory.",
+                ]
+            )
+        ]
+        # ベクトル検索はid-0, id-1の順に返す
+        mock_chroma.return_value.similarity_search_with_score.return_value = [
+            (docs[0], 0.2),
+            (docs[1], 0.4),
+        ]
+
+        store = ChromaVectorStore(persist_directory=str(test_chroma_dir / "hybrid"))
+        store._lexical_index = LexicalIndex.from_records(
+            [doc.id for doc in docs],
+            [doc.page_content for doc in docs],
+            [doc.metadata for doc in docs],
+        )
+        return store
+
+    def test_hybrid_search_fuses_rankings(self, hybrid_store):
+        """BM25とベクトルの順位がRRFで統合されること"""
+        # Act
+        results = hybrid_store.hybrid_search_with_score("add_conditional_edges", k=3)
+
+        # Assert
+        ids = [doc.id for doc, _ in results]
+        assert ids[0] == "id-1"
+        assert set(ids) == {"id-0", "id-1"}
+        scores = [score for _, score in results]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_hybrid_search_includes_lexical_only_hits(self, hybrid_store):
+        """ベクトル検索に現れない語彙一致のチャンクも返ること"""
+        results = hybrid_store.hybrid_search("MemorySaver", k=3)
+
+        assert "id-2" in [doc.id for doc in results]
+
+    def test_hybrid_search_vector_failure_falls_back(self, hybrid_store):
+        """ベクトル検索が失敗しても語彙検索の結果を返すこと"""
+        # Arrange
+        hybrid_store.vector_store.similarity_search_with_score.side_effect = Exception("timeout")
+
+        # Act
+        results = hybrid_store.hybrid_search("MemorySaver", k=3)
+
+        # Assert
+        assert [doc.id for doc in results] == ["id-2"]
+
+    def test_ahybrid_search_matches_sync_ranking(self, hybrid_store):
+        """非同期ハイブリッド検索は非同期の埋め込みで同じ順位を返すこと"""
+        # Arrange
+        hybrid_store.embeddings.embeddings.aembed_query = AsyncMock(return_value=[0.1, 0.2])
+        hybrid_store.vector_store._collection.query.return_value = {
+            "ids": [["id-0", "id-1"]],
+            "documents": [
+                ["StateGraph defines the workflow.", "Use add_conditional_edges to route."]
+            ],
+            "metadatas": [[{"doc_type": "official_docs"}, {"doc_type": "official_docs"}]],
+            "distances": [[0.2, 0.4]],
+        }
+
+        # Act
+        results = asyncio.run(hybrid_store.ahybrid_search("add_conditional_edges", k=3))
+        expected = hybrid_store.hybrid_search("add_conditional_edges", k=3)
+
+        # Assert
+        assert [doc.id for doc in results] == [doc.id for doc in expected]
+        hybrid_store.embeddings.embeddings.aembed_query.assert_awaited_once()
+
+    def test_ammr_search_uses_async_embedding(self, mocker, mock_openai_embeddings):
+        """非同期MMR検索は非同期クライアントで埋め込み、重複の少ない候補を選ぶこと"""
+        # Arrange
+        mock_openai_embeddings()
+        mock_chroma = mocker.patch("src.features.rag.vectorstore.Chroma")
+        mock_chroma.return_value._collection.query.return_value = {
+            "ids": [["a", "a-copy", "b"]],
+            "documents": [["doc a", "doc a", "doc b"]],
+            "metadatas": [[{}, {}, {}]],
+            "distances": [[0.1, 0.1, 0.3]],
+            "embeddings": [[[1.0, 0.0], [1.0, 0.0], [0.0, 1.0]]],
+        }
+        store = ChromaVectorStore()
+        store.embeddings.embeddings.aembed_query = AsyncMock(return_value=[1.0, 0.2])
+
+        # Act
+        results = asyncio.run(store.ammr_search("MemorySaver", k=2, lambda_mult=0.5))
+
+        # Assert
+        assert [doc.id for doc in results] == ["a", "b"]
+        store.embeddings.embeddings.embed_query.assert_not_called()
+
+    # ========================================================================
+    # Warmup Tests
+    # ========================================================================
+
+    def test_warmup_probes_with_cached_query_embeddings(
+        self, mocker, mock_openai_embeddings, test_chroma_dir, tmp_path
+    ):
+        """キャッシュ済みのクエリ埋め込みでプローブ検索し、埋め込みAPIを呼ばないこと"""
+        # Arrange
+        mock_openai_embeddings()
+        mock_chroma = mocker.patch("src.features.rag.vectorstore.Chroma")
+        mock_chroma.return_value._collection.count.return_value = 3
+        store = ChromaVectorStore(persist_directory=str(test_chroma_dir))
+        store.lexical_index_enabled = False
+
+        cache_path = tmp_path / "query_embeddings.sqlite3"
+        QueryEmbeddingCache(store.embedding_namespace, persist_path=cache_path).set(
+            "StateGraph", [0.5, 0.5]
+        )
+        store.query_cache = QueryEmbeddingCache(store.embedding_namespace, persist_path=cache_path)
+        store.embeddings.cache = store.query_cache
+
+        # Act
+        result = store.warmup()
+
+        # Assert
+        assert result["status"] == "ready"
+        assert set(result["steps"]) == {
+            "collection",
+            "query_cache",
+            "index",
+            "embeddings_connection",
+        }
+        assert result["probe_queries"] == 1
+        query = store.vector_store._collection.query.call_args.kwargs
+        assert query["query_embeddings"] == [[0.5, 0.5]]
+        assert store.embeddings.embed_query("StateGraph") == [0.5, 0.5]
+        store.embeddings.embeddings.embed_query.assert_not_called()
+        openai_client = store.embeddings.embeddings.client._client
+        models = openai_client.with_options.return_value.models
+        models.retrieve.assert_called_once_with(store.embedding_model_name)
+
+    def test_warmup_reports_failed_steps(self, mocker, mock_openai_embeddings, test_chroma_dir):
+        """失敗したステップがあっても最後まで実行してdegradedを返すこと"""
+        # Arrange
+        mock_openai_embeddings()
+        mock_chroma = mocker.patch("src.features.rag.vectorstore.Chroma")
+        mock_chroma.return_value.get.return_value = {"ids": ["a"], "embeddings": [[0.1, 0.2]]}
+        mock_chroma.return_value._collection.query.side_effect = Exception("segment error")
+        store = ChromaVectorStore(persist_directory=str(test_chroma_dir))
+        store.lexical_index_enabled = False
+
+        # Act
+        result = store.warmup()
+
+        # Assert
+        assert result["status"] == "degraded"
+        assert result["steps"]["index"]["error"] == "segment error"
+        assert "error" not in result["steps"]["embeddings_connection"]
+
+    def test_warmup_opens_async_connection_on_serving_loop(
+        self, mocker, mock_openai_embeddings, test_chroma_dir
+    ):
+        """ループ指定時は非同期クライアントの接続もそのループ上で確立すること"""
+        # Arrange
+        mock_openai_embeddings()
+        mocker.patch("src.features.rag.vectorstore.Chroma")
+        store = ChromaVectorStore(persist_directory=str(test_chroma_dir))
+        store.lexical_index_enabled = False
+        seen_loops = []
+
+        async def retrieve(model):
+            seen_loops.append(asyncio.get_running_loop())
+
+        async_client = store.embeddings.embeddings.async_client._client
+        async_client.with_options.return_value.models.retrieve = retrieve
+        loop = asyncio.new_event_loop()
+        loop_thread = threading.Thread(target=loop.run_forever, daemon=True)
+        loop_thread.start()
+
+        # Act
+        try:
+            result = store.warmup(loop=loop)
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            loop_thread.join()
+            loop.close()
+
+        # Assert
+        assert "error" not in result["steps"]["embeddings_connection"]
+        assert seen_loops == [loop]
+
+    # ========================================================================
+    # MMR Search Tests
+    # ========================================================================
+
+    def test_mmr_skips_near_duplicates(self):
+        """ほぼ重複した候補より、別の観点の候補を優先すること"""
+        # Arrange: 0と1はほぼ同じ向き、2は別方向
+        query = [1.0, 0.5]
+        candidates = np.array([[1.0, 0.4], [1.0, 0.39], [0.6, 0.8]])
+
+        # Act
+        selected = maximal_marginal_relevance(query, candidates, k=2, lambda_mult=0.5)
+
+        # Assert
+        assert selected == [0, 2]
+
+    def test_mmr_lambda_one_is_similarity_order(self):
+        """lambda_mult=1.0では類似度順になること"""
+        rng = np.random.default_rng(1)
+        candidates = rng.normal(size=(20, 8))
+        query = rng.normal(size=8)
+        unit = candidates / np.linalg.norm(candidates, axis=1, keepdims=True)
+
+        selected = maximal_marginal_relevance(query, candidates, k=5, lambda_mult=1.0)
+
+        assert selected == list(np.argsort(-(unit @ query))[:5])
+
+    def test_mmr_search_uses_single_query_with_embeddings(
+        self, mocker, mock_openai_embeddings, test_chroma_dir
+    ):
+        """候補を埋め込み付きで1回だけ取得し、多様化した結果を返すこと"""
+        # Arrange
+        mock_openai_embeddings()
+        mock_chroma = mocker.patch("src.features.rag.vectorstore.Chroma")
+        mock_chroma.return_value._collection.query.return_value = {
+            "ids": [["a", "b", "c"]],
+            "documents": [["chunk a", "chunk a'", "chunk c"]],
+            "metadatas": [[{"doc_type": "official_docs"}] * 3],
+            "distances": [[0.01, 0.02, 0.5]],
+            "embeddings": [[[1.0, 0.4], [1.0, 0.39], [0.6, 0.8]]],
+        }
+        store = ChromaVectorStore(persist_directory=str(test_chroma_dir))
+        store.embeddings.embeddings.embed_query.return_value = [1.0, 0.5]
+
+        # Act
+        results = store.mmr_search_with_score("StateGraph", k=2, fetch_k=10, lambda_mult=0.5)
+
+        # Assert
+        assert [doc.id for doc, _ in results] == ["a", "c"]
+        assert results[1][1] == 0.5
+        store.vector_store._collection.query.assert_called_once_with(
+            query_embeddings=[[1.0, 0.5]],
+            n_results=10,
+            where=None,
+            include=["documents", "metadatas", "distances", "embeddings"],
+        )
+
+    def test_mmr_search_error(self, mocker, mock_openai_embeddings, test_chroma_dir):
+        """MMR検索のエラーはVectorStoreError"""
+        mock_openai_embeddings()
+        mock_chroma = mocker.patch("src.features.rag.vectorstore.Chroma")
+        mock_chroma.return_value._collection.query.side_effect = Exception("Query error")
+        store = ChromaVectorStore(persist_directory=str(test_chroma_dir))
+
+        with pytest.raises(VectorStoreError, match="Failed to perform MMR search"):
+            store.mmr_search("test query")
+
+    def test_add_documents_builds_lexical_index(
+        self, mocker, mock_openai_embeddings, sample_documents, test_chroma_dir
+    ):
+        """インジェスト後に語彙インデックスが構築・保存されること"""
+        # Arrange
+        mock_openai_embeddings()
+        mock_chroma = mocker.patch("src.features.rag.vectorstore.Chroma")
+
+        def get(ids=None, where=None, limit=None, offset=None, include=None):
+            if include and offset == 0:
+                return {
+                    "ids": ["a", "b"],
+                    "documents": [doc.page_content for doc in sample_documents[:2]],
+                    "metadatas": [doc.metadata for doc in sample_documents[:2]],
+                }
+            return {"ids": []}
+
+        mock_chroma.return_value.get.side_effect = get
+        vectorstore = ChromaVectorStore(persist_directory=str(test_chroma_dir / "lexical"))
+
+        # Act
+        vectorstore.add_documents(sample_documents[:2])
+
+        # Assert
+        assert vectorstore.lexical_index_path.exists()
+        index = LexicalIndex.load(vectorstore.lexical_index_path)
+        assert index.ids == ["a", "b"]
+        assert index.search("StateGraph", k=1)[0][0] == 1
+
     # ========================================================================
     # Collection Management Tests
     # ========================================================================
@@ -309,6 +964,108 @@ class TestChromaVectorStore:
         # Assert
         assert count == 0  # エラー時は0を返す
 
+    def test_get_collection_info_from_cache(self, mocker, mock_openai_embeddings, tmp_path):
+        """初回のみ集計し、以降はデータベースに問い合わせずに統計を返すこと"""
+        # Arrange
+        mock_openai_embeddings()
+        mock_chroma = mocker.patch("src.features.rag.vectorstore.Chroma")
+        mock_chroma.return_value.get.side_effect = [
+            {"ids": ["a", "b", "c"], "metadatas": [{"doc_type": "blog"}, {}, None]},
+            {"ids": []},
+            {"ids": ["a"], "embeddings": [[0.1, 0.2, 0.3]]},
+        ]
+        mock_chroma.return_value._collection.count.return_value = 3
+        vectorstore = ChromaVectorStore(persist_directory=str(tmp_path / "chroma"))
+
+        # Act
+        info = vectorstore.get_collection_info()
+        calls = vectorstore.vector_store.get.call_count
+        cached = vectorstore.get_collection_info()
+
+        # Assert
+        assert info["document_count"] == 3
+        assert info["documents_by_type"] == {"blog": 1, "unknown": 2}
+        assert info["embedding_dimension"] == 3
+        assert info["last_ingest_at"] is None
+        assert cached == info
+        assert vectorstore.vector_store.get.call_count == calls
+        assert vectorstore.stats_path.exists()
+
+    def test_collection_info_updated_on_add(
+        self, mocker, mock_openai_embeddings, mock_chroma, sample_documents, tmp_path
+    ):
+        """追加したチャンクが統計に反映され、件数取得でコレクションに問い合わせないこと"""
+        # Arrange
+        mock_openai_embeddings()
+        mock_chroma([])
+        vectorstore = ChromaVectorStore(persist_directory=str(tmp_path / "chroma"))
+        vectorstore._stats = CollectionStats(vectorstore.stats_path, embedding_dimension=8)
+
+        # Act
+        result = vectorstore.add_documents(sample_documents)
+        info = vectorstore.get_collection_info()
+
+        # Assert
+        assert result["total_documents_in_store"] == len(sample_documents)
+        assert sum(info["documents_by_type"].values()) == len(sample_documents)
+        assert info["last_ingest_at"] is not None
+        vectorstore.vector_store._collection.count.assert_not_called()
+
+    def test_persisted_stats_reused_when_count_matches(
+        self, mocker, mock_openai_embeddings, tmp_path
+    ):
+        """件数が一致すれば永続化された統計を走査なしで再利用すること"""
+        # Arrange
+        mock_openai_embeddings()
+        mock_chroma = mocker.patch("src.features.rag.vectorstore.Chroma")
+        mock_chroma.return_value._collection.count.return_value = 2
+        persist_directory = str(tmp_path / "chroma")
+        saved = CollectionStats(
+            ChromaVectorStore(persist_directory=persist_directory).stats_path,
+            counts={"github": 2},
+            embedding_dimension=4,
+            last_ingest_at="2026-01-01T00:00:00Z",
+        )
+        saved.save()
+
+        # Act
+        info = ChromaVectorStore(persist_directory=persist_directory).get_collection_info()
+
+        # Assert
+        assert info["documents_by_type"] == {"github": 2}
+        assert info["last_ingest_at"] == "2026-01-01T00:00:00Z"
+        mock_chroma.return_value.get.assert_not_called()
+
+    def test_collection_info_reloaded_after_external_ingest(
+        self, mocker, mock_openai_embeddings, tmp_path
+    ):
+        """他のプロセスが統計ファイルを書き換えたら読み込み直すこと"""
+        # Arrange
+        mock_openai_embeddings()
+        mock_chroma = mocker.patch("src.features.rag.vectorstore.Chroma")
+        mock_chroma.return_value._collection.count.return_value = 2
+        persist_directory = str(tmp_path / "chroma")
+        reader = ChromaVectorStore(persist_directory=persist_directory)
+        CollectionStats(reader.stats_path, counts={"github": 2}).save()
+        before = reader.get_collection_info()
+
+        # Act
+        # インジェストスクリプトなど別プロセスでの書き込み（ファイルの置き換え）
+        mock_chroma.return_value._collection.count.return_value = 5
+        CollectionStats(
+            reader.stats_path,
+            counts={"github": 2, "blog": 3},
+            last_ingest_at="2026-01-02T00:00:00Z",
+        ).save()
+        after = reader.get_collection_info()
+
+        # Assert
+        assert before["document_count"] == 2
+        assert after["document_count"] == 5
+        assert after["documents_by_type"] == {"github": 2, "blog": 3}
+        assert after["last_ingest_at"] == "2026-01-02T00:00:00Z"
+        mock_chroma.return_value.get.assert_not_called()
+
     # ========================================================================
     # Retriever Tests
     # ========================================================================